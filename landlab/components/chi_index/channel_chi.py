@@ -8,11 +8,7 @@
 import numpy as np
 
 from landlab import Component, RasterModelGrid
-
-try:
-    from itertools import izip
-except ImportError:
-    izip = zip
+from landlab.utils.stack_accumulate import accumulate_up_stack
 
 
 class ChiFinder(Component):
@@ -283,8 +279,9 @@ class ChiFinder(Component):
     ):
         """Calculates chi at each channel node by summing chi_integrand.
 
-        This method assumes a uniform, mean spacing between nodes. Method is
-        deliberately split out for potential cythonization at a later stage.
+        This method assumes a uniform, mean spacing between nodes. The
+        integrand is summed along the channel network by
+        :func:`~landlab.utils.stack_accumulate.accumulate_up_stack`.
 
         Parameters
         ----------
@@ -325,11 +322,14 @@ class ChiFinder(Component):
                [ 0. ,  0. ,  0. ,  0. ]])
         """
         receivers = self._grid.at_node["flow__receiver_node"]
+        integrand_at_nodes = np.zeros(self._grid.number_of_nodes)
+        integrand_at_nodes[valid_upstr_order] = chi_integrand
+
         # because chi_array is all zeros, BC cases where node is receiver
         # resolve themselves
-        for (node, integrand) in izip(valid_upstr_order, chi_integrand):
-            dstr_node = receivers[node]
-            chi_array[node] = chi_array[dstr_node] + integrand
+        accumulate_up_stack(
+            valid_upstr_order, receivers, integrand_at_nodes, out=chi_array
+        )
         chi_array *= mean_dx
 
     def integrate_chi_each_dx(
@@ -337,9 +337,9 @@ class ChiFinder(Component):
     ):
         """Calculates chi at each channel node by summing chi_integrand*dx.
 
-        This method accounts explicitly for spacing between each node. Method
-        is deliberately split out for potential cythonization at a later
-        stage. Uses a trapezium integration method.
+        This method accounts explicitly for spacing between each node. Uses a
+        trapezium integration method, summed along the channel network by
+        :func:`~landlab.utils.stack_accumulate.accumulate_up_stack`.
 
         Parameters
         ----------
@@ -411,19 +411,20 @@ class ChiFinder(Component):
         receivers = self._grid.at_node["flow__receiver_node"]
         links = self._grid.at_node["flow__link_to_receiver_node"]
 
-        # because chi_array is all zeros, BC cases where node is receiver
-        # resolve themselves
+        # nodes without a link to a receiver are left as they are
+        has_link = links != self._grid.BAD_INDEX
         half_integrand = 0.5 * chi_integrand_at_nodes
-        for node in valid_upstr_order:
-            dstr_node = receivers[node]
-            dstr_link = links[node]
-            if dstr_link != self._grid.BAD_INDEX:
-                dstr_length = self._link_lengths[dstr_link]
-                half_head_val = half_integrand[node]
-                half_tail_val = half_integrand[dstr_node]
-                mean_val = half_head_val + half_tail_val
-                chi_to_add = mean_val * dstr_length
-                chi_array[node] = chi_array[dstr_node] + chi_to_add
+        chi_to_add = np.zeros(self._grid.number_of_nodes)
+        chi_to_add[has_link] = (
+            half_integrand[has_link] + half_integrand[receivers[has_link]]
+        ) * self._link_lengths[links[has_link]]
+
+        accumulate_up_stack(
+            valid_upstr_order,
+            np.where(has_link, receivers, -1),
+            chi_to_add,
+            out=chi_array,
+        )
 
     def mean_channel_node_spacing(self, ch_nodes):
         """Calculates the mean spacing between all adjacent channel nodes.
@@ -217,7 +217,7 @@ class DepressionFinderAndRouter(Component):
         """
         super().__init__(grid)
 
-        self._bc_set_code = self._grid.bc_set_code
+        self._status_version = self._grid.status_cache_version()
 
         self._user_supplied_pits = pits
         self._reroute_flow = reroute_flow
@@ -868,9 +868,9 @@ class DepressionFinderAndRouter(Component):
         . ~ . . .
         o . . . .
         """
-        if self._bc_set_code != self._grid.bc_set_code:
+        if self._status_version != self._grid.status_cache_version():
             self.updated_boundary_conditions()
-            self._bc_set_code = self._grid.bc_set_code
+            self._status_version = self._grid.status_cache_version()
 
         # verify that there is an outlet to the grid and
         if not np.any(
@@ -7,6 +7,7 @@
 import numpy as np
 
 from landlab import Component, LinkStatus
+from landlab.utils import SubStepper
 
 
 class DepthDependentDiffuser(Component):
@@ -100,6 +101,19 @@ class DepthDependentDiffuser(Component):
     >>> np.greater(soil_decay_depth_1[1], soil_decay_depth_point1[1])
     False
 
+    Time steps longer than the stability limit of the scheme can be divided
+    into stable sub-steps.
+
+    >>> z[:] = mg.node_x ** 2
+    >>> BRz = mg.at_node["bedrock__elevation"]
+    >>> BRz[:] = z - 1.0
+    >>> DDdiff = DepthDependentDiffuser(mg, dynamic_dt=True)
+    >>> DDdiff.run_one_step(1.0)
+    >>> DDdiff.number_of_substeps
+    4
+    >>> np.all(np.diff(z[mg.core_nodes]) > 0.0)
+    True
+
     References
     ----------
     **Required Software Citation(s) Specific to this Component**
@@ -185,7 +199,15 @@ class DepthDependentDiffuser(Component):
         },
     }
 
-    def __init__(self, grid, linear_diffusivity=1.0, soil_transport_decay_depth=1.0):
+    def __init__(
+        self,
+        grid,
+        linear_diffusivity=1.0,
+        soil_transport_decay_depth=1.0,
+        dynamic_dt=False,
+        if_unstable="pass",
+        courant_factor=0.2,
+    ):
         """
         Parameters
         ----------
@@ -195,12 +217,23 @@ class DepthDependentDiffuser(Component):
             Hillslope diffusivity, m**2/yr
         soil_transport_decay_depth: float
             Characteristic transport soil depth, m
+        dynamic_dt : bool, optional
+            Divide time steps into sub-steps that satisfy the Courant
+            condition of the scheme.
+        if_unstable : {"pass", "warn", "raise"}, optional
+            What to do if dynamic_dt is False and the time step is longer
+            than the stable time step.
+        courant_factor : float, optional
+            Factor to identify stable time-step duration.
         """
         super().__init__(grid)
         # Store grid and parameters
 
         self._K = linear_diffusivity
         self._soil_transport_decay_depth = soil_transport_decay_depth
+        self._dynamic_dt = dynamic_dt
+        self._if_unstable = if_unstable
+        self._substepper = SubStepper(grid, courant_factor=courant_factor)
 
         # get reference to inputs
         self._elev = self._grid.at_node["topographic__elevation"]
@@ -213,6 +246,11 @@ class DepthDependentDiffuser(Component):
         self._flux = self._grid.at_link["soil__flux"]
         self._bedrock = self._grid.at_node["bedrock__elevation"]
 
+    @property
+    def number_of_substeps(self):
+        """Number of sub-steps taken by the last call to run_one_step."""
+        return self._substepper.number_of_substeps
+
     def soilflux(self, dt):
         """Calculate soil flux for a time period 'dt'.
 
@@ -222,7 +260,17 @@ class DepthDependentDiffuser(Component):
         dt: float (time)
             The imposed timestep.
         """
+        substeps = self._substepper.iter_substeps(
+            dt,
+            self._calc_flux_and_stable_time_step,
+            adaptive=self._dynamic_dt,
+            if_unstable=self._if_unstable,
+        )
+        for sub_dt in substeps:
+            self._update_soil_and_topography(sub_dt)
 
+    def _calc_flux_and_stable_time_step(self):
+        """Calculate soil flux, and the stable time step, at links."""
         # update soil thickness
         self._grid.at_node["soil__depth"][:] = (
             self._grid.at_node["topographic__elevation"]
@@ -239,13 +287,17 @@ class DepthDependentDiffuser(Component):
         slope[self._grid.status_at_link == LinkStatus.INACTIVE] = 0.0
 
         # Calculate flux
-        self._flux[:] = (
-            -self._K
-            * slope
+        diffusivity = (
+            self._K
             * self._soil_transport_decay_depth
             * (1.0 - np.exp(-H_link / self._soil_transport_decay_depth))
         )
+        self._flux[:] = -diffusivity * slope
+
+        return self._substepper.calc_stable_time_step(diffusivity)
 
+    def _update_soil_and_topography(self, dt):
+        """Update soil, bedrock and topography with the soil flux."""
         # Calculate flux divergence
         dqdx = self._grid.calc_flux_div_at_node(self._flux)
 
@@ -10,6 +10,18 @@ import numpy as np
 
 from landlab import Component, LinkStatus
 from landlab.core.messages import deprecation_message
+from landlab.utils import SubStepper
+
+_UNSTABLE_MESSAGE = (
+    "Topographic slopes are high enough such that the "
+    "Courant condition is exceeded AND you have not "
+    "selected dynamic timestepping with dynamic_dt=True. "
+    "This may lead to infinite and/or nan values for "
+    "slope, elevation, and soil depth. Consider using a "
+    "smaller time step or dynamic timestepping. The "
+    "Courant condition recommends a timestep of "
+    "{stable} or smaller."
+)
 
 
 class DepthDependentTaylorDiffuser(Component):
@@ -93,26 +105,29 @@ class DepthDependentTaylorDiffuser(Component):
     The DepthDependentTaylorDiffuser makes and moves soil at a rate proportional
     to slope, this means that there is a characteristic time scale for soil
     transport and an associated stability criteria for the timestep. The
-    maximum characteristic time scale, :math:`De_{max}`, is given as a function of the
-    hillslope diffustivity, :math:`D`, the maximum slope, :math:`S_{max}`, and the critical slope
-    :math:`S_c`.
+    characteristic time scale of each link, :math:`D_e`, is given as a function of
+    the transport velocity, :math:`K`, the slope of the link, :math:`S`, the
+    critical slope :math:`S_c`, and the soil depth on the link, :math:`H`.
 
     .. math::
 
-        De_{max} = D
+        D_e = K H_*
             \left(
             1 +
-            \left( \frac{S_{max}{S_c}\right )^2 +
-            \left( \frac{S_{max}{S_c}\right )^4 +
+            \left( \frac{S}{S_c}\right )^2 +
+            \left( \frac{S}{S_c}\right )^4 +
             \dots +
-            \left( \frac{S_{max}{S_c}\right )^{( 2 * ( n - 1 ))}
+            \left( \frac{S}{S_c}\right )^{( 2 * ( n - 1 ))}
             \right)
+            (1 - exp( - H / H_*))
 
-    The maximum stable time step is given by
+    The maximum stable time step is the smallest, over all links, of
 
     .. math::
 
-        dtmax = courant_factor * dx * dx / Demax
+        dtmax = courant_factor * L * L / D_e
+
+    where :math:`L` is the length of the link.
 
     Where the courant factor is a user defined scale (default is 0.2)
 
@@ -128,7 +143,7 @@ class DepthDependentTaylorDiffuser(Component):
     dynamic_dt=True. This may lead to infinite and/or nan values for slope,
     elevation, and soil depth. Consider using a smaller time step or dynamic
     timestepping. The Courant condition recommends a timestep of
-    0.0953407607307 or smaller.
+    0.11770031669780827 or smaller.
 
     Alternatively you can specify if_unstable='raise', and a Runtime Error will
     be raised if this condition is not met.
@@ -160,7 +175,7 @@ class DepthDependentTaylorDiffuser(Component):
     dynamic_dt=True. This may lead to infinite and/or nan values for slope,
     elevation, and soil depth. Consider using a smaller time step or dynamic
     timestepping. The Courant condition recommends a timestep of
-    0.004 or smaller.
+    0.004000000450140749 or smaller.
 
     Now, we'll re-build the grid and do the same example with dynamic timesteps.
 
@@ -353,6 +368,7 @@ class DepthDependentTaylorDiffuser(Component):
         self._dynamic_dt = dynamic_dt
         self._if_unstable = if_unstable
         self._courant_factor = courant_factor
+        self._substepper = SubStepper(grid, courant_factor=courant_factor)
 
         # get reference to inputs
         self._elev = self._grid.at_node["topographic__elevation"]
@@ -365,6 +381,11 @@ class DepthDependentTaylorDiffuser(Component):
         self._flux = self._grid.at_link["soil__flux"]
         self._bedrock = self._grid.at_node["bedrock__elevation"]
 
+    @property
+    def number_of_substeps(self):
+        """Number of sub-steps taken by the last call to run_one_step."""
+        return self._substepper.number_of_substeps
+
     def soilflux(self, dt):
         """Calculate soil flux for a time period 'dt'.
 
@@ -373,81 +394,36 @@ class DepthDependentTaylorDiffuser(Component):
         dt: float (time)
             The imposed timestep.
         """
-        # establish time left as all of dt
-        time_left = dt
-
-        # begin while loop for time left
-        while time_left > 0.0:
-
-            # calculate soil__depth
-            self._grid.at_node["soil__depth"][:] = (
-                self._grid.at_node["topographic__elevation"]
-                - self._grid.at_node["bedrock__elevation"]
-            )
-
-            # Calculate soil depth at links.
-            self._H_link = self._grid.map_value_at_max_node_to_link(
-                "topographic__elevation", "soil__depth"
-            )
-
-            # Calculate gradients
-            self._slope = self._grid.calc_grad_at_link(self._elev)
-            self._slope[self._grid.status_at_link == LinkStatus.INACTIVE] = 0.0
-
-            # Test for time stepping courant condition
-            # Test for time stepping courant condition
-            courant_slope_term = 0.0
-            courant_s_over_scrit = self._slope.max() / self._slope_crit
-            for i in range(0, 2 * self._nterms, 2):
-                courant_slope_term += courant_s_over_scrit ** i
-                if np.any(np.isinf(courant_slope_term)):
-                    message = (
-                        "Soil flux term is infinite in Courant condition "
-                        "calculation. This is likely due to "
-                        "using too many terms in the Taylor expansion."
-                    )
-                    raise RuntimeError(message)
-            # Calculate De Max
-            De_max = self._K * (courant_slope_term)
-            # Calculate longest stable timestep
-            self._dt_max = self._courant_factor * (self._grid.dx ** 2) / De_max
-
-            # Test for the Courant condition and print warning if user intended
-            # for it to be printed.
-            if (
-                (self._dt_max < dt)
-                and (not self._dynamic_dt)
-                and (self._if_unstable != "pass")
-            ):
-                message = (
-                    "Topographic slopes are high enough such that the "
-                    "Courant condition is exceeded AND you have not "
-                    "selected dynamic timestepping with dynamic_dt=True. "
-                    "This may lead to infinite and/or nan values for "
-                    "slope, elevation, and soil depth. Consider using a "
-                    "smaller time step or dynamic timestepping. The "
-                    "Courant condition recommends a timestep of "
-                    "" + str(self._dt_max) + " or smaller."
-                )
-                if self._if_unstable == "raise":
-                    raise RuntimeError(message)
-                if self._if_unstable == "warn":
-                    print(message)
-
-            # if dynamic dt is selected, use it, otherwise, use the entire time
-            if self._dynamic_dt:
-                self._sub_dt = np.min([dt, self._dt_max])
-                time_left -= self._sub_dt
-            else:
-                self._sub_dt = dt
-                time_left = 0
-
-            # update sed flux, topography, soil, and bedrock based on the
+        substeps = self._substepper.iter_substeps(
+            dt,
+            self._calc_flux_and_stable_time_step,
+            adaptive=self._dynamic_dt,
+            if_unstable=self._if_unstable,
+            message=_UNSTABLE_MESSAGE,
+        )
+        for self._sub_dt in substeps:
+            # update topography, soil, and bedrock based on the
             # current self._sub_dt
             self._update_flux_topography_soil_and_bedrock()
+        self._dt_max = self._substepper.stable_time_step
+
+    def _calc_flux_and_stable_time_step(self):
+        """Calculate soil flux, and the stable time step, at links."""
+        # calculate soil__depth
+        self._grid.at_node["soil__depth"][:] = (
+            self._grid.at_node["topographic__elevation"]
+            - self._grid.at_node["bedrock__elevation"]
+        )
+
+        # Calculate soil depth at links.
+        self._H_link = self._grid.map_value_at_max_node_to_link(
+            "topographic__elevation", "soil__depth"
+        )
+
+        # Calculate gradients
+        self._slope = self._grid.calc_grad_at_link(self._elev)
+        self._slope[self._grid.status_at_link == LinkStatus.INACTIVE] = 0.0
 
-    def _update_flux_topography_soil_and_bedrock(self):
-        """Calculate soil flux and update topography."""
         # Calculate flux
         slope_term = 0.0
         s_over_scrit = self._slope / self._slope_crit
@@ -460,12 +436,17 @@ class DepthDependentTaylorDiffuser(Component):
                 )
                 raise RuntimeError(message)
 
-        self._flux[:] = -(
-            (self._K * self._slope * self._soil_transport_decay_depth)
+        diffusivity = (
+            (self._K * self._soil_transport_decay_depth)
             * (slope_term)
             * (1.0 - np.exp(-self._H_link / self._soil_transport_decay_depth))
         )
+        self._flux[:] = -diffusivity * self._slope
+
+        return self._substepper.calc_stable_time_step(diffusivity)
 
+    def _update_flux_topography_soil_and_bedrock(self):
+        """Update topography, soil, and bedrock with the soil flux."""
         # Calculate flux divergence
         dqdx = self._grid.calc_flux_div_at_node(self._flux)
 
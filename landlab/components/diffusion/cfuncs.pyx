@@ -0,0 +1,69 @@
+import numpy as np
+
+cimport cython
+cimport numpy as np
+
+DTYPE_FLOAT = np.double
+ctypedef np.double_t DTYPE_FLOAT_t
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def solve_tridiagonal_rows(
+    const DTYPE_FLOAT_t[:, :] lower,
+    const DTYPE_FLOAT_t[:, :] diagonal,
+    const DTYPE_FLOAT_t[:, :] upper,
+    DTYPE_FLOAT_t[:, :] rhs,
+):
+    """Solve a tridiagonal system for each row of an array.
+
+    Each row, *i*, of the arrays holds the elements of a system of
+    equations,
+
+        lower[i, j] * x[j - 1] + diagonal[i, j] * x[j] + upper[i, j] * x[j + 1]
+            = rhs[i, j]
+
+    which is solved, in place, with the Thomas algorithm. The first element
+    of *lower* and the last element of *upper* in each row are not used.
+    The systems must not need pivoting (diagonally dominant systems don't).
+
+    Parameters
+    ----------
+    lower, diagonal, upper : ndarray of float, shape (n_rows, n_cols)
+        Sub-diagonal, diagonal and super-diagonal elements of each system.
+    rhs : ndarray of float, shape (n_rows, n_cols)
+        Right-hand sides of each system, overwritten with the solutions.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.components.diffusion.cfuncs import solve_tridiagonal_rows
+    >>> lower = np.array([[0.0, -1.0, -1.0]])
+    >>> diagonal = np.array([[2.0, 2.0, 2.0]])
+    >>> upper = np.array([[-1.0, -1.0, 0.0]])
+    >>> x = np.array([[1.0, 0.0, 1.0]])
+    >>> solve_tridiagonal_rows(lower, diagonal, upper, x)
+    >>> x
+    array([[ 1.,  1.,  1.]])
+    """
+    cdef int n_rows = rhs.shape[0]
+    cdef int n_cols = rhs.shape[1]
+    cdef DTYPE_FLOAT_t[:] scratch = np.empty(n_cols, dtype=DTYPE_FLOAT)
+    cdef int row, col
+    cdef double denom
+
+    with nogil:
+        for row in range(n_rows):
+            denom = diagonal[row, 0]
+            scratch[0] = upper[row, 0] / denom
+            rhs[row, 0] = rhs[row, 0] / denom
+            for col in range(1, n_cols):
+                denom = diagonal[row, col] - lower[row, col] * scratch[col - 1]
+                scratch[col] = upper[row, col] / denom
+                rhs[row, col] = (
+                    rhs[row, col] - lower[row, col] * rhs[row, col - 1]
+                ) / denom
+
+            for col in range(n_cols - 2, -1, -1):
+                rhs[row, col] -= scratch[col] * rhs[row, col + 1]
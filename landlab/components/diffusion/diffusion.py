@@ -1,5 +1,5 @@
 #! /usr/env/python
-"""Component that models 2D diffusion using an explicit finite-volume method.
+"""Component that models 2D diffusion using a finite-volume method.
 
 Created July 2013 GT Last updated March 2016 DEJH with LL v1.0 component
 style
@@ -7,8 +7,13 @@ style
 
 
 import numpy as np
+from scipy.sparse import diags
 
 from landlab import Component, FieldError, LinkStatus, NodeStatus, RasterModelGrid
+from landlab.utils import SparseSolver, SubStepper
+from landlab.utils.matrix import CoreNodeMatrixBuilder, get_core_node_at_node
+
+from .cfuncs import solve_tridiagonal_rows
 
 _ALPHA = 0.15  # time-step stability factor
 # ^0.25 not restrictive enough at meter scales w S~1 (possible cases)
@@ -34,6 +39,16 @@ class LinearDiffuser(Component):
     the diffusivity at each patch will be the mean vector sum of that at the
     bounding links.
 
+    The 'implicit' method solves the same fluxes as the 'simple' method,
+    but with a backward-Euler time step, so that each call to
+    :func:`run_one_step` is a single step no matter how large *dt* is.
+    On a raster, the default solver splits each step into implicit steps
+    along rows and then columns (an alternating direction implicit, or ADI,
+    scheme), each of which is a set of tridiagonal systems. This is fast
+    but adds a splitting error that grows with *dt*. The *"direct"* and
+    *"cg"* solvers solve the full two-dimensional system, and *"cg"* is the
+    default for other grids.
+
     The primary method of this class is :func:`run_one_step`.
 
     Examples
@@ -58,7 +73,7 @@ class LinearDiffuser(Component):
     >>> ld2 = LinearDiffuser(mg2, linear_diffusivity=kd)
     >>> for i in range(10):
     ...     ld2.run_one_step(0.1)
-    >>> z2[mg2.core_nodes].sum() == 2.
+    >>> np.isclose(z2[mg2.core_nodes].sum(), 2.)
     True
     >>> z2.reshape((5, 30))[2, 8] > z2.reshape((5, 30))[2, 22]
     True
@@ -91,6 +106,22 @@ class LinearDiffuser(Component):
     >>> np.all(z2[mg2.core_nodes] < z1[mg2.core_nodes])
     True
 
+    The implicit method takes time steps much longer than the stability
+    limit of the explicit methods in a single step.
+
+    >>> mg = RasterModelGrid((3, 7))
+    >>> z = mg.add_zeros("topographic__elevation", at="node")
+    >>> mg.set_closed_boundaries_at_grid_edges(False, True, False, True)
+    >>> ld = LinearDiffuser(mg, linear_diffusivity=1.0, method="implicit")
+    >>> uplift_rate = 0.001
+    >>> for i in range(10):
+    ...     z[mg.core_nodes] += uplift_rate * 1000.0
+    ...     ld.run_one_step(1000.0)
+    >>> z[mg.core_nodes]
+    array([ 0.0025,  0.004 ,  0.0045,  0.004 ,  0.0025])
+    >>> ld.time_step
+    1000.0
+
     References
     ----------
     **Required Software Citation(s) Specific to this Component**
@@ -135,7 +166,15 @@ class LinearDiffuser(Component):
         },
     }
 
-    def __init__(self, grid, linear_diffusivity=0.01, method="simple", deposit=True):
+    def __init__(
+        self,
+        grid,
+        linear_diffusivity=0.01,
+        method="simple",
+        deposit=True,
+        solver=None,
+        solver_kwds=None,
+    ):
         """
         Parameters
         ----------
@@ -146,7 +185,7 @@ class LinearDiffuser(Component):
             diffusivities on either nodes or links - the component will
             distinguish which based on array length. Values on nodes will be
             mapped to links using an upwind scheme in the simple case.
-        method : {'simple', 'resolve_on_patches', 'on_diagonals'}
+        method : {'simple', 'resolve_on_patches', 'on_diagonals', 'implicit'}
             The method used to represent the fluxes. 'simple' solves a finite
             difference method with a simple staggered grid scheme onto the links.
             'resolve_on_patches' solves the scheme by mapping both slopes and
@@ -161,6 +200,8 @@ class LinearDiffuser(Component):
             performed on a raster. 'on_diagonals' pretends that the "faces" of a
             cell with 8 links are represented by a stretched regular octagon set
             within the true cell.
+            'implicit' uses the fluxes of 'simple' but takes a single,
+            backward-Euler time step for each call to :func:`run_one_step`.
         deposit : {True, False}
             Whether diffusive material can be deposited. True means that diffusive
             material will be deposited if the divergence of sediment flux is
@@ -170,12 +211,34 @@ class LinearDiffuser(Component):
             likely removes any material that would be deposited. If one couples
             fluvial detachment-limited incision with linear diffusion, the channels
             will not reach the predicted analytical solution unless deposit is set
-            to False.
+            to False. The 'implicit' method requires deposit to be True.
+        solver : {'adi', 'direct', 'cg'}, optional
+            Solver used by the 'implicit' method. 'adi' (the default for
+            rasters, and only available on rasters) solves tridiagonal
+            systems along rows and then columns. 'direct' and 'cg' (the
+            default for other grids) solve the full system with
+            :class:`~landlab.utils.SparseSolver`.
+        solver_kwds : dict, optional
+            Additional keywords passed to :class:`~landlab.utils.SparseSolver`
+            by the 'direct' and 'cg' solvers.
         """
         super().__init__(grid)
 
-        self._bc_set_code = self._grid.bc_set_code
-        assert method in ("simple", "resolve_on_patches", "on_diagonals")
+        self._status_version = self._grid.status_cache_version()
+        assert method in ("simple", "resolve_on_patches", "on_diagonals", "implicit")
+        self._implicit = method == "implicit"
+        if self._implicit:
+            if not deposit:
+                raise ValueError("the implicit method requires deposit=True")
+            if solver is None:
+                solver = "adi" if isinstance(grid, RasterModelGrid) else "cg"
+            if solver == "adi":
+                if not isinstance(grid, RasterModelGrid):
+                    raise ValueError("the adi solver requires a raster grid")
+                self._solver = None
+            else:
+                self._solver = SparseSolver(method=solver, **(solver_kwds or {}))
+            self._matrix_builder = CoreNodeMatrixBuilder(grid)
         if method == "resolve_on_patches":
             assert isinstance(self._grid, RasterModelGrid)
             self._use_patches = True
@@ -221,18 +284,10 @@ class LinearDiffuser(Component):
         self._values_to_diffuse = "topographic__elevation"
 
         # Set internal time step
-        # ..todo:
-        #   implement mechanism to compute time-steps dynamically if grid is
-        #   adaptive/changing
         # as of modern componentization (Spring '16), this can take arrays
-        # and irregular grids
-        # CFL condition precalc:
-        CFL_prefactor = (
-            _ALPHA * self._grid.length_of_link[: self._grid.number_of_links] ** 2.0
-        )
-        # ^ link_length can include diags, if not careful...
-        self._CFL_actives_prefactor = CFL_prefactor[self._grid.active_links]
-        # ^note we can do this as topology shouldn't be changing
+        # and irregular grids. The CFL condition is re-derived every time the
+        # component is run, as diffusivities could change dynamically.
+        self._substepper = SubStepper(self._grid, courant_factor=_ALPHA)
 
         # Get a list of interior cells
         self._interior_cells = self._grid.node_at_core_cell
@@ -378,6 +433,9 @@ class LinearDiffuser(Component):
         if self._use_diags:
             self._g.fill(0.0)
 
+        if self._implicit:
+            self._update_implicit_links()
+
         if self._kd_on_links or self._use_patches:
             mg = self._grid
             x_link_patch_pres = mg.patches_present_at_link[self._hoz]
@@ -405,12 +463,129 @@ class LinearDiffuser(Component):
                 self._hoz_link_neighbors == -1,
             )
 
+    def _update_implicit_links(self):
+        """Set up the link and node data used by the implicit method."""
+        grid = self._grid
+        active_links = grid.active_links
+
+        self._width_over_length = np.zeros(grid.number_of_links)
+        self._width_over_length[active_links] = (
+            grid.length_of_face[grid.face_at_link[active_links]]
+            / grid.length_of_link[active_links]
+        )
+        self._area_at_core_node = grid.area_of_cell[grid.cell_at_node[grid.core_nodes]]
+
+        core_node_at_node = get_core_node_at_node(grid)
+        is_fixed_value = grid.status_at_node == NodeStatus.FIXED_VALUE
+        tails = grid.node_at_link_tail[active_links]
+        heads = grid.node_at_link_head[active_links]
+        to_fixed_value = is_fixed_value[heads] | is_fixed_value[tails]
+        self._fixed_value_links = active_links[to_fixed_value]
+        self._fixed_value_node_at_link = np.where(is_fixed_value[heads], heads, tails)[
+            to_fixed_value
+        ]
+        self._row_at_fixed_value_link = core_node_at_node[
+            np.where(is_fixed_value[heads], tails, heads)[to_fixed_value]
+        ]
+
+        if self._solver is None:
+            self._is_core_at_row = grid.status_at_node.reshape(grid.shape) == (
+                NodeStatus.CORE
+            )
+            self._area_at_row = np.ones(grid.shape)
+            self._area_at_row.flat[grid.core_nodes] = self._area_at_core_node
+        else:
+            self._solver.reset()
+
+    def _get_kd_at_link(self):
+        """Diffusivity at links, mapped from nodes if needed."""
+        if isinstance(self._kd, np.ndarray) and not self._kd_on_links:
+            return self._grid.map_max_of_link_nodes_to_link(self._kd)
+        else:
+            return self._kd
+
+    def _run_one_step_implicit(self, dt):
+        """Take a single backward-Euler step of length *dt*."""
+        grid = self._grid
+        z = grid.at_node[self._values_to_diffuse]
+        core_nodes = grid.core_nodes
+        z_at_core_node = z[core_nodes]
+
+        kd_at_link = np.broadcast_to(self._get_kd_at_link(), grid.number_of_links)
+        coef_at_link = kd_at_link * self._width_over_length
+
+        if self._solver is None:
+            self._solve_adi(z, coef_at_link, dt)
+        else:
+            mat = diags(self._area_at_core_node) - dt * (
+                self._matrix_builder.get_matrix(coef_at_link)
+            )
+            rhs = self._area_at_core_node * z_at_core_node
+            rhs += dt * np.bincount(
+                self._row_at_fixed_value_link,
+                weights=coef_at_link[self._fixed_value_links]
+                * z[self._fixed_value_node_at_link],
+                minlength=len(core_nodes),
+            )
+            z[core_nodes] = self._solver.solve(mat, rhs)
+
+        z[self._fixed_grad_nodes] = (
+            z[self._fixed_grad_anchors] + self._fixed_grad_offsets
+        )
+
+        self._dqsds.fill(0.0)
+        self._dqsds[core_nodes] = (z_at_core_node - z[core_nodes]) / dt
+        active_links = grid.active_links
+        self._g[active_links] = grid.calc_grad_at_link(z)[active_links]
+        self._qs[active_links] = -kd_at_link[active_links] * self._g[active_links]
+
+    def _solve_adi(self, z, coef_at_link, dt):
+        """Implicit steps along the rows and then the columns of a raster."""
+        grid = self._grid
+        n_rows, n_cols = grid.shape
+        is_core = self._is_core_at_row
+        scale = dt / self._area_at_row
+
+        z_at_row = z.reshape(grid.shape)
+
+        coef_at_row = coef_at_link[grid.horizontal_links].reshape((n_rows, n_cols - 1))
+        values = np.ascontiguousarray(z_at_row)
+        solve_tridiagonal_rows(
+            *self._tridiagonal_elements(coef_at_row, scale, is_core), values
+        )
+
+        coef_at_col = coef_at_link[grid.vertical_links].reshape((n_rows - 1, n_cols))
+        values = np.ascontiguousarray(values.T)
+        solve_tridiagonal_rows(
+            *self._tridiagonal_elements(coef_at_col.T, scale.T, is_core.T), values
+        )
+
+        z_at_row[is_core] = values.T[is_core]
+
+    @staticmethod
+    def _tridiagonal_elements(coef_between_nodes, scale, is_core):
+        """Elements of the implicit systems along each row of nodes.
+
+        Non-core nodes are given an identity row so that they keep their
+        values.
+        """
+        lower = np.zeros(scale.shape)
+        upper = np.zeros(scale.shape)
+        lower[:, 1:] = -coef_between_nodes
+        upper[:, :-1] = -coef_between_nodes
+        lower *= scale
+        upper *= scale
+        lower[~is_core] = 0.0
+        upper[~is_core] = 0.0
+        diagonal = 1.0 - lower - upper
+        return lower, diagonal, upper
+
     def run_one_step(self, dt):
         """Run the diffuser for one timestep, dt.
 
         If the imposed timestep dt is longer than the Courant-Friedrichs-Lewy
         condition for the diffusion, this timestep will be internally divided
-        as the component runs, as needed.
+        as the component runs, as needed (unless the method is 'implicit').
 
         Parameters
         ----------
@@ -423,9 +598,14 @@ class LinearDiffuser(Component):
         if not self._run_before:
             self.updated_boundary_conditions()  # just in case
             self._run_before = True
-        if self._bc_set_code != self._grid.bc_set_code:
+        if self._status_version != self._grid.status_cache_version():
             self.updated_boundary_conditions()
-            self._bc_set_code = self._grid.bc_set_code
+            self._status_version = self._grid.status_cache_version()
+
+        if self._implicit:
+            self._dt = dt
+            self._run_one_step_implicit(dt)
+            return
 
         core_nodes = self._grid.node_at_core_cell
         # do mapping of array kd here, in case it points at an updating
@@ -433,21 +613,12 @@ class LinearDiffuser(Component):
         if isinstance(self._kd, np.ndarray):
             if not self._kd_on_links:
                 kd_links = self._grid.map_max_of_link_nodes_to_link(self._kd)
-                kd_activelinks = kd_links[self._grid.active_links]
-                # re-derive CFL condition, as could change dynamically:
-                dt_links = self._CFL_actives_prefactor / kd_activelinks
-                self._dt = np.nanmin(dt_links)
             else:
                 kd_links = self._kd
-                kd_activelinks = self._kd[self._grid.active_links]
-                dt_links = self._CFL_actives_prefactor / kd_activelinks
-                self._dt_links = dt_links
-                self._dt = np.nanmin(np.fabs(dt_links))
+            kd_activelinks = kd_links[self._grid.active_links]
         else:
-            kd_activelinks = self._kd
-            # re-derive CFL condition, as could change dynamically:
-            dt_links = self._CFL_actives_prefactor / kd_activelinks
-            self._dt = np.nanmin(dt_links)
+            kd_links = kd_activelinks = self._kd
+        self._dt = self._substepper.calc_stable_time_step(kd_links)
 
         if self._use_patches:
             # need this else diffusivities on inactive links deform off-angle
@@ -456,16 +627,7 @@ class LinearDiffuser(Component):
             kd_links[self._grid.status_at_link == LinkStatus.INACTIVE] = 0.0
 
         # Take the smaller of delt or built-in time-step size self._dt
-        self._tstep_ratio = dt / self._dt
-        repeats = int(self._tstep_ratio // 1.0)
-        extra_time = self._tstep_ratio - repeats
-
-        # Can really get into trouble if no diffusivity happens but we run...
-        if self._dt < np.inf:
-            loops = repeats + 1
-        else:
-            loops = 0
-        for i in range(loops):
+        for timestep in self._substepper.iter_substeps(dt, lambda: self._dt):
             if not self._use_diags:
                 grads = mg.calc_grad_at_link(z)
                 self._g[mg.active_links] = grads[mg.active_links]
@@ -573,11 +735,6 @@ class LinearDiffuser(Component):
             if not self._deposit:
                 dzdt[np.where(dzdt > 0)] = 0.0
             # Update the elevations
-            timestep = self._dt
-            if i == (repeats):
-                timestep *= extra_time
-            else:
-                pass
             self._grid.at_node[self._values_to_diffuse][core_nodes] += (
                 dzdt[core_nodes] * timestep
             )
@@ -592,3 +749,10 @@ class LinearDiffuser(Component):
     def time_step(self):
         """Returns internal time-step size (as a property)."""
         return self._dt
+
+    @property
+    def number_of_substeps(self):
+        """Number of sub-steps taken by the last call to run_one_step."""
+        if self._implicit:
+            return 1
+        return self._substepper.number_of_substeps
@@ -11,17 +11,20 @@ ctypedef np.double_t DTYPE_FLOAT_t
 
 
 @cython.boundscheck(False)
-def _calc_dists_to_channel(np.ndarray[np.uint8_t, ndim=1] ch_network,
-                           np.ndarray[DTYPE_INT_t, ndim=1] flow_receivers,
-                           np.ndarray[DTYPE_INT_t, ndim=1] upstream_order,
-                           np.ndarray[DTYPE_FLOAT_t, ndim=1] link_lengths,
-                           np.ndarray[DTYPE_INT_t, ndim=1] stack_links,
-                           np.ndarray[DTYPE_FLOAT_t, ndim=1] dist_to_ch,
-                           DTYPE_INT_t num_nodes):
+@cython.wraparound(False)
+def _calc_dists_to_channel(const np.uint8_t[:] ch_network,
+                           const DTYPE_INT_t[:] flow_receivers,
+                           const DTYPE_INT_t[:] upstream_order,
+                           const DTYPE_FLOAT_t[:] link_lengths,
+                           const DTYPE_INT_t[:] stack_links,
+                           DTYPE_FLOAT_t[:] dist_to_ch):
     """Calculate distance to nearest channel.
 
     Calculate the distances to the closest channel node for all nodes in the
-    grid.
+    grid. Nodes are visited in upstream order so that the distance of a
+    node is the distance of its receiver plus the length of the link to it.
+    Nodes that are their own receivers (boundaries and pits) are treated as
+    channels.
 
     Parameters
     ----------
@@ -29,39 +32,128 @@ def _calc_dists_to_channel(np.ndarray[np.uint8_t, ndim=1] ch_network,
         integer logical map of which nodes contain channels.
     flow_receivers : node array
         ID of the next downstream node.
+    upstream_order : node array
+        Node IDs ordered from downstream to upstream.
     link_lengths : num_d8_links-length array of floats
         The length of all links on the grid, including diagonals if present.
     stack_links : node array
         The ID of the link that leads to the downstream node.
-    dists_to_ch : number_of_nodes-length array of floats
+    dist_to_ch : number_of_nodes-length array of floats
         The output array; the distance to the nearest channel node.
-    num_nodes : int
-        The number of nodes.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.components.drainage_density.cfuncs import (
+    ...     _calc_dists_to_channel
+    ... )
+
+    Nodes 1, 2 and 3 drain, one to the next, to node 0; node 2 is a
+    channel.
+
+    >>> dist = np.empty(4)
+    >>> _calc_dists_to_channel(
+    ...     np.array([0, 0, 1, 0], dtype=np.uint8),
+    ...     np.array([0, 0, 1, 2]),
+    ...     np.array([0, 1, 2, 3]),
+    ...     np.array([1.0, 2.0, 4.0]),
+    ...     np.array([-1, 0, 1, 2]),
+    ...     dist,
+    ... )
+    >>> dist
+    array([ 0.,  1.,  0.,  4.])
+    """
+    cdef int num_nodes = upstream_order.shape[0]
+    cdef int i, node, receiver
+
+    with nogil:
+        for i in range(num_nodes):
+            node = upstream_order[i]
+            receiver = flow_receivers[node]
+            if ch_network[node] == 1 or receiver == node:
+                dist_to_ch[node] = 0.
+            else:
+                dist_to_ch[node] = (
+                    dist_to_ch[receiver] + link_lengths[stack_links[node]]
+                )
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _calc_dists_to_channel_for_thresholds(
+    const DTYPE_FLOAT_t[:] channel_values,
+    const DTYPE_FLOAT_t[:] thresholds,
+    const DTYPE_INT_t[:] flow_receivers,
+    const DTYPE_INT_t[:] upstream_order,
+    const DTYPE_FLOAT_t[:] link_lengths,
+    const DTYPE_INT_t[:] stack_links,
+    DTYPE_FLOAT_t[:, :] dist_to_ch,
+):
+    """Calculate distance to nearest channel for several thresholds.
+
+    As ``_calc_dists_to_channel`` but in one pass for each of a set of
+    channelization thresholds, where channels are the nodes with
+    *channel_values* greater than a threshold.
+
+    Parameters
+    ----------
+    channel_values : node array
+        Value to compare with the thresholds to define channels.
+    thresholds : array of floats
+        The channelization thresholds.
+    flow_receivers : node array
+        ID of the next downstream node.
+    upstream_order : node array
+        Node IDs ordered from downstream to upstream.
+    link_lengths : num_d8_links-length array of floats
+        The length of all links on the grid, including diagonals if present.
+    stack_links : node array
+        The ID of the link that leads to the downstream node.
+    dist_to_ch : array of floats, shape `(n_thresholds, n_nodes)`
+        The output array; the distance to the nearest channel node for each
+        threshold.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.components.drainage_density.cfuncs import (
+    ...     _calc_dists_to_channel_for_thresholds
+    ... )
+
+    Nodes 1, 2 and 3 drain, one to the next, to node 0.
+
+    >>> dist = np.empty((3, 4))
+    >>> _calc_dists_to_channel_for_thresholds(
+    ...     np.array([4.0, 3.0, 2.0, 1.0]),
+    ...     np.array([0.5, 1.5, 2.5]),
+    ...     np.array([0, 0, 1, 2]),
+    ...     np.array([0, 1, 2, 3]),
+    ...     np.array([1.0, 2.0, 4.0]),
+    ...     np.array([-1, 0, 1, 2]),
+    ...     dist,
+    ... )
+    >>> dist
+    array([[ 0.,  0.,  0.,  0.],
+           [ 0.,  0.,  0.,  4.],
+           [ 0.,  0.,  2.,  6.]])
     """
-    cdef DTYPE_INT_t node
-    cdef DTYPE_INT_t node_iter
-    cdef DTYPE_INT_t flag
-    cdef DTYPE_FLOAT_t distance
-
-    for i in range(num_nodes):
-        node = upstream_order[i]
-        if ch_network[node] == 1:
-            # ^we're standing in a channel
-            dist_to_ch[node] = 0.
-        else:
-            distance = 0
-            flag = 0
-            node_iter = node
-            while flag == 0:  # as long as we haven't hit a channel yet...
-                if flow_receivers[node_iter] == node_iter:
-                    # ^if no flow receiver (boundary probably)
-                    ch_network[node_iter] = 1
-                    # ^convince the node it's a channel
-                else:
-                    distance += link_lengths[stack_links[node_iter]]
-                    node_iter = flow_receivers[node_iter]
-                if ch_network[node_iter] == 1:
-                    # ^we've hit a channel
-                    dist_to_ch[node] = distance
-                    # ^save distance to channel
-                    flag = 1
+    cdef int num_nodes = upstream_order.shape[0]
+    cdef int num_thresholds = thresholds.shape[0]
+    cdef int i, k, node, receiver
+    cdef double length, value
+
+    with nogil:
+        for i in range(num_nodes):
+            node = upstream_order[i]
+            receiver = flow_receivers[node]
+            if receiver == node:
+                for k in range(num_thresholds):
+                    dist_to_ch[k, node] = 0.
+            else:
+                length = link_lengths[stack_links[node]]
+                value = channel_values[node]
+                for k in range(num_thresholds):
+                    if value > thresholds[k]:
+                        dist_to_ch[k, node] = 0.
+                    else:
+                        dist_to_ch[k, node] = dist_to_ch[k, receiver] + length
@@ -406,15 +406,18 @@ class DrainageDensity(Component):
             )
         )
 
-    def _update_channel_mask_values(self):
-        channel__mask = (
+    def _channelization_values(self):
+        return (
             self._area_coefficient
             * np.power(self._grid.at_node["drainage_area"], self._area_exponent)
             * self._slope_coefficient
             * np.power(
                 self._grid.at_node["topographic__steepest_slope"], self._slope_exponent
             )
-        ) > self._channelization_threshold
+        )
+
+    def _update_channel_mask_values(self):
+        channel__mask = self._channelization_values() > self._channelization_threshold
         self._grid.at_node["channel__mask"] = channel__mask.astype(np.uint8)
 
     def calculate_drainage_density(self):
@@ -432,6 +435,7 @@ class DrainageDensity(Component):
 
         if self._mask_as_array is False:
             self._update_channel_mask()
+        self._channel_network = self._grid.at_node["channel__mask"]
 
         _calc_dists_to_channel(
             self._channel_network,
@@ -440,7 +444,6 @@ class DrainageDensity(Component):
             self._grid.length_of_d8,
             self._stack_links,
             self._distance_to_channel,
-            self._grid.number_of_nodes,
         )
         landscape_drainage_density = 1.0 / (
             2.0
@@ -452,3 +455,75 @@ class DrainageDensity(Component):
         )
         # this is THE drainage density
         return landscape_drainage_density
+
+    def calculate_distances_to_channel(self, channelization_thresholds):
+        """Calculate distances to channels for several thresholds.
+
+        Channels are defined with the area and slope coefficients and
+        exponents given to the component, but for each of a set of
+        channelization thresholds rather than the one given to the
+        component. Distances for all thresholds are found in a single pass
+        over the grid. Neither the ``channel__mask`` nor the
+        ``surface_to_channel__minimum_distance`` field is changed.
+
+        Parameters
+        ----------
+        channelization_thresholds : array of float
+            Threshold values above which channels exist.
+
+        Returns
+        -------
+        ndarray of float, shape `(n_thresholds, n_nodes)`
+            Distance from each node to the nearest channel, for each
+            threshold.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from landlab import RasterModelGrid
+        >>> from landlab.components import FlowAccumulator, DrainageDensity
+        >>> mg = RasterModelGrid((5, 5))
+        >>> _ = mg.add_field(
+        ...     "topographic__elevation", mg.y_of_node.copy(), at="node"
+        ... )
+        >>> FlowAccumulator(mg, flow_director="D8").run_one_step()
+        >>> dd = DrainageDensity(
+        ...     mg,
+        ...     area_coefficient=1.0,
+        ...     slope_coefficient=1.0,
+        ...     area_exponent=1.0,
+        ...     slope_exponent=0.0,
+        ...     channelization_threshold=1.5,
+        ... )
+        >>> dists = dd.calculate_distances_to_channel([1.5, 2.5, 3.5])
+        >>> dists[:, mg.core_nodes]
+        array([[ 0.,  0.,  0.,  0.,  0.,  0.,  1.,  1.,  1.],
+               [ 0.,  0.,  0.,  1.,  1.,  1.,  2.,  2.,  2.],
+               [ 1.,  1.,  1.,  2.,  2.,  2.,  3.,  3.,  3.]])
+
+        Drainage density for each threshold,
+
+        >>> 1.0 / (2.0 * dists[:, mg.core_nodes].mean(axis=1))
+        array([ 1.5 ,  0.5 ,  0.25])
+        """
+        from .cfuncs import _calc_dists_to_channel_for_thresholds
+
+        if self._mask_as_array:
+            raise ValueError(
+                "Distances for several channelization thresholds need "
+                "the area and slope coefficients and exponents, not a "
+                "channel mask."
+            )
+
+        thresholds = np.atleast_1d(np.asarray(channelization_thresholds, dtype=float))
+        distances = np.empty((len(thresholds), self._grid.number_of_nodes))
+        _calc_dists_to_channel_for_thresholds(
+            np.asarray(self._channelization_values(), dtype=float),
+            thresholds,
+            self._flow_receivers,
+            self._upstream_order,
+            self._grid.length_of_d8,
+            self._stack_links,
+            distances,
+        )
+        return distances
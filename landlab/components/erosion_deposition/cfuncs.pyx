@@ -4,6 +4,7 @@ cimport cython
 
 cdef extern from "math.h":
     double exp(double x) nogil
+    double pow(double x, double y) nogil
 
 DTYPE_FLOAT = np.double
 ctypedef np.double_t DTYPE_FLOAT_t
@@ -12,48 +13,298 @@ DTYPE_INT = int
 ctypedef np.int_t DTYPE_INT_t
 
 
-def calculate_qs_in(np.ndarray[DTYPE_INT_t, ndim=1] stack_flip_ud,
-                    np.ndarray[DTYPE_INT_t, ndim=1] flow_receivers,
-                    np.ndarray[DTYPE_FLOAT_t, ndim=1] cell_area_at_node,
-                    np.ndarray[DTYPE_FLOAT_t, ndim=1] q,
-                    np.ndarray[DTYPE_FLOAT_t, ndim=1] qs,
-                    np.ndarray[DTYPE_FLOAT_t, ndim=1] qs_in,
-                    np.ndarray[DTYPE_FLOAT_t, ndim=1] Es,
-                    DTYPE_FLOAT_t v_s,
-                    DTYPE_FLOAT_t F_f):
-
-    """Calculate and qs and qs_in."""
-    # define internal variables
-    cdef unsigned int n_nodes = stack_flip_ud.shape[0]
-    cdef unsigned int node_id
-    cdef unsigned int i
-
-    # iterate top to bottom through the stack, calculate qs and adjust qs_in
-    for i in range(n_nodes):
-
-        # choose the node id
-        node_id = stack_flip_ud[i]
-
-        # If q at current node is greather than zero, calculate qs based on a
-        # local analytical solution. This local analytical solution depends on
-        # qs_in, the sediment flux coming into the node from upstream (hence
-        # the upstream to downstream node ordering).
-
-        # Because calculation of qs requires qs_in, this operation must be done
-        # in an upstream to downstream loop, and cannot be vectorized.
-        #
-        # there is water flux (q) and this node is not a pit then calculate qs.
-
-        if q[node_id] > 0 and (flow_receivers[node_id] != node_id):
-            qs[node_id] = ((qs_in[node_id]
-                            + ((1.0 - F_f) * Es[node_id]) * cell_area_at_node[node_id])
-                           / (1.0 + (v_s * cell_area_at_node[node_id] / (q[node_id]))))
-
-            # finally, add this node's qs to recieiving nodes qs_in.
-            # if qs[node_id] == 0, then there is no need for this line to be
-            # evaluated.
-            qs_in[flow_receivers[node_id]] += qs[node_id]
-
-        else:
-            # if q at the current node is zero, set qs at that node is zero.
-            qs[node_id] = 0
+cdef inline double _erosion_term(
+    double omega, double sp_crit, double crit_divisor
+) nogil:
+    """Stream power less an exponentially smoothed threshold."""
+    if sp_crit != 0.0:
+        return omega - sp_crit * (1.0 - exp(-omega / sp_crit)) / crit_divisor
+    else:
+        return omega
+
+
+cdef inline double _nanmin(double a, double b) nogil:
+    """Smaller of two values, or NaN if either is NaN (like numpy.amin)."""
+    if b < a or b != b:
+        return b
+    else:
+        return a
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def calc_sediment_budget(
+    const DTYPE_INT_t[:] stack,
+    const DTYPE_INT_t[:] flow_receivers,
+    const np.uint8_t[:] status_at_node,
+    int core_status,
+    const DTYPE_INT_t[:] flood_status_code,
+    int flooded_status,
+    const DTYPE_FLOAT_t[:] cell_area_at_node,
+    const DTYPE_FLOAT_t[:] q,
+    const DTYPE_FLOAT_t[:] slope,
+    double m_sp,
+    double n_sp,
+    double v_s,
+    double F_f,
+    const DTYPE_FLOAT_t[:] K_br,
+    const DTYPE_FLOAT_t[:] sp_crit_br,
+    DTYPE_FLOAT_t[:] Er,
+    DTYPE_FLOAT_t[:] qs,
+    DTYPE_FLOAT_t[:] qs_in,
+    DTYPE_FLOAT_t[:] depo_rate,
+    DTYPE_FLOAT_t[:] br_erosion_term=None,
+    const DTYPE_FLOAT_t[:] K_sed=None,
+    const DTYPE_FLOAT_t[:] sp_crit_sed=None,
+    const DTYPE_FLOAT_t[:] soil_depth=None,
+    double H_star=1.0,
+    double phi=0.0,
+    DTYPE_FLOAT_t[:] sed_erosion_term=None,
+    DTYPE_FLOAT_t[:] Es=None,
+    const DTYPE_FLOAT_t[:] z=None,
+    DTYPE_FLOAT_t[:] dzdt=None,
+    DTYPE_FLOAT_t[:] dHdt=None,
+    const np.uint8_t[:] ignore_time_to_flat=None,
+    double max_dt=np.inf,
+    double time_step_factor=0.5,
+):
+    """Calculate erosion, sediment flux and deposition in one sweep.
+
+    Nodes are visited from upstream to downstream. At each node the
+    erosion rates are calculated from the local stream power and the
+    sediment flux leaving the node is found from the flux coming in from
+    upstream, which is then added to the influx of the node's receiver.
+    Erosion is switched off at flooded core nodes. A flooded core node is
+    one with a *flood_status_code* of *flooded_status* or, if
+    *flood_status_code* is ``None`` (depressions are not handled), a core
+    node that is its own receiver; all of the incoming sediment is
+    deposited at such pits.
+
+    Erosion is split into sediment entrainment, *Es*, and bedrock erosion,
+    *Er*, by a cover of sediment of thickness *soil_depth*, as in Space. If
+    *soil_depth* is ``None`` there is no cover and everything is eroded
+    from the substrate as *Er*, as in ErosionDeposition.
+
+    If *z* is given, the rate of change of elevation at core nodes and the
+    largest time step (no longer than *max_dt*) for which no node becomes
+    (nearly) as low as its receiver and, with a cover, no sediment cover
+    is exhausted are also calculated.
+
+    Parameters
+    ----------
+    stack : ndarray of int
+        Nodes ordered downstream to upstream.
+    flow_receivers : ndarray of int
+        Receiver of each node.
+    status_at_node : ndarray of uint8
+        Status of each node.
+    core_status : int
+        Status of core nodes.
+    flood_status_code : ndarray of int or None
+        Flood status of each node, if depressions are handled.
+    flooded_status : int
+        Flood status of flooded nodes.
+    cell_area_at_node : ndarray of float
+        Area of the cell of each node.
+    q : ndarray of float
+        Water discharge.
+    slope : ndarray of float
+        Slope to each node's receiver.
+    m_sp, n_sp : float
+        Discharge and slope exponents.
+    v_s : float
+        Effective settling velocity.
+    F_f : float
+        Fraction of eroded bedrock that becomes fines.
+    K_br, sp_crit_br : ndarray of float
+        Erodibility and erosion threshold of bedrock (or substrate).
+    Er : ndarray of float
+        Output array for the rate of bedrock erosion.
+    qs, qs_in : ndarray of float
+        Output arrays for the sediment flux out of and in to each node.
+    depo_rate : ndarray of float
+        Output array for the rate of deposition.
+    br_erosion_term : ndarray of float, optional
+        Output array for bedrock erosion without cover.
+    K_sed, sp_crit_sed, soil_depth : ndarray of float, optional
+        Erodibility, entrainment threshold and thickness of sediment.
+    H_star : float, optional
+        Sediment thickness required for full entrainment.
+    phi : float, optional
+        Sediment porosity.
+    sed_erosion_term, Es : ndarray of float, optional
+        Output arrays for the rate of entrainment without and with cover.
+    z : ndarray of float, optional
+        Elevation.
+    dzdt : ndarray of float, optional
+        Output array for the rate of change of elevation (zero at nodes
+        that are not core nodes).
+    dHdt : ndarray of float, optional
+        Output array for the rate of change of sediment thickness.
+    ignore_time_to_flat : ndarray of uint8, optional
+        Nodes that do not limit the time step by flattening.
+    max_dt : float, optional
+        Longest time step.
+    time_step_factor : float, optional
+        Fraction of the time to flattening (or exhaustion) to step.
+
+    Returns
+    -------
+    float
+        The largest stable time step, or *max_dt* if *z* is not given.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.components.erosion_deposition.cfuncs import (
+    ...     calc_sediment_budget,
+    ... )
+
+    Two core nodes draining to an open boundary node, 0.
+
+    >>> stack = np.array([0, 1, 2])
+    >>> receivers = np.array([0, 0, 0])
+    >>> status = np.array([1, 0, 0], dtype=np.uint8)
+    >>> area = np.array([0.0, 1.0, 1.0])
+    >>> q = np.array([5.0, 4.0, 1.0])
+    >>> slope = np.array([0.0, 0.1, 0.1])
+    >>> K = np.full(3, 1.0)
+    >>> sp_crit = np.zeros(3)
+    >>> Er, qs, qs_in, depo_rate = np.empty((4, 3))
+    >>> calc_sediment_budget(
+    ...     stack, receivers, status, 0, None, 3, area, q, slope, 0.5, 1.0,
+    ...     1.0, 0.0, K, sp_crit, Er, qs, qs_in, depo_rate,
+    ... )
+    inf
+    >>> Er
+    array([ 0. ,  0.2,  0.1])
+    >>> qs
+    array([ 0.  ,  0.16,  0.05])
+    >>> qs_in
+    array([ 0.21,  0.  ,  0.  ])
+    >>> depo_rate
+    array([ 0.  ,  0.04,  0.05])
+
+    With an elevation, the largest stable time step is also returned.
+
+    >>> z = np.array([0.0, 1.0, 2.0])
+    >>> dzdt = np.empty(3)
+    >>> calc_sediment_budget(
+    ...     stack, receivers, status, 0, None, 3, area, q, slope, 0.5, 1.0,
+    ...     1.0, 0.0, K, sp_crit, Er, qs, qs_in, depo_rate, z=z, dzdt=dzdt,
+    ...     max_dt=100.0,
+    ... )
+    3.125
+    >>> dzdt
+    array([ 0.  , -0.16, -0.05])
+    """
+    cdef int n_nodes = stack.shape[0]
+    cdef bint has_cover = soil_depth is not None
+    cdef bint with_time_step = z is not None
+    cdef bint with_dzdt = dzdt is not None
+    cdef bint with_dHdt = dHdt is not None
+    cdef bint handles_depressions = flood_status_code is not None
+    cdef bint with_br_erosion_term = br_erosion_term is not None
+    cdef bint with_ignore = ignore_time_to_flat is not None
+    cdef double porosity_factor = 1.0 / (1.0 - phi)
+    cdef double dt = max_dt
+    cdef double Q_to_the_m, S_to_the_n, cover, br_term, sed_term
+    cdef double E_s, E_r, rate, rocdif, zdif
+    cdef bint is_core, is_flooded
+    cdef int i, node, receiver
+
+    with nogil:
+        for node in range(n_nodes):
+            qs_in[node] = 0.0
+
+        # iterate from upstream to downstream so that all of the sediment
+        # entering a node is known before the node is visited.
+        for i in range(n_nodes - 1, -1, -1):
+            node = stack[i]
+            receiver = flow_receivers[node]
+
+            is_core = status_at_node[node] == core_status
+            if handles_depressions:
+                is_flooded = is_core and flood_status_code[node] == flooded_status
+            else:
+                is_flooded = is_core and receiver == node
+
+            if is_flooded:
+                br_term = 0.0
+                sed_term = 0.0
+                E_r = 0.0
+                E_s = 0.0
+            else:
+                if n_sp == 1.0:
+                    S_to_the_n = slope[node]
+                else:
+                    S_to_the_n = pow(slope[node], n_sp)
+                Q_to_the_m = pow(q[node], m_sp)
+
+                br_term = _erosion_term(
+                    K_br[node] * Q_to_the_m * S_to_the_n, sp_crit_br[node], 1.0
+                )
+                if has_cover:
+                    sed_term = _erosion_term(
+                        K_sed[node] * Q_to_the_m * S_to_the_n,
+                        sp_crit_sed[node],
+                        1.0 - phi,
+                    )
+                    cover = exp(-soil_depth[node] / H_star)
+                    E_s = sed_term * (1.0 - cover)
+                    E_r = br_term * cover
+                else:
+                    sed_term = 0.0
+                    E_s = 0.0
+                    E_r = br_term
+
+            Er[node] = E_r
+            if with_br_erosion_term:
+                br_erosion_term[node] = br_term
+            if has_cover:
+                Es[node] = E_s
+                sed_erosion_term[node] = sed_term
+
+            # the flux out of a node follows from a local analytical solution
+            # that depends on the flux in from upstream.
+            if q[node] > 0.0 and receiver != node:
+                qs[node] = (
+                    qs_in[node] + (E_s + (1.0 - F_f) * E_r) * cell_area_at_node[node]
+                ) / (1.0 + (v_s * cell_area_at_node[node] / q[node]))
+                qs_in[receiver] += qs[node]
+            else:
+                qs[node] = 0.0
+
+            if q[node] > 0.0:
+                depo_rate[node] = qs[node] * (v_s / q[node])
+            else:
+                depo_rate[node] = 0.0
+            if is_flooded and not handles_depressions:  # all sed dropped here
+                depo_rate[node] = qs_in[node] / cell_area_at_node[node]
+
+            if with_dzdt:
+                if is_core:
+                    dzdt[node] = depo_rate[node] * porosity_factor - (E_s + E_r)
+                else:
+                    dzdt[node] = 0.0
+
+            if with_dHdt:
+                rate = porosity_factor * (depo_rate[node] - E_s)
+                dHdt[node] = rate
+                if with_time_step and rate < 0.0:
+                    dt = _nanmin(dt, -(time_step_factor * soil_depth[node] / rate))
+
+        # the time for a node to flatten against its receiver needs the rate
+        # of change of both.
+        if with_time_step:
+            for node in range(n_nodes):
+                if with_ignore and ignore_time_to_flat[node]:
+                    continue
+                receiver = flow_receivers[node]
+                rocdif = dzdt[node] - dzdt[receiver]
+                zdif = z[node] - z[receiver]
+                if rocdif < 0.0 and not zdif <= 0.0:
+                    dt = _nanmin(dt, -(time_step_factor * zdif / rocdif))
+
+    return dt
@@ -6,8 +6,6 @@ from landlab.components.erosion_deposition.generalized_erosion_deposition import
 )
 from landlab.utils.return_array import return_array_at_node
 
-from .cfuncs import calculate_qs_in
-
 ROOT2 = np.sqrt(2.0)  # syntactic sugar for precalculated square root of 2
 TIME_STEP_FACTOR = 0.5  # factor used in simple subdivision solver
 
@@ -328,14 +326,14 @@ class ErosionDeposition(_GeneralizedErosionDeposition):
         # K's and critical values can be floats, grid fields, or arrays
         # use setter for K defined below
         self.K = K
-        self._sp_crit = return_array_at_node(grid, sp_crit)
+        self._sp_crit = np.asarray(return_array_at_node(grid, sp_crit), dtype=float)
+        self._erosion_term = np.zeros(grid.number_of_nodes)
 
         # Handle option for solver
         if solver == "basic":
             self.run_one_step = self.run_one_step_basic
         elif solver == "adaptive":
             self.run_one_step = self.run_with_adaptive_time_step_solver
-            self._time_to_flat = np.zeros(grid.number_of_nodes)
         else:
             raise ValueError(
                 "Parameter 'solver' must be one of: " + "'basic', 'adaptive'"
@@ -348,49 +346,18 @@ class ErosionDeposition(_GeneralizedErosionDeposition):
 
     @K.setter
     def K(self, new_val):
-        self._K = return_array_at_node(self._grid, new_val)
-
-    def _calc_erosion_rates(self):
-        """Calculate erosion rates."""
-        omega = self._K * self._Q_to_the_m * np.power(self._slope, self._n_sp)
-        omega_over_sp_crit = np.divide(
-            omega, self._sp_crit, out=np.zeros_like(omega), where=self._sp_crit != 0
-        )
+        self._K = np.asarray(return_array_at_node(self._grid, new_val), dtype=float)
 
-        self._erosion_term = omega - self._sp_crit * (1.0 - np.exp(-omega_over_sp_crit))
+    def _calc_qs_in_and_depo_rate(self, **kwds):
+        """Calculate erosion, sediment flux and deposition rates.
 
-    def _calc_qs_in_and_depo_rate(self):
-        self._calc_hydrology()
-        self._calc_erosion_rates()
-
-        is_flooded_core_node = self._get_flooded_core_nodes()
-        self._erosion_term[is_flooded_core_node] = 0.0
-
-        self._qs_in[:] = 0.0
-        self._depo_rate[:] = 0.0
-
-        # iterate top to bottom through the stack, calculate qs
-        # cythonized version of calculating qs_in
-        calculate_qs_in(
-            np.flipud(self._stack),
-            self._flow_receivers,
-            self._cell_area_at_node,
-            self._q,
-            self._qs,
-            self._qs_in,
-            self._erosion_term,
-            self._v_s,
-            self._F_f,
-        )
-
-        self._depo_rate[self._q > 0] = self._qs[self._q > 0] * (
-            self._v_s / self._q[self._q > 0]
+        All of the eroded substrate goes to the erosion term (there is no
+        cover). Any keywords, for finding a stable time step, are passed
+        on to ``_calc_sediment_budget``.
+        """
+        return self._calc_sediment_budget(
+            K_br=self._K, sp_crit_br=self._sp_crit, Er=self._erosion_term, **kwds
         )
-        if not self._depressions_are_handled():  # all sed dropped here
-            self._depo_rate[is_flooded_core_node] = (
-                self._qs_in[is_flooded_core_node]
-                / self._cell_area_at_node[is_flooded_core_node]
-            )
 
     def run_one_step_basic(self, dt=1.0):
         """Calculate change in rock and alluvium thickness for a time period
@@ -424,7 +391,6 @@ class ErosionDeposition(_GeneralizedErosionDeposition):
         remaining_time = dt
 
         z = self._grid.at_node["topographic__elevation"]
-        r = self._flow_receivers
         dzdt = np.zeros(len(z))
         cores = self._grid.core_nodes
 
@@ -449,43 +415,21 @@ class ErosionDeposition(_GeneralizedErosionDeposition):
             else:
                 first_iteration = False
 
-            self._calc_qs_in_and_depo_rate()
-
-            # Rate of change of elevation at core nodes:
-            dzdt[cores] = self._depo_rate[cores] - self._erosion_term[cores]
-
-            # Difference in elevation between each upstream-downstream pair
-            zdif = z - z[r]
-
-            # Rate of change of the *difference* in elevation between each
-            # upstream-downstream pair.
-            rocdif = dzdt - dzdt[r]
-
-            # (Re)-initialize the array that will contain "time to (almost)
-            # flat" for each node (relative to its downstream neighbor).
-            self._time_to_flat[:] = remaining_time
-
-            # Find locations where the upstream and downstream node elevations
-            # are converging (e.g., the upstream one is eroding faster than its
-            # downstream neighbor)
-            converging = np.nonzero(rocdif < 0.0)[0]
-
-            # Find the time to (almost) flat by dividing difference by rate of
-            # change of difference, and then multiplying by a "safety factor"
-            self._time_to_flat[converging] = -(
-                TIME_STEP_FACTOR * zdif[converging] / rocdif[converging]
+            # In the same pass that finds erosion and deposition, find the
+            # rate of change of elevation at core nodes and, for each
+            # upstream-downstream pair that is converging, the time to
+            # (almost) flat, times a "safety factor". Pairs where the source
+            # is at the same or lower elevation as its downstream neighbor
+            # (e.g., because it's a pit or a lake) are masked out. The
+            # maximum stable time step is the shortest of these times.
+            dt_max = self._calc_qs_in_and_depo_rate(
+                z=z,
+                dzdt=dzdt,
+                ignore_time_to_flat=is_flooded_core_node.view(np.uint8),
+                max_dt=remaining_time,
+                time_step_factor=TIME_STEP_FACTOR,
             )
-
-            # Mask out pairs where the source at the same or lower elevation
-            # as its downstream neighbor (e.g., because it's a pit or a lake).
-            # Here, masking out means simply assigning the remaining time in
-            # the global time step.
-            self._time_to_flat[np.nonzero(zdif <= 0.0)[0]] = remaining_time
-            self._time_to_flat[is_flooded_core_node] = remaining_time
-
-            # From this, find the maximum stable time step. If it is smaller
-            # than our tolerance, report and quit.
-            dt_max = max(np.amin(self._time_to_flat), self._dt_min)
+            dt_max = max(dt_max, self._dt_min)
 
             # Finally, apply dzdt to all nodes for a (sub)step of duration
             # dt_max
@@ -4,6 +4,7 @@ from landlab import Component, RasterModelGrid
 from landlab.utils.return_array import return_array_at_node
 
 from ..depression_finder.lake_mapper import _FLOODED
+from .cfuncs import calc_sediment_budget
 
 DEFAULT_MINIMUM_TIME_STEP = 0.001  # default minimum time step duration
 
@@ -126,13 +127,10 @@ class _GeneralizedErosionDeposition(Component):
         self.initialize_output_fields()
 
         self._qs = grid.at_node["sediment__flux"]
-        self._q = return_array_at_node(grid, discharge_field)
+        self._q = np.asarray(return_array_at_node(grid, discharge_field), dtype=float)
 
-        # Create arrays for sediment influx at each node, discharge to the
-        # power "m", and deposition rate
+        # Create arrays for sediment influx at each node and deposition rate
         self._qs_in = np.zeros(grid.number_of_nodes)
-        self._Q_to_the_m = np.zeros(grid.number_of_nodes)
-        self._S_to_the_n = np.zeros(grid.number_of_nodes)
         self._depo_rate = np.zeros(grid.number_of_nodes)
 
         # store other constants
@@ -178,9 +176,6 @@ class _GeneralizedErosionDeposition(Component):
             - self._topographic__elevation[self._flow_receivers]
         ) / self._link_lengths[self._link_to_reciever]
 
-    def _calc_hydrology(self):
-        self._Q_to_the_m[:] = np.power(self._q, self._m_sp)
-
     def _depressions_are_handled(self):
         """Return True if a depression-handling component is present."""
         return "flood_status_code" in self._grid.at_node
@@ -202,3 +197,50 @@ class _GeneralizedErosionDeposition(Component):
                 is_pit,
             )
         return np.array(is_flooded_core)
+
+    def _calc_sediment_budget(self, **kwds):
+        """Calculate erosion, sediment flux and deposition rates.
+
+        Erosion rates, the sediment flux into and out of each node, and
+        deposition rates are all found in a single upstream-to-downstream
+        pass with a compiled kernel. Components pass their erodibilities,
+        thresholds and output arrays (and, for a sediment cover, its
+        thickness) as keywords. If an elevation, *z*, is also given, the
+        rate of change of elevation and the largest stable time step are
+        calculated too.
+
+        Parameters
+        ----------
+        **kwds
+            Keywords of
+            :func:`~landlab.components.erosion_deposition.cfuncs.calc_sediment_budget`.
+
+        Returns
+        -------
+        float
+            The largest stable time step, or *max_dt* if *z* is not given.
+        """
+        if self._depressions_are_handled():
+            flood_status_code = self._grid.at_node["flood_status_code"]
+        else:
+            flood_status_code = None
+
+        return calc_sediment_budget(
+            self._stack,
+            self._flow_receivers,
+            self._grid.status_at_node,
+            self._grid.BC_NODE_IS_CORE,
+            flood_status_code,
+            _FLOODED,
+            self._cell_area_at_node,
+            self._q,
+            self._slope,
+            self._m_sp,
+            self._n_sp,
+            self._v_s,
+            self._F_f,
+            qs=self._qs,
+            qs_in=self._qs_in,
+            depo_rate=self._depo_rate,
+            **kwds
+        )
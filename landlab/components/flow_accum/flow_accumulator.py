@@ -752,6 +752,9 @@ class FlowAccumulator(Component):
         self._D_structure = self._grid.BAD_INDEX * grid.ones(at="link", dtype=int)
         self._nodes_not_in_stack = True
 
+        self._routing_version = 0
+        self._last_routing = None
+
         # STEP 3:
         # identify Flow Director method, save name, import and initialize the
         # correct flow director component if necessary; same with
@@ -770,6 +773,59 @@ class FlowAccumulator(Component):
         """Values of the surface over which flow is accumulated."""
         return self._surface_values
 
+    @property
+    def routing_version(self):
+        """Version of the flow routing.
+
+        The version is incremented each time flow is accumulated over a
+        network of receivers (and, for route-to-many directors, receiver
+        proportions and links to receivers) that differs from the previous
+        one. Components that calculate values from the flow routing can
+        keep them for as long as the version is unchanged.
+
+        Examples
+        --------
+        >>> from landlab import RasterModelGrid
+        >>> from landlab.components import FlowAccumulator
+        >>> mg = RasterModelGrid((3, 4))
+        >>> z = mg.add_field("topographic__elevation", mg.x_of_node.copy(), at="node")
+        >>> fa = FlowAccumulator(mg)
+        >>> fa.routing_version
+        0
+        >>> fa.run_one_step()
+        >>> fa.routing_version
+        1
+
+        Lowering the surface everywhere does not change the routing.
+
+        >>> z -= 1.0
+        >>> fa.run_one_step()
+        >>> fa.routing_version
+        1
+
+        Tilting it the other way does.
+
+        >>> z[:] = -mg.x_of_node
+        >>> fa.run_one_step()
+        >>> fa.routing_version
+        2
+        """
+        return self._routing_version
+
+    def _update_routing_version(self):
+        """Increment the routing version if the flow routing has changed."""
+        names = ["flow__receiver_node", "flow__link_to_receiver_node"]
+        if self._flow_director._to_n_receivers != "one":
+            names.append("flow__receiver_proportions")
+        routing = [self._grid.at_node[name] for name in names]
+
+        if self._last_routing is None or not all(
+            np.array_equal(current, last)
+            for current, last in zip(routing, self._last_routing)
+        ):
+            self._routing_version += 1
+            self._last_routing = [values.copy() for values in routing]
+
     @property
     def flow_director(self):
         """The FlowDirector used internally."""
@@ -1195,6 +1251,8 @@ class FlowAccumulator(Component):
                     if self._flow_director._name == "FlowDirectorSteepest":
                         self._flow_director._determine_link_directions()
 
+            self._update_routing_version()
+
             # step 3. Stack, D, delta construction
             nd = as_id_array(flow_accum_bw._make_number_of_donors_array(r))
             delta = as_id_array(flow_accum_bw._make_delta_array(nd))
@@ -1214,6 +1272,8 @@ class FlowAccumulator(Component):
             # Get p
             p = self._grid["node"]["flow__receiver_proportions"]
 
+            self._update_routing_version()
+
             # step 3. Stack, D, delta construction
             nd = as_id_array(flow_accum_to_n._make_number_of_donors_array_to_n(r, p))
             delta = as_id_array(flow_accum_to_n._make_delta_array_to_n(nd))
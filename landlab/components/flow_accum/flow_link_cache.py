@@ -0,0 +1,128 @@
+"""Cache the lengths of the links along which flow is routed.
+
+Stream power eroders need, at every time step, the lengths of the links from
+nodes to their flow receivers raised to the power of the slope exponent.
+These only change when flow is routed differently, so they can be
+calculated once and then reused for as long as the routing is unchanged.
+
+Examples
+--------
+>>> from landlab import RasterModelGrid
+>>> from landlab.components import FlowAccumulator
+>>> from landlab.components.flow_accum.flow_link_cache import FlowLinkCache
+
+>>> mg = RasterModelGrid((3, 4), xy_spacing=2.0)
+>>> z = mg.add_field("topographic__elevation", mg.x_of_node.copy(), at="node")
+>>> fa = FlowAccumulator(mg, flow_director="D8")
+>>> fa.run_one_step()
+
+>>> cache = FlowLinkCache(mg, 2.0, flow_accumulator=fa)
+>>> cache.update()
+False
+>>> cache.has_receiver.reshape(mg.shape)
+array([[False, False, False, False],
+       [False,  True,  True, False],
+       [False, False, False, False]], dtype=bool)
+>>> cache.length_to_the_n
+array([ 4.,  4.])
+
+>>> z -= 1.0
+>>> fa.run_one_step()
+>>> cache.update()
+True
+>>> cache.hits, cache.misses
+(1, 1)
+"""
+import numpy as np
+
+
+class FlowLinkCache:
+
+    """Lengths of the links to flow receivers, raised to a power.
+
+    Values are only calculated at nodes that have a link to a receiver, and
+    are recalculated only when flow routing changes. If a FlowAccumulator is
+    given, the routing is considered to have changed when its
+    *routing_version* changes. Otherwise, the links to receivers are
+    compared with those of the previous update.
+
+    Parameters
+    ----------
+    grid : ModelGrid
+        A grid.
+    n : float
+        Power to which to raise link lengths.
+    flow_accumulator : FlowAccumulator, optional
+        The FlowAccumulator that routes flow over *grid*.
+    """
+
+    def __init__(self, grid, n, flow_accumulator=None):
+        self._grid = grid
+        self._n = n
+        self._flow_accumulator = flow_accumulator
+
+        try:
+            self._length_of_link = grid.length_of_d8
+        except AttributeError:
+            self._length_of_link = grid.length_of_link
+
+        self._routing_version = None
+        self._links = None
+        self._has_receiver = None
+        self._length_to_the_n = None
+        self.reset_counters()
+
+    @property
+    def has_receiver(self):
+        """Nodes that have a link to a flow receiver."""
+        return self._has_receiver
+
+    @property
+    def length_to_the_n(self):
+        """Length of the link to the receiver of each node that has one."""
+        return self._length_to_the_n
+
+    @property
+    def hits(self):
+        """Number of updates that reused cached values."""
+        return self._hits
+
+    @property
+    def misses(self):
+        """Number of updates that recalculated values."""
+        return self._misses
+
+    def reset_counters(self):
+        """Set the hit and miss counters back to zero."""
+        self._hits = 0
+        self._misses = 0
+
+    def update(self):
+        """Recalculate link lengths if flow routing has changed.
+
+        Returns
+        -------
+        bool
+            ``True`` if the cached values were reused.
+        """
+        links = self._grid.at_node["flow__link_to_receiver_node"]
+
+        if self._flow_accumulator is not None:
+            version = self._flow_accumulator.routing_version
+            is_current = version == self._routing_version
+            self._routing_version = version
+        else:
+            is_current = self._links is not None and np.array_equal(links, self._links)
+            if not is_current:
+                self._links = links.copy()
+
+        if is_current and self._has_receiver is not None:
+            self._hits += 1
+            return True
+
+        self._misses += 1
+        self._has_receiver = np.not_equal(links, self._grid.BAD_INDEX)
+        self._length_to_the_n = (
+            self._length_of_link[links[self._has_receiver]] ** self._n
+        )
+        return False
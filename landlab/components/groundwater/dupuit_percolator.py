@@ -6,13 +6,21 @@
 from warnings import warn
 
 import numpy as np
+from scipy.sparse import diags
+from scipy.sparse.linalg import LinearOperator, cg, splu
 
 from landlab import Component
 from landlab.grid.mappers import (
     map_mean_of_link_nodes_to_link,
     map_value_at_max_node_to_link,
 )
-from landlab.utils import return_array_at_link, return_array_at_node
+from landlab.grid.nodestatus import NodeStatus
+from landlab.utils import (
+    get_core_node_at_node,
+    return_array_at_link,
+    return_array_at_node,
+)
+from landlab.utils.matrix import CoreNodeMatrixBuilder
 
 
 # regularization functions used to deal with numerical demons of seepage
@@ -392,6 +400,11 @@ class GroundwaterDupuitPercolator(Component):
         self._callback_kwds = callback_kwds
         self.callback_fun = callback_fun
 
+        # state of the semi-implicit solver
+        self._status_version = None
+        self._number_of_factorizations = 0
+        self._matrix_builder = CoreNodeMatrixBuilder(grid)
+
     @property
     def callback_fun(self):
         r"""callback function for adaptive timestep solver
@@ -514,6 +527,7 @@ class GroundwaterDupuitPercolator(Component):
         """set aquifer drainable porosity (-)"""
         self._n = return_array_at_node(self._grid, new_val)
         self._n_link = map_mean_of_link_nodes_to_link(self._grid, self._n)
+        self._factorization = None
 
     @property
     def number_of_substeps(self):
@@ -528,6 +542,14 @@ class GroundwaterDupuitPercolator(Component):
 
         return self._num_substeps
 
+    @property
+    def number_of_factorizations(self):
+        """
+        The number of times the run_with_semi_implicit_solver method has
+        factored its matrix.
+        """
+        return self._number_of_factorizations
+
     def calc_recharge_flux_in(self):
         """Calculate flux into the domain from recharge.
 
@@ -605,16 +627,8 @@ class GroundwaterDupuitPercolator(Component):
             * self._grid.at_node["aquifer__thickness"][self._cores]
         )
 
-    def run_one_step(self, dt):
-        """Advance component by one time step of size dt.
-
-        Parameters
-        ----------
-        dt: float
-            The imposed timestep.
-        """
-
-        # check water table above surface
+    def _limit_water_table_to_surface(self):
+        """Set the water table to the surface where it is above it."""
         if (self._wtable > self._elev).any():
             warn(
                 "water table above elevation surface. "
@@ -626,6 +640,18 @@ class GroundwaterDupuitPercolator(Component):
             ]
             self._thickness[self._cores] = (self._wtable - self._base)[self._cores]
 
+    def run_one_step(self, dt):
+        """Advance component by one time step of size dt.
+
+        Parameters
+        ----------
+        dt: float
+            The imposed timestep.
+        """
+
+        # check water table above surface
+        self._limit_water_table_to_surface()
+
         # Calculate base gradient
         self._base_grad[self._grid.active_links] = self._grid.calc_grad_at_link(
             self._base
@@ -687,16 +713,7 @@ class GroundwaterDupuitPercolator(Component):
         """
 
         # check water table above surface
-        if (self._wtable > self._elev).any():
-            warn(
-                "water table above elevation surface. "
-                "Setting water table elevation here to "
-                "elevation surface"
-            )
-            self._wtable[self._wtable > self._elev] = self._elev[
-                self._wtable > self._elev
-            ]
-            self._thickness[self._cores] = (self._wtable - self._base)[self._cores]
+        self._limit_water_table_to_surface()
 
         # Calculate base gradient
         self._base_grad[self._grid.active_links] = self._grid.calc_grad_at_link(
@@ -792,3 +809,254 @@ class GroundwaterDupuitPercolator(Component):
             )
 
         self._qsavg[:] = qs_cumulative / dt
+
+    def _update_solver_links(self):
+        """Find the links used by the semi-implicit solver.
+
+        These depend only on the status of the grid's nodes and so are only
+        found again if that changes.
+        """
+        version = self._grid.status_cache_version("status_at_node")
+        if version == self._status_version:
+            return
+        self._status_version = version
+        self._factorization = None
+
+        grid = self._grid
+        self._cores = grid.core_nodes
+
+        is_active = grid.status_at_link == grid.BC_LINK_IS_ACTIVE
+        has_face = grid.face_at_link >= 0
+        self._width_over_length = np.zeros(grid.number_of_links)
+        self._width_over_length[has_face] = (
+            grid.length_of_face[grid.face_at_link[has_face]]
+            / grid.length_of_link[has_face]
+        )
+        self._width_over_length[~is_active] = 0.0
+
+        # active links between a core node and an open boundary node
+        is_core = grid.status_at_node[grid.nodes_at_link] == NodeStatus.CORE
+        boundary_links = np.flatnonzero(is_active & (is_core.sum(axis=1) == 1))
+        core_end = np.where(is_core[boundary_links, 0], 0, 1)
+        self._boundary_links = boundary_links
+        self._core_at_boundary_link = grid.nodes_at_link[boundary_links, core_end]
+        self._open_at_boundary_link = grid.nodes_at_link[
+            boundary_links, 1 - core_end
+        ]
+        self._row_at_boundary_link = get_core_node_at_node(grid)[
+            self._core_at_boundary_link
+        ]
+        self._is_fixed_value_at_boundary_link = (
+            grid.status_at_node[self._open_at_boundary_link]
+            == NodeStatus.FIXED_VALUE
+        )
+
+    def _calc_solver_matrix(self, dt, transmissivity):
+        """Matrix of the backward-Euler system for core-node water table."""
+        mat = self._matrix_builder.get_matrix(
+            transmissivity * self._width_over_length
+        )
+        storage = self._n[self._cores] * self._grid.cell_area_at_node[self._cores] / dt
+        return (diags(storage) - mat).tocsc()
+
+    def _update_factorization(self, dt, transmissivity, tolerance):
+        """Factor the solver matrix if transmissivity has changed too much.
+
+        Returns
+        -------
+        ndarray of float
+            The transmissivity at links used for the current factorization.
+        """
+        if (
+            self._factorization is None
+            or dt != self._factored_dt
+            or np.any(
+                np.abs(transmissivity - self._factored_transmissivity)
+                > tolerance * self._factored_transmissivity
+            )
+        ):
+            self._factorization = splu(
+                self._calc_solver_matrix(dt, transmissivity),
+                permc_spec="MMD_AT_PLUS_A",
+            )
+            self._factored_dt = dt
+            self._factored_transmissivity = transmissivity.copy()
+            self._number_of_factorizations += 1
+        return self._factored_transmissivity
+
+    def run_with_semi_implicit_solver(
+        self, dt, solver="direct", refactor_tolerance=0.05, rtol=1e-10
+    ):
+        """
+        Advance component by one time step of size dt using a semi-implicit
+        solver.
+
+        Transmissivity is calculated from the aquifer thickness at the start
+        of the time step, and the groundwater flux divergence is then
+        calculated implicitly from the water table at the end of the step
+        by solving a sparse linear system for the core nodes. The time step
+        is not limited by the stability conditions of the explicit scheme,
+        so this method can take time steps much larger than those of
+        ``run_with_adaptive_time_step_solver``. Seepage and saturation
+        excess are calculated with the same regularized solution that
+        the explicit methods use.
+
+        The factorization of the matrix is kept between calls and only
+        recalculated when the transmissivity of a link changes by more
+        than a fraction, *refactor_tolerance*, of its value when the matrix
+        was last factored (or when *dt*, porosity, or the boundary
+        conditions change). With the *"direct"* solver, the water table
+        is solved for with the stored factorization, that is, with the
+        transmissivity of the last factorization. With the *"cg"* solver,
+        the matrix is built with the current transmissivity and solved
+        with the conjugate gradient method, using the stored
+        factorization as a preconditioner. The *"direct"* solver is faster
+        but transmissivities may lag by up to *refactor_tolerance*; use the
+        *"cg"* solver (or a tolerance of zero) if that matters.
+
+        Fixed-value boundary nodes are treated implicitly. Fluxes through
+        fixed-gradient boundary nodes are calculated from the water table
+        at the start of the time step.
+
+        Parameters
+        ----------
+        dt: float
+            The imposed timestep.
+        solver: {"direct", "cg"}, optional
+            Method used to solve the linear system.
+        refactor_tolerance: float, optional
+            Relative change in transmissivity at any link above which the
+            matrix is factored again.
+        rtol: float, optional
+            Relative tolerance of the *"cg"* solver.
+
+        Examples
+        --------
+        >>> from landlab import RasterModelGrid
+        >>> from landlab.components import GroundwaterDupuitPercolator
+
+        >>> grid = RasterModelGrid((3, 10), xy_spacing=10.0)
+        >>> grid.set_closed_boundaries_at_grid_edges(True, True, False, True)
+        >>> elev = grid.add_ones("topographic__elevation", at="node")
+        >>> base = grid.add_zeros("aquifer_base__elevation", at="node")
+        >>> gdp = GroundwaterDupuitPercolator(
+        ...     grid, hydraulic_conductivity=0.01, recharge_rate=1e-8
+        ... )
+        >>> for _ in range(10):
+        ...     gdp.run_with_semi_implicit_solver(1e6)
+        >>> gdp.number_of_factorizations < 10
+        True
+
+        At steady state, the recharge over the aquifer leaves through the
+        open boundary.
+
+        >>> np.isclose(gdp.calc_gw_flux_out(), gdp.calc_recharge_flux_in())
+        True
+        """
+        if solver not in ("direct", "cg"):
+            raise ValueError(
+                "{solver}: solver not understood (must be one of 'direct' or 'cg')".format(
+                    solver=solver
+                )
+            )
+
+        # check water table above surface
+        self._limit_water_table_to_surface()
+
+        self._update_solver_links()
+        grid = self._grid
+        cores = self._cores
+        active_links = grid.active_links
+
+        # Calculate base gradient
+        self._base_grad[active_links] = grid.calc_grad_at_link(self._base)[
+            active_links
+        ]
+        cosa = np.cos(np.arctan(self._base_grad))
+
+        # Transmissivity from the upwind aquifer thickness at links
+        K = self.K
+        hlink = (
+            map_value_at_max_node_to_link(
+                grid, "water_table__elevation", "aquifer__thickness"
+            )
+            * cosa
+        )
+        transmissivity = K * hlink * cosa
+        transmissivity[self._width_over_length == 0.0] = 0.0
+
+        factored_transmissivity = self._update_factorization(
+            dt, transmissivity, refactor_tolerance
+        )
+        if solver == "direct":
+            transmissivity = factored_transmissivity
+
+        # Right-hand side: storage, recharge, and flux from boundary nodes
+        area = grid.cell_area_at_node[cores]
+        rhs = (self._n[cores] * area / dt) * self._wtable[cores]
+        rhs += area * self._recharge[cores]
+
+        links = self._boundary_links
+        wtable_at_boundary = self._wtable[self._open_at_boundary_link] - np.where(
+            self._is_fixed_value_at_boundary_link,
+            0.0,
+            self._wtable[self._core_at_boundary_link],
+        )
+        rhs += np.bincount(
+            self._row_at_boundary_link,
+            weights=transmissivity[links]
+            * self._width_over_length[links]
+            * wtable_at_boundary,
+            minlength=len(cores),
+        )
+
+        # Solve for the new water table at core nodes
+        if solver == "direct":
+            wtable_at_core = self._factorization.solve(rhs)
+        else:
+            mat = self._calc_solver_matrix(dt, transmissivity)
+            preconditioner = LinearOperator(
+                mat.shape, matvec=self._factorization.solve, dtype=float
+            )
+            try:
+                wtable_at_core, info = cg(
+                    mat, rhs, x0=self._wtable[cores], M=preconditioner, rtol=rtol
+                )
+            except TypeError:
+                wtable_at_core, info = cg(
+                    mat, rhs, x0=self._wtable[cores], M=preconditioner, tol=rtol
+                )
+            if info > 0:
+                warn("conjugate gradient solver did not converge")
+
+        wtable = self._wtable.copy()
+        wtable[cores] = wtable_at_core
+        grad = grid.calc_grad_at_link(wtable)
+
+        # Calculate hydraulic gradient and groundwater velocity
+        self._hydr_grad[active_links] = (grad * cosa)[active_links]
+        self._vel[:] = -K * self._hydr_grad
+
+        # Calculate specific discharge
+        self._q[:] = -transmissivity * grad
+
+        # Groundwater flux divergence
+        dqdx = grid.calc_flux_div_at_node(self._q)
+
+        # Regolith thickness
+        reg_thickness = self._elev - self._base
+
+        # update thickness from analytical
+        self._thickness[cores] = _update_thickness(
+            dt, self._thickness, reg_thickness, self._recharge, dqdx, self._n, self._r
+        )[cores]
+        self._thickness[self._thickness < 0] = 0.0
+
+        # Recalculate water surface height
+        self._wtable[:] = self._base + self._thickness
+
+        # Calculate surface discharge at nodes
+        self._qs[:] = _regularize_G(
+            self._thickness / reg_thickness, self._r
+        ) * _regularize_R(self._recharge - dqdx)
+        self._qsavg[:] = self._qs
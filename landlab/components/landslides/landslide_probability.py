@@ -30,6 +30,7 @@ import copy
 
 import numpy as np
 import scipy.constants
+import scipy.sparse
 from scipy import interpolate
 from statsmodels.distributions.empirical_distribution import ECDF
 
@@ -97,6 +98,19 @@ class LandslideProbability(Component):
                                                                HSD_id_dict,
                                                                fract_dict])
 
+    or, with the fractions of upstream HSD ids found by
+    ``landlab.utils.find_upstream_hsd_fractions``,
+
+    .. code-block:: python
+
+        fractions, HSD_ids, _ = find_upstream_hsd_fractions(grid, hsd_ids)
+        LandslideProbability(grid,
+                             number_of_iterations=250,
+                             groundwater__recharge_distribution='data_driven_spatial',
+                             groundwater__recharge_HSD_inputs=[HSD_dict,
+                                                               fractions,
+                                                               HSD_ids])
+
     Examples
     --------
     >>> from landlab import RasterModelGrid
@@ -383,6 +397,9 @@ class LandslideProbability(Component):
             Note: this input method is a very specific one, and to use this method,
             one has to refer Ref 1 & Ref 2 mentioned above, as this set of
             inputs require rigorous pre-processing of data.
+            Alternatively, the second and third items can be the sparse
+            matrix of HSD fractions and the HSD ids of its columns, as
+            returned by landlab.utils.find_upstream_hsd_fractions.
         g: float, optional (m/sec^2)
             acceleration due to gravity.
         seed: int, optional
@@ -444,8 +461,17 @@ class LandslideProbability(Component):
         # Custom HSD inputs - Hydrologic Source Domain -> Model Domain
         elif self._groundwater__recharge_distribution == "data_driven_spatial":
             self._HSD_dict = groundwater__recharge_HSD_inputs[0]
-            self._HSD_id_dict = groundwater__recharge_HSD_inputs[1]
-            self._fract_dict = groundwater__recharge_HSD_inputs[2]
+            if scipy.sparse.issparse(groundwater__recharge_HSD_inputs[1]):
+                self._fract_matrix = scipy.sparse.csr_matrix(
+                    groundwater__recharge_HSD_inputs[1]
+                )
+                self._fract_matrix_HSD_ids = np.asarray(
+                    groundwater__recharge_HSD_inputs[2]
+                )
+            else:
+                self._fract_matrix = None
+                self._HSD_id_dict = groundwater__recharge_HSD_inputs[1]
+                self._fract_dict = groundwater__recharge_HSD_inputs[2]
             self._interpolate_HSD_dict()
 
         # Check if all output fields are initialized
@@ -650,8 +676,15 @@ class LandslideProbability(Component):
         numpy array of recharge at node i.
         """
         store_Re = np.zeros(self._n)
-        HSD_id_list = self._HSD_id_dict[i]
-        fract_list = self._fract_dict[i]
+        if self._fract_matrix is None:
+            HSD_id_list = self._HSD_id_dict[i]
+            fract_list = self._fract_dict[i]
+        else:
+            start, end = self._fract_matrix.indptr[i : i + 2]
+            HSD_id_list = self._fract_matrix_HSD_ids[
+                self._fract_matrix.indices[start:end]
+            ]
+            fract_list = self._fract_matrix.data[start:end]
         for j in range(0, len(HSD_id_list)):
             Re_temp = self._interpolated_HSD_dict[HSD_id_list[j]]
             fract_temp = fract_list[j]
@@ -0,0 +1,440 @@
+import numpy as np
+
+cimport cython
+cimport numpy as np
+
+from libc.math cimport acos, fabs, pow, sqrt
+
+
+DTYPE_INT = int
+ctypedef np.int_t DTYPE_INT_t
+DTYPE_FLOAT = np.double
+ctypedef np.double_t DTYPE_FLOAT_t
+
+cdef double RAD2DEG = 180.0 / np.pi
+
+# Inverse radius of curvature (times dx) of straight, 45 and 90 degree bends.
+cdef double RADCURV_STRAIGHT = 0.23
+cdef double RADCURV_45 = 0.67
+cdef double RADCURV_90 = 1.37
+
+
+cdef inline bint _isclose(double a, double b):
+    """Same as numpy.isclose with its default tolerances."""
+    return fabs(a - b) <= 1e-8 + 1e-5 * fabs(b)
+
+
+cdef inline bint _contains(const DTYPE_INT_t[:] nodes, DTYPE_INT_t node):
+    cdef int k
+    for k in range(nodes.shape[0]):
+        if nodes[k] == node:
+            return True
+    return False
+
+
+cdef double _angle_at_node(
+    DTYPE_INT_t donor,
+    DTYPE_INT_t vertex,
+    DTYPE_INT_t receiver,
+    const DTYPE_FLOAT_t[:] x_of_node,
+    const DTYPE_FLOAT_t[:] y_of_node,
+):
+    """Angle (in degrees) at *vertex* between *donor* and *receiver*."""
+    cdef double x1 = x_of_node[donor] - x_of_node[vertex]
+    cdef double y1 = y_of_node[donor] - y_of_node[vertex]
+    cdef double x2 = x_of_node[receiver] - x_of_node[vertex]
+    cdef double y2 = y_of_node[receiver] - y_of_node[vertex]
+
+    return RAD2DEG * acos(
+        (x1 * x2 + y1 * y2) / sqrt((x1 * x1 + y1 * y1) * (x2 * x2 + y2 * y2))
+    )
+
+
+cdef DTYPE_INT_t _straight_node(
+    DTYPE_INT_t donor,
+    DTYPE_INT_t receiver,
+    const DTYPE_INT_t[:] neighbors,
+    const DTYPE_INT_t[:] diagonals,
+    randint,
+):
+    """Lateral node of a straight channel segment (see *straight_node*)."""
+    cdef DTYPE_INT_t first, second
+
+    if donor == neighbors[1] or donor == neighbors[3]:
+        if neighbors[2] == -1:
+            return neighbors[0]
+        elif neighbors[0] == -1:
+            return neighbors[2]
+        first, second = neighbors[0], neighbors[2]
+    elif donor == neighbors[0] or donor == neighbors[2]:
+        if neighbors[1] == -1:
+            return neighbors[3]
+        elif neighbors[3] == -1:
+            return neighbors[1]
+        first, second = neighbors[1], neighbors[3]
+    elif _contains(diagonals, donor) and _contains(diagonals, receiver):
+        if receiver == diagonals[0]:
+            first, second = neighbors[0], neighbors[1]
+        elif receiver == diagonals[1]:
+            first, second = neighbors[1], neighbors[2]
+        elif receiver == diagonals[2]:
+            first, second = neighbors[2], neighbors[3]
+        else:
+            first, second = neighbors[3], neighbors[0]
+    else:
+        return 0
+
+    if randint(0, 2) == 0:
+        return first
+    else:
+        return second
+
+
+cdef DTYPE_INT_t _forty_five_node(
+    DTYPE_INT_t donor,
+    DTYPE_INT_t receiver,
+    const DTYPE_INT_t[:] nb,
+    const DTYPE_INT_t[:] dg,
+):
+    """Lateral node of a 45 degree bend (see *forty_five_node*)."""
+    if (
+        donor == dg[0] and receiver == nb[3]
+        or donor == dg[3] and receiver == nb[1]
+        or donor == nb[0] and receiver == dg[2]
+        or donor == nb[0] and receiver == dg[1]
+    ):
+        return nb[2]
+    elif (
+        donor == dg[1] and receiver == nb[3]
+        or donor == dg[2] and receiver == nb[1]
+        or donor == nb[2] and receiver == dg[3]
+        or donor == nb[2] and receiver == dg[0]
+    ):
+        return nb[0]
+    elif (
+        donor == dg[3] and receiver == nb[2]
+        or donor == dg[2] and receiver == nb[0]
+        or donor == nb[3] and receiver == dg[0]
+        or donor == nb[3] and receiver == dg[1]
+    ):
+        return nb[1]
+    elif (
+        donor == dg[0] and receiver == nb[2]
+        or donor == dg[1] and receiver == nb[0]
+        or donor == nb[1] and receiver == dg[3]
+        or donor == nb[1] and receiver == dg[2]
+    ):
+        return nb[3]
+    return 0
+
+
+cdef DTYPE_INT_t _ninety_node(
+    DTYPE_INT_t donor,
+    DTYPE_INT_t receiver,
+    const DTYPE_INT_t[:] nb,
+    const DTYPE_INT_t[:] dg,
+):
+    """Lateral node of a 90 degree bend (see *ninety_node*)."""
+    cdef bint donor_is_diagonal = _contains(dg, donor)
+    cdef bint receiver_is_diagonal = _contains(dg, receiver)
+
+    if donor_is_diagonal and receiver_is_diagonal:
+        if donor == dg[0] and receiver == dg[3] or donor == dg[1] and receiver == dg[2]:
+            return nb[3]
+        elif donor == dg[2] and receiver == dg[1] or donor == dg[3] and receiver == dg[0]:
+            return nb[1]
+        elif donor == dg[2] and receiver == dg[3] or donor == dg[1] and receiver == dg[0]:
+            return nb[0]
+        elif donor == dg[3] and receiver == dg[2] or donor == dg[0] and receiver == dg[1]:
+            return nb[2]
+    elif not donor_is_diagonal and not receiver_is_diagonal:
+        if donor == nb[0]:
+            return nb[2]
+        elif donor == nb[1]:
+            return nb[3]
+        elif donor == nb[2]:
+            return nb[0]
+        elif donor == nb[3]:
+            return nb[1]
+    return 0
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def _find_lateral_nodes(
+    const DTYPE_INT_t[:] nodes,
+    const DTYPE_INT_t[:] receiver,
+    const DTYPE_FLOAT_t[:] drainage_area,
+    const DTYPE_FLOAT_t[:] x_of_node,
+    const DTYPE_FLOAT_t[:] y_of_node,
+    const DTYPE_INT_t[:, :] adjacent_nodes_at_node,
+    const DTYPE_INT_t[:, :] diagonal_nodes_at_node,
+    double dx,
+    DTYPE_INT_t[:] lat_node,
+    DTYPE_FLOAT_t[:] inv_rad_curv,
+    randint=None,
+):
+    """Find the node each node of a channel network erodes laterally.
+
+    This is a compiled version of
+    :func:`~landlab.components.lateral_erosion.node_finder.node_finder`
+    applied to each of *nodes*, in order. Nodes that don't receive flow
+    are skipped. Random choices (between donors with the same drainage area
+    and between the banks of straight segments) are made with *randint*,
+    in the same order as the pure-Python version.
+
+    Parameters
+    ----------
+    nodes : ndarray of int
+        Nodes to find lateral nodes of.
+    receiver : ndarray of int
+        Flow receiver of each node.
+    drainage_area : ndarray of float
+        Drainage area at each node.
+    x_of_node, y_of_node : ndarray of float
+        Coordinates of nodes.
+    adjacent_nodes_at_node : ndarray of int, shape (n_nodes, 4)
+        Active adjacent nodes of each node (E, N, W, S).
+    diagonal_nodes_at_node : ndarray of int, shape (n_nodes, 4)
+        Diagonal nodes of each node (NE, NW, SW, SE).
+    dx : float
+        Node spacing.
+    lat_node : ndarray of int
+        Lateral node of each node (0 if there is none), filled for *nodes*.
+    inv_rad_curv : ndarray of float
+        Inverse radius of curvature at each node, filled for *nodes*.
+    randint : callable, optional
+        Random integer generator with the signature of
+        ``numpy.random.randint``. If not given, use ``numpy.random.randint``.
+    """
+    cdef int n_nodes = receiver.shape[0]
+    cdef DTYPE_INT_t[:] donors_offset = np.zeros(n_nodes + 1, dtype=DTYPE_INT)
+    cdef DTYPE_INT_t[:] donors = np.empty(n_nodes, dtype=DTYPE_INT)
+    cdef DTYPE_INT_t[:] count = np.zeros(n_nodes, dtype=DTYPE_INT)
+    cdef int node, donor, rcvr, n, k, j, n_max, lateral
+    cdef double area_max, angle, radcurv
+
+    if randint is None:
+        randint = np.random.randint
+
+    # Donors of each node, in order of node id (as numpy.where finds them).
+    for node in range(n_nodes):
+        donors_offset[receiver[node] + 1] += 1
+    for node in range(n_nodes):
+        donors_offset[node + 1] += donors_offset[node]
+    for node in range(n_nodes):
+        rcvr = receiver[node]
+        donors[donors_offset[rcvr] + count[rcvr]] = node
+        count[rcvr] += 1
+
+    for n in range(nodes.shape[0]):
+        node = nodes[n]
+        if count[node] == 0:
+            continue
+        rcvr = receiver[node]
+
+        # The donor is the one with the largest drainage area. Choose
+        # between donors with the same drainage area at random.
+        donor = donors[donors_offset[node]]
+        if count[node] > 1:
+            area_max = drainage_area[donor]
+            for k in range(donors_offset[node] + 1, donors_offset[node + 1]):
+                if drainage_area[donors[k]] > area_max:
+                    area_max = drainage_area[donors[k]]
+            n_max = 0
+            for k in range(donors_offset[node], donors_offset[node + 1]):
+                if drainage_area[donors[k]] == area_max:
+                    if n_max == 0:
+                        donor = donors[k]
+                    n_max += 1
+            if n_max > 1:
+                j = randint(0, n_max)
+                for k in range(donors_offset[node], donors_offset[node + 1]):
+                    if drainage_area[donors[k]] == area_max:
+                        if j == 0:
+                            donor = donors[k]
+                            break
+                        j -= 1
+
+        lateral = 0
+        radcurv = 0.0
+        if donor != rcvr and donor != node:
+            angle = _angle_at_node(donor, node, rcvr, x_of_node, y_of_node)
+            if _isclose(angle, 0.0) or _isclose(angle, 180.0):
+                lateral = _straight_node(
+                    donor,
+                    rcvr,
+                    adjacent_nodes_at_node[node],
+                    diagonal_nodes_at_node[node],
+                    randint,
+                )
+                radcurv = RADCURV_STRAIGHT
+            elif _isclose(angle, 45.0) or _isclose(angle, 135.0):
+                lateral = _forty_five_node(
+                    donor,
+                    rcvr,
+                    adjacent_nodes_at_node[node],
+                    diagonal_nodes_at_node[node],
+                )
+                radcurv = RADCURV_45
+            elif _isclose(angle, 90.0):
+                lateral = _ninety_node(
+                    donor,
+                    rcvr,
+                    adjacent_nodes_at_node[node],
+                    diagonal_nodes_at_node[node],
+                )
+                radcurv = RADCURV_90
+
+        lat_node[node] = lateral
+        inv_rad_curv[node] = radcurv / dx
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def _erode_and_route_sediment(
+    const DTYPE_INT_t[:] nodes,
+    const DTYPE_INT_t[:] receiver,
+    const DTYPE_FLOAT_t[:] drainage_area,
+    const DTYPE_FLOAT_t[:] slope,
+    const DTYPE_FLOAT_t[:] kv,
+    const DTYPE_FLOAT_t[:] kl,
+    const DTYPE_INT_t[:] lat_node,
+    const DTYPE_FLOAT_t[:] inv_rad_curv,
+    const DTYPE_FLOAT_t[:] z,
+    double alph,
+    double dx,
+    double dx2,
+    double runoff,
+    double wid_coeff,
+    double wid_exp,
+    DTYPE_FLOAT_t[:] qs_in,
+    DTYPE_FLOAT_t[:] dzver,
+    DTYPE_FLOAT_t[:] vol_lat_dt,
+):
+    """Vertical and lateral erosion, and sediment routing, down a network.
+
+    *nodes* are ordered from upstream to downstream. For each node, the
+    rate of vertical incision (less deposition) is added to *dzver*, the
+    rate of lateral erosion of its lateral node is added to *vol_lat_dt* and
+    the sediment eroded is added to the sediment flux into its receiver.
+
+    Parameters
+    ----------
+    nodes : ndarray of int
+        Nodes ordered from upstream to downstream.
+    receiver : ndarray of int
+        Flow receiver of each node.
+    drainage_area, slope : ndarray of float
+        Drainage area and (non-negative) steepest slope at each node.
+    kv, kl : ndarray of float
+        Vertical and lateral erodibility at each node.
+    lat_node : ndarray of int
+        Lateral node of each node (0 if there is none).
+    inv_rad_curv : ndarray of float
+        Inverse radius of curvature at each node.
+    z : ndarray of float
+        Elevation at each node.
+    alph : float
+        Deposition parameter.
+    dx, dx2 : float
+        Node spacing, and its square.
+    runoff : float
+        Runoff used to calculate water depth.
+    wid_coeff, wid_exp : float
+        Coefficient and exponent of the water-depth relation.
+    qs_in : ndarray of float
+        Sediment flux into each node, updated in place.
+    dzver : ndarray of float
+        Rate of elevation change from vertical erosion and deposition.
+    vol_lat_dt : ndarray of float
+        Rate of lateral erosion (as a volume) of each node, added to.
+    """
+    cdef int n, node, lateral
+    cdef double area, water_depth, petlat
+
+    for n in range(nodes.shape[0]):
+        node = nodes[n]
+        area = drainage_area[node]
+
+        dzver[node] = alph * qs_in[node] / area + (
+            -kv[node] * pow(area, 0.5) * slope[node]
+        )
+        water_depth = wid_coeff * pow(area * runoff, wid_exp)
+
+        petlat = 0.0
+        lateral = lat_node[node]
+        if lateral > 0 and z[lateral] > z[node]:
+            petlat = -kl[node] * area * slope[node] * inv_rad_curv[node]
+            vol_lat_dt[lateral] += fabs(petlat) * dx * water_depth
+
+        qs_in[receiver[node]] += (
+            qs_in[node] - (dzver[node] * dx2) - (petlat * dx * water_depth)
+        )
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def _erode_lateral_nodes(
+    const DTYPE_INT_t[:] nodes,
+    const DTYPE_INT_t[:] receiver,
+    const DTYPE_FLOAT_t[:] drainage_area,
+    const DTYPE_INT_t[:] lat_node,
+    const DTYPE_FLOAT_t[:] z,
+    double dx2,
+    double runoff,
+    double wid_coeff,
+    double wid_exp,
+    bint undercut,
+    DTYPE_FLOAT_t[:] vol_lat,
+    DTYPE_FLOAT_t[:] dzlat,
+):
+    """Lower lateral nodes that have been eroded enough.
+
+    A lateral node is lowered to the elevation of the receiver of its
+    primary node once the volume eroded from it is greater than the volume
+    needed to do so, and its eroded volume is reset to zero.
+
+    Parameters
+    ----------
+    nodes : ndarray of int
+        Nodes ordered from upstream to downstream.
+    receiver : ndarray of int
+        Flow receiver of each node.
+    drainage_area : ndarray of float
+        Drainage area at each node.
+    lat_node : ndarray of int
+        Lateral node of each node (0 if there is none).
+    z : ndarray of float
+        Elevation at each node.
+    dx2 : float
+        Area of a cell.
+    runoff : float
+        Runoff used to calculate water depth.
+    wid_coeff, wid_exp : float
+        Coefficient and exponent of the water-depth relation.
+    undercut : bool
+        Use the undercutting-slump model, otherwise the total-block model.
+    vol_lat : ndarray of float
+        Volume eroded laterally from each node.
+    dzlat : ndarray of float
+        Elevation change of each node from lateral erosion.
+    """
+    cdef int n, node, lateral
+    cdef double water_depth, voldiff
+
+    for n in range(nodes.shape[0]):
+        node = nodes[n]
+        lateral = lat_node[node]
+        water_depth = wid_coeff * pow(drainage_area[node] * runoff, wid_exp)
+        if lateral > 0 and z[lateral] > z[node]:
+            if undercut:
+                voldiff = (z[node] + water_depth - z[receiver[node]]) * dx2
+            else:
+                voldiff = (z[lateral] - z[receiver[node]]) * dx2
+            if vol_lat[lateral] >= voldiff:
+                dzlat[lateral] = z[receiver[node]] - z[lateral]
+                vol_lat[lateral] = 0.0
@@ -9,7 +9,11 @@ import numpy as np
 from landlab import Component, RasterModelGrid
 from landlab.components.flow_accum import FlowAccumulator
 
-from .node_finder import node_finder
+from .cfuncs import (
+    _erode_and_route_sediment,
+    _erode_lateral_nodes,
+    _find_lateral_nodes,
+)
 
 # Hard coded constants
 cfl_cond = 0.3  # CFL timestep condition
@@ -17,6 +21,64 @@ wid_coeff = 0.4  # coefficient for calculating channel width
 wid_exp = 0.35  # exponent for calculating channel width
 
 
+def _calc_time_to_flat(nodes, receiver, z, dzdt, slope, dt_max):
+    """Time for nodes to erode down to the elevation of their receivers.
+
+    Only nodes that are converging with their receivers (the receiver
+    erodes slower than the node) limit the time step.
+
+    Parameters
+    ----------
+    nodes : ndarray of int
+        Nodes ordered from upstream to downstream.
+    receiver : ndarray of int
+        Flow receiver of each node.
+    z : ndarray of float
+        Elevation at each node.
+    dzdt : ndarray of float
+        Rate of elevation change at each node.
+    slope : ndarray of float
+        Steepest slope at each node.
+    dt_max : float
+        Longest time step.
+
+    Returns
+    -------
+    float
+        The time step.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.components.lateral_erosion.lateral_erosion import (
+    ...     _calc_time_to_flat,
+    ... )
+    >>> z = np.array([0.0, 1.0, 3.0])
+    >>> dzdt = np.array([0.0, -0.1, -0.3])
+    >>> slope = np.array([0.0, 1.0, 2.0])
+    >>> receiver = np.array([0, 0, 1])
+    >>> _calc_time_to_flat([2, 1], receiver, z, dzdt, slope, 100.0)
+    10.0
+    """
+    nodes = np.asarray(nodes)
+    dz = z[nodes] - z[receiver[nodes]]
+    dzdt_diff = dzdt[receiver[nodes]] - dzdt[nodes]
+
+    converging = (dzdt_diff > 1.0e-5) & (slope[nodes] > 1e-5)
+    dz, dzdt_diff = dz[converging], dzdt_diff[converging]
+    if len(dz) == 0:
+        return dt_max
+
+    dt_flat = dz / dzdt_diff
+    # where rounding means nodes would cross in dt_flat, dt_flat is used
+    # whether or not it is the shortest time to flat found so far
+    (crossing,) = np.nonzero(dzdt_diff * dt_flat > dz)
+    if len(crossing) > 0:
+        return dt_flat[crossing[-1] :].min()
+    else:
+        return min(dt_max, dt_flat.min())
+
+
 class LateralEroder(Component):
     """Laterally erode neighbor node through fluvial erosion.
 
@@ -398,6 +460,27 @@ class LateralEroder(Component):
         # for arrays of Kv. Checks that length of Kv array is good.
         self._Kv = np.ones(self._grid.number_of_nodes, dtype=float) * Kv
 
+    def _find_lateral_nodes(self, nodes, flowdirs, da, lat_nodes, inv_rad_curv):
+        """Find the lateral node of each node that receives flow.
+
+        node_finder picks the lateral node to erode based on angle between
+        segments between three nodes. lat_nodes are 0 or -1 if a boundary node
+        was chosen as a lateral node.
+        """
+        grid = self._grid
+        _find_lateral_nodes(
+            nodes,
+            flowdirs,
+            da,
+            grid.x_of_node,
+            grid.y_of_node,
+            grid.active_adjacent_nodes_at_node,
+            grid.diagonal_adjacent_nodes_at_node,
+            grid.dx,
+            lat_nodes,
+            inv_rad_curv,
+        )
+
     def run_one_step_basic(self, dt=1.0):
         """Calculate vertical and lateral erosion for a time period 'dt'.
 
@@ -409,7 +492,6 @@ class LateralEroder(Component):
         Klr = self._Klr
         grid = self._grid
         UC = self._UC
-        TB = self._TB
         inlet_on = self._inlet_on  # this is a true/false flag
         Kv = self._Kv
         qs_in = self._qs_in
@@ -459,76 +541,51 @@ class LateralEroder(Component):
         # reverse list so we go from upstream to down stream
         dwnst_nodes = dwnst_nodes[::-1]
         max_slopes[:] = max_slopes.clip(0)
-        for i in dwnst_nodes:
-            # calc deposition and erosion
-            dep = alph * qs_in[i] / da[i]
-            ero = -Kv[i] * da[i] ** (0.5) * max_slopes[i]
-            dzver[i] = dep + ero
-            # potential lateral erosion initially set to 0
-            petlat = 0.0
-            # water depth in meters, needed for lateral erosion calc
-            wd = wid_coeff * (da[i] * runoffms) ** wid_exp
-
-            # Choose lateral node for node i. If node i flows downstream, continue.
-            # if node i is the first cell at the top of the drainage network, don't go
-            # into this loop because in this case, node i won't have a "donor" node
-            if i in flowdirs:
-                # node_finder picks the lateral node to erode based on angle
-                # between segments between three nodes
-                [lat_node, inv_rad_curv] = node_finder(grid, i, flowdirs, da)
-                # node_finder returns the lateral node ID and the radius of curvature
-                lat_nodes[i] = lat_node
-                # if the lateral node is not 0 or -1 continue. lateral node may be
-                # 0 or -1 if a boundary node was chosen as a lateral node. then
-                # radius of curavature is also 0 so there is no lateral erosion
-                if lat_node > 0:
-                    # if the elevation of the lateral node is higher than primary node,
-                    # calculate a new potential lateral erosion (L/T), which is negative
-                    if z[lat_node] > z[i]:
-                        petlat = -Kl[i] * da[i] * max_slopes[i] * inv_rad_curv
-                        # the calculated potential lateral erosion is mutiplied by the length of the node
-                        # and the bank height, then added to an array, vol_lat_dt, for volume eroded
-                        # laterally  *per timestep* at each node. This vol_lat_dt is reset to zero for
-                        # each timestep loop. vol_lat_dt is added to itself in case more than one primary
-                        # nodes are laterally eroding this lat_node
-                        # volume of lateral erosion per timestep
-                        vol_lat_dt[lat_node] += abs(petlat) * grid.dx * wd
-
-            # send sediment downstream. sediment eroded from vertical incision
-            # and lateral erosion is sent downstream
-            #            print("debug before 406")
-            qs_in[flowdirs[i]] += (
-                qs_in[i] - (dzver[i] * grid.dx ** 2) - (petlat * grid.dx * wd)
-            )  # qsin to next node
+        # Choose the lateral node of each node. Nodes at the top of the drainage
+        # network have no "donor" node, and so no lateral node.
+        inv_rad_curv = np.zeros(grid.number_of_nodes)
+        self._find_lateral_nodes(dwnst_nodes, flowdirs, da, lat_nodes, inv_rad_curv)
+        # calc deposition and erosion (vertical and lateral) and send sediment
+        # downstream
+        _erode_and_route_sediment(
+            dwnst_nodes,
+            flowdirs,
+            da,
+            max_slopes,
+            Kv,
+            Kl,
+            lat_nodes,
+            inv_rad_curv,
+            z,
+            alph,
+            grid.dx,
+            grid.dx ** 2,
+            runoffms,
+            wid_coeff,
+            wid_exp,
+            qs_in,
+            dzver,
+            vol_lat_dt,
+        )
         qs[:] = qs_in - (dzver * grid.dx ** 2)
         dzdt[:] = dzver * dt
         vol_lat[:] += vol_lat_dt * dt
-        # this loop determines if enough lateral erosion has happened to change
-        # the height of the neighbor node.
-        for i in dwnst_nodes:
-            lat_node = lat_nodes[i]
-            wd = wid_coeff * (da[i] * runoffms) ** wid_exp
-            if lat_node > 0:  # greater than zero now bc inactive neighbors are value -1
-                if z[lat_node] > z[i]:
-                    # vol_diff is the volume that must be eroded from lat_node so that its
-                    # elevation is the same as node downstream of primary node
-                    # UC model: this would represent undercutting (the water height at
-                    # node i), slumping, and instant removal.
-                    if UC == 1:
-                        voldiff = (z[i] + wd - z[flowdirs[i]]) * grid.dx ** 2
-                    # TB model: entire lat node must be eroded before lateral erosion
-                    # occurs
-                    if TB == 1:
-                        voldiff = (z[lat_node] - z[flowdirs[i]]) * grid.dx ** 2
-                    # if the total volume eroded from lat_node is greater than the volume
-                    # needed to be removed to make node equal elevation,
-                    # then instantaneously remove this height from lat node. already has
-                    # timestep in it
-                    if vol_lat[lat_node] >= voldiff:
-                        self._dzlat[lat_node] = z[flowdirs[i]] - z[lat_node]  # -0.001
-                        # after the lateral node is eroded, reset its volume eroded to
-                        # zero
-                        vol_lat[lat_node] = 0.0
+        # determine if enough lateral erosion has happened to change the height
+        # of the neighbor node.
+        _erode_lateral_nodes(
+            dwnst_nodes,
+            flowdirs,
+            da,
+            lat_nodes,
+            z,
+            grid.dx ** 2,
+            runoffms,
+            wid_coeff,
+            wid_exp,
+            UC,
+            vol_lat,
+            self._dzlat,
+        )
         # combine vertical and lateral erosion.
         dz = dzdt + self._dzlat
         # change height of landscape
@@ -541,7 +598,6 @@ class LateralEroder(Component):
         Klr = self._Klr
         grid = self._grid
         UC = self._UC
-        TB = self._TB
         inlet_on = self._inlet_on  # this is a true/false flag
         Kv = self._Kv
         qs_in = self._qs_in
@@ -590,40 +646,28 @@ class LateralEroder(Component):
         while time < globdt:
             max_slopes[:] = max_slopes.clip(0)
             # here calculate dzdt for each node, with initial time step
-            for i in dwnst_nodes:
-                dep = alph * qs_in[i] / da[i]
-                ero = -Kv[i] * da[i] ** (0.5) * max_slopes[i]
-                dzver[i] = dep + ero
-                petlat = 0.0
-                # water depth in meters, needed for lateral erosion calc
-                wd = wid_coeff * (da[i] * runoffms) ** wid_exp
-
-                if i in flowdirs:
-                    # node_finder picks the lateral node to erode based on angle
-                    # between segments between three nodes
-                    [lat_node, inv_rad_curv] = node_finder(grid, i, flowdirs, da)
-                    # node_finder returns the lateral node ID and the radius of
-                    # curvature
-                    lat_nodes[i] = lat_node
-                    # if the lateral node is not 0 or -1 continue.
-                    if lat_node > 0:
-                        # if the elevation of the lateral node is higher than primary node,
-                        # calculate a new potential lateral erosion (L/T), which is
-                        # negative
-                        if z[lat_node] > z[i]:
-                            petlat = -Kl[i] * da[i] * max_slopes[i] * inv_rad_curv
-                            # the calculated potential lateral erosion is mutiplied by the length of the node
-                            # and the bank height, then added to an array, vol_lat_dt, for volume eroded
-                            # laterally  *per timestep* at each node. This vol_lat_dt is reset to zero for
-                            # each timestep loop. vol_lat_dt is added to itself more than one primary nodes are
-                            # laterally eroding this lat_node
-                            # volume of lateral erosion per timestep
-                            vol_lat_dt[lat_node] += abs(petlat) * grid.dx * wd
-                # send sediment downstream. sediment eroded from vertical incision
-                # and lateral erosion is sent downstream
-                qs_in[flowdirs[i]] += (
-                    qs_in[i] - (dzver[i] * grid.dx ** 2) - (petlat * grid.dx * wd)
-                )  # qsin to next node
+            inv_rad_curv = np.zeros(grid.number_of_nodes)
+            self._find_lateral_nodes(dwnst_nodes, flowdirs, da, lat_nodes, inv_rad_curv)
+            _erode_and_route_sediment(
+                dwnst_nodes,
+                flowdirs,
+                da,
+                max_slopes,
+                Kv,
+                Kl,
+                lat_nodes,
+                inv_rad_curv,
+                z,
+                alph,
+                grid.dx,
+                grid.dx ** 2,
+                runoffms,
+                wid_coeff,
+                wid_exp,
+                qs_in,
+                dzver,
+                vol_lat_dt,
+            )
             # summing qs for this entire timestep
             qs[:] += qs_in - (dzver * grid.dx ** 2)
             dzdt[:] = dzver
@@ -634,24 +678,7 @@ class LateralEroder(Component):
             # Limit dt so that this flattening or reversal doesn't happen.
             # How close you allow these two points to get to eachother is
             # determined by the cfl timestep condition, hard coded to equal 0.3
-            # dtn is an arbitrarily large number to begin with, but will be adapted as we step through
-            # the nodes
-            dtn = dt * 50  # starting minimum timestep for this round
-            for i in dwnst_nodes:
-                # are points converging? ie, downstream eroding slower than upstream
-                dzdtdif = dzdt[flowdirs[i]] - dzdt[i]
-                # if points converging, find time to zero slope
-                if dzdtdif > 1.0e-5 and max_slopes[i] > 1e-5:
-                    # time to flat between points
-                    dtflat = (z[i] - z[flowdirs[i]]) / dzdtdif
-                    # if time to flat is smaller than dt, take the lower value
-                    if dtflat < dtn:
-                        dtn = dtflat
-                    #                        assert dtn>0, "dtn <0 at dtflat"
-                    # if dzdtdif*dtflat will make upstream lower than downstream, find
-                    # time to flat
-                    if dzdtdif * dtflat > (z[i] - z[flowdirs[i]]):
-                        dtn = (z[i] - z[flowdirs[i]]) / dzdtdif
+            dtn = _calc_time_to_flat(dwnst_nodes, flowdirs, z, dzdt, max_slopes, dt * 50)
             dtn *= cfl_cond
             # new minimum timestep for this round of nodes
             dt = min(abs(dtn), dt)
@@ -661,36 +688,22 @@ class LateralEroder(Component):
             # the entire model run. So vol_lat is itself plus vol_lat_dt (for current loop)
             # times stable timestep size
             vol_lat[:] += vol_lat_dt * dt
-            # this loop determines if enough lateral erosion has happened to change
-            # the height of the neighbor node.
-            for i in dwnst_nodes:
-                lat_node = lat_nodes[i]
-                wd = wid_coeff * (da[i] * runoffms) ** wid_exp
-                if (
-                    lat_node > 0
-                ):  # greater than zero now bc inactive neighbors are value -1
-                    if z[lat_node] > z[i]:
-                        # vol_diff is the volume that must be eroded from lat_node so that its
-                        # elevation is the same as node downstream of primary node
-                        # UC model: this would represent undercutting (the water height
-                        # at node i), slumping, and instant removal.
-                        if UC == 1:
-                            voldiff = (z[i] + wd - z[flowdirs[i]]) * grid.dx ** 2
-                        # TB model: entire lat node must be eroded before lateral
-                        # erosion occurs
-                        if TB == 1:
-                            voldiff = (z[lat_node] - z[flowdirs[i]]) * grid.dx ** 2
-                        # if the total volume eroded from lat_node is greater than the volume
-                        # needed to be removed to make node equal elevation,
-                        # then instantaneously remove this height from lat node. already
-                        # has timestep in it
-                        if vol_lat[lat_node] >= voldiff:
-                            self._dzlat[lat_node] = (
-                                z[flowdirs[i]] - z[lat_node]
-                            )  # -0.001
-                            # after the lateral node is eroded, reset its volume eroded
-                            # to zero
-                            vol_lat[lat_node] = 0.0
+            # determine if enough lateral erosion has happened to change the
+            # height of the neighbor node.
+            _erode_lateral_nodes(
+                dwnst_nodes,
+                flowdirs,
+                da,
+                lat_nodes,
+                z,
+                grid.dx ** 2,
+                runoffms,
+                wid_coeff,
+                wid_exp,
+                UC,
+                vol_lat,
+                self._dzlat,
+            )
 
             # multiply dzdt by timestep size and combine with lateral erosion
             # self._dzlat, which is already a length for the calculated time step
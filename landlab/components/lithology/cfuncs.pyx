@@ -0,0 +1,102 @@
+import numpy as np
+cimport numpy as np
+cimport cython
+
+from libc.math cimport NAN
+
+DTYPE_FLOAT = np.double
+ctypedef np.double_t DTYPE_FLOAT_t
+
+DTYPE_INT = int
+ctypedef np.int_t DTYPE_INT_t
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def fill_rock_cube(
+    const DTYPE_FLOAT_t[:, :] z_top,
+    const DTYPE_FLOAT_t[:, :] dz,
+    const DTYPE_FLOAT_t[:, :] rock_type,
+    const DTYPE_FLOAT_t[:] depths,
+    DTYPE_FLOAT_t[:, :] out,
+):
+    """Find the rock type at depths below the surface of each stack.
+
+    Layers are ordered from the bottom of the stacks to the surface, as in
+    landlab's layers. Layers without thickness are ignored. A depth that is
+    exactly at the top of a layer belongs to that layer. Depths below the
+    bottom of a stack are given a rock type of NaN.
+
+    Parameters
+    ----------
+    z_top : ndarray of float, shape `(n_layers, n_stacks)`
+        Depth from the surface to the top of each layer.
+    dz : ndarray of float, shape `(n_layers, n_stacks)`
+        Thickness of each layer.
+    rock_type : ndarray of float, shape `(n_layers, n_stacks)`
+        Rock type of each layer.
+    depths : ndarray of float, shape `(n_depths, )`
+        Depths below the surface.
+    out : ndarray of float, shape `(n_depths, n_stacks)`
+        Output array for the rock type at each depth of each stack.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.components.lithology.cfuncs import fill_rock_cube
+
+    Two stacks of three layers; the middle layer of the second stack has
+    been eroded to nothing.
+
+    >>> dz = np.array([[4.0, 4.0], [2.0, 0.0], [1.0, 1.0]])
+    >>> z_top = np.array([[3.0, 1.0], [1.0, 1.0], [0.0, 0.0]])
+    >>> rock_type = np.array([[1.0, 1.0], [2.0, 2.0], [3.0, 3.0]])
+    >>> depths = np.array([0.0, 0.5, 1.0, 3.0, 5.0, 7.0, 8.0])
+    >>> out = np.empty((7, 2))
+    >>> fill_rock_cube(z_top, dz, rock_type, depths, out)
+    >>> out
+    array([[  3.,   3.],
+           [  3.,   3.],
+           [  2.,   1.],
+           [  1.,   1.],
+           [  1.,   1.],
+           [  1.,  nan],
+           [ nan,  nan]])
+    """
+    cdef int n_layers = z_top.shape[0]
+    cdef int n_stacks = z_top.shape[1]
+    cdef int n_depths = depths.shape[0]
+    cdef DTYPE_FLOAT_t[:] tops = np.empty(n_layers, dtype=DTYPE_FLOAT)
+    cdef DTYPE_FLOAT_t[:] types = np.empty(n_layers, dtype=DTYPE_FLOAT)
+    cdef int stack, layer, n_real, i, lo, hi, mid
+    cdef double depth, bottom
+
+    with nogil:
+        for stack in range(n_stacks):
+            # the layers with thickness, from the surface down, so that
+            # their tops increase with depth.
+            n_real = 0
+            bottom = 0.0
+            for layer in range(n_layers - 1, -1, -1):
+                if dz[layer, stack] > 0.0:
+                    tops[n_real] = z_top[layer, stack]
+                    types[n_real] = rock_type[layer, stack]
+                    bottom = z_top[layer, stack] + dz[layer, stack]
+                    n_real += 1
+
+            for i in range(n_depths):
+                depth = depths[i]
+                if n_real == 0 or depth < tops[0] or depth > bottom:
+                    out[i, stack] = NAN
+                    continue
+
+                # find the last layer whose top is not below depth.
+                lo = 0
+                hi = n_real
+                while hi - lo > 1:
+                    mid = (lo + hi) // 2
+                    if tops[mid] <= depth:
+                        lo = mid
+                    else:
+                        hi = mid
+                out[i, stack] = types[lo]
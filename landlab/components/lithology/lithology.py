@@ -4,12 +4,13 @@
 
 import numpy as np
 import xarray as xr
-from scipy.interpolate import interp1d
 
 from landlab import Component
 from landlab.layers import EventLayers, MaterialLayers
 from landlab.utils.return_array import return_array_at_node
 
+from .cfuncs import fill_rock_cube
+
 
 class Lithology(Component):
 
@@ -511,8 +512,44 @@ class Lithology(Component):
                     )
                     raise ValueError(msg)
 
+        self._update_property_table()
+
+    def _update_property_table(self):
+        """Build a lookup table of property values by rock type.
+
+        Rock types are given compact codes by their position in a sorted
+        array of rock type IDs, ``_rock_ids``, and the values of each
+        property are stored in an array indexed by these codes. The table is
+        only built if the rock type IDs are numbers; otherwise ``_rock_ids``
+        is ``None`` and values are looked up in the property dictionary.
+        """
+        try:
+            rock_ids = np.asarray(sorted(self._ids))
+        except TypeError:
+            rock_ids = None
+        if rock_ids is None or rock_ids.dtype.kind not in "biuf":
+            self._rock_ids = None
+            self._property_table = None
+        else:
+            self._rock_ids = rock_ids
+            self._property_table = {
+                at: np.array([self._attrs[at][rid] for rid in rock_ids.tolist()])
+                for at in self._properties
+            }
+
+    def _update_surface_codes(self):
+        """Find the code of the rock type at the surface of each node."""
+        self._surface_code = None
+        if self._rock_ids is not None:
+            codes = np.searchsorted(self._rock_ids, self._surface_rock_type)
+            codes.clip(0, len(self._rock_ids) - 1, out=codes)
+            if np.all(self._rock_ids[codes] == self._surface_rock_type):
+                self._surface_code = codes
+
     def _update_surface_values(self):
         """Update Lithology surface values."""
+        self._update_surface_codes()
+
         # Update surface values for each attribute.
         self._grid["node"][self._rock_id_name][:] = self._surface_rock_type
         for at in self._properties:
@@ -670,6 +707,7 @@ class Lithology(Component):
                 self._grid.add_empty(at, at="node")
             self._attrs[at] = attrs[at]
             self._properties.append(at)
+        self._update_property_table()
 
         # update surface values
         self._update_surface_values()
@@ -730,6 +768,7 @@ class Lithology(Component):
                     new_ids.append(rid)
                     self._attrs[at][rid] = att_dict[rid]
         self._ids = self._ids.union(new_ids)
+        self._update_property_table()
 
         # update surface values
         self._update_surface_values()
@@ -784,15 +823,19 @@ class Lithology(Component):
 
         # set the value in the attribute dictionary
         self._attrs[at][rock_id] = value
+        self._update_property_table()
 
         # update surface values
         self._update_surface_values()
 
     def _get_surface_values(self, at):
         """Get surface values for attribute."""
-        return np.array(list(map(self._attrs[at].get, self._surface_rock_type)))
+        if self._surface_code is not None:
+            return self._property_table[at][self._surface_code]
+        else:
+            return np.array(list(map(self._attrs[at].get, self._surface_rock_type)))
 
-    def rock_cube_to_xarray(self, depths):
+    def rock_cube_to_xarray(self, depths, out=None, depths_per_block=None):
         """Construct a 3D rock cube of rock type ID as an xarray dataset.
 
         Create an xarray dataset in (x, y, z) that shows the rock type with
@@ -804,29 +847,92 @@ class Lithology(Component):
         Note also that when this method is called, it will construct the current
         values of lithology with depth, NOT the initial values.
 
+        The cube is filled a block of depth slices at a time. To build cubes
+        too big to hold in memory, pass an array that is stored on disk (a
+        ``numpy.memmap``, for instance) as *out*.
+
         Parameters
         ----------
         depths : array
+            Depths below the topographic surface. Depths below the bottom of
+            the Lithology are given a rock type of NaN.
+        out : array of shape `(n_depths, n_rows, n_columns)`, optional
+            Array into which to write the rock cube.
+        depths_per_block : int, optional
+            Number of depth slices to fill at a time. The default is to fill
+            all of them at once, unless *out* is given, in which case slices
+            are filled in blocks of about a million values.
 
         Returns
         -------
         ds : xarray dataset
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> from landlab import RasterModelGrid
+        >>> from landlab.components import Lithology
+        >>> mg = RasterModelGrid((3, 3))
+        >>> z = mg.add_zeros("topographic__elevation", at="node")
+        >>> thicknesses = [1, 2, 4, 1]
+        >>> ids = [1, 2, 1, 2]
+        >>> attrs = {'K_sp': {1: 0.001,
+        ...                   2: 0.0001}}
+        >>> lith = Lithology(mg, thicknesses, ids, attrs)
+
+        >>> ds = lith.rock_cube_to_xarray([0.0, 1.5, 4.0, 7.5, 9.0])
+        >>> ds.rock_type__id.values[:, 1, 1]
+        array([  1.,   2.,   1.,   2.,  nan])
+
+        Write the cube into an array on disk, one depth slice at a time.
+
+        >>> import os, tempfile
+        >>> with tempfile.TemporaryDirectory() as tmpdir:
+        ...     cube = np.lib.format.open_memmap(
+        ...         os.path.join(tmpdir, "rock_cube.npy"),
+        ...         mode="w+",
+        ...         shape=(5, 3, 3),
+        ...     )
+        ...     ds = lith.rock_cube_to_xarray(
+        ...         [0.0, 1.5, 4.0, 7.5, 9.0], out=cube, depths_per_block=1
+        ...     )
+        ...     print(cube[:, 1, 1])
+        ...     del ds, cube
+        [  1.   2.   1.   2.  nan]
         """
-        depths = np.asarray(depths)
-        rock_type = self._layers[self._rock_id_name]
-        rock_cube = np.empty((depths.size, self._grid.shape[0], self._grid.shape[1]))
-
-        # at each node point, interpolate between ztop/bottomo correct.y
-        for sid in range(self._layers.number_of_stacks):
-            coord = np.unravel_index(sid, (self._grid.shape[0], self._grid.shape[1]))
-            real_layers = self.dz[:, sid] > 0
-            f = interp1d(
-                np.flipud(self.z_top[real_layers, sid]),
-                np.flipud(rock_type[real_layers, sid]),
-                kind="previous",
+        depths = np.asarray(depths, dtype=float).reshape((-1,))
+        if np.any(depths < 0.0):
+            raise ValueError("Depths for the rock cube must not be negative.")
+
+        shape = (self._grid.shape[0], self._grid.shape[1])
+        if out is None:
+            rock_cube = np.empty((depths.size,) + shape)
+        else:
+            rock_cube = out
+            if rock_cube.shape != (depths.size,) + shape:
+                raise ValueError(
+                    "Rock cube array has the wrong shape "
+                    "({0} != {1}).".format(rock_cube.shape, (depths.size,) + shape)
+                )
+        if depths_per_block is None:
+            if out is None:
+                depths_per_block = depths.size
+            else:
+                depths_per_block = 2 ** 20 // self._layers.number_of_stacks
+        depths_per_block = max(int(depths_per_block), 1)
+
+        z_top = np.ascontiguousarray(self.z_top, dtype=float)
+        dz = np.ascontiguousarray(self.dz, dtype=float)
+        rock_type = np.ascontiguousarray(
+            self._layers[self._rock_id_name], dtype=float
+        )
+        block = np.empty((min(depths_per_block, depths.size), z_top.shape[1]))
+        for start in range(0, depths.size, depths_per_block):
+            stop = min(start + depths_per_block, depths.size)
+            fill_rock_cube(
+                z_top, dz, rock_type, depths[start:stop], block[: stop - start]
             )
-            vals = f(depths)
-            rock_cube[:, coord[0], coord[1]] = vals
+            rock_cube[start:stop] = block[: stop - start].reshape((-1,) + shape)
 
         ds = xr.Dataset(
             data_vars={
@@ -1,8 +1,8 @@
 import numpy as np
 import scipy.sparse as sparse
-import scipy.sparse.linalg as linalg
 
 from landlab import Component
+from landlab.utils import SparseSolver
 
 # Things to add: 1. Explicit stability check.
 # 2. Implicit handling of scenarios where kappa*dt exceeds critical step -
@@ -51,6 +51,12 @@ class PerronNLDiffuse(Component):
     >>> np.allclose(z, z_target)
     True
 
+    The structure of the matrix is only calculated once, and reused for
+    all of the following time steps.
+
+    >>> nl.number_of_structure_updates
+    1
+
     References
     ----------
     **Required Software Citation(s) Specific to this Component**
@@ -87,6 +93,8 @@ class PerronNLDiffuse(Component):
         S_crit=33.0 * np.pi / 180.0,
         rock_density=2700.0,
         sed_density=2700.0,
+        solver="direct",
+        solver_kwds=None,
     ):
         """
         Parameters
@@ -101,10 +109,26 @@ class PerronNLDiffuse(Component):
             The density of intact rock
         sed_density : float (kg*m**-3)
             The density of the mobile (sediment) layer
+        solver : {"direct", "bicgstab"}, optional
+            Method used to solve the (nonsymmetric) matrix system of each
+            time step. The iterative method reuses its preconditioner
+            over time steps, and starts from the previous solution.
+        solver_kwds : dict, optional
+            Additional keywords passed to
+            :class:`~landlab.utils.SparseSolver`.
         """
         super().__init__(grid)
 
-        self._bc_set_code = self._grid.bc_set_code
+        if solver not in ("direct", "bicgstab"):
+            raise ValueError(
+                "{0}: solver must be 'direct' or 'bicgstab' as the matrix "
+                "is not symmetric".format(solver)
+            )
+        self._solver = SparseSolver(method=solver, **(solver_kwds or {}))
+        self._matrix_keys = None
+        self._number_of_structure_updates = 0
+
+        self._status_version = self._grid.status_cache_version()
         self._values_to_diffuse = "topographic__elevation"
         self._kappa = nonlinear_diffusivity
         self._rock_density = rock_density
@@ -230,8 +254,26 @@ class PerronNLDiffuse(Component):
 
         self.updated_boundary_conditions()
 
+    @property
+    def number_of_structure_updates(self):
+        """Number of times the sparsity structure of the matrix was built."""
+        return self._number_of_structure_updates
+
+    @property
+    def solver_iterations(self):
+        """Number of iterations used by the last solve."""
+        return self._solver.iterations
+
+    @property
+    def number_of_factorizations(self):
+        """Number of times the matrix (or preconditioner) was factored."""
+        return self._solver.number_of_factorizations
+
     def updated_boundary_conditions(self):
         """Call if grid BCs are updated after component instantiation."""
+        self._matrix_keys = None
+        self._solver.reset()
+
         grid = self._grid
         nrows = self._nrows
         ncols = self._ncols
@@ -1321,59 +1363,82 @@ class PerronNLDiffuse(Component):
                             conditions...!"""
             )
 
-        # new approach using COO sparse matrix requires we build the matrix
-        # only now...
-        self._operating_matrix = sparse.coo_matrix(
-            (
-                np.concatenate(
-                    (
-                        core_op_mat_data,
-                        corners_op_mat_data,
-                        bottom_op_mat_data,
-                        top_op_mat_data,
-                        left_op_mat_data,
-                        right_op_mat_data,
-                        bottom_op_mat_data_add,
-                        top_op_mat_data_add,
-                        left_op_mat_data_add,
-                        right_op_mat_data_add,
-                    )
-                ),
+        # the positions of the matrix entries only change with the boundary
+        # conditions, so only the values of the matrix are updated here.
+        self._fill_operating_matrix(
+            np.concatenate(
                 (
-                    np.concatenate(
-                        (
-                            core_op_mat_row,
-                            corners_op_mat_row,
-                            bottom_op_mat_row,
-                            top_op_mat_row,
-                            left_op_mat_row,
-                            right_op_mat_row,
-                            bottom_op_mat_row_add,
-                            top_op_mat_row_add,
-                            left_op_mat_row_add,
-                            right_op_mat_row_add,
-                        )
-                    ),
-                    np.concatenate(
-                        (
-                            core_op_mat_col,
-                            corners_op_mat_col,
-                            bottom_op_mat_col,
-                            top_op_mat_col,
-                            left_op_mat_col,
-                            right_op_mat_col,
-                            bottom_op_mat_col_add,
-                            top_op_mat_col_add,
-                            left_op_mat_col_add,
-                            right_op_mat_col_add,
-                        )
-                    ),
-                ),
+                    core_op_mat_row,
+                    corners_op_mat_row,
+                    bottom_op_mat_row,
+                    top_op_mat_row,
+                    left_op_mat_row,
+                    right_op_mat_row,
+                    bottom_op_mat_row_add,
+                    top_op_mat_row_add,
+                    left_op_mat_row_add,
+                    right_op_mat_row_add,
+                )
             ),
-            shape=(n_interior_nodes, n_interior_nodes),
-        ).tocsr()
+            np.concatenate(
+                (
+                    core_op_mat_col,
+                    corners_op_mat_col,
+                    bottom_op_mat_col,
+                    top_op_mat_col,
+                    left_op_mat_col,
+                    right_op_mat_col,
+                    bottom_op_mat_col_add,
+                    top_op_mat_col_add,
+                    left_op_mat_col_add,
+                    right_op_mat_col_add,
+                )
+            ),
+            np.concatenate(
+                (
+                    core_op_mat_data,
+                    corners_op_mat_data,
+                    bottom_op_mat_data,
+                    top_op_mat_data,
+                    left_op_mat_data,
+                    right_op_mat_data,
+                    bottom_op_mat_data_add,
+                    top_op_mat_data_add,
+                    left_op_mat_data_add,
+                    right_op_mat_data_add,
+                )
+            ),
+            n_interior_nodes,
+        )
         self._mat_RHS = _mat_RHS
 
+    def _fill_operating_matrix(self, rows, cols, data, n_rows):
+        """Sum matrix entries into the operating matrix.
+
+        Entries that share a row and column are added together, as they
+        would be for a COO matrix. The CSR structure of the matrix is kept
+        from one call to the next and only rebuilt if the positions of the
+        entries change.
+        """
+        keys = rows.astype(int) * n_rows + cols.astype(int)
+        if self._matrix_keys is None or not np.array_equal(keys, self._matrix_keys):
+            unique_keys, self._entry_at_key = np.unique(keys, return_inverse=True)
+            indptr = np.searchsorted(unique_keys // n_rows, np.arange(n_rows + 1))
+            self._operating_matrix = sparse.csr_matrix(
+                (
+                    np.zeros(len(unique_keys)),
+                    (unique_keys % n_rows).astype(np.int32),
+                    indptr.astype(np.int32),
+                ),
+                shape=(n_rows, n_rows),
+            )
+            self._matrix_keys = keys
+            self._number_of_structure_updates += 1
+
+        self._operating_matrix.data[:] = np.bincount(
+            self._entry_at_key, weights=data, minlength=self._operating_matrix.nnz
+        )
+
     # These methods translate ID numbers between arrays of differing sizes
     def _realIDtointerior(self, ID):
         ncols = self._ncols
@@ -1436,16 +1501,18 @@ class PerronNLDiffuse(Component):
         dt : float (time)
             The imposed timestep.
         """
-        if self._bc_set_code != self._grid.bc_set_code:
+        if self._status_version != self._grid.status_cache_version():
             self.updated_boundary_conditions()
-            self._bc_set_code = self._grid.bc_set_code
+            self._status_version = self._grid.status_cache_version()
         else:
             self._gear_timestep(dt, self._grid)
             for i in range(self._internal_repeats):
                 # Initialize the variables for the step:
                 self._set_variables(self._grid)
                 # Solve interior of grid:
-                _interior_elevs = linalg.spsolve(self._operating_matrix, self._mat_RHS)
+                _interior_elevs = self._solver.solve(
+                    self._operating_matrix, self._mat_RHS
+                )
                 # this fn solves Ax=B for x
 
                 # Handle the BC cells; test common cases first for speed
@@ -0,0 +1,615 @@
+import numpy as np
+cimport numpy as np
+cimport cython
+
+from libc.math cimport fabs, pow, sqrt
+
+
+DTYPE_INT = int
+ctypedef np.int_t DTYPE_INT_t
+DTYPE_FLOAT = np.double
+ctypedef np.double_t DTYPE_FLOAT_t
+
+cdef double SEVEN_OVER_THREE = 7.0 / 3.0
+cdef double NEWTON_TOL = 1.0e-12
+cdef int NEWTON_MAX_ITER = 50
+cdef int BISECT_MAX_ITER = 200
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def _calc_depth_and_slope_at_links(
+    const DTYPE_INT_t[:] links,
+    const DTYPE_INT_t[:, :] nodes_at_link,
+    const DTYPE_FLOAT_t[:] length_of_link,
+    const DTYPE_FLOAT_t[:] z_at_node,
+    const DTYPE_FLOAT_t[:] h_at_node,
+    DTYPE_FLOAT_t[:] h_at_link,
+    DTYPE_FLOAT_t[:] slope_at_link,
+):
+    """Flow depth and water-surface slope at links.
+
+    The flow depth at a link is the difference between the higher of the
+    two water surfaces and the higher of the two bed elevations at the
+    link's nodes (Bates et al., 2010).
+
+    Parameters
+    ----------
+    links : ndarray of int
+        Links to calculate depth and slope at.
+    nodes_at_link : ndarray of int, shape `(n_links, 2)`
+        Tail and head nodes of each link.
+    length_of_link : ndarray of float
+        Length of each link.
+    z_at_node : ndarray of float
+        Bed elevation at nodes.
+    h_at_node : ndarray of float
+        Water depth at nodes.
+    h_at_link : ndarray of float
+        Flow depth at links (modified in place).
+    slope_at_link : ndarray of float
+        Water-surface slope at links (modified in place).
+    """
+    cdef int n_links = links.shape[0]
+    cdef int i, link, tail, head
+    cdef double w_tail, w_head, w_max, z_max
+
+    with nogil:
+        for i in range(n_links):
+            link = links[i]
+            tail = nodes_at_link[link, 0]
+            head = nodes_at_link[link, 1]
+
+            w_tail = h_at_node[tail] + z_at_node[tail]
+            w_head = h_at_node[head] + z_at_node[head]
+
+            w_max = w_tail if w_tail > w_head else w_head
+            z_max = z_at_node[tail] if z_at_node[tail] > z_at_node[head] else z_at_node[head]
+
+            h_at_link[link] = w_max - z_max
+            slope_at_link[link] = (w_head - w_tail) / length_of_link[link]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def _update_discharge_at_links(
+    const DTYPE_INT_t[:] links,
+    const DTYPE_INT_t[:, :] neighbors_at_link,
+    const DTYPE_FLOAT_t[:] h_at_link,
+    const DTYPE_FLOAT_t[:] slope_at_link,
+    const DTYPE_FLOAT_t[:] mannings_n,
+    int n_stride,
+    double theta,
+    double g,
+    double dt,
+    DTYPE_FLOAT_t[:] q_old,
+    DTYPE_FLOAT_t[:] q,
+):
+    """Inertial (de Almeida et al., 2012) update of discharge at links.
+
+    Each link is updated from the discharge at the link and at its two
+    neighbors along the direction of flow at the start of the step. These
+    values are first copied into *q_old*, which has one more element than
+    there are links. This last element is a ghost link that always has zero
+    discharge and stands in for neighbors that do not exist.
+
+    Parameters
+    ----------
+    links : ndarray of int
+        Links to update.
+    neighbors_at_link : ndarray of int, shape `(n_links, 2)`
+        The two neighbors of each link (west and east for horizontal links,
+        north and south for vertical links). Missing neighbors are given
+        as the id of the ghost link, *n_links*.
+    h_at_link : ndarray of float
+        Flow depth at links.
+    slope_at_link : ndarray of float
+        Water-surface slope at links.
+    mannings_n : ndarray of float
+        Manning's roughness coefficient.
+    n_stride : int
+        Stride of *mannings_n*; 0 if roughness is uniform, 1 if given at
+        links.
+    theta : float
+        Weighting factor from de Almeida et al., 2012.
+    g : float
+        Acceleration due to gravity.
+    dt : float
+        Time step.
+    q_old : ndarray of float, shape `(n_links + 1, )`
+        Buffer to hold discharge at the start of the step. Its last element
+        must be zero.
+    q : ndarray of float
+        Discharge at links (updated in place).
+    """
+    cdef int n_links = q.shape[0]
+    cdef int n_updates = links.shape[0]
+    cdef int i, link, neighbor
+    cdef double c_theta = (1.0 - theta) / 2.0
+    cdef double c_friction = g * dt
+    cdef double q_link, h_link, n_link
+
+    with nogil:
+        for i in range(n_updates):
+            link = links[i]
+            q_old[link] = q[link]
+            neighbor = neighbors_at_link[link, 0]
+            if neighbor < n_links:
+                q_old[neighbor] = q[neighbor]
+            neighbor = neighbors_at_link[link, 1]
+            if neighbor < n_links:
+                q_old[neighbor] = q[neighbor]
+
+        for i in range(n_updates):
+            link = links[i]
+            q_link = q_old[link]
+            h_link = h_at_link[link]
+            n_link = mannings_n[link * n_stride]
+
+            q[link] = (
+                theta * q_link
+                + c_theta * (
+                    q_old[neighbors_at_link[link, 0]]
+                    + q_old[neighbors_at_link[link, 1]]
+                )
+                - g * h_link * dt * slope_at_link[link]
+            ) / (
+                1.0
+                + c_friction * (n_link * n_link) * fabs(q_link)
+                / pow(h_link, SEVEN_OVER_THREE)
+            )
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def _limit_discharge_at_links(
+    const DTYPE_INT_t[:] links,
+    const DTYPE_FLOAT_t[:] h_at_link,
+    double g,
+    double dx,
+    double dt,
+    DTYPE_FLOAT_t[:] q,
+):
+    """Limit discharge at links where flow is too fast to be stable.
+
+    Discharge is reduced where the Froude number is greater than one and
+    where, in a time step, more than a quarter of the water at a link would
+    leave it.
+
+    Parameters
+    ----------
+    links : ndarray of int
+        Links to limit discharge at.
+    h_at_link : ndarray of float
+        Flow depth at links.
+    g : float
+        Acceleration due to gravity.
+    dx : float
+        Grid spacing.
+    dt : float
+        Time step.
+    q : ndarray of float
+        Discharge at links (updated in place).
+    """
+    cdef int n_links = links.shape[0]
+    cdef int i, link
+    cdef double q_link, h_link, froude, courant, quarter_depth
+
+    with nogil:
+        for i in range(n_links):
+            link = links[i]
+            q_link = q[link]
+            if q_link == 0.0:
+                continue
+            h_link = h_at_link[link]
+
+            froude = (q_link / h_link) / sqrt(g * h_link)
+            courant = q_link * dt / dx
+            quarter_depth = h_link / 4.0
+
+            if q_link > 0.0:
+                if courant > quarter_depth:
+                    q[link] = ((h_link * dx) / 5.0) / dt
+                elif froude > 1.0:
+                    q[link] = h_link * (sqrt(g * h_link) * 1.0)
+            elif q_link < 0.0:
+                if fabs(courant) > quarter_depth:
+                    q[link] = 0.0 - (h_link * dx / 5.0) / dt
+                elif fabs(froude) > 1.0:
+                    q[link] = 0.0 - (h_link * sqrt(g * h_link) * 1.0)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _find_wet_front(
+    const DTYPE_INT_t[:] nodes,
+    int search_neighbors,
+    const DTYPE_FLOAT_t[:] h_at_node,
+    double h_dry,
+    const DTYPE_INT_t[:, :] adjacent_nodes_at_node,
+    const DTYPE_INT_t[:, :] links_at_node,
+    const DTYPE_INT_t[:, :] nodes_at_link,
+    const np.uint8_t[:] status_at_link,
+    int active_status,
+    np.uint8_t[:] is_front_node,
+    np.uint8_t[:] is_front_link,
+    DTYPE_INT_t[:] front_nodes,
+    DTYPE_INT_t[:] front_links,
+    DTYPE_INT_t[:] front_active_links,
+    const DTYPE_INT_t[:] old_front_links,
+    DTYPE_FLOAT_t[:] q,
+):
+    """Find the nodes and links at the front of wet areas.
+
+    A node is wet if its water depth is greater than *h_dry*. The front is
+    made up of the wet nodes and the nodes adjacent to them (so that water
+    can advance by one node in a step), and the links that touch any of
+    those nodes. Discharge is set to zero at links that were part of the
+    old front but are not part of the new one.
+
+    Parameters
+    ----------
+    nodes : ndarray of int
+        Nodes to search for wet nodes.
+    search_neighbors : int
+        If non-zero, also search the nodes adjacent to *nodes*.
+    h_at_node : ndarray of float
+        Water depth at nodes.
+    h_dry : float
+        Depth at or below which a node is dry.
+    adjacent_nodes_at_node : ndarray of int, shape `(n_nodes, max_neighbors)`
+        Nodes adjacent to each node, padded with -1.
+    links_at_node : ndarray of int, shape `(n_nodes, max_links)`
+        Links of each node, padded with -1.
+    nodes_at_link : ndarray of int, shape `(n_links, 2)`
+        Tail and head nodes of each link.
+    status_at_link : ndarray of uint8
+        Status of each link.
+    active_status : int
+        Status of active links.
+    is_front_node, is_front_link : ndarray of uint8
+        Work arrays that must be all zero. They are all zero on return.
+    front_nodes : ndarray of int
+        Buffer to hold the nodes of the new front followed by the other
+        nodes at the ends of its links.
+    front_links, front_active_links : ndarray of int
+        Buffers to hold the links of the new front (and those of its
+        links that are active).
+    old_front_links : ndarray of int
+        Links of the old front.
+    q : ndarray of float
+        Discharge at links.
+
+    Returns
+    -------
+    tuple of int
+        Number of front nodes, number of front nodes plus the other nodes
+        at the ends of front links, number of front links and number of
+        active front links.
+    """
+    cdef int n_nodes = nodes.shape[0]
+    cdef int n_neighbors = adjacent_nodes_at_node.shape[1]
+    cdef int n_links_at_node = links_at_node.shape[1]
+    cdef int n_front_nodes = 0
+    cdef int n_end_nodes = 0
+    cdef int n_front_links = 0
+    cdef int n_front_active_links = 0
+    cdef int i, j, k, node, candidate, neighbor, link
+
+    with nogil:
+        for i in range(n_nodes):
+            for j in range(-1, n_neighbors if search_neighbors else 0):
+                if j < 0:
+                    candidate = nodes[i]
+                else:
+                    candidate = adjacent_nodes_at_node[nodes[i], j]
+                    if candidate < 0:
+                        continue
+                if h_at_node[candidate] <= h_dry:
+                    continue
+
+                if not is_front_node[candidate]:
+                    is_front_node[candidate] = 1
+                    front_nodes[n_front_nodes] = candidate
+                    n_front_nodes += 1
+                for k in range(n_neighbors):
+                    neighbor = adjacent_nodes_at_node[candidate, k]
+                    if neighbor >= 0 and not is_front_node[neighbor]:
+                        is_front_node[neighbor] = 1
+                        front_nodes[n_front_nodes] = neighbor
+                        n_front_nodes += 1
+
+        for i in range(n_front_nodes):
+            node = front_nodes[i]
+            for j in range(n_links_at_node):
+                link = links_at_node[node, j]
+                if link >= 0 and not is_front_link[link]:
+                    is_front_link[link] = 1
+                    front_links[n_front_links] = link
+                    n_front_links += 1
+                    if status_at_link[link] == active_status:
+                        front_active_links[n_front_active_links] = link
+                        n_front_active_links += 1
+
+        n_end_nodes = n_front_nodes
+        for i in range(n_front_links):
+            for j in range(2):
+                node = nodes_at_link[front_links[i], j]
+                if not is_front_node[node]:
+                    is_front_node[node] = 1
+                    front_nodes[n_end_nodes] = node
+                    n_end_nodes += 1
+
+        for i in range(old_front_links.shape[0]):
+            link = old_front_links[i]
+            if not is_front_link[link]:
+                q[link] = 0.0
+
+        for i in range(n_end_nodes):
+            is_front_node[front_nodes[i]] = 0
+        for i in range(n_front_links):
+            is_front_link[front_links[i]] = 0
+
+    return n_front_nodes, n_end_nodes, n_front_links, n_front_active_links
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def _update_depth_at_nodes(
+    const DTYPE_INT_t[:] nodes,
+    const np.uint8_t[:] status_at_node,
+    int core_status,
+    const DTYPE_INT_t[:, :] links_at_node,
+    const np.int8_t[:, :] link_dirs_at_node,
+    const DTYPE_INT_t[:] face_at_link,
+    const DTYPE_FLOAT_t[:] length_of_face,
+    const DTYPE_INT_t[:] cell_at_node,
+    const DTYPE_FLOAT_t[:] area_of_cell,
+    const DTYPE_FLOAT_t[:] q,
+    double dt,
+    double h_dry,
+    double h_floor,
+    DTYPE_FLOAT_t[:] h_at_node,
+):
+    """Update water depth at nodes from the divergence of discharge.
+
+    Parameters
+    ----------
+    nodes : ndarray of int
+        Nodes to update. Only core nodes are changed.
+    status_at_node : ndarray of uint8
+        Status of each node.
+    core_status : int
+        Status of core nodes.
+    links_at_node : ndarray of int, shape `(n_nodes, max_links)`
+        Links of each node, padded with -1.
+    link_dirs_at_node : ndarray of int8, shape `(n_nodes, max_links)`
+        Direction of each link relative to its node.
+    face_at_link : ndarray of int
+        Face that crosses each link.
+    length_of_face : ndarray of float
+        Length of each face.
+    cell_at_node : ndarray of int
+        Cell of each node.
+    area_of_cell : ndarray of float
+        Area of each cell.
+    q : ndarray of float
+        Discharge (per unit width) at links.
+    dt : float
+        Time step.
+    h_dry : float
+        Depths less than this are set to *h_floor*.
+    h_floor : float
+        Depth of nodes shallower than *h_dry*.
+    h_at_node : ndarray of float
+        Water depth at nodes (updated in place).
+    """
+    cdef int n_nodes = nodes.shape[0]
+    cdef int n_links_at_node = links_at_node.shape[1]
+    cdef int i, j, node, link
+    cdef double net_influx
+
+    with nogil:
+        for i in range(n_nodes):
+            node = nodes[i]
+            if status_at_node[node] == core_status:
+                net_influx = 0.0
+                for j in range(n_links_at_node):
+                    link = links_at_node[node, j]
+                    if link >= 0:
+                        net_influx += (
+                            link_dirs_at_node[node, j] * q[link]
+                            * length_of_face[face_at_link[link]]
+                        )
+                h_at_node[node] += net_influx / area_of_cell[cell_at_node[node]] * dt
+            if h_at_node[node] < h_dry:
+                h_at_node[node] = h_floor
+
+
+cdef inline double _water_fn(
+    double x, double a, double b, double c, double d, double e
+) nogil:
+    """Residual of the implicit kinematic-wave depth equation."""
+    return x - c + a * pow(b * x + (b - 1.0) * c, d) - e
+
+
+cdef inline double _water_fn_prime(
+    double x, double a, double b, double c, double d
+) nogil:
+    """Derivative of :func:`_water_fn` with respect to depth."""
+    return 1.0 + a * d * b * pow(b * x + (b - 1.0) * c, d - 1.0)
+
+
+cdef double _solve_water_fn(
+    double x0, double a, double b, double c, double d, double e
+) nogil:
+    """Solve the implicit kinematic-wave depth equation.
+
+    Newton's method is tried first, starting from *x0*. If it fails to
+    converge (or leaves the range of depths for which the equation is
+    defined) the root is found by bisection instead.
+    """
+    cdef double x = x0
+    cdef double dx, f, lo, hi, mid
+    cdef int i
+
+    for i in range(NEWTON_MAX_ITER):
+        f = _water_fn(x, a, b, c, d, e)
+        dx = f / _water_fn_prime(x, a, b, c, d)
+        x -= dx
+        if not (x == x):
+            break
+        if fabs(dx) <= NEWTON_TOL * fabs(x):
+            return x
+
+    # Fall back to bisection. The residual increases with depth so bracket
+    # the root between the smallest depth for which the equation is defined
+    # and a depth at which the residual is positive.
+    lo = 0.0
+    if b > 0.0 and (1.0 - b) * c / b > lo:
+        lo = (1.0 - b) * c / b
+    if _water_fn(lo, a, b, c, d, e) >= 0.0:
+        return lo
+
+    hi = lo + c + e + 1.0
+    for i in range(BISECT_MAX_ITER):
+        if _water_fn(hi, a, b, c, d, e) >= 0.0:
+            break
+        lo, hi = hi, 2.0 * hi
+
+    for i in range(BISECT_MAX_ITER):
+        mid = 0.5 * (lo + hi)
+        if _water_fn(mid, a, b, c, d, e) < 0.0:
+            lo = mid
+        else:
+            hi = mid
+        if hi - lo <= NEWTON_TOL * hi:
+            break
+
+    return 0.5 * (lo + hi)
+
+
+def _solve_water_depth(
+    double x0, double a, double b, double c, double d, double e
+):
+    """Solve the implicit kinematic-wave depth equation at a single node.
+
+    Parameters
+    ----------
+    x0 : float
+        Initial guess of water depth at the new time step.
+    a : float
+        "alpha" parameter.
+    b : float
+        Weighting factor on new versus old time step.
+    c : float
+        Water depth at the old time step.
+    d : float
+        Depth-discharge exponent.
+    e : float
+        Water inflow volume per unit cell area in one time step.
+
+    Returns
+    -------
+    float
+        Water depth at the new time step.
+
+    Examples
+    --------
+    >>> from landlab.components.overland_flow.cfuncs import _solve_water_depth
+    >>> h = _solve_water_depth(0.0, 2.0, 1.0, 0.0, 1.5, 0.5)
+    >>> round(h + 2.0 * h ** 1.5, 12)
+    0.5
+    """
+    return _solve_water_fn(x0, a, b, c, d, e)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def _route_implicit_kinwave(
+    const DTYPE_INT_t[:] nodes_ordered,
+    const np.uint8_t[:] status_at_node,
+    int core_status,
+    const DTYPE_FLOAT_t[:] alpha,
+    const DTYPE_FLOAT_t[:] grad_width_sum,
+    const DTYPE_FLOAT_t[:] area_at_node,
+    const DTYPE_INT_t[:, :] receivers,
+    const DTYPE_FLOAT_t[:, :] proportions,
+    double dt,
+    double runoff_rate,
+    double weight,
+    double depth_exp,
+    double vel_coef,
+    DTYPE_FLOAT_t[:] depth,
+    DTYPE_FLOAT_t[:] disch_in,
+):
+    """Solve for water depth from upstream to downstream.
+
+    Nodes are visited in the reverse of *nodes_ordered* (a downstream to
+    upstream ordering) so that all inflow to a node is known when its new
+    depth is found. The outflow from each core node is then passed on to
+    its receivers.
+
+    Parameters
+    ----------
+    nodes_ordered : ndarray of int
+        Nodes ordered from downstream to upstream.
+    status_at_node : ndarray of uint8
+        Status of each node.
+    core_status : int
+        Status of core nodes.
+    alpha : ndarray of float
+        Prefactor of the outflow term at each node.
+    grad_width_sum : ndarray of float
+        Sum of square root of gradient times face width over the outflow
+        links of each node.
+    area_at_node : ndarray of float
+        Area of the cell of each node.
+    receivers : ndarray of int, shape `(n_nodes, n_receivers)`
+        Nodes that receive flow from each node, padded with -1.
+    proportions : ndarray of float, shape `(n_nodes, n_receivers)`
+        Proportion of outflow sent to each receiver.
+    dt : float
+        Time step.
+    runoff_rate : float
+        Local runoff rate.
+    weight : float
+        Weighting on depth at new time step versus old time step.
+    depth_exp : float
+        Exponent on water depth in the velocity equation.
+    vel_coef : float
+        Velocity coefficient (one over roughness).
+    depth : ndarray of float
+        Water depth at nodes (updated in place).
+    disch_in : ndarray of float
+        Inflow discharge at nodes. Must be zero on entry.
+    """
+    cdef int n_nodes = nodes_ordered.shape[0]
+    cdef int n_receivers = receivers.shape[1]
+    cdef int i, j, node, receiver
+    cdef double old_depth, inflow, h_eff, outflow
+
+    with nogil:
+        for i in range(n_nodes - 1, -1, -1):
+            node = nodes_ordered[i]
+            if status_at_node[node] != core_status:
+                continue
+
+            old_depth = depth[node]
+            inflow = dt * runoff_rate + dt * disch_in[node] / area_at_node[node]
+            depth[node] = _solve_water_fn(
+                old_depth, alpha[node], weight, old_depth, depth_exp, inflow
+            )
+
+            h_eff = weight * depth[node] + (1.0 - weight) * old_depth
+            outflow = vel_coef * pow(h_eff, depth_exp) * grad_width_sum[node]
+
+            for j in range(n_receivers):
+                receiver = receivers[node, j]
+                if receiver >= 0:
+                    disch_in[receiver] += outflow * proportions[node, j]
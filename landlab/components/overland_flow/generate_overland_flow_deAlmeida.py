@@ -89,9 +89,16 @@ array([ 0. ,  0. ,  0. ,  0. ,
 import numpy as np
 import scipy.constants
 
-from landlab import Component, FieldError
+from landlab import Component, FieldError, LinkStatus, NodeStatus
 
 from . import _links as links
+from .cfuncs import (
+    _calc_depth_and_slope_at_links,
+    _find_wet_front,
+    _limit_discharge_at_links,
+    _update_depth_at_nodes,
+    _update_discharge_at_links,
+)
 
 _SEVEN_OVER_THREE = 7.0 / 3.0
 
@@ -253,6 +260,7 @@ class OverlandFlow(Component):
         theta=0.8,
         rainfall_intensity=0.0,
         steep_slopes=False,
+        track_wet_front=False,
     ):
         """Create an overland flow component.
 
@@ -277,6 +285,11 @@ class OverlandFlow(Component):
         steep_slopes : bool, optional
             Modify the algorithm to handle steeper slopes at the expense of
             speed. If model runs become unstable, consider setting to True.
+        track_wet_front : bool, optional
+            Only update discharge at links that touch a wet node (a node
+            where water is deeper than *h_init*) or a node next to a wet
+            node. This can be much faster when most of the grid is dry.
+            Discharge at all other links is set to zero.
         """
         super().__init__(grid)
 
@@ -338,6 +351,7 @@ class OverlandFlow(Component):
 
         self._dt = None
         self._dhdt = grid.zeros()
+        self._flux_div = grid.zeros()
 
         # When we instantiate the class we recognize that neighbors have not
         # been found. After the user either calls self.set_up_neighbor_array
@@ -356,11 +370,38 @@ class OverlandFlow(Component):
         # Assiging a class variable to the elevation field.
         self._z = self._grid.at_node["topographic__elevation"]
 
+        # Links to update are either all of the links or, if tracking the
+        # wet front, only those that touch a wet node or one of its
+        # neighbors. Buffers for the front are double so that the old front
+        # can be read while the new one is found.
+        self._track_wet_front = bool(track_wet_front)
+        self._all_links = np.arange(self._grid.number_of_links)
+        self._active_fraction = 1.0
+        if self._track_wet_front:
+            self._all_nodes = np.arange(self._grid.number_of_nodes)
+            self._is_front_node = np.zeros(self._grid.number_of_nodes, dtype=np.uint8)
+            self._is_front_link = np.zeros(self._grid.number_of_links, dtype=np.uint8)
+            self._front_nodes = np.empty((2, self._grid.number_of_nodes), dtype=int)
+            self._front_links = np.empty((2, self._grid.number_of_links), dtype=int)
+            self._front_active_links = np.empty(self._grid.number_of_links, dtype=int)
+            self._front = 0
+            self._n_front = (0, 0, 0, 0)
+            self._front_is_stale = True
+
     @property
     def h(self):
         """The depth of water at each node."""
         return self._h
 
+    @property
+    def active_fraction(self):
+        """Fraction of links updated in the most recent sub-step.
+
+        This is always 1 unless the component was created with
+        *track_wet_front* set to ``True``.
+        """
+        return self._active_fraction
+
     @property
     def dt(self):
         """dt: Component timestep."""
@@ -390,16 +431,64 @@ class OverlandFlow(Component):
         """Calculate time step.
 
         Adaptive time stepper from Bates et al., 2010 and de Almeida et
-        al., 2012
+        al., 2012. If tracking the wet front, only nodes of the front are
+        used to find the maximum water depth.
         """
-        self._dt = (
-            self._alpha
-            * self._grid.dx
-            / np.sqrt(self._g * np.amax(self._grid.at_node["surface_water__depth"]))
-        )
+        h = self._grid.at_node["surface_water__depth"]
+        if self._track_wet_front:
+            if self._front_is_stale:
+                self._update_wet_front(search_all=True)
+            front_nodes = self._front_nodes[self._front, : self._n_front[0]]
+            if len(front_nodes) > 0:
+                h = h[front_nodes]
+
+        self._dt = self._alpha * self._grid.dx / np.sqrt(self._g * np.amax(h))
 
         return self._dt
 
+    def _update_wet_front(self, search_all=False):
+        """Find the nodes and links of the wet front.
+
+        Parameters
+        ----------
+        search_all : bool, optional
+            Search all nodes for wet nodes. Otherwise, only search nodes of
+            the current front and their neighbors (which, without rainfall,
+            are the only nodes whose depth can have changed).
+        """
+        old = self._front
+        new = 1 - old
+        n_nodes, _, n_links, _ = self._n_front
+
+        if search_all or self._rainfall_intensity > 0.0:
+            nodes, search_neighbors = self._all_nodes, False
+            old_front_links = self._all_links
+        else:
+            nodes, search_neighbors = self._front_nodes[old, :n_nodes], True
+            old_front_links = self._front_links[old, :n_links]
+
+        self._n_front = _find_wet_front(
+            nodes,
+            search_neighbors,
+            self._grid.at_node["surface_water__depth"],
+            self._h_init,
+            self._grid.adjacent_nodes_at_node,
+            self._grid.links_at_node,
+            self._grid.nodes_at_link,
+            self._grid.status_at_link,
+            LinkStatus.ACTIVE,
+            self._is_front_node,
+            self._is_front_link,
+            self._front_nodes[new],
+            self._front_links[new],
+            self._front_active_links,
+            old_front_links,
+            self._grid.at_link["surface_water__discharge"],
+        )
+        self._front = new
+        self._front_is_stale = False
+        self._active_fraction = self._n_front[2] / self._grid.number_of_links
+
     def set_up_neighbor_arrays(self):
         """Create and initialize link neighbor arrays.
 
@@ -509,11 +598,19 @@ class OverlandFlow(Component):
         ids = self._vert_bdy_ids[ids]
         self._south_neighbors[ids] = self._vertical_active_link_ids[ids]
 
-        # Set up arrays for discharge in the horizontal & vertical directions.
-        self._q_horizontal = np.zeros(
-            links.number_of_horizontal_links(self._grid.shape)
-        )
-        self._q_vertical = np.zeros(links.number_of_vertical_links(self._grid.shape))
+        # Gather the neighbors of every link into a single array. Missing
+        # neighbors refer to a ghost link, one past the last link, that
+        # always has zero discharge.
+        n_links = self._grid.number_of_links
+        self._neighbors_at_link = np.empty((n_links, 2), dtype=int)
+        self._neighbors_at_link[self._horizontal_ids, 0] = self._west_neighbors
+        self._neighbors_at_link[self._horizontal_ids, 1] = self._east_neighbors
+        self._neighbors_at_link[self._vertical_ids, 0] = self._north_neighbors
+        self._neighbors_at_link[self._vertical_ids, 1] = self._south_neighbors
+        self._neighbors_at_link[self._neighbors_at_link == -1] = n_links
+
+        # Discharge at the start of a step, padded with the ghost link.
+        self._q_at_start_of_step = np.zeros(n_links + 1)
 
         # Once the neighbor arrays are set up, we change the flag to True!
         self._neighbor_flag = True
@@ -534,6 +631,19 @@ class OverlandFlow(Component):
         local_elapsed_time = 0.0
         if dt is None:
             dt = np.inf  # to allow the loop to begin
+
+        # Manning's n is either uniform or given at links.
+        mannings_n = np.asarray(self._mannings_n, dtype=float)
+        mannings_n_stride = 0 if mannings_n.ndim == 0 else 1
+        mannings_n = mannings_n.reshape(-1)
+        if mannings_n_stride and mannings_n.size != self._grid.number_of_links:
+            raise ValueError("mannings_n must be a scalar or defined at links")
+
+        # Depths may have been changed since the last step so the wet front
+        # must be found again.
+        if self._track_wet_front:
+            self._front_is_stale = True
+
         while local_elapsed_time < dt:
             dt_local = self.calc_time_step()
             # Can really get into trouble if nothing happens but we still run:
@@ -560,128 +670,51 @@ class OverlandFlow(Component):
             self._core_nodes = self._grid.core_nodes
             self._active_links = self._grid.active_links
 
+            # ... and the links to update in this step.
+            if self._track_wet_front:
+                _, _, n_links, n_active_links = self._n_front
+                links_to_update = self._front_links[self._front, :n_links]
+                active_links_to_update = self._front_active_links[:n_active_links]
+            else:
+                links_to_update = self._all_links
+                active_links_to_update = self._active_links
+
             # Per Bates et al., 2010, this solution needs to find difference
             # between the highest water surface in the two cells and the
-            # highest bed elevation
-            zmax = self._grid.map_max_of_link_nodes_to_link(self._z)
-            w = self._h + self._z
-            wmax = self._grid.map_max_of_link_nodes_to_link(w)
-            hflow = wmax[self._grid.active_links] - zmax[self._grid.active_links]
-
-            # Insert this water depth into an array of water depths at the
-            # links.
-            self._h_links[self._active_links] = hflow
-
-            # Now we calculate the slope of the water surface elevation at
-            # active links
-            self._water_surface__gradient = self._grid.calc_grad_at_link(w)[
-                self._grid.active_links
-            ]
-
-            # And insert these values into an array of all links
-            self._water_surface_slope[
-                self._active_links
-            ] = self._water_surface__gradient
+            # highest bed elevation. At the same time, calculate the slope of
+            # the water surface at active links.
+            _calc_depth_and_slope_at_links(
+                active_links_to_update,
+                self._grid.nodes_at_link,
+                self._grid.length_of_link,
+                self._z,
+                self._h,
+                self._h_links,
+                self._water_surface_slope,
+            )
+
             # If the user chooses to set boundary links to the neighbor value,
             # we set the discharge array to have the boundary links set to
             # their neighbor value
             if self._default_fixed_links is True:
                 self._q[self._grid.fixed_links] = self._q[self._active_neighbors]
 
-            # Now we can calculate discharge. To handle links with neighbors
-            # that do not exist, we will do a fancy indexing trick. Non-
-            # existent links or inactive links have an index of '-1', which in
-            # Python, looks to the end of a list or array. To accommodate these
-            # '-1' indices, we will simply insert an value of 0.0 discharge (in
-            # units of L^2/T) to the end of the discharge array.
-            self._q = np.append(self._q, [0])
-
-            horiz = self._horizontal_ids
-            vert = self._vertical_ids
-            # Now we calculate discharge in the horizontal direction
-            try:
-                self._q[horiz] = (
-                    self._theta * self._q[horiz]
-                    + (1.0 - self._theta)
-                    / 2.0
-                    * (self._q[self._west_neighbors] + self._q[self._east_neighbors])
-                    - self._g
-                    * self._h_links[horiz]
-                    * self._dt
-                    * self._water_surface_slope[horiz]
-                ) / (
-                    1
-                    + self._g
-                    * self._dt
-                    * self._mannings_n ** 2.0
-                    * abs(self._q[horiz])
-                    / self._h_links[horiz] ** _SEVEN_OVER_THREE
-                )
-
-                # ... and in the vertical direction
-                self._q[vert] = (
-                    self._theta * self._q[vert]
-                    + (1 - self._theta)
-                    / 2.0
-                    * (self._q[self._north_neighbors] + self._q[self._south_neighbors])
-                    - self._g
-                    * self._h_links[vert]
-                    * self._dt
-                    * self._water_surface_slope[vert]
-                ) / (
-                    1
-                    + self._g
-                    * self._dt
-                    * self._mannings_n ** 2.0
-                    * abs(self._q[vert])
-                    / self._h_links[vert] ** _SEVEN_OVER_THREE
-                )
-
-            except ValueError:
-                self._mannings_n = self._grid["link"]["mannings_n"]
-                # if manning's n in a field
-                # calc discharge in horizontal
-                self._q[horiz] = (
-                    self._theta * self._q[horiz]
-                    + (1.0 - self._theta)
-                    / 2.0
-                    * (self._q[self._west_neighbors] + self._q[self._east_neighbors])
-                    - self._g
-                    * self._h_links[horiz]
-                    * self._dt
-                    * self._water_surface_slope[horiz]
-                ) / (
-                    1
-                    + self._g
-                    * self._dt
-                    * self._mannings_n[horiz] ** 2.0
-                    * abs(self._q[horiz])
-                    / self._h_links[horiz] ** _SEVEN_OVER_THREE
-                )
-
-                # ... and in the vertical direction
-                self._q[vert] = (
-                    self._theta * self._q[vert]
-                    + (1 - self._theta)
-                    / 2.0
-                    * (self._q[self._north_neighbors] + self._q[self._south_neighbors])
-                    - self._g
-                    * self._h_links[vert]
-                    * self._dt
-                    * self._water_surface_slope[self._vertical_ids]
-                ) / (
-                    1
-                    + self._g
-                    * self._dt
-                    * self._mannings_n[vert] ** 2.0
-                    * abs(self._q[vert])
-                    / self._h_links[vert] ** _SEVEN_OVER_THREE
-                )
-
-            # Now to return the array to its original length (length of number
-            # of all links), we delete the extra 0.0 value from the end of the
-            # array.
-            self._q = np.delete(self._q, len(self._q) - 1)
+            # Now we can calculate discharge, in place, for both horizontal
+            # and vertical links. Links that do not have a neighbor in the
+            # direction of flow use a ghost link with zero discharge instead.
+            _update_discharge_at_links(
+                links_to_update,
+                self._neighbors_at_link,
+                self._h_links,
+                self._water_surface_slope,
+                mannings_n,
+                mannings_n_stride,
+                self._theta,
+                self._g,
+                self._dt,
+                self._q_at_start_of_step,
+                self._q,
+            )
 
             # Updating the discharge array to have the boundary links set to
             # their neighbor
@@ -689,94 +722,64 @@ class OverlandFlow(Component):
                 self._q[self._grid.fixed_links] = self._q[self._active_neighbors]
 
             if self._steep_slopes is True:
-                # To prevent water from draining too fast for our time steps...
-                # Our Froude number.
-                Fr = 1.0
-                # Our two limiting factors, the froude number and courant
-                # number.
-                # Looking a calculated q to be compared to our Fr number.
-                calculated_q = (self._q / self._h_links) / np.sqrt(
-                    self._g * self._h_links
-                )
-
-                # Looking at our calculated q and comparing it to Courant no.,
-                q_courant = self._q * self._dt / self._grid.dx
-
-                # Water depth split equally between four links..
-                water_div_4 = self._h_links / 4.0
-
-                # IDs where water discharge is positive...
-                (positive_q,) = np.where(self._q > 0)
-
-                # ... and negative.
-                (negative_q,) = np.where(self._q < 0)
-
-                # Where does our calculated q exceed the Froude number? If q
-                # does exceed the Froude number, we are getting supercritical
-                # flow and discharge needs to be reduced to maintain stability.
-                (Froude_logical,) = np.where((calculated_q) > Fr)
-                (Froude_abs_logical,) = np.where(abs(calculated_q) > Fr)
-
-                # Where does our calculated q exceed the Courant number and
-                # water depth divided amongst 4 links? If the calculated q
-                # exceeds the Courant number and is greater than the water
-                # depth divided by 4 links, we reduce discharge to maintain
-                # stability.
-                (water_logical,) = np.where(q_courant > water_div_4)
-                (water_abs_logical,) = np.where(abs(q_courant) > water_div_4)
-
-                # Where are these conditions met? For positive and negative q,
-                # there are specific rules to reduce q. This step finds where
-                # the discharge values are positive or negative and where
-                # discharge exceeds the Froude or Courant number.
-                self._if_statement_1 = np.intersect1d(positive_q, Froude_logical)
-                self._if_statement_2 = np.intersect1d(negative_q, Froude_abs_logical)
-                self._if_statement_3 = np.intersect1d(positive_q, water_logical)
-                self._if_statement_4 = np.intersect1d(negative_q, water_abs_logical)
-
-                # Rules 1 and 2 reduce discharge by the Froude number.
-                self._q[self._if_statement_1] = self._h_links[self._if_statement_1] * (
-                    np.sqrt(self._g * self._h_links[self._if_statement_1]) * Fr
+                # To prevent water from draining too fast for our time steps,
+                # reduce discharge where the Froude number is greater than
+                # one and where more than a quarter of the water at a link
+                # would drain in one time step.
+                _limit_discharge_at_links(
+                    links_to_update,
+                    self._h_links,
+                    self._g,
+                    self._grid.dx,
+                    self._dt,
+                    self._q,
                 )
 
-                self._q[self._if_statement_2] = 0.0 - (
-                    self._h_links[self._if_statement_2]
-                    * np.sqrt(self._g * self._h_links[self._if_statement_2])
-                    * Fr
+            if self._track_wet_front and self._rainfall_intensity == 0.0:
+                # Without rainfall, depths only change at the nodes of the
+                # front and at the other ends of its links.
+                _update_depth_at_nodes(
+                    self._front_nodes[self._front, : self._n_front[1]],
+                    self._grid.status_at_node,
+                    NodeStatus.CORE,
+                    self._grid.links_at_node,
+                    self._grid.link_dirs_at_node,
+                    self._grid.face_at_link,
+                    self._grid.length_of_face,
+                    self._grid.cell_at_node,
+                    self._grid.area_of_cell,
+                    self._q,
+                    self._dt,
+                    self._h_init if self._steep_slopes else -np.inf,
+                    self._h_init * 10.0 ** -3,
+                    self._h,
                 )
-
-                # Rules 3 and 4 reduce discharge by the Courant number.
-                self._q[self._if_statement_3] = (
-                    (self._h_links[self._if_statement_3] * self._grid.dx) / 5.0
-                ) / self._dt
-
-                self._q[self._if_statement_4] = (
-                    0.0
-                    - (self._h_links[self._if_statement_4] * self._grid.dx / 5.0)
-                    / self._dt
+            else:
+                # Once stability has been restored, we calculate the change
+                # in water depths on all core nodes by finding the difference
+                # between inputs (rainfall) and the inputs/outputs (flux
+                # divergence of discharge)
+                self._grid.calc_flux_div_at_node(self._q, out=self._flux_div)
+                np.subtract(self._rainfall_intensity, self._flux_div, out=self._dhdt)
+
+                # Updating our water depths...
+                self._h[self._core_nodes] = (
+                    self._h[self._core_nodes] + self._dhdt[self._core_nodes] * self._dt
                 )
 
-            # Once stability has been restored, we calculate the change in
-            # water depths on all core nodes by finding the difference between
-            # inputs (rainfall) and the inputs/outputs (flux divergence of
-            # discharge)
-            self._dhdt = self._rainfall_intensity - self._grid.calc_flux_div_at_node(
-                self._q
-            )
-
-            # Updating our water depths...
-            self._h[self._core_nodes] = (
-                self._h[self._core_nodes] + self._dhdt[self._core_nodes] * self._dt
-            )
-
-            # To prevent divide by zero errors, a minimum threshold water depth
-            # must be maintained. To reduce mass imbalances, this is set to
-            # find locations where water depth is smaller than h_init (default
-            # is 0.001) and the new value is self._h_init * 10^-3. This was set
-            # as it showed the smallest amount of mass creation in the grid
-            # during testing.
-            if self._steep_slopes is True:
-                self._h[self._h < self._h_init] = self._h_init * 10.0 ** -3
+                # To prevent divide by zero errors, a minimum threshold water
+                # depth must be maintained. To reduce mass imbalances, this is
+                # set to find locations where water depth is smaller than
+                # h_init (default is 0.001) and the new value is
+                # self._h_init * 10^-3. This was set as it showed the smallest
+                # amount of mass creation in the grid during testing.
+                if self._steep_slopes is True:
+                    self._h[self._h < self._h_init] = self._h_init * 10.0 ** -3
+
+            # Water can only have moved between nodes of the old front so
+            # the new front is found by searching near the old one.
+            if self._track_wet_front:
+                self._update_wet_front()
 
             # And reset our field values with the newest water depth and
             # discharge.
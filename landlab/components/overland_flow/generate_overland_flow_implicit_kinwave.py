@@ -7,13 +7,15 @@ Created on Fri May 27 14:26:13 2016
 @author: gtucker
 """
 
+import time
 
 import numpy as np
-from scipy.optimize import newton
 
-from landlab import Component
+from landlab import Component, NodeStatus
 from landlab.components import FlowAccumulator
 
+from .cfuncs import _route_implicit_kinwave
+
 
 def water_fn(x, a, b, c, d, e):
     r"""Evaluates the solution to the water-depth equation.
@@ -131,8 +133,10 @@ class KinwaveImplicitOverlandFlow(Component):
     When we combine these equations, we have an equation that includes the
     unknown :math:`H^{t+1}` and a bunch of terms that are known.
     If :math:`w\ne 0`, it is a nonlinear equation in :math:`H^{t+1}`,
-    and must be solved iteratively. We do this using a root-finding
-    method in the scipy.optimize library.
+    and must be solved iteratively. We do this using Newton's method,
+    falling back to bisection for nodes where it fails to converge. The
+    upstream-to-downstream sweep is compiled; the time it takes is given
+    by the *solve_time* property.
 
     Examples
     --------
@@ -265,6 +269,8 @@ class KinwaveImplicitOverlandFlow(Component):
         # Flag to let us know whether this is our first iteration
         self._first_iteration = True
 
+        self._solve_time = 0.0
+
     @property
     def runoff_rate(self):
         """Runoff rate.
@@ -296,6 +302,11 @@ class KinwaveImplicitOverlandFlow(Component):
         """The depth of water at each node."""
         return self._depth
 
+    @property
+    def solve_time(self):
+        """Time, in seconds, taken to solve for depth in the last step."""
+        return self._solve_time
+
     def run_one_step(self, dt):
         """Calculate water flow for a time period `dt`."""
 
@@ -326,63 +337,53 @@ class KinwaveImplicitOverlandFlow(Component):
                         self._grid.face_at_link[self._flow_lnks[:, i]]
                     ]
                 )
-
-            # Calculate values of alpha, which is defined as
-            #
-            #   $\alpha = \frac{\Sigma W S^{1/2} \Delta t}{A C_r}$
-            cores = self._grid.core_nodes
-            self._alpha[cores] = (
-                self._vel_coef
-                * self._grad_width_sum[cores]
-                * dt
-                / (self._grid.area_of_cell[self._grid.cell_at_node[cores]])
-            )
+            self._first_iteration = False
+
+        # Calculate values of alpha, which is defined as
+        #
+        #   $\alpha = \frac{\Sigma W S^{1/2} \Delta t}{A C_r}$
+        cores = self._grid.core_nodes
+        self._alpha[cores] = (
+            self._vel_coef
+            * self._grad_width_sum[cores]
+            * dt
+            / (self._grid.area_of_cell[self._grid.cell_at_node[cores]])
+        )
 
         # Zero out inflow discharge
         self._disch_in[:] = 0.0
 
-        # Upstream-to-downstream loop
-        for i in range(len(self._nodes_ordered) - 1, -1, -1):
-            n = self._nodes_ordered[i]
-            if self._grid.status_at_node[n] == 0:
-
-                # Solve for new water depth
-                aa = self._alpha[n]
-                cc = self._depth[n]
-                ee = (dt * self._runoff_rate) + (
-                    dt
-                    * self._disch_in[n]
-                    / self._grid.area_of_cell[self._grid.cell_at_node[n]]
-                )
-                self._depth[n] = newton(
-                    water_fn,
-                    self._depth[n],
-                    args=(aa, self._weight, cc, self._depth_exp, ee),
-                )
-
-                # Calc outflow
-                Heff = self._weight * self._depth[n] + (1.0 - self._weight) * cc
-                outflow = (
-                    self._vel_coef * (Heff ** self._depth_exp) * self._grad_width_sum[n]
-                )  # this is manning/chezy/darcy
-
-                # Send flow downstream. Here we take total inflow discharge
-                # and partition it among the node's neighbors. For this, we use
-                # the flow director's "proportions" array, which contains, for
-                # each node, the proportion of flow that heads out toward each
-                # of its N neighbors. The proportion is zero if the neighbor is
-                # uphill; otherwise, it is S^1/2 / sum(S^1/2). If for example
-                # we have a raster grid, there will be four neighbors and four
-                # proportions, some of which may be zero and some between 0 and
-                # 1.
-                self._disch_in[self._grid.adjacent_nodes_at_node[n]] += (
-                    outflow * self._flow_accum.flow_director._proportions[n]
-                )
+        # Upstream-to-downstream sweep. Depth at each node is found by
+        # solving the implicit equation (see water_fn) and the resulting
+        # outflow is partitioned among the node's neighbors using the flow
+        # director's "proportions" array, which contains, for each node, the
+        # proportion of flow that heads out toward each of its N neighbors.
+        # The proportion is zero if the neighbor is uphill; otherwise, it is
+        # S^1/2 / sum(S^1/2).
+        start = time.perf_counter()
+        _route_implicit_kinwave(
+            self._nodes_ordered,
+            self._grid.status_at_node,
+            NodeStatus.CORE,
+            self._alpha,
+            self._grad_width_sum,
+            self._grid.cell_area_at_node,
+            self._grid.adjacent_nodes_at_node,
+            self._flow_accum.flow_director._proportions,
+            dt,
+            self._runoff_rate,
+            self._weight,
+            self._depth_exp,
+            self._vel_coef,
+            self._depth,
+            self._disch_in,
+        )
+        self._solve_time = time.perf_counter() - start
 
-                # TODO: the above is enough to implement the solution for flow
-                # depth, but it does not provide any information about flow
-                # velocity or discharge on links. This could be added as an
-                # optional method, perhaps done just before output.
+        # TODO: the above is enough to implement the solution for flow
+        # depth, but it does not provide any information about flow
+        # velocity or discharge on links. This could be added as an
+        # optional method, perhaps done just before output.
 
 
 if __name__ == "__main__":
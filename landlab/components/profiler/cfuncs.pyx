@@ -0,0 +1,210 @@
+import numpy as np
+cimport numpy as np
+cimport cython
+
+DTYPE_INT = int
+ctypedef np.int_t DTYPE_INT_t
+
+DTYPE_FLOAT = np.double
+ctypedef np.double_t DTYPE_FLOAT_t
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef int _extract_channel_segments(
+    const DTYPE_INT_t[:] outlets,
+    const DTYPE_INT_t[:] receivers,
+    const DTYPE_INT_t[:] donors,
+    const DTYPE_INT_t[:] donors_at_node,
+    const DTYPE_FLOAT_t[:] channel_definition,
+    double minimum_channel_threshold,
+    int main_channel_only,
+    const np.uint8_t[:] is_outlet,
+    DTYPE_INT_t[:] segment_offset,
+    DTYPE_INT_t[:] segment_outlet,
+    DTYPE_INT_t[:] nodes,
+    DTYPE_INT_t[:] queue,
+) nogil:
+    """Find channel segments; see :func:`extract_channel_segments`."""
+    cdef int n_outlets = outlets.shape[0]
+    cdef int max_segments = segment_outlet.shape[0]
+    cdef int max_nodes = nodes.shape[0]
+    cdef int max_queue = queue.shape[0]
+    cdef int n_segments = 0
+    cdef int n_nodes = 0
+    cdef int i, k, head, tail, outlet, start, node, donor, best, n_above
+    cdef double threshold = minimum_channel_threshold
+
+    segment_offset[0] = 0
+
+    for i in range(n_outlets):
+        outlet = outlets[i]
+        queue[0] = outlet
+        head = 0
+        tail = 1
+        while head < tail:
+            start = queue[head]
+            head += 1
+            if n_segments == max_segments:
+                return -1
+
+            if receivers[start] != start and not is_outlet[start]:
+                if n_nodes == max_nodes:
+                    return -1
+                nodes[n_nodes] = receivers[start]
+                n_nodes += 1
+
+            node = start
+            while True:
+                if n_nodes == max_nodes:
+                    return -1
+                nodes[n_nodes] = node
+                n_nodes += 1
+
+                # the donor with the largest value and the number of
+                # donors above the threshold, ignoring the start of the
+                # segment (which may be its own donor).
+                best = -1
+                n_above = 0
+                for k in range(donors_at_node[node], donors_at_node[node + 1]):
+                    donor = donors[k]
+                    if donor == start:
+                        continue
+                    if best < 0 or channel_definition[donor] > channel_definition[best]:
+                        best = donor
+                    if channel_definition[donor] > threshold:
+                        n_above += 1
+
+                if main_channel_only and best >= 0:
+                    if channel_definition[best] < threshold:
+                        break
+                    node = best
+                elif n_above == 0:
+                    break
+                elif n_above == 1:
+                    node = best
+                else:
+                    for k in range(donors_at_node[node], donors_at_node[node + 1]):
+                        donor = donors[k]
+                        if donor != start and channel_definition[donor] > threshold:
+                            if tail == max_queue:
+                                return -1
+                            queue[tail] = donor
+                            tail += 1
+                    break
+
+            segment_outlet[n_segments] = outlet
+            n_segments += 1
+            segment_offset[n_segments] = n_nodes
+
+    return n_segments
+
+
+def extract_channel_segments(
+    const DTYPE_INT_t[:] outlets,
+    const DTYPE_INT_t[:] receivers,
+    const DTYPE_INT_t[:] donors,
+    const DTYPE_INT_t[:] donors_at_node,
+    const DTYPE_FLOAT_t[:] channel_definition,
+    double minimum_channel_threshold,
+    int main_channel_only,
+    const np.uint8_t[:] is_outlet,
+    DTYPE_INT_t[:] segment_offset,
+    DTYPE_INT_t[:] segment_outlet,
+    DTYPE_INT_t[:] nodes,
+    DTYPE_INT_t[:] queue,
+):
+    """Walk upstream from outlets to find the segments of channel networks.
+
+    The segments draining to each outlet are found breadth first. A
+    segment starts at the receiver of its first node (unless that node is
+    an outlet) and continues upstream until it reaches a channel head or,
+    if *main_channel_only* is false, a junction of more than one channel.
+    If *main_channel_only* is true, segments always follow the donor with
+    the largest *channel_definition* and there is one segment per outlet.
+
+    Parameters
+    ----------
+    outlets : ndarray of int
+        Nodes at which to start channel networks.
+    receivers : ndarray of int, shape `(n_nodes, )`
+        Flow receiver of each node.
+    donors : ndarray of int, shape `(n_nodes, )`
+        Donors of each node, with those of each node in increasing order.
+    donors_at_node : ndarray of int, shape `(n_nodes + 1, )`
+        Offsets into *donors* of the donors of each node.
+    channel_definition : ndarray of float, shape `(n_nodes, )`
+        Value (typically drainage area) that defines channels.
+    minimum_channel_threshold : float
+        Value of *channel_definition* that a donor must exceed to be part
+        of a channel.
+    main_channel_only : int
+        Only follow the main channel upstream from each outlet.
+    is_outlet : ndarray of uint8, shape `(n_nodes, )`
+        Nodes that are outlets.
+    segment_offset : ndarray of int
+        Output array for the offsets into *nodes* of the nodes of each
+        segment, with one more element than the number of segments.
+    segment_outlet : ndarray of int
+        Output array for the outlet to which each segment drains.
+    nodes : ndarray of int
+        Output array for the nodes of each segment, ordered from downstream
+        to upstream.
+    queue : ndarray of int
+        Work array for segments yet to be walked.
+
+    Returns
+    -------
+    int
+        Number of segments, or -1 if an output or work array was too small.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.components.profiler.cfuncs import extract_channel_segments
+
+    Node 0 is an outlet where a channel from 1 is joined by channels from 2
+    and 3. Node 4 drains to node 3.
+
+    >>> receivers = np.array([0, 0, 1, 1, 3])
+    >>> donors = np.array([0, 1, 2, 3, 4])
+    >>> donors_at_node = np.array([0, 2, 4, 4, 5, 5])
+    >>> area = np.array([5.0, 4.0, 1.0, 2.0, 1.0])
+    >>> is_outlet = np.array([1, 0, 0, 0, 0], dtype=np.uint8)
+    >>> segment_offset = np.empty(10, dtype=int)
+    >>> segment_outlet = np.empty(10, dtype=int)
+    >>> nodes = np.empty(10, dtype=int)
+    >>> queue = np.empty(10, dtype=int)
+
+    >>> extract_channel_segments(
+    ...     np.array([0]), receivers, donors, donors_at_node, area, 0.0, 1,
+    ...     is_outlet, segment_offset, segment_outlet, nodes, queue,
+    ... )
+    1
+    >>> nodes[:segment_offset[1]]
+    array([0, 1, 3, 4])
+
+    >>> extract_channel_segments(
+    ...     np.array([0]), receivers, donors, donors_at_node, area, 0.0, 0,
+    ...     is_outlet, segment_offset, segment_outlet, nodes, queue,
+    ... )
+    3
+    >>> segment_offset[:4]
+    array([0, 2, 4, 7])
+    >>> nodes[:7]
+    array([0, 1, 1, 2, 1, 3, 4])
+    """
+    return _extract_channel_segments(
+        outlets,
+        receivers,
+        donors,
+        donors_at_node,
+        channel_definition,
+        minimum_channel_threshold,
+        main_channel_only,
+        is_outlet,
+        segment_offset,
+        segment_outlet,
+        nodes,
+        queue,
+    )
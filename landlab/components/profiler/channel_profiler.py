@@ -9,6 +9,7 @@ import numpy as np
 from matplotlib import cm
 
 from landlab.components.profiler.base_profiler import _BaseProfiler
+from landlab.components.profiler.cfuncs import extract_channel_segments
 from landlab.core.utils import as_id_array
 from landlab.utils.flow__distance import calculate_flow__distance
 
@@ -610,6 +611,7 @@ class ChannelProfiler(_BaseProfiler):
             raise ValueError(msg)
 
         self._outlet_nodes = outlet_nodes
+        self._data_struct_cache = None
 
     @property
     def data_structure(self):
@@ -633,150 +635,96 @@ class ChannelProfiler(_BaseProfiler):
         """
         return self._data_struct
 
-    def _get_channel_segment(self, i):
-        """Get channel segment and return additional nodes to process.
-
-        Parameters
-        ----------
-        i : int, required
-            Node id of start of channel segment.
-
-        Returns
-        ----------
-        channel_segment : list
-            Node IDs of the nodes in the current channel segment.
-        nodes_to_process, list
-            List of nodes to add to the processing queue. These nodes are those
-            that drain to the upper end of this channel segment. If
-            main_channel_only = False this will be an empty list.
-        """
-        j = i
-        channel_segment = []
-        channel_upstream = True
-
-        # add the reciever of j to the channel segment if it is not j.
-        # but only do this when j is not the watershed outlet.
-        recieving_node = self._flow_receiver[j]
-        if (recieving_node != j) and (j not in self._outlet_nodes):
-            channel_segment.append(recieving_node)
-
-        while channel_upstream:
-
-            # add the new node to the channel segment
-            channel_segment.append(j)
-
-            # get supplying nodes
-            supplying_nodes = np.where(self._flow_receiver == j)[0]
-
-            # remove supplying nodes that are the outlet node
-            supplying_nodes = supplying_nodes[np.where(supplying_nodes != i)]
-
-            # if only adding the biggest channel, continue upstream choosing the
-            # largest node until no more nodes remain.
-            if (self._main_channel_only) and (len(supplying_nodes) > 0):
-                max_drainage = np.argmax(
-                    self._channel_definition_field[supplying_nodes]
-                )
-
-                if (
-                    self._channel_definition_field[supplying_nodes[max_drainage]]
-                    < self._minimum_channel_threshold
-                ):
-                    nodes_to_process = []
-                    channel_upstream = False
-                else:
-                    j = supplying_nodes[max_drainage]
-
-            # if considering multiple channel segments, continue upstream until
-            # there are two or more donors with sufficient discharge, then
-            # break, returning those nodes as starting points.
-            else:
-
-                # get all upstream drainage areas
-                upstream_das = self._channel_definition_field[supplying_nodes]
-
-                # if no nodes upstream exceed the threshold, exit
-                if np.sum(upstream_das > self._minimum_channel_threshold) == 0:
-                    nodes_to_process = []
-                    channel_upstream = False
-
-                # otherwise
-                else:
-                    # if only one upstream node exceeds the threshold, proceed
-                    # up the channel.
-                    if np.sum(upstream_das > self._minimum_channel_threshold) == 1:
-                        max_drainage = np.argmax(
-                            self._channel_definition_field[supplying_nodes]
-                        )
-                        j = supplying_nodes[max_drainage]
-                    # otherwise provide the multiple upstream nodes to be
-                    # processed into a new channel.
-                    else:
-                        nodes_to_process = supplying_nodes[
-                            upstream_das > self._minimum_channel_threshold
-                        ]
-                        channel_upstream = False
-
-        return (channel_segment, nodes_to_process)
+    @property
+    def _data_struct(self):
+        """Nested dictionaries of the channel network, made when first used."""
+        if self._data_struct_cache is None:
+            self._data_struct_cache = OrderedDict(
+                (outlet_id, OrderedDict()) for outlet_id in self._unique_outlet_nodes
+            )
+            for outlet_id, ids, distances, color in zip(
+                self._segment_outlets,
+                self._nodes,
+                self._distance_along_profile,
+                self._colors,
+            ):
+                self._data_struct_cache[outlet_id][(ids[0], ids[-1])] = {
+                    "ids": ids,
+                    "distances": distances,
+                    "color": color,
+                }
+        return self._data_struct_cache
 
     def _create_profile_structure(self):
         """Create the profile_IDs data structure for channel network.
 
-        The bound attribute self._profile structure is the channel segment
-        datastructure. profile structure is a list of length
-        number_of_watersheds. Each element of profile_structure is itself a
-        list of length number of stream segments that drain to each of the
-        starting nodes. Each stream segment list contains the node ids of a
-        stream segment from downstream to upstream.
+        Segments of the channel networks of all watersheds are found in one
+        pass and stored as flat arrays: the node ids of every segment, one
+        after another, from downstream to upstream, the offsets of each
+        segment into these, and the outlet to which each segment drains.
+        The nested dictionaries of ``data_structure`` are only made from
+        these if they are asked for.
         """
-        self._data_struct = OrderedDict()
-
-        if self._main_channel_only:
-            for i in self._outlet_nodes:
-                (channel_segment, nodes_to_process) = self._get_channel_segment(i)
-                segment_tuple = (channel_segment[0], channel_segment[-1])
-                self._data_struct[i] = {
-                    segment_tuple: {"ids": as_id_array(channel_segment)}
-                }
+        self._data_struct_cache = None
 
-        else:
-            for i in self._outlet_nodes:
-                channel_network = OrderedDict()
-                queue = [i]
-                while len(queue) > 0:
-                    node_to_process = queue.pop(0)
-                    (channel_segment, nodes_to_process) = self._get_channel_segment(
-                        node_to_process
-                    )
-                    segment_tuple = (channel_segment[0], channel_segment[-1])
-                    channel_network[segment_tuple] = {
-                        "ids": as_id_array(channel_segment)
-                    }
-                    queue.extend(nodes_to_process)
-                self._data_struct[i] = channel_network
+        _, first = np.unique(self._outlet_nodes, return_index=True)
+        self._unique_outlet_nodes = as_id_array(self._outlet_nodes[np.sort(first)])
 
+        self._extract_segments()
         self._calculate_distances()
         self.assign_colors()
         self._create_flat_structures()
 
-    def _create_flat_structures(self):
-        """Create expected flattened structures for ids, distances, and colors."""
-        self._nodes = []
+    def _extract_segments(self):
+        """Find the segments of the channel networks as flat arrays."""
+        receivers = as_id_array(self._flow_receiver)
+        n_nodes = len(receivers)
+
+        donors = as_id_array(np.argsort(receivers, kind="stable"))
+        donors_at_node = np.zeros(n_nodes + 1, dtype=int)
+        np.cumsum(np.bincount(receivers, minlength=n_nodes), out=donors_at_node[1:])
+
+        is_outlet = np.zeros(n_nodes, dtype=np.uint8)
+        is_outlet[self._outlet_nodes] = 1
+
+        # networks of different outlets only overlap if outlets are nested,
+        # so these are almost always big enough.
+        max_segments = n_nodes + len(self._unique_outlet_nodes)
+        max_nodes = 2 * n_nodes + len(self._unique_outlet_nodes)
+        while True:
+            segment_offsets = np.empty(max_segments + 1, dtype=int)
+            segment_outlets = np.empty(max_segments, dtype=int)
+            nodes = np.empty(max_nodes, dtype=int)
+            queue = np.empty(n_nodes + 1, dtype=int)
+            n_segments = extract_channel_segments(
+                self._unique_outlet_nodes,
+                receivers,
+                donors,
+                donors_at_node,
+                np.asarray(self._channel_definition_field, dtype=float),
+                self._minimum_channel_threshold,
+                self._main_channel_only,
+                is_outlet,
+                segment_offsets,
+                segment_outlets,
+                nodes,
+                queue,
+            )
+            if n_segments >= 0:
+                break
+            max_segments *= 2
+            max_nodes *= 2
 
-        self._distance_along_profile = []
-        self._colors = []
+        self._segment_offsets = segment_offsets[: n_segments + 1]
+        self._segment_outlets = segment_outlets[:n_segments]
+        self._segment_nodes = nodes[: self._segment_offsets[-1]]
 
-        for outlet_id in self._data_struct:
-            seg_tuples = self._data_struct[outlet_id].keys()
-            self._nodes.extend(
-                [self._data_struct[outlet_id][seg]["ids"] for seg in seg_tuples]
-            )
-            self._distance_along_profile.extend(
-                [self._data_struct[outlet_id][seg]["distances"] for seg in seg_tuples]
-            )
-            self._colors.extend(
-                [self._data_struct[outlet_id][seg]["color"] for seg in seg_tuples]
-            )
+    def _create_flat_structures(self):
+        """Create expected flattened structures for ids, distances, and colors."""
+        self._nodes = np.split(self._segment_nodes, self._segment_offsets[1:-1])
+        self._distance_along_profile = np.split(
+            self._segment_distances, self._segment_offsets[1:-1]
+        )
 
     def assign_colors(self, color_mapping=None):
         """Assign a unique color for each watershed.
@@ -788,27 +736,27 @@ class ChannelProfiler(_BaseProfiler):
         """
 
         if color_mapping is None:
-            num_watersheds = len(self._data_struct)
+            num_watersheds = len(self._unique_outlet_nodes)
             norm = mpl.colors.Normalize(vmin=0, vmax=num_watersheds)
             mappable = cm.ScalarMappable(norm=norm, cmap=self._cmap)
             color_mapping = {
                 outlet_id: mappable.to_rgba(idx)
-                for idx, outlet_id in enumerate(self._data_struct)
+                for idx, outlet_id in enumerate(self._unique_outlet_nodes)
             }
 
-        for outlet_id in self._data_struct:
-            for segment_tuple in self._data_struct[outlet_id]:
-                self._data_struct[outlet_id][segment_tuple]["color"] = color_mapping[
-                    outlet_id
-                ]
+        self._colors = [color_mapping[outlet_id] for outlet_id in self._segment_outlets]
+
+        if self._data_struct_cache is not None:
+            for outlet_id in self._data_struct_cache:
+                for segment_tuple in self._data_struct_cache[outlet_id]:
+                    self._data_struct_cache[outlet_id][segment_tuple][
+                        "color"
+                    ] = color_mapping[outlet_id]
 
     def _calculate_distances(self):
         """Get distances along the network data structure."""
         distance_upstream = calculate_flow__distance(self._grid)
-        for outlet_id in self._data_struct:
-            offset = distance_upstream[outlet_id]
-
-            for segment_tuple in self._data_struct[outlet_id]:
-                ids = self._data_struct[outlet_id][segment_tuple]["ids"]
-                d = distance_upstream[ids]
-                self._data_struct[outlet_id][segment_tuple]["distances"] = d - offset
+        offset = np.repeat(
+            distance_upstream[self._segment_outlets], np.diff(self._segment_offsets)
+        )
+        self._segment_distances = distance_upstream[self._segment_nodes] - offset
@@ -4,6 +4,7 @@ cimport cython
 
 cdef extern from "math.h":
     double exp(double x) nogil
+    double log(double x) nogil
 
 DTYPE_FLOAT = np.double
 ctypedef np.double_t DTYPE_FLOAT_t
@@ -12,46 +13,116 @@ DTYPE_INT = int
 ctypedef np.int_t DTYPE_INT_t
 
 
-def calculate_qs_in(np.ndarray[DTYPE_INT_t, ndim=1] stack_flip_ud,
-                    np.ndarray[DTYPE_INT_t, ndim=1] flow_receivers,
-                    np.ndarray[DTYPE_FLOAT_t, ndim=1] cell_area_at_node,
-                    np.ndarray[DTYPE_FLOAT_t, ndim=1] q,
-                    np.ndarray[DTYPE_FLOAT_t, ndim=1] qs,
-                    np.ndarray[DTYPE_FLOAT_t, ndim=1] qs_in,
-                    np.ndarray[DTYPE_FLOAT_t, ndim=1] Es,
-                    np.ndarray[DTYPE_FLOAT_t, ndim=1] Er,
-                    DTYPE_FLOAT_t v_s,
-                    DTYPE_FLOAT_t F_f):
-    """Calculate and qs and qs_in."""
-    # define internal variables
-    cdef unsigned int n_nodes = stack_flip_ud.shape[0]
-    cdef unsigned int node_id
-    cdef unsigned int i
-
-    # iterate top to bottom through the stack, calculate qs and adjust  qs_in
-    for i in range(n_nodes):
-
-        # choose the node id
-        node_id = stack_flip_ud[i]
-
-        # If q at current node is greather than zero, calculate qs based on a
-        # local analytical solution. This local analytical solution depends on
-        # qs_in, the sediment flux coming into the node from upstream (hence
-        # the upstream to downstream node ordering).
-
-        # Because calculation of qs requires qs_in, this operation must be done
-        # in an upstream to downstream loop, and cannot be vectorized.
-
-        # there is water flux (q) and this node is not a pit then calculate qs.
-        if q[node_id] > 0 and (flow_receivers[node_id] != node_id):
-            qs[node_id] = (qs_in[node_id] + ((Es[node_id]) + ((1.0 - F_f) * (Er[node_id]))) * cell_area_at_node[node_id]) / \
-                            (1.0 + (v_s * cell_area_at_node[node_id] / (q[node_id])))
-
-            # finally, add this nodes qs to recieiving nodes qs_in.
-            # if qs[node_id] == 0, then there is no need for this line to be
-            # evaluated.
-            qs_in[flow_receivers[node_id]] += qs[node_id]
+cdef inline double _bedrock_lowering_rate(
+    double t, double a, double b, double c, double d, double H0
+) nogil:
+    """Rate of bedrock lowering, dR/dt, at time t (see space._dRdt)."""
+    cdef double bH0 = b * H0
+    cdef bint too_thick = bH0 > 100.0
+    cdef double H, term1, term2, term3
 
+    if too_thick:
+        bH0 = 100.0
+
+    if d <= 0.0:
+        H = H0 + c * t
+    elif c == d:
+        if too_thick:
+            H = H0
         else:
-            # if q at the current node is zero, set qs at that node is zero.
-            qs[node_id] = 0
+            H = (1.0 / b) * log(d * b * t + exp(bH0))
+    elif too_thick:
+        H = H0 + (c - d) * t
+    else:
+        term1 = 1.0 / ((c / d) - 1.0)
+        term2 = exp((c - d) * t * b)
+        term3 = (c / d - 1.0) * exp(bH0) + 1.0
+        H = (1.0 / b) * log(term1 * (term2 * term3 - 1.0))
+
+    return -a * exp(-b * H)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def integrate_bedrock_lowering_rate(
+    const DTYPE_INT_t[:] nodes,
+    const DTYPE_FLOAT_t[:] a,
+    double b,
+    const DTYPE_FLOAT_t[:] c,
+    const DTYPE_FLOAT_t[:] d,
+    const DTYPE_FLOAT_t[:] H0,
+    double dt,
+    const DTYPE_FLOAT_t[:] abscissas,
+    const DTYPE_FLOAT_t[:] weights,
+    int n_panels,
+    DTYPE_FLOAT_t[:] out,
+):
+    """Integrate the rate of bedrock lowering over a time step.
+
+    The integral, from 0 to *dt*, is calculated for each of *nodes* with a
+    composite Gauss-Legendre quadrature rule of fixed order.
+
+    Parameters
+    ----------
+    nodes : ndarray of int
+        Nodes to integrate at.
+    a : ndarray of float
+        Bedrock erosion term at each node.
+    b : float
+        Inverse of the sediment entrainment length scale.
+    c : ndarray of float
+        Deposition rate (divided by one less porosity) at each node.
+    d : ndarray of float
+        Sediment erosion term (divided by one less porosity) at each node.
+    H0 : ndarray of float
+        Sediment thickness at the start of the time step.
+    dt : float
+        Time step.
+    abscissas, weights : ndarray of float
+        Gauss-Legendre abscissas and weights on [-1, 1].
+    n_panels : int
+        Number of equal panels the time step is divided into.
+    out : ndarray of float
+        Integral at each of *nodes*.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.components.space.cfuncs import (
+    ...     integrate_bedrock_lowering_rate,
+    ... )
+    >>> x, w = np.polynomial.legendre.leggauss(8)
+    >>> a = np.array([1.0, 1.0])
+    >>> c = np.array([0.0, 1.0])
+    >>> d = np.array([0.0, 0.0])
+    >>> H0 = np.array([0.0, 0.0])
+    >>> out = np.zeros(2)
+    >>> integrate_bedrock_lowering_rate(
+    ...     np.array([0, 1]), a, 1.0, c, d, H0, 1.0, x, w, 4, out
+    ... )
+    >>> np.round(out, 6)
+    array([-1.      , -0.632121])
+    """
+    cdef int n_nodes = nodes.shape[0]
+    cdef int order = abscissas.shape[0]
+    cdef double half_width = 0.5 * dt / n_panels
+    cdef int n, node, panel, k
+    cdef double total, center
+
+    with nogil:
+        for n in range(n_nodes):
+            node = nodes[n]
+            total = 0.0
+            for panel in range(n_panels):
+                center = (2 * panel + 1) * half_width
+                for k in range(order):
+                    total += weights[k] * _bedrock_lowering_rate(
+                        center + half_width * abscissas[k],
+                        a[node],
+                        b,
+                        c[node],
+                        d[node],
+                        H0[node],
+                    )
+            out[n] = total * half_width
@@ -1,5 +1,4 @@
 import numpy as np
-from scipy.integrate import quad
 
 from landlab.components.erosion_deposition.generalized_erosion_deposition import (
     DEFAULT_MINIMUM_TIME_STEP,
@@ -7,10 +6,12 @@ from landlab.components.erosion_deposition.generalized_erosion_deposition import
 )
 from landlab.utils.return_array import return_array_at_node
 
-from .cfuncs import calculate_qs_in
+from .cfuncs import integrate_bedrock_lowering_rate
 
 ROOT2 = np.sqrt(2.0)  # syntactic sugar for precalculated square root of 2
 TIME_STEP_FACTOR = 0.5  # factor used in simple subdivision solver
+QUADRATURE_ORDER = 16  # order of the fallback bedrock-lowering quadrature
+QUADRATURE_PANELS = 32  # number of panels of the fallback quadrature
 
 
 class Space(_GeneralizedErosionDeposition):
@@ -310,7 +311,6 @@ class Space(_GeneralizedErosionDeposition):
             raise ValueError("Porosity must be > 0.0")
 
         self._phi = float(phi)
-        self._porosity_factor = 1.0 / (1.0 - self._phi)
 
         # space specific inits
         self._H_star = H_star
@@ -337,17 +337,18 @@ class Space(_GeneralizedErosionDeposition):
         self.K_sed = K_sed
         self.K_br = K_br
 
-        self._sp_crit_sed = return_array_at_node(grid, sp_crit_sed)
-        self._sp_crit_br = return_array_at_node(grid, sp_crit_br)
+        self._sp_crit_sed = np.asarray(
+            return_array_at_node(grid, sp_crit_sed), dtype=float
+        )
+        self._sp_crit_br = np.asarray(return_array_at_node(grid, sp_crit_br), dtype=float)
 
         # Handle option for solver
         if solver == "basic":
             self.run_one_step = self.run_one_step_basic
         elif solver == "adaptive":
             self.run_one_step = self.run_with_adaptive_time_step_solver
-            self._time_to_flat = np.zeros(grid.number_of_nodes)
-            self._time_to_zero_alluv = np.zeros(grid.number_of_nodes)
             self._dzdt = np.zeros(grid.number_of_nodes)
+            self._dHdt = np.zeros(grid.number_of_nodes)
         else:
             raise ValueError(
                 "Parameter 'solver' must be one of: " + "'basic', 'adaptive'"
@@ -360,7 +361,7 @@ class Space(_GeneralizedErosionDeposition):
 
     @K_br.setter
     def K_br(self, new_val):
-        self._K_br = return_array_at_node(self._grid, new_val)
+        self._K_br = np.asarray(return_array_at_node(self._grid, new_val), dtype=float)
 
     @property
     def K_sed(self):
@@ -369,46 +370,7 @@ class Space(_GeneralizedErosionDeposition):
 
     @K_sed.setter
     def K_sed(self, new_val):
-        self._K_sed = return_array_at_node(self._grid, new_val)
-
-    def _calc_erosion_rates(self):
-        """Calculate erosion rates."""
-        # if sp_crits are zero, then this colapses to correct all the time.
-        if self._n_sp == 1.0:
-            S_to_the_n = self._slope
-        else:
-            S_to_the_n = np.power(self._slope, self._n_sp)
-        omega_sed = self._K_sed * self._Q_to_the_m * S_to_the_n
-        omega_br = self._K_br * self._Q_to_the_m * S_to_the_n
-
-        omega_sed_over_sp_crit = np.divide(
-            omega_sed,
-            self._sp_crit_sed,
-            out=np.zeros_like(omega_sed),
-            where=self._sp_crit_sed != 0,
-        )
-
-        omega_br_over_sp_crit = np.divide(
-            omega_br,
-            self._sp_crit_br,
-            out=np.zeros_like(omega_br),
-            where=self._sp_crit_br != 0,
-        )
-
-        self._sed_erosion_term = omega_sed - self._sp_crit_sed * (
-            1.0 - np.exp(-omega_sed_over_sp_crit)
-        ) / (
-            1 - self._phi
-        )  # convert from a volume to a mass flux.
-
-        self._br_erosion_term = omega_br - self._sp_crit_br * (
-            1.0 - np.exp(-omega_br_over_sp_crit)
-        )
-
-        H_over_Hstar = self._soil__depth / self._H_star
-        self._Es = self._sed_erosion_term * (1.0 - np.exp(-H_over_Hstar))
-
-        self._Er = self._br_erosion_term * np.exp(-H_over_Hstar)
+        self._K_sed = np.asarray(return_array_at_node(self._grid, new_val), dtype=float)
 
     @property
     def Es(self):
@@ -425,49 +387,28 @@ class Space(_GeneralizedErosionDeposition):
         """Sediment thickness."""
         return self._H
 
-    def _calc_qs_in_and_depo_rate(self):
-
-        # Choose a method for calculating erosion:
-        self._calc_hydrology()
-        self._calc_erosion_rates()
-
-        is_flooded_core_node = self._get_flooded_core_nodes()
+    def _calc_qs_in_and_depo_rate(self, **kwds):
+        """Calculate erosion, sediment flux and deposition rates.
 
-        self._Es[is_flooded_core_node] = 0.0
-        self._Er[is_flooded_core_node] = 0.0
-
-        self._sed_erosion_term[is_flooded_core_node] = 0.0
-        self._br_erosion_term[is_flooded_core_node] = 0.0
-
-        self._qs_in[:] = 0
-        self._depo_rate[:] = 0.0
-
-        # iterate top to bottom through the stack, calculate qs
-        # cythonized version of calculating qs_in
-        calculate_qs_in(
-            np.flipud(self._stack),
-            self._flow_receivers,
-            self._cell_area_at_node,
-            self._q,
-            self._qs,
-            self._qs_in,
-            self._Es,
-            self._Er,
-            self._v_s,
-            self._F_f,
-        )
-
-        self._depo_rate[self._q > 0] = self._qs[self._q > 0] * (
-            self._v_s / self._q[self._q > 0]
+        Erosion is split into sediment entrainment and bedrock erosion by
+        the sediment cover. Any keywords, for finding a stable time step,
+        are passed on to ``_calc_sediment_budget``.
+        """
+        return self._calc_sediment_budget(
+            K_br=self._K_br,
+            sp_crit_br=self._sp_crit_br,
+            Er=self._Er,
+            br_erosion_term=self._br_erosion_term,
+            K_sed=self._K_sed,
+            sp_crit_sed=self._sp_crit_sed,
+            soil_depth=self._soil__depth,
+            H_star=self._H_star,
+            phi=self._phi,
+            sed_erosion_term=self._sed_erosion_term,
+            Es=self._Es,
+            **kwds
         )
 
-        if not self._depressions_are_handled():  # all sed dropped here
-            self._depo_rate[is_flooded_core_node] = (
-                self._qs_in[is_flooded_core_node]
-                / self._cell_area_at_node[is_flooded_core_node]
-            )
-        return is_flooded_core_node
-
     def run_one_step_basic(self, dt=1.0):
         """Calculate change in rock and alluvium thickness for a time period
         'dt'.
@@ -573,22 +514,17 @@ class Space(_GeneralizedErosionDeposition):
         # include dH/dt within timestep in integrating for R.
         # This matters when we are starting with very little soil and increasing.
 
-        # to do this right I think we need a numerical integral for
-        # R(t). Unfortunately we have three cases for H(t). These are now
-        # implemented in the function _dRdt. This loop and the solver can be
-        # cythonized. But not today.
-
+        # to do this right we need an integral for R(t). We have three cases
+        # for H(t), each of which can be integrated analytically.
         dR = self._grid.zeros(at="node")
-        for idx in self.grid.core_nodes:
-            args = (
-                self._br_erosion_term[idx],
-                1.0 / self._H_star,
-                self._depo_rate[idx] / (1.0 - self._phi),
-                self._sed_erosion_term[idx] / (1.0 - self._phi),
-                H0[idx],
-            )
-
-            dR[idx] = quad(_dRdt, 0, dt, args)[0]
+        dR[cores] = _calc_bedrock_lowering(
+            self._br_erosion_term[cores],
+            1.0 / self._H_star,
+            self._depo_rate[cores] / (1.0 - self._phi),
+            self._sed_erosion_term[cores] / (1.0 - self._phi),
+            H0[cores],
+            dt,
+        )
 
         self._bedrock__elevation += dR
 
@@ -643,13 +579,10 @@ class Space(_GeneralizedErosionDeposition):
         z = self._grid.at_node["topographic__elevation"]
         br = self._grid.at_node["bedrock__elevation"]
         H = self._grid.at_node["soil__depth"]
-        r = self._flow_receivers
         cores = self._grid.core_nodes
 
         first_iteration = True
 
-        is_flooded_core_node = self._get_flooded_core_nodes()
-
         # Outer WHILE loop: keep going until time is used up
         while remaining_time > 0.0:
 
@@ -661,58 +594,149 @@ class Space(_GeneralizedErosionDeposition):
             if not first_iteration:
                 # update the link slopes
                 self._update_flow_link_slopes()
-                # update where nodes are flooded. This shouuldn't happen because
-                # of the dynamic timestepper, but just in case, we update here.
-                is_flooded_core_node[self._slope < 0] = True
             else:
                 first_iteration = False
 
-            is_flooded_core_node = (
-                self._calc_qs_in_and_depo_rate()
-            )  # THIS IS THE SPEED BOTTLENECK
-
-            # Now look at upstream-downstream node pairs, and recording the
-            # time it would take for each pair to flatten. Take the minimum.
-            self._dzdt[cores] = self._depo_rate[cores] * self._porosity_factor - (
-                self._Es[cores] + self._Er[cores]
+            # In the same pass that finds erosion and deposition, find the
+            # rates of change of elevation and alluvium thickness, the time
+            # it would take for each upstream-downstream node pair to flatten
+            # and the time to exhaust regolith. The maximum stable time step
+            # is the shortest of these.
+            dt_max = self._calc_qs_in_and_depo_rate(
+                z=z,
+                dzdt=self._dzdt,
+                dHdt=self._dHdt,
+                max_dt=remaining_time,
+                time_step_factor=TIME_STEP_FACTOR,
             )
-            rocdif = self._dzdt - self._dzdt[r]
-            zdif = z - z[r]
-            self._time_to_flat[:] = remaining_time
+            dt_max = max(self._dt_min, dt_max)
 
-            converging = np.where(rocdif < 0.0)[0]
-            self._time_to_flat[converging] = -(
-                TIME_STEP_FACTOR * zdif[converging] / rocdif[converging]
-            )
-            self._time_to_flat[np.where(zdif <= 0.0)[0]] = remaining_time
+            # Now a vector operation: apply dzdt and dhdt to all nodes
+            br[cores] -= self._Er[cores] * dt_max
+            H[cores] += self._dHdt[cores] * dt_max
+            z[cores] = br[cores] + H[cores]
 
-            # From this, find the maximum stable time step with regard to slope
-            # evolution.
-            dt_max1 = np.amin(self._time_to_flat)
+            # Update remaining time and continue
+            remaining_time -= dt_max
 
-            # Next we consider time to exhaust regolith
-            self._time_to_zero_alluv[:] = remaining_time
 
-            # poof deposition by phi
-            dHdt = self._porosity_factor * (self._depo_rate - self._Es)
-            decreasing_H = np.where(dHdt < 0.0)[0]
-            self._time_to_zero_alluv[decreasing_H] = -(
-                TIME_STEP_FACTOR * H[decreasing_H] / dHdt[decreasing_H]
-            )
+def _calc_bedrock_lowering(a, b, c, d, H0, dt):
+    """Change in bedrock elevation over a time step.
 
-            # Now find the smallest time that would lead to near-empty alluv
-            dt_max2 = np.amin(self._time_to_zero_alluv)
+    Integrate :func:`_dRdt` from 0 to *dt*. Each of the three cases for
+    the evolution of sediment thickness, H(t), is integrated analytically,
 
-            # Take the smaller of the limits
-            dt_max = max(self._dt_min, min(dt_max1, dt_max2))
+    * when there is no entrainment (or when sediment is very thick), H
+      changes linearly and dR = -a exp(-b H0) (1 - exp(-b k dt)) / (b k),
+      where k is the rate of change of H,
+    * when deposition balances entrainment,
+      dR = -a / (b d) ln(1 + b d dt exp(-b H0)),
+    * otherwise,
+      dR = -a / (b d) ln(1 + (1 - exp(-b (c - d) dt)) exp(-b H0) d / (c - d)).
 
-            # Now a vector operation: apply dzdt and dhdt to all nodes
-            br[cores] -= self._Er[cores] * dt_max
-            H[cores] += dHdt[cores] * dt_max
-            z[cores] = br[cores] + H[cores]
+    These are evaluated so as not to overflow or lose precision when the
+    exponentials are very large or very small.
 
-            # Update remaining time and continue
-            remaining_time -= dt_max
+    Where these aren't finite (for out-of-range parameters, say), the
+    integral is calculated with a fixed-order Gauss-Legendre quadrature.
+
+    Parameters
+    ----------
+    a : array_like
+        Bedrock erosion term.
+    b : float
+        Inverse of the sediment entrainment length scale, 1 / H*.
+    c : array_like
+        Deposition rate divided by one less porosity.
+    d : array_like
+        Sediment erosion term divided by one less porosity.
+    H0 : array_like
+        Sediment thickness at the start of the time step.
+    dt : float
+        Time step.
+
+    Returns
+    -------
+    ndarray
+        Change in bedrock elevation.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from scipy.integrate import quad
+    >>> from landlab.components.space.space import _calc_bedrock_lowering, _dRdt
+
+    >>> a = np.array([0.01, 0.01, 0.01, 0.01])
+    >>> c = np.array([0.02, 0.02, 0.02, 0.02])
+    >>> d = np.array([0.0, 0.02, 0.05, 0.01])
+    >>> H0 = np.array([0.5, 0.5, 0.5, 200.0])
+    >>> dR = _calc_bedrock_lowering(a, 2.0, c, d, H0, 10.0)
+    >>> expected = [
+    ...     quad(_dRdt, 0, 10.0, args)[0] for args in zip(a, [2.0] * 4, c, d, H0)
+    ... ]
+    >>> np.allclose(dR, expected, rtol=1e-12, atol=0.0)
+    True
+    """
+    a, c, d, H0 = np.broadcast_arrays(
+        *[np.asarray(value, dtype=float) for value in (a, c, d, H0)]
+    )
+    bH0 = b * H0
+    dR = np.empty_like(a)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        # H changes linearly with time: no entrainment, or very thick
+        # sediment. Factor out exp(-b H) at the thinnest H so nothing
+        # overflows.
+        linear = (d <= 0.0) | (bH0 > 100.0)
+        rate = np.where(d <= 0.0, c, c - d)[linear]
+        bkdt = b * np.abs(rate) * dt
+        H_min = H0[linear] + np.minimum(rate, 0.0) * dt
+        dR[linear] = (
+            -a[linear]
+            * np.exp(-b * H_min)
+            * np.where(bkdt == 0.0, dt, -np.expm1(-bkdt) / (b * np.abs(rate)))
+        )
+
+        # deposition balances entrainment
+        balanced = ~linear & (c == d)
+        dR[balanced] = (
+            -a[balanced]
+            / (b * d[balanced])
+            * np.log1p(b * d[balanced] * dt * np.exp(-bH0[balanced]))
+        )
+
+        # the full equation, dR = -a / (b d) ln(1 + x), with x evaluated
+        # through its logarithm as it can be very large or very small.
+        full = ~linear & (c != d)
+        s = b * (d[full] - c[full]) * dt
+        log_x = (
+            -bH0[full]
+            + np.log(d[full])
+            - np.log(np.abs(d[full] - c[full]))
+            + np.where(s > 0.0, s + np.log(-np.expm1(-s)), np.log(-np.expm1(s)))
+        )
+        dR[full] = -a[full] / (b * d[full]) * np.logaddexp(0.0, log_x)
+
+    not_finite = np.flatnonzero(~np.isfinite(dR))
+    if len(not_finite) > 0:
+        abscissas, weights = np.polynomial.legendre.leggauss(QUADRATURE_ORDER)
+        integral = np.empty(len(not_finite))
+        integrate_bedrock_lowering_rate(
+            not_finite,
+            a.ravel(),
+            b,
+            c.ravel(),
+            d.ravel(),
+            H0.ravel(),
+            dt,
+            abscissas,
+            weights,
+            QUADRATURE_PANELS,
+            integral,
+        )
+        dR.flat[not_finite] = integral
+
+    return dR
 
 
 def _dRdt(t, a, b, c, d, H0):
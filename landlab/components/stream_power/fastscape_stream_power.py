@@ -8,10 +8,12 @@
 
 import numpy as np
 
-from landlab import Component, RasterModelGrid
+from landlab import Component
 from landlab.utils.return_array import return_array_at_node
 
 from ..depression_finder.lake_mapper import _FLOODED
+from ..flow_accum import FlowAccumulator
+from ..flow_accum.flow_link_cache import FlowLinkCache
 from .cfuncs import (
     brent_method_erode_fixed_threshold,
     brent_method_erode_variable_threshold,
@@ -196,6 +198,7 @@ class FastscapeEroder(Component):
         threshold_sp=0.0,
         discharge_field="drainage_area",
         erode_flooded_nodes=True,
+        flow_accumulator=None,
     ):
         """Initialize the Fastscape stream power component. Note: a timestep,
         dt, can no longer be supplied to this component through the input file.
@@ -224,6 +227,11 @@ class FastscapeEroder(Component):
             depression/lake mapper (e.g., DepressionFinderAndRouter). When set
             to false, the field *flood_status_code* must be present on the grid
             (this is created by the DepressionFinderAndRouter). Default True.
+        flow_accumulator : FlowAccumulator, optional
+            The FlowAccumulator that routes flow over the grid. If given, link
+            lengths are only recalculated when its *routing_version* changes;
+            otherwise they are recalculated whenever the links to receivers
+            differ from those of the previous step.
         """
         super().__init__(grid)
 
@@ -262,10 +270,29 @@ class FastscapeEroder(Component):
 
         self._A = return_array_at_node(grid, discharge_field)
 
+        if flow_accumulator is not None and not isinstance(
+            flow_accumulator, FlowAccumulator
+        ):
+            raise ValueError("flow_accumulator must be a FlowAccumulator.")
+        self._flow_links = FlowLinkCache(
+            grid, self._n, flow_accumulator=flow_accumulator
+        )
+
         # make storage variables
         self._A_to_the_m = grid.zeros(at="node")
+        self._A_of_A_to_the_m = None
         self._alpha = grid.empty(at="node")
 
+    @property
+    def routing_cache_hits(self):
+        """Number of steps that reused link lengths from the previous step."""
+        return self._flow_links.hits
+
+    @property
+    def routing_cache_misses(self):
+        """Number of steps that recalculated link lengths."""
+        return self._flow_links.misses
+
     @property
     def K(self):
         """Erodibility (units depend on m_sp)."""
@@ -300,29 +327,21 @@ class FastscapeEroder(Component):
         flow_receivers = self._grid["node"]["flow__receiver_node"]
         z = self._grid.at_node["topographic__elevation"]
 
-        defined_flow_receivers = np.not_equal(
-            self._grid.at_node["flow__link_to_receiver_node"], self._grid.BAD_INDEX
-        )
+        # link lengths only change with the routing, and A**m with discharge
+        self._flow_links.update()
+        defined_flow_receivers = self._flow_links.has_receiver
 
-        if isinstance(self._grid, RasterModelGrid):
-            flow_link_lengths = self._grid.length_of_d8[
-                self._grid.at_node["flow__link_to_receiver_node"][
-                    defined_flow_receivers
-                ]
-            ]
-        else:
-            flow_link_lengths = self._grid.length_of_link[
-                self._grid.at_node["flow__link_to_receiver_node"][
-                    defined_flow_receivers
-                ]
-            ]
+        if self._A_of_A_to_the_m is None or not np.array_equal(
+            self._A, self._A_of_A_to_the_m
+        ):
+            np.power(self._A, self._m, out=self._A_to_the_m)
+            self._A_of_A_to_the_m = self._A.copy()
 
-        np.power(self._A, self._m, out=self._A_to_the_m)
         self._alpha[defined_flow_receivers] = (
             self._K[defined_flow_receivers]
             * dt
             * self._A_to_the_m[defined_flow_receivers]
-            / (flow_link_lengths ** self._n)
+            / self._flow_links.length_to_the_n
         )
 
         # Handle flooded nodes, if any (no erosion there)
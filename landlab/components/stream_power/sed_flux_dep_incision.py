@@ -6,6 +6,21 @@ import scipy.constants
 from landlab import Component, MissingKeyError
 from landlab.utils.decorators import make_return_array_immutable
 
+from .cfuncs import (
+    SED_FLUX_ALMOST_PARABOLIC,
+    SED_FLUX_GENERALIZED_HUMPED,
+    SED_FLUX_LINEAR_DECLINE,
+    SED_FLUX_NONE,
+    route_sediment_dependent_incision,
+)
+
+_SED_FLUX_FN_TYPE = {
+    "generalized_humped": SED_FLUX_GENERALIZED_HUMPED,
+    "linear_decline": SED_FLUX_LINEAR_DECLINE,
+    "almost_parabolic": SED_FLUX_ALMOST_PARABOLIC,
+    "None": SED_FLUX_NONE,
+}
+
 
 class SedDepEroder(Component):
     """
@@ -233,6 +248,7 @@ class SedDepEroder(Component):
         return_stream_properties=False,
         # flooded node info
         flooded_depths=None,
+        compiled_routing=True,
     ):
         """Constructor for the class.
 
@@ -351,6 +367,10 @@ class SedDepEroder(Component):
             component will dynamically update this array as it fills nodes
             with sediment (...but does NOT update any other related lake
             fields).
+        compiled_routing : bool
+            If True (default), route sediment down the network with a
+            compiled kernel; otherwise use the (slower) pure-Python loop.
+            Both give the same results.
         """
         super().__init__(grid)
 
@@ -366,6 +386,7 @@ class SedDepEroder(Component):
                 raise NotImplementedError(msg)
         self._flooded_depths = flooded_depths
         self._pseudoimplicit_repeats = pseudoimplicit_repeats
+        self._compiled_routing = bool(compiled_routing)
 
         self._link_S_with_trailing_blank = np.zeros(grid.number_of_links + 1)
         # ^needs to be filled with values in execution
@@ -459,6 +480,13 @@ class SedDepEroder(Component):
             self._nt = n_t
 
         # now conditional inputs
+        # parameters of the sediment flux function for compiled routing
+        self._hump_params = (
+            float(kappa_hump),
+            float(nu_hump),
+            float(phi_hump),
+            float(c_hump),
+        )
         if self._type == "generalized_humped":
             self._kappa = kappa_hump
             self._nu = nu_hump
@@ -559,6 +587,10 @@ class SedDepEroder(Component):
         self._cell_areas.fill(np.mean(grid.area_of_cell))
         self._cell_areas[grid.node_at_cell] = grid.area_of_cell
 
+        # work arrays for routing sediment
+        self._sed_into_node = np.zeros(grid.number_of_nodes)
+        self._dz = np.zeros(grid.number_of_nodes)
+
         # set up the necessary fields:
         self.initialize_output_fields()
         if self._return_ch_props:
@@ -681,6 +713,189 @@ class SedDepEroder(Component):
         sed_flux_out = rel_sed_flux * trans_cap_vol_out
         return dz, sed_flux_out, rel_sed_flux, error_in_sed_flux_fn
 
+    def _route_sediment(
+        self,
+        s_in,
+        flow_receiver,
+        transport_capacities,
+        erosion_prefactors,
+        erosion_scale,
+        dt_this_step,
+        rel_sed_flux,
+        flooded_depths=None,
+        was_flooded=None,
+    ):
+        """Route sediment down the network, incising and depositing.
+
+        Nodes are worked through from upstream to downstream. The incision
+        over the step at a node, before the sediment flux function is
+        applied, is ``erosion_scale * erosion_prefactors``.
+
+        Parameters
+        ----------
+        s_in : ndarray of int
+            Nodes ordered downstream to upstream.
+        flow_receiver : ndarray of int
+            Receiver of each node.
+        transport_capacities : ndarray of float
+            Volumetric transport capacity at each node.
+        erosion_prefactors : ndarray of float
+            Incision at each node, in units of *erosion_scale*.
+        erosion_scale : float
+            Factor to convert *erosion_prefactors* to incision over the step.
+        dt_this_step : float
+            Duration of the step, in seconds.
+        rel_sed_flux : ndarray of float
+            Output array for the sediment flux relative to capacity.
+        flooded_depths : ndarray of float, optional
+            Depths of flooding, updated as nodes fill with sediment.
+        was_flooded : ndarray of bool, optional
+            Nodes flooded at the start of the step, which pass on sediment
+            in excess of filling their lake even once filled.
+
+        Returns
+        -------
+        (sed_into_node, dz) : tuple of ndarray of float
+            Volume of sediment entering each node, and change in elevation.
+        """
+        if self._compiled_routing and self._type in _SED_FLUX_FN_TYPE:
+            if was_flooded is not None:
+                was_flooded = np.asarray(was_flooded, dtype=bool).view(np.uint8)
+            bad_node = route_sediment_dependent_incision(
+                s_in,
+                flow_receiver,
+                self._cell_areas,
+                transport_capacities,
+                np.asarray(erosion_prefactors, dtype=float),
+                erosion_scale,
+                dt_this_step,
+                _SED_FLUX_FN_TYPE[self._type],
+                *self._hump_params,
+                self._pseudoimplicit_repeats,
+                self._sed_into_node,
+                self._dz,
+                rel_sed_flux,
+                flooded_depths=flooded_depths,
+                was_flooded=was_flooded,
+            )
+            assert bad_node < 0, (
+                "failed at node "
+                + str(bad_node)
+                + " with rel sed flux "
+                + str(rel_sed_flux[bad_node])
+            )
+            return self._sed_into_node, self._dz
+        else:
+            return self._route_sediment_by_python(
+                s_in,
+                flow_receiver,
+                transport_capacities,
+                erosion_prefactors,
+                erosion_scale,
+                dt_this_step,
+                rel_sed_flux,
+                flooded_depths=flooded_depths,
+                was_flooded=was_flooded,
+            )
+
+    def _route_sediment_by_python(
+        self,
+        s_in,
+        flow_receiver,
+        transport_capacities,
+        erosion_prefactors,
+        erosion_scale,
+        dt_this_step,
+        rel_sed_flux,
+        flooded_depths=None,
+        was_flooded=None,
+    ):
+        """Route sediment down the network node by node, in Python.
+
+        See :meth:`_route_sediment` for parameters.
+        """
+        sed_into_node = np.zeros(self._grid.number_of_nodes, dtype=float)
+        dz = np.zeros(self._grid.number_of_nodes, dtype=float)
+        cell_areas = self._cell_areas
+        node_vol_capacities = transport_capacities * dt_this_step
+
+        for i in s_in[::-1]:  # work downstream
+            cell_area = cell_areas[i]
+            if flooded_depths is not None:
+                flood_depth = flooded_depths[i]
+            else:
+                flood_depth = 0.0
+            sed_flux_into_this_node = sed_into_node[i]
+            node_capacity = transport_capacities[i]
+            # ^we work in volume flux, not volume per se here
+            node_vol_capacity = node_vol_capacities[i]
+            if flood_depth > 0.0:
+                node_vol_capacity = 0.0
+                # requires special case handling - as much sed as possible is
+                # dumped here, then the remainder passed on
+            if sed_flux_into_this_node < node_vol_capacity:
+                # ^note incision is forbidden at capacity
+                # flooded nodes never enter this branch
+                # #implementing the pseudoimplicit method:
+                dz_prefactor = erosion_scale * erosion_prefactors[i]
+                vol_prefactor = dz_prefactor * cell_area
+                (
+                    dz_here,
+                    sed_flux_out,
+                    rel_sed_flux_here,
+                    error_in_sed_flux,
+                ) = self.get_sed_flux_function_pseudoimplicit(
+                    sed_flux_into_this_node,
+                    node_vol_capacity,
+                    vol_prefactor,
+                    dz_prefactor,
+                )
+                # note now dz_here may never create more sed than the out can
+                # transport...
+                assert sed_flux_out <= node_vol_capacity, (
+                    "failed at node "
+                    + str(i)
+                    + " with rel sed flux "
+                    + str(sed_flux_out / node_capacity)
+                )
+                rel_sed_flux[i] = rel_sed_flux_here
+                vol_pass = sed_flux_out
+            else:
+                rel_sed_flux[i] = 1.0
+                vol_dropped = sed_flux_into_this_node - node_vol_capacity
+                dz_here = -vol_dropped / cell_area
+                # with the pits, we aim to inhibit incision, but depo is OK.
+                # We have already zero'd any adverse grads, so sed can make it
+                # to the bottom of the pit but no further in a single step,
+                # which seems raeasonable. Pit should fill.
+                if was_flooded is not None:
+                    isflooded = was_flooded[i]
+                else:
+                    isflooded = False
+                if flood_depth <= 0.0 and not isflooded:
+                    vol_pass = node_vol_capacity
+                    # we want flooded nodes which have already been filled to
+                    # enter the else statement
+                else:
+                    height_excess = -dz_here - flood_depth
+                    # ...above water level
+                    if height_excess <= 0.0:
+                        vol_pass = 0.0
+                        # dz_here is already correct
+                        flooded_depths[i] += dz_here
+                    else:
+                        dz_here = -flood_depth
+                        vol_pass = height_excess * cell_area
+                        # ^bit cheeky?
+                        flooded_depths[i] = 0.0
+                        # note we must update flooded depths transiently to
+                        # conserve mass
+
+            dz[i] -= dz_here
+            sed_into_node[flow_receiver[i]] += vol_pass
+
+        return sed_into_node, dz
+
     def run_one_step(self, dt):
         """Run the component across one timestep increment, dt.
 
@@ -707,10 +922,12 @@ class SedDepEroder(Component):
             flooded_nodes = flooded_depths > 0.0
         elif isinstance(self._flooded_depths, np.ndarray):
             assert self._flooded_depths.size == self._grid.number_of_nodes
+            flooded_depths = self._flooded_depths
             flooded_nodes = self._flooded_depths > 0.0
             # need an *updateable* record of the pit depths
         else:
             # if None, handle in loop
+            flooded_depths = None
             flooded_nodes = None
         steepest_link = "flow__link_to_receiver_node"
         link_length = np.empty(grid.number_of_nodes, dtype=float)
@@ -755,6 +972,10 @@ class SedDepEroder(Component):
                         * self._shields_prefactor_to_shear_noDchar
                         * self._Dchar
                     )
+            try:
+                thresh = variable_thresh
+            except NameError:  # it doesn't exist
+                thresh = self._thresh
 
             node_Q = self._k_Q * self._runoff_rate * node_A ** self._c
             shear_stress_prefactor_timesAparts = (
@@ -814,109 +1035,17 @@ class SedDepEroder(Component):
 
                 dt_this_step = dt_secs - internal_t
                 # ^timestep adjustment is made AFTER the dz calc
-                node_vol_capacities = transport_capacities * dt_this_step
 
-                sed_into_node = np.zeros(grid.number_of_nodes, dtype=float)
-                dz = np.zeros(grid.number_of_nodes, dtype=float)
-                cell_areas = self._cell_areas
-                try:
-                    raise NameError
-                    # ^tripped out deliberately for now; doesn't appear to
-                    # accelerate much
-                    weave.inline(
-                        self._routing_code,
-                        [
-                            "len_s_in",
-                            "sed_into_node",
-                            "transport_capacities",
-                            "dz",
-                            "cell_areas",
-                            "dt_this_step",
-                            "flow__receiver_node",
-                        ],
-                    )
-                except NameError:
-                    for i in s_in[::-1]:  # work downstream
-                        cell_area = cell_areas[i]
-                        if flooded_nodes is not None:
-                            flood_depth = flooded_depths[i]
-                        else:
-                            flood_depth = 0.0
-                        sed_flux_into_this_node = sed_into_node[i]
-                        node_capacity = transport_capacities[i]
-                        # ^we work in volume flux, not volume per se here
-                        node_vol_capacity = node_vol_capacities[i]
-                        if flood_depth > 0.0:
-                            node_vol_capacity = 0.0
-                            # requires special case handling - as much sed as
-                            # possible is dumped here, then the remainder
-                            # passed on
-                        if sed_flux_into_this_node < node_vol_capacity:
-                            # ^note incision is forbidden at capacity
-                            # flooded nodes never enter this branch
-                            # #implementing the pseudoimplicit method:
-                            try:
-                                thresh = variable_thresh
-                            except NameError:  # it doesn't exist
-                                thresh = self._thresh
-                            dz_prefactor = (
-                                self._K_unit_time
-                                * dt_this_step
-                                * (shear_tothe_a[i] - thresh).clip(0.0)
-                            )
-                            vol_prefactor = dz_prefactor * cell_area
-                            (
-                                dz_here,
-                                sed_flux_out,
-                                rel_sed_flux_here,
-                                error_in_sed_flux,
-                            ) = self.get_sed_flux_function_pseudoimplicit(
-                                sed_flux_into_this_node,
-                                node_vol_capacity,
-                                vol_prefactor,
-                                dz_prefactor,
-                            )
-                            # note now dz_here may never create more sed than
-                            # the out can transport...
-                            assert sed_flux_out <= node_vol_capacity, (
-                                "failed at node "
-                                + str(s_in.size - i)
-                                + " with rel sed flux "
-                                + str(sed_flux_out / node_capacity)
-                            )
-                            rel_sed_flux[i] = rel_sed_flux_here
-                            vol_pass = sed_flux_out
-                        else:
-                            rel_sed_flux[i] = 1.0
-                            vol_dropped = sed_flux_into_this_node - node_vol_capacity
-                            dz_here = -vol_dropped / cell_area
-                            # with the pits, we aim to inhibit incision, but
-                            # depo is OK. We have already zero'd any adverse
-                            # grads, so sed can make it to the bottom of the
-                            # pit but no further in a single step, which seems
-                            # raeasonable. Pit should fill.
-                            if flood_depth <= 0.0:
-                                vol_pass = node_vol_capacity
-                            else:
-                                height_excess = -dz_here - flood_depth
-                                # ...above water level
-                                if height_excess <= 0.0:
-                                    vol_pass = 0.0
-                                    # dz_here is already correct
-                                    flooded_depths[i] += dz_here
-                                else:
-                                    dz_here = -flood_depth
-                                    vol_pass = height_excess * cell_area
-                                    # ^bit cheeky?
-                                    flooded_depths[i] = 0.0
-                                    # note we must update flooded depths
-                                    # transiently to conserve mass
-                            # do we need to retain a small downhill slope?
-                            # ...don't think so. Will resolve itself on next
-                            # timestep.
-
-                        dz[i] -= dz_here
-                        sed_into_node[flow_receiver[i]] += vol_pass
+                sed_into_node, dz = self._route_sediment(
+                    s_in,
+                    flow_receiver,
+                    transport_capacities,
+                    (shear_tothe_a - thresh).clip(0.0),
+                    self._K_unit_time * dt_this_step,
+                    dt_this_step,
+                    rel_sed_flux,
+                    flooded_depths=flooded_depths,
+                )
 
                 break_flag = True
 
@@ -960,75 +1089,18 @@ class SedDepEroder(Component):
 
                 dt_this_step = dt_secs - internal_t
                 # ^timestep adjustment is made AFTER the dz calc
-                node_vol_capacities = transport_capacities * dt_this_step
-
-                sed_into_node = np.zeros(grid.number_of_nodes, dtype=float)
-                dz = np.zeros(grid.number_of_nodes, dtype=float)
-                cell_areas = self._cell_areas
-                for i in s_in[::-1]:  # work downstream
-                    cell_area = cell_areas[i]
-                    if flooded_nodes is not None:
-                        flood_depth = flooded_depths[i]
-                    else:
-                        flood_depth = 0.0
-                    sed_flux_into_this_node = sed_into_node[i]
-                    node_capacity = transport_capacities[i]
-                    # ^we work in volume flux, not volume per se here
-                    node_vol_capacity = node_vol_capacities[i]
-                    if flood_depth > 0.0:
-                        node_vol_capacity = 0.0
-                    if sed_flux_into_this_node < node_vol_capacity:
-                        # ^note incision is forbidden at capacity
-                        dz_prefactor = dt_this_step * erosion_prefactor_withS[i]
-                        vol_prefactor = dz_prefactor * cell_area
-                        (
-                            dz_here,
-                            sed_flux_out,
-                            rel_sed_flux_here,
-                            error_in_sed_flux,
-                        ) = self.get_sed_flux_function_pseudoimplicit(
-                            sed_flux_into_this_node,
-                            node_vol_capacity,
-                            vol_prefactor,
-                            dz_prefactor,
-                        )
-                        # note now dz_here may never create more sed than the
-                        # out can transport...
-                        assert sed_flux_out <= node_vol_capacity, (
-                            "failed at node "
-                            + str(s_in.size - i)
-                            + " with rel sed flux "
-                            + str(sed_flux_out / node_capacity)
-                        )
-                        rel_sed_flux[i] = rel_sed_flux_here
-                        vol_pass = sed_flux_out
-                    else:
-                        rel_sed_flux[i] = 1.0
-                        vol_dropped = sed_flux_into_this_node - node_vol_capacity
-                        dz_here = -vol_dropped / cell_area
-                        try:
-                            isflooded = flooded_nodes[i]
-                        except TypeError:  # was None
-                            isflooded = False
-                        if flood_depth <= 0.0 and not isflooded:
-                            vol_pass = node_vol_capacity
-                            # we want flooded nodes which have already been
-                            # filled to enter the else statement
-                        else:
-                            height_excess = -dz_here - flood_depth
-                            # ...above water level
-                            if height_excess <= 0.0:
-                                vol_pass = 0.0
-                                # dz_here is already correct
-                                flooded_depths[i] += dz_here
-                            else:
-                                dz_here = -flood_depth
-                                vol_pass = height_excess * cell_area
-                                # ^bit cheeky?
-                                flooded_depths[i] = 0.0
-
-                    dz[i] -= dz_here
-                    sed_into_node[flow_receiver[i]] += vol_pass
+
+                sed_into_node, dz = self._route_sediment(
+                    s_in,
+                    flow_receiver,
+                    transport_capacities,
+                    erosion_prefactor_withS,
+                    dt_this_step,
+                    dt_this_step,
+                    rel_sed_flux,
+                    flooded_depths=flooded_depths,
+                    was_flooded=flooded_nodes,
+                )
                 break_flag = True
 
                 node_z[grid.core_nodes] += dz[grid.core_nodes]
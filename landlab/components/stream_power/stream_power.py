@@ -7,6 +7,8 @@ from landlab import Component, MissingKeyError
 from landlab.utils.return_array import return_array_at_node
 
 from ..depression_finder.lake_mapper import _FLOODED
+from ..flow_accum import FlowAccumulator
+from ..flow_accum.flow_link_cache import FlowLinkCache
 from .cfuncs import (
     brent_method_erode_fixed_threshold,
     brent_method_erode_variable_threshold,
@@ -180,6 +182,7 @@ class StreamPowerEroder(Component):
         channel_width_field=1.0,
         discharge_field="drainage_area",
         erode_flooded_nodes=True,
+        flow_accumulator=None,
     ):
         """Initialize the StreamPowerEroder.
 
@@ -237,6 +240,11 @@ class StreamPowerEroder(Component):
             depression/lake mapper (e.g., DepressionFinderAndRouter). When set
             to false, the field *flood_status_code* must be present on the grid
             (this is created by the DepressionFinderAndRouter). Default True.
+        flow_accumulator : FlowAccumulator, optional
+            The FlowAccumulator that routes flow over the grid. If given, link
+            lengths are only recalculated when its *routing_version* changes;
+            otherwise they are recalculated whenever the links to receivers
+            differ from those of the previous step.
         """
         super().__init__(grid)
 
@@ -342,6 +350,26 @@ class StreamPowerEroder(Component):
         self._stream_power_erosion = self._grid.zeros(centering="node")
         self._alpha = self._grid.zeros("node")
 
+        if flow_accumulator is not None and not isinstance(
+            flow_accumulator, FlowAccumulator
+        ):
+            raise ValueError("flow_accumulator must be a FlowAccumulator.")
+        self._flow_links = FlowLinkCache(
+            grid, self._n, flow_accumulator=flow_accumulator
+        )
+        self._A_to_the_m = None
+        self._A_of_A_to_the_m = None
+
+    @property
+    def routing_cache_hits(self):
+        """Number of steps that reused link lengths from the previous step."""
+        return self._flow_links.hits
+
+    @property
+    def routing_cache_misses(self):
+        """Number of steps that recalculated link lengths."""
+        return self._flow_links.misses
+
     @property
     def K(self):
         """Erodibility (units depend on m_sp)."""
@@ -373,18 +401,16 @@ class StreamPowerEroder(Component):
 
         upstream_order_IDs = self._grid["node"]["flow__upstream_node_order"]
 
-        defined_flow_receivers = np.not_equal(
-            self._grid["node"]["flow__link_to_receiver_node"], self._grid.BAD_INDEX
-        )
+        # link lengths only change with the routing, and A**m with discharge
+        routing_is_current = self._flow_links.update()
+        defined_flow_receivers = self._flow_links.has_receiver
 
-        try:
-            length_of_link = self._grid.length_of_d8
-        except AttributeError:
-            length_of_link = self._grid.length_of_link
+        if not (
+            routing_is_current and np.array_equal(self._A, self._A_of_A_to_the_m)
+        ):
+            self._A_to_the_m = self._A[defined_flow_receivers] ** self._m
+            self._A_of_A_to_the_m = self._A.copy()
 
-        flow_link_lengths = length_of_link[
-            self._grid.at_node["flow__link_to_receiver_node"][defined_flow_receivers]
-        ]
         flow_receivers = self._grid["node"]["flow__receiver_node"]
 
         # Operate the main function:
@@ -392,17 +418,17 @@ class StreamPowerEroder(Component):
             self._alpha[defined_flow_receivers] = (
                 self._K[defined_flow_receivers]
                 * dt
-                * self._A[defined_flow_receivers] ** self._m
+                * self._A_to_the_m
                 / self._W[defined_flow_receivers]
-                / (flow_link_lengths ** self._n)
+                / self._flow_links.length_to_the_n
             )
 
         else:
             self._alpha[defined_flow_receivers] = (
                 self._K[defined_flow_receivers]
                 * dt
-                * self._A[defined_flow_receivers] ** self._m
-                / (flow_link_lengths ** self._n)
+                * self._A_to_the_m
+                / self._flow_links.length_to_the_n
             )
 
         # Handle flooded nodes, if any (no erosion there)
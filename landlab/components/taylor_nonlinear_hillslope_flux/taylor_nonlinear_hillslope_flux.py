@@ -11,6 +11,18 @@
 import numpy as np
 
 from landlab import Component, LinkStatus
+from landlab.utils import SubStepper
+
+_UNSTABLE_MESSAGE = (
+    "Topographic slopes are high enough such that the "
+    "Courant condition is exceeded AND you have not "
+    "selected dynamic timestepping with dynamic_dt=True. "
+    "This may lead to infinite and/or nan values for "
+    "slope, elevation, and soil depth. Consider using a "
+    "smaller time step or dynamic timestepping. The "
+    "Courant condition recommends a timestep of "
+    "{stable} or smaller."
+)
 
 
 class TaylorNonLinearDiffuser(Component):
@@ -52,15 +64,17 @@ class TaylorNonLinearDiffuser(Component):
     The TaylorNonLinearDiffuser makes and moves soil at a rate proportional
     to slope, this means that there is a characteristic time scale for soil
     transport and an associated stability criteria for the timestep. The
-    maximum characteristic time scale, Demax, is given as a function of the
-    hillslope diffustivity, D, the maximum slope, Smax, and the critical slope
+    characteristic time scale of each link, De, is given as a function of the
+    hillslope diffustivity, D, the slope of the link, S, and the critical slope
     Sc.
 
-        Demax = D ( 1 + ( Smax / Sc )**2 ( Smax / Sc )**4 + .. + ( Smax / Sc )**( 2 * ( n - 1 )) )
+        De = D ( 1 + ( S / Sc )**2 ( S / Sc )**4 + .. + ( S / Sc )**( 2 * ( n - 1 )) )
+
+    The maximum stable time step is the smallest, over all links, of
 
-    The maximum stable time step is given by
+        dtmax = courant_factor * L * L / De
 
-        dtmax = courant_factor * dx * dx / Demax
+    where L is the length of the link.
 
     Where the courant factor is a user defined scale (default is 0.2)
 
@@ -75,8 +89,8 @@ class TaylorNonLinearDiffuser(Component):
     exceeded AND you have not selected dynamic timestepping with
     dynamic_dt=True. This may lead to infinite and/or nan values for slope,
     elevation, and soil depth. Consider using a smaller time step or dynamic
-    timestepping. The Courant condition recommends a timestep of  0.2 or
-    smaller.
+    timestepping. The Courant condition recommends a timestep of
+    0.0019801980198019802 or smaller.
 
     Alternatively you can specify if_unstable='raise', and a Runtime Error will
     be raised if this condition is not met.
@@ -120,6 +134,25 @@ class TaylorNonLinearDiffuser(Component):
     >>> cubicflux.run_one_step(10.)
     >>> np.any(np.isnan(z))
     False
+    >>> cubicflux.number_of_substeps
+    1108
+
+    With local time stepping, only the nodes next to links that need
+    shorter time steps are updated with them. Here, only the steep
+    right side of a landscape is sub-stepped.
+
+    >>> mg = RasterModelGrid((5, 10))
+    >>> z = mg.add_zeros("topographic__elevation", at="node")
+    >>> z += 0.1 * mg.node_x + np.where(mg.node_x > 6, mg.node_x - 6, 0.0)**2
+    >>> cubicflux = TaylorNonLinearDiffuser(
+    ...     mg,
+    ...     dynamic_dt=True,
+    ...     local_time_stepping=True)
+    >>> cubicflux.run_one_step(0.1)
+    >>> cubicflux.number_of_substeps
+    8
+    >>> np.any(np.isnan(z))
+    False
 
     References
     ----------
@@ -192,6 +225,7 @@ class TaylorNonLinearDiffuser(Component):
         dynamic_dt=False,
         if_unstable="pass",
         courant_factor=0.2,
+        local_time_stepping=False,
     ):
         """Initialize the TaylorNonLinearDiffuser.
 
@@ -218,6 +252,11 @@ class TaylorNonLinearDiffuser(Component):
         courant_factor : float (optional, default = 0.2)
             Factor to identify stable time-step duration when using dynamic
             timestepping.
+        local_time_stepping : bool, optional
+            With dynamic time-stepping, only sub-step the links (and the
+            nodes at their ends) whose stable time step is shorter than
+            the time step. Fluxes on other links are held at their values
+            from the start of the time step.
         """
         super().__init__(grid)
 
@@ -229,6 +268,9 @@ class TaylorNonLinearDiffuser(Component):
         self._dynamic_dt = dynamic_dt
         self._courant_factor = courant_factor
         self._if_unstable = if_unstable
+        self._substepper = SubStepper(
+            grid, courant_factor=courant_factor, local=local_time_stepping
+        )
 
         # Create fields:
 
@@ -247,6 +289,33 @@ class TaylorNonLinearDiffuser(Component):
         else:
             self._flux = self._grid.add_zeros("soil__flux", at="link")
 
+    @property
+    def number_of_substeps(self):
+        """Number of sub-steps taken by the last call to run_one_step."""
+        return self._substepper.number_of_substeps
+
+    def _calc_flux_at_links(self, links):
+        """Calculate the flux, and the effective diffusivity, at links."""
+        self._slope[links] = (
+            self._elev[self._grid.node_at_link_head[links]]
+            - self._elev[self._grid.node_at_link_tail[links]]
+        ) / self._grid.length_of_link[links]
+
+        # Calculate flux
+        slope_term = 0.0
+        s_over_scrit = self._slope[links] / self._slope_crit
+        for i in range(0, 2 * self._nterms, 2):
+            slope_term += s_over_scrit ** i
+            if np.any(np.isinf(slope_term)):
+                message = (
+                    "Soil flux term is infinite. This is likely due to "
+                    "using too many terms in the Taylor expansion."
+                )
+                raise RuntimeError(message)
+        diffusivity = self._K * slope_term
+
+        return -diffusivity * self._slope[links], diffusivity
+
     def soilflux(self, dt):
         """Calculate soil flux for a time period 'dt'.
 
@@ -255,84 +324,20 @@ class TaylorNonLinearDiffuser(Component):
         dt: float (time)
             The imposed timestep.
         """
-        # establish time left as all of dt
-        time_left = dt
-
-        # begin while loop for time left
-        while time_left > 0.0:
-
-            # Calculate gradients
-            self._slope[:] = self._grid.calc_grad_at_link(self._elev)
-            self._slope[self._grid.status_at_link == LinkStatus.INACTIVE] = 0.0
-
-            # Test for time stepping courant condition
-            courant_slope_term = 0.0
-            courant_s_over_scrit = self._slope.max() / self._slope_crit
-            for i in range(0, 2 * self._nterms, 2):
-                courant_slope_term += courant_s_over_scrit ** i
-                if np.any(np.isinf(courant_slope_term)):
-                    message = (
-                        "Soil flux term is infinite in Courant condition "
-                        "calculation. This is likely due to "
-                        "using too many terms in the Taylor expansion."
-                    )
-                    raise RuntimeError(message)
-            # Calculate De Max
-            De_max = self._K * (courant_slope_term)
-            # Calculate longest stable timestep
-            self._dt_max = self._courant_factor * (self._grid.dx ** 2) / De_max
-
-            # Test for the Courant condition and print warning if user intended
-            # for it to be printed.
-            if (
-                (self._dt_max < dt)
-                and (not self._dynamic_dt)
-                and (self._if_unstable != "pass")
-            ):
-                message = (
-                    "Topographic slopes are high enough such that the "
-                    "Courant condition is exceeded AND you have not "
-                    "selected dynamic timestepping with dynamic_dt=True. "
-                    "This may lead to infinite and/or nan values for "
-                    "slope, elevation, and soil depth. Consider using a "
-                    "smaller time step or dynamic timestepping. The "
-                    "Courant condition recommends a timestep of "
-                    "" + str(self._dt_max) + " or smaller."
-                )
-                if self._if_unstable == "raise":
-                    raise RuntimeError(message)
-                if self._if_unstable == "warn":
-                    print(message)
-
-            # if dynamic dt is selected, use it, otherwise, use the entire time
-            if self._dynamic_dt:
-                self._sub_dt = np.min([dt, self._dt_max])
-                time_left -= self._sub_dt
-            else:
-                self._sub_dt = dt
-                time_left = 0
-
-            # Calculate flux
-            slope_term = 0.0
-            s_over_scrit = self._slope / self._slope_crit
-            for i in range(0, 2 * self._nterms, 2):
-                slope_term += s_over_scrit ** i
-                if np.any(np.isinf(slope_term)):
-                    message = (
-                        "Soil flux term is infinite. This is likely due to "
-                        "using too many terms in the Taylor expansion."
-                    )
-                    raise RuntimeError(message)
-
-            self._flux[:] = -((self._K * self._slope) * (slope_term))
-
-            # Calculate flux divergence
-            dqdx = self._grid.calc_flux_div_at_node(self._flux)
-
-            # Update topography
-            self._elev[self._grid.core_nodes] -= (
-                dqdx[self._grid.core_nodes] * self._sub_dt
-            )
+        self._slope.fill(0.0)
+        self._flux.fill(0.0)
+
+        self._substepper.advance(
+            dt,
+            self._elev,
+            self._calc_flux_at_links,
+            links=np.flatnonzero(self._grid.status_at_link != LinkStatus.INACTIVE),
+            flux_at_link=self._flux,
+            adaptive=self._dynamic_dt,
+            if_unstable=self._if_unstable,
+            message=_UNSTABLE_MESSAGE,
+        )
+        self._dt_max = self._substepper.stable_time_step
 
     def run_one_step(self, dt):
         """Advance cubic soil flux component by one time step of size dt.
@@ -5,11 +5,11 @@ Calculate cycle-averaged tidal flow field using approach of Mariotti (2018)
 """
 
 import numpy as np
-from scipy.sparse.linalg import spsolve
 
 from landlab import Component, HexModelGrid, RasterModelGrid
 from landlab.grid.mappers import map_min_of_link_nodes_to_link
-from landlab.utils import get_core_node_matrix
+from landlab.utils import SparseSolver
+from landlab.utils.matrix import CoreNodeMatrixBuilder
 from landlab.utils.return_array import return_array_at_link
 
 _FOUR_THIRDS = 4.0 / 3.0
@@ -86,6 +86,14 @@ class TidalFlowCalculator(Component):
         Scale velocity (see Mariotti, 2018) (m/s) (default 1)
     min_water_depth : float, optional
         Minimum depth for calculating diffusion coefficient (m) (default 0.01)
+    solver : {"direct", "cg"}, optional
+        Solve for water-surface elevation with a sparse direct solver, whose
+        factorization is reused for as long as the matrix does not change,
+        or with the preconditioned conjugate gradient method, starting from
+        the previous solution (default "direct")
+    solver_kwds : dict, optional
+        Additional keywords passed to :class:`~landlab.utils.SparseSolver`
+        (for instance, *preconditioner* and *rtol* for the "cg" solver)
 
     Examples
     --------
@@ -100,6 +108,13 @@ class TidalFlowCalculator(Component):
     >>> int(round(grid.at_link['ebb_tide_flow__velocity'][10] * 1.0e6))
     4
 
+    The matrix of the system only changes if the topography, roughness, or
+    boundary conditions do, so its factorization is reused.
+
+    >>> tfc.run_one_step()
+    >>> tfc.number_of_factorizations
+    1
+
     References
     ----------
     Mariotti, G. (2018) Marsh channel morphological response to sea level rise
@@ -155,6 +170,8 @@ class TidalFlowCalculator(Component):
         mean_sea_level=0.0,
         scale_velocity=1.0,
         min_water_depth=0.01,
+        solver="direct",
+        solver_kwds=None,
     ):
         """Initialize TidalFlowCalculator."""
 
@@ -192,6 +209,10 @@ class TidalFlowCalculator(Component):
         self._diffusion_coef_at_links = np.zeros(grid.number_of_links)
         self._boundary_mean_water_surf_elev = np.zeros(grid.number_of_nodes)
 
+        # Linear solver, and the builder of its matrix
+        self._solver = SparseSolver(method=solver, **(solver_kwds or {}))
+        self._matrix_builder = CoreNodeMatrixBuilder(grid)
+
     @property
     def roughness(self):
         """Roughness coefficient (Manning's n)."""
@@ -230,6 +251,24 @@ class TidalFlowCalculator(Component):
     def mean_sea_level(self, new_val):
         self._mean_sea_level = new_val
 
+    @property
+    def solve_time(self):
+        """Wall time (in seconds) spent solving for water-surface elevation
+        in the last call to run_one_step."""
+        return self._solver.solve_time
+
+    @property
+    def solver_iterations(self):
+        """Number of iterations taken by the linear solver in the last call
+        to run_one_step (always zero for the direct solver)."""
+        return self._solver.iterations
+
+    @property
+    def number_of_factorizations(self):
+        """Number of times the linear solver has factored its matrix (or
+        preconditioner)."""
+        return self._solver.number_of_factorizations
+
     def calc_tidal_inundation_rate(self):
         """Calculate and store the rate of inundation/draining at each node,
         averaged over a tidal half-cycle.
@@ -311,18 +350,14 @@ class TidalFlowCalculator(Component):
         cores = self.grid.core_nodes
 
         # For flood tide, set up matrix and add boundary info to RHS vector
-        # mat, rhs = make_core_node_matrix_var_coef(
-        mat, rhs = get_core_node_matrix(
-            self.grid,
-            self._boundary_mean_water_surf_elev,
-            coef_at_link=self._diffusion_coef_at_links,
-        )
+        mat = self._matrix_builder.get_matrix(self._diffusion_coef_at_links)
+        rhs = self._matrix_builder.get_rhs(self._boundary_mean_water_surf_elev)
 
-        rhs[:, 0] += self._grid_multiplier * tidal_inundation_rate[cores]
+        rhs += self._grid_multiplier * tidal_inundation_rate[cores]
 
         # Solve for flood tide water-surface elevation
         tidal_wse = np.zeros(self.grid.number_of_nodes)
-        tidal_wse[self.grid.core_nodes] = spsolve(mat, rhs)
+        tidal_wse[self.grid.core_nodes] = self._solver.solve(mat, rhs)
 
         # Calculate flood-tide water-surface gradient at links
         tidal_wse_grad = np.zeros(self.grid.number_of_links)
@@ -1,3 +1,4 @@
+from .cache import GraphCache
 from .dual import DualGraph
 from .graph import Graph, NetworkGraph
 from .graph_convention import ConventionConverter, GraphConvention
@@ -31,4 +32,5 @@ __all__ = [
     "DualRadialGraph",
     "ConventionConverter",
     "GraphConvention",
+    "GraphCache",
 ]
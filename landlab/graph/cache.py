@@ -0,0 +1,230 @@
+"""Opt-in on-disk cache of constructed graphs.
+
+Building the graph of a grid (sorting nodes, links and patches, finding the
+Voronoi diagram of a set of points, etc.) can take a significant amount of
+time for large grids. When the same grid is created many times (in a Monte
+Carlo ensemble, for instance) the graph can instead be read from a cache.
+
+The cache is disabled by default. To turn it on, set the
+``LANDLAB_GRAPH_CACHE_DIR`` environment variable to the path of a directory
+where cached graphs will be stored. Each graph is stored as a set of *.npy*
+files that are memory-mapped when read back, so that a cache hit costs
+little more than opening a few files.
+
+Examples
+--------
+>>> import tempfile
+>>> from landlab.graph import DualUniformRectilinearGraph
+>>> from landlab.graph.cache import GraphCache
+
+>>> cache = GraphCache(path=tempfile.mkdtemp())
+>>> cache.enabled
+True
+>>> key = cache.key("DualUniformRectilinearGraph", (3, 4))
+>>> cache.load(key) is None
+True
+>>> cache.save(key, DualUniformRectilinearGraph((3, 4)))
+>>> ds, dual_ds = cache.load(key)
+>>> ds["nodes_at_link"].shape
+(17, 2)
+>>> dual_ds["nodes_at_link"].shape
+(7, 2)
+>>> cache.hits, cache.misses
+(1, 1)
+>>> cache.clear()
+>>> cache.load(key) is None
+True
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import xarray as xr
+
+GRAPH_CACHE_ENV = "LANDLAB_GRAPH_CACHE_DIR"
+_CACHE_FORMAT = 1
+
+
+def _update_hash(sha, value):
+    """Add a construction argument to a hash."""
+    if isinstance(value, (list, tuple)):
+        sha.update("({0})".format(len(value)).encode())
+        for item in value:
+            _update_hash(sha, item)
+        return
+
+    if value is not None and not isinstance(value, str):
+        array = np.asarray(value)
+        if array.dtype.kind in "biuf":
+            array = np.ascontiguousarray(array, dtype=float)
+            sha.update(str(array.shape).encode())
+            sha.update(array.tobytes())
+            return
+
+    sha.update(repr(value).encode())
+
+
+def _write_dataset(ds, path):
+    os.makedirs(path)
+    meta = {}
+    for name, var in ds.variables.items():
+        meta[name] = {
+            "dims": list(var.dims),
+            "attrs": dict(var.attrs),
+            "is_coord": name in ds.coords,
+        }
+        np.save(os.path.join(path, name + ".npy"), var.values)
+    with open(os.path.join(path, "meta.json"), "w") as fp:
+        json.dump(meta, fp)
+
+
+def _read_dataset(path):
+    with open(os.path.join(path, "meta.json"), "r") as fp:
+        meta = json.load(fp)
+
+    data_vars, coords = {}, {}
+    for name, info in meta.items():
+        data = np.load(os.path.join(path, name + ".npy"), mmap_mode="c")
+        var = xr.Variable(info["dims"], data, attrs=info["attrs"])
+        if info["is_coord"]:
+            coords[name] = var
+        else:
+            data_vars[name] = var
+
+    return xr.Dataset(data_vars=data_vars, coords=coords)
+
+
+class GraphCache:
+
+    """A directory of graphs keyed by a hash of their construction arguments.
+
+    Parameters
+    ----------
+    path : str, optional
+        Directory in which to store cached graphs. If not given, use the
+        directory named by the ``LANDLAB_GRAPH_CACHE_DIR`` environment
+        variable. If neither is set, the cache is disabled.
+    """
+
+    def __init__(self, path=None):
+        self._path = path
+        self.reset_counters()
+
+    @property
+    def path(self):
+        """Directory that holds cached graphs (or ``None`` if disabled)."""
+        return self._path if self._path is not None else os.environ.get(GRAPH_CACHE_ENV)
+
+    @property
+    def enabled(self):
+        """Indicate if the cache is active."""
+        return bool(self.path)
+
+    @property
+    def hits(self):
+        """Number of graphs read from the cache."""
+        return self._hits
+
+    @property
+    def misses(self):
+        """Number of graphs that were not found in the cache."""
+        return self._misses
+
+    def reset_counters(self):
+        """Set the hit and miss counters back to zero."""
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def key(*args):
+        """Hash construction arguments into a cache key.
+
+        Numeric arguments (including arrays of node coordinates) are hashed
+        by value so that, for instance, ``1`` and ``1.0`` produce the same
+        key.
+
+        Examples
+        --------
+        >>> from landlab.graph.cache import GraphCache
+        >>> GraphCache.key("raster", (3, 4), 1.0) == GraphCache.key("raster", [3, 4], 1)
+        True
+        >>> GraphCache.key("raster", (3, 4)) == GraphCache.key("raster", (4, 3))
+        False
+        """
+        from landlab import __version__
+
+        sha = hashlib.sha1()
+        _update_hash(sha, (__version__, _CACHE_FORMAT) + args)
+        return sha.hexdigest()
+
+    def load(self, key):
+        """Read a graph from the cache.
+
+        Parameters
+        ----------
+        key : str
+            Cache key, as returned by :meth:`key`.
+
+        Returns
+        -------
+        tuple of Dataset or None
+            The datasets of the graph and its dual, or ``None`` if the
+            graph is not in the cache (or the cache is disabled).
+        """
+        if not self.enabled:
+            return None
+
+        path = os.path.join(self.path, key)
+        try:
+            cached = (
+                _read_dataset(os.path.join(path, "primal")),
+                _read_dataset(os.path.join(path, "dual")),
+            )
+        except (OSError, ValueError):
+            self._misses += 1
+            return None
+        else:
+            self._hits += 1
+            return cached
+
+    def save(self, key, graph):
+        """Write a graph and its dual to the cache.
+
+        The graph is first written to a temporary directory that is then
+        renamed so that processes sharing a cache never see a partially
+        written graph.
+
+        Parameters
+        ----------
+        key : str
+            Cache key, as returned by :meth:`key`.
+        graph : DualGraph
+            The graph to store.
+        """
+        if not self.enabled:
+            return
+
+        os.makedirs(self.path, exist_ok=True)
+        path = os.path.join(self.path, key)
+        if os.path.isdir(path):
+            return
+
+        tmp = tempfile.mkdtemp(dir=self.path, prefix=".tmp-")
+        try:
+            _write_dataset(graph.ds, os.path.join(tmp, "primal"))
+            _write_dataset(graph.dual.ds, os.path.join(tmp, "dual"))
+            os.rename(tmp, path)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    def clear(self):
+        """Remove all graphs from the cache."""
+        if self.enabled and os.path.isdir(self.path):
+            for name in os.listdir(self.path):
+                shutil.rmtree(os.path.join(self.path, name), ignore_errors=True)
+
+
+graph_cache = GraphCache()
@@ -163,6 +163,15 @@ class NetworkGraph:
 
         self._origin = (0.0, 0.0)
 
+    def _init_from_dataset(self, ds):
+        """Set up the graph from an existing (already sorted) ugrid dataset."""
+        self._ds = ds
+
+        self._frozen = False
+        self.freeze()
+
+        self._origin = (0.0, 0.0)
+
     @property
     def frozen(self):
         return self._frozen
@@ -189,7 +198,7 @@ class NetworkGraph:
         """Freeze the graph by making arrays read-only."""
         for var in self.ds.variables:
             array = self.ds[var].values
-            while array is not None:
+            while isinstance(array, np.ndarray):
                 array.flags.writeable = False
                 array = array.base
         self._frozen = True
@@ -199,7 +208,7 @@ class NetworkGraph:
         for var in self.ds.variables:
             arrays = []
             array = self.ds[var].values
-            while array is not None:
+            while isinstance(array, np.ndarray):
                 arrays.append(array)
                 array = array.base
             for array in arrays[::-1]:
@@ -96,8 +96,5 @@ class DualHexGraph(DualGraph, TriGraph):
         perimeter_links[-1, 1] = self._perimeter_nodes[0]
 
         DualVoronoiGraph.__init__(
-            self, (y_of_node, x_of_node), perimeter_links=perimeter_links, sort=False
+            self, (y_of_node, x_of_node), perimeter_links=perimeter_links, sort=sort
         )
-
-        if sort:
-            self.sort()
@@ -1,9 +1,11 @@
 import numpy as np
 
+from ..cache import graph_cache
 from ..dual import DualGraph
 from .structured_quad import (
     RectilinearGraph,
     StructuredQuadGraph,
+    StructuredQuadGraphTopology,
     UniformRectilinearGraph,
 )
 
@@ -184,6 +186,12 @@ class DualUniformRectilinearGraph(DualGraph, UniformRectilinearGraph):
         spacing = np.broadcast_to(spacing, 2)
         origin = np.broadcast_to(origin, 2)
 
+        key = graph_cache.key("DualUniformRectilinearGraph", shape, spacing, origin)
+        cached = graph_cache.load(key)
+        if cached is not None:
+            self._init_from_cache(shape, spacing, origin, cached)
+            return
+
         UniformRectilinearGraph.__init__(self, shape, spacing=spacing, origin=origin)
 
         dual_graph = UniformRectilinearGraph(
@@ -195,3 +203,19 @@ class DualUniformRectilinearGraph(DualGraph, UniformRectilinearGraph):
             node_at_cell=DualStructuredQuadGraph.get_node_at_cell(self.shape),
             nodes_at_face=DualStructuredQuadGraph.get_nodes_at_face(self.shape),
         )
+
+        graph_cache.save(key, self)
+
+    def _init_from_cache(self, shape, spacing, origin, cached):
+        """Set up the graph and its dual from cached datasets."""
+        StructuredQuadGraphTopology.__init__(self, shape)
+        self._init_from_dataset(cached[0])
+        self._spacing, self._origin = tuple(spacing), tuple(origin)
+
+        dual_graph = UniformRectilinearGraph.__new__(UniformRectilinearGraph)
+        StructuredQuadGraphTopology.__init__(dual_graph, (shape[0] - 1, shape[1] - 1))
+        dual_graph._init_from_dataset(cached[1])
+        dual_graph._spacing = tuple(spacing)
+        dual_graph._origin = tuple(origin + spacing * 0.5)
+
+        self.merge(dual_graph)
@@ -1,5 +1,6 @@
 import numpy as np
 
+from ..cache import graph_cache
 from ..dual import DualGraph
 from ..graph import Graph
 from .voronoi import DelaunayGraph
@@ -45,6 +46,29 @@ class DualVoronoiGraph(DualGraph, DelaunayGraph):
         >>> graph.node_at_cell
         array([5, 6])
         """
+        key = graph_cache.key(
+            "DualVoronoiGraph", node_y_and_x, perimeter_links, bool(sort)
+        )
+        cached = graph_cache.load(key)
+        if cached is None and graph_cache.enabled:
+            # Build into a scratch graph so that, as with a cache hit, this
+            # graph's derived quantities are computed from the final arrays.
+            graph = DualVoronoiGraph.__new__(DualVoronoiGraph)
+            graph._build(node_y_and_x, perimeter_links=perimeter_links, sort=sort)
+            graph_cache.save(key, graph)
+            cached = graph.ds, graph.dual.ds
+
+        if cached is None:
+            DualVoronoiGraph._build(
+                self, node_y_and_x, perimeter_links=perimeter_links, sort=sort
+            )
+        else:
+            self._init_from_dataset(cached[0])
+            dual_graph = Graph.__new__(Graph)
+            dual_graph._init_from_dataset(cached[1])
+            self.merge(dual_graph)
+
+    def _build(self, node_y_and_x, perimeter_links=None, sort=False):
         mesh = VoronoiDelaunayToGraph(
             np.vstack((node_y_and_x[1], node_y_and_x[0])).T,
             perimeter_links=perimeter_links,
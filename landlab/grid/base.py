@@ -21,10 +21,12 @@ from ..layers.eventlayers import EventLayersMixIn
 from ..layers.materiallayers import MaterialLayersMixIn
 from ..utils.decorators import cache_result_in_object
 from . import grid_funcs as gfuncs
+from .buffer_pool import BufferPool
 from .decorators import (
     override_array_setitem_and_reset,
     return_id_array,
     return_readonly_id_array,
+    sync_status_caches,
 )
 from .linkstatus import LinkStatus, set_status_at_link
 from .nodestatus import NodeStatus
@@ -257,6 +259,42 @@ def find_true_vector_from_link_vector_pair(L1, L2, b1x, b1y, b2x, b2y):
     return ax, ay
 
 
+def _patch_cached_rows(grid, attr, rows, get_values):
+    """Replace rows of an array cached in a grid.
+
+    The cached array is copied (rather than updated in place) so that
+    arrays that have already been handed out are left untouched.
+    """
+    try:
+        cached = grid.__dict__[attr]
+    except KeyError:
+        return
+    updated = np.array(cached)
+    updated[rows] = get_values()
+    updated.flags.writeable = cached.flags.writeable
+    grid.__dict__[attr] = updated
+
+
+def _update_cached_status_at_link(grid, attr, links, nodes_at_link):
+    """Recompute the cached status of some links.
+
+    Returns
+    -------
+    ndarray of int
+        The links whose status changed. If the status of links is not
+        cached, all of *links* are returned.
+    """
+    if attr not in grid.__dict__:
+        return links
+
+    status_at_link = set_status_at_link(grid._node_status[nodes_at_link[links]])
+    changed = status_at_link != grid.__dict__[attr][links]
+    links, status_at_link = links[changed], status_at_link[changed]
+    if len(links) > 0:
+        _patch_cached_rows(grid, attr, links, lambda: status_at_link)
+    return links
+
+
 class ModelGrid(GraphFields, EventLayersMixIn, MaterialLayersMixIn):
 
     """Base class for 2D structured or unstructured grids for numerical models.
@@ -339,6 +377,31 @@ class ModelGrid(GraphFields, EventLayersMixIn, MaterialLayersMixIn):
     at_cell = {}  # : Values defined at cells
     at_grid = {}  # : Values defined at grid
 
+    # Cached quantities that depend on node status, and names of their versions
+    _STATUS_CACHE_ATTRS = (
+        "_active_link_dirs_at_node",
+        "_status_at_link",
+        "_active_links",
+        "_fixed_links",
+        "_activelink_fromnode",
+        "_activelink_tonode",
+        "_active_faces",
+        "_core_nodes",
+        "_core_cells",
+        "_active_adjacent_nodes_at_node",
+        "_fixed_value_boundary_nodes",
+        "_node_at_core_cell",
+        "_link_status_at_node",
+        "__node_active_inlink_matrix",
+        "__node_active_outlink_matrix",
+    )
+    _STATUS_CACHES = (
+        "status_at_node",
+        "core_nodes",
+        "fixed_value_boundary_nodes",
+        "status_at_link",
+    )
+
     @classmethod
     def from_file(cls, file_like):
         """Create grid from a file-like object.
@@ -414,6 +477,7 @@ class ModelGrid(GraphFields, EventLayersMixIn, MaterialLayersMixIn):
         self._all_node_distances_map = None
         self._all_node_azimuths_map = None
         self.bc_set_code = 0
+        self._status_cache_versions = dict.fromkeys(self._STATUS_CACHES, 0)
 
         self._axis_units = tuple(np.broadcast_to(axis_units, self.ndim))
         self._axis_name = tuple(np.broadcast_to(axis_name, self.ndim))
@@ -529,6 +593,36 @@ class ModelGrid(GraphFields, EventLayersMixIn, MaterialLayersMixIn):
         """Set a new value for the model grid xy_of_reference."""
         self._ref_coord = (new_xy_of_reference[0], new_xy_of_reference[1])
 
+    @property
+    @cache_result_in_object()
+    def buffer_pool(self):
+        """Pool of scratch arrays used by grid mappers and gradients.
+
+        Functions like mappers and gradient calculations that are not given
+        an *out* buffer take their output arrays from this pool. By default
+        the pool allocates a new array for every request but counts the
+        allocations. Turn on reuse to have each function reuse its output
+        (and intermediate) arrays from one call to the next.
+
+        See Also
+        --------
+        landlab.grid.buffer_pool.BufferPool
+
+        Examples
+        --------
+        >>> from landlab import RasterModelGrid
+        >>> grid = RasterModelGrid((3, 4))
+        >>> grid.buffer_pool.reuse = True
+        >>> values_at_link = grid.map_mean_of_link_nodes_to_link(grid.x_of_node)
+        >>> values_at_link is grid.map_mean_of_link_nodes_to_link(grid.y_of_node)
+        True
+        >>> grid.buffer_pool.allocations
+        1
+
+        LLCATS: GINF
+        """
+        return BufferPool(self)
+
     @property
     def ndim(self):
         """Number of spatial dimensions of the grid.
@@ -575,6 +669,7 @@ class ModelGrid(GraphFields, EventLayersMixIn, MaterialLayersMixIn):
         self.reset_status_at_node()
 
     @property
+    @sync_status_caches
     @cache_result_in_object()
     @return_readonly_id_array
     def active_adjacent_nodes_at_node(self):
@@ -626,6 +721,7 @@ class ModelGrid(GraphFields, EventLayersMixIn, MaterialLayersMixIn):
         )
 
     @property
+    @sync_status_caches
     @make_return_array_immutable
     @cache_result_in_object()
     def active_link_dirs_at_node(self):
@@ -659,12 +755,14 @@ class ModelGrid(GraphFields, EventLayersMixIn, MaterialLayersMixIn):
         )
 
     @property
+    @sync_status_caches
     @make_return_array_immutable
     @cache_result_in_object()
     def link_status_at_node(self):
         return self.status_at_link[self.links_at_node]
 
     @property
+    @sync_status_caches
     @return_readonly_id_array
     @cache_result_in_object()
     def core_nodes(self):
@@ -894,6 +992,7 @@ class ModelGrid(GraphFields, EventLayersMixIn, MaterialLayersMixIn):
         ]
 
     @property
+    @sync_status_caches
     @return_readonly_id_array
     @cache_result_in_object()
     def fixed_value_boundary_nodes(self):
@@ -925,6 +1024,7 @@ class ModelGrid(GraphFields, EventLayersMixIn, MaterialLayersMixIn):
         return np.where(self._node_status == NodeStatus.FIXED_VALUE)[0]
 
     @property
+    @sync_status_caches
     @return_readonly_id_array
     @cache_result_in_object()
     def active_faces(self):
@@ -946,6 +1046,7 @@ class ModelGrid(GraphFields, EventLayersMixIn, MaterialLayersMixIn):
         return self.face_at_link[self.active_links]
 
     @property
+    @sync_status_caches
     @return_readonly_id_array
     @cache_result_in_object()
     def active_links(self):
@@ -963,6 +1064,7 @@ class ModelGrid(GraphFields, EventLayersMixIn, MaterialLayersMixIn):
         return np.where(self.status_at_link == LinkStatus.ACTIVE)[0]
 
     @property
+    @sync_status_caches
     @return_readonly_id_array
     @cache_result_in_object()
     def fixed_links(self):
@@ -1079,6 +1181,7 @@ class ModelGrid(GraphFields, EventLayersMixIn, MaterialLayersMixIn):
         return np.where(np.isclose(self.angle_of_link, angle))[0]
 
     @property
+    @sync_status_caches
     @cache_result_in_object()
     @return_readonly_id_array
     def node_at_core_cell(self):
@@ -1107,6 +1210,7 @@ class ModelGrid(GraphFields, EventLayersMixIn, MaterialLayersMixIn):
         return np.where(self.status_at_node == NodeStatus.CORE)[0]
 
     @property
+    @sync_status_caches
     @make_return_array_immutable
     @cache_result_in_object()
     def core_cells(self):
@@ -1403,6 +1507,7 @@ class ModelGrid(GraphFields, EventLayersMixIn, MaterialLayersMixIn):
         self._axis_name = tuple(new_names)
 
     @property
+    @sync_status_caches
     @make_return_array_immutable
     @cache_result_in_object()
     def status_at_link(self):
@@ -2075,40 +2180,202 @@ class ModelGrid(GraphFields, EventLayersMixIn, MaterialLayersMixIn):
         return cell_area_at_node
 
     def reset_status_at_node(self):
-        attrs = [
-            "_active_link_dirs_at_node",
-            "_status_at_link",
-            "_active_links",
-            "_fixed_links",
-            "_activelink_fromnode",
-            "_activelink_tonode",
-            "_active_faces",
-            "_core_nodes",
-            "_core_cells",
-            "_fixed_links",
-            "_active_adjacent_nodes_at_node",
-            "_fixed_value_boundary_nodes",
-            "_node_at_core_cell",
-            "_link_status_at_node",
-        ]
+        """Mark cached quantities that depend on node status as out of date.
 
-        for attr in attrs:
-            try:
-                del self.__dict__[attr]
-            except KeyError:
-                pass
+        This is called whenever ``status_at_node`` is set. Rather than
+        removing the cached quantities, they are brought up to date the next
+        time one of them is used. At that point only the entries that touch
+        nodes whose status actually changed are recomputed.
+
+        LLCATS: BC
+        """
+        self._status_is_dirty = True
         try:
             self.bc_set_code += 1
         except AttributeError:
             self.bc_set_code = 0
+
+    def status_cache_version(self, name="status_at_node"):
+        """Version number of a cached quantity that depends on node status.
+
+        The version of a cache is incremented each time its values change,
+        which makes it a cheap way for a component to check whether it needs
+        to rebuild anything that depends on the boundary conditions of
+        the grid. Unlike ``bc_set_code``, the version is not incremented if
+        the status of nodes is set but not actually changed.
+
+        Parameters
+        ----------
+        name : str, optional
+            Name of the cached quantity. One of *status_at_node*,
+            *core_nodes*, *fixed_value_boundary_nodes*, or
+            *status_at_link* (and, for grids with diagonals,
+            *status_at_diagonal*).
+
+        Returns
+        -------
+        int
+            The version of the cache.
+
+        Examples
+        --------
+        >>> from landlab import RasterModelGrid
+        >>> grid = RasterModelGrid((4, 5))
+        >>> grid.status_cache_version("status_at_link")
+        0
+
+        Changing a core node to a fixed-value node changes the status of
+        its links, the set of fixed-value nodes, and the set of core nodes.
+
+        >>> grid.status_at_node[7] = grid.BC_NODE_IS_FIXED_VALUE
+        >>> grid.status_cache_version("status_at_link")
+        1
+        >>> grid.status_cache_version("fixed_value_boundary_nodes")
+        1
+        >>> grid.status_cache_version("core_nodes")
+        1
+
+        Setting the status of a node to its current value changes nothing.
+
+        >>> grid.status_at_node[7] = grid.BC_NODE_IS_FIXED_VALUE
+        >>> grid.status_cache_version("status_at_node")
+        1
+
+        LLCATS: BC
+        """
+        self._sync_status_caches()
         try:
-            del self.__dict__["__node_active_inlink_matrix"]
+            return self._status_cache_versions[name]
         except KeyError:
-            pass
+            raise ValueError(
+                "{name}: not a status cache (not one of {names})".format(
+                    name=name, names=", ".join(sorted(self._status_cache_versions))
+                )
+            )
+
+    def _sync_status_caches(self):
+        """Bring cached quantities that depend on node status up to date."""
+        is_dirty = self.__dict__.get("_status_is_dirty", False)
+        if not is_dirty and "_status_at_last_sync" in self.__dict__:
+            return
+        if "_node_status" not in self.__dict__:
+            return
+        self._status_is_dirty = False
+
+        status_at_node = self._node_status
         try:
-            del self.__dict__["__node_active_outlink_matrix"]
-        except KeyError:
-            pass
+            last_status = self._status_at_last_sync
+        except AttributeError:
+            self._status_at_last_sync = status_at_node.copy()
+            if is_dirty:
+                self._clear_status_caches()
+            return
+
+        changed_nodes = np.flatnonzero(status_at_node != last_status)
+        if len(changed_nodes) == 0:
+            return
+
+        old_status = last_status[changed_nodes]
+        last_status[changed_nodes] = status_at_node[changed_nodes]
+
+        if len(changed_nodes) > 0.1 * self.number_of_nodes:
+            self._clear_status_caches()
+        else:
+            self._update_status_caches(changed_nodes, old_status)
+
+    def _clear_status_caches(self):
+        """Remove all cached quantities that depend on node status."""
+        for attr in self._STATUS_CACHE_ATTRS:
+            self.__dict__.pop(attr, None)
+        for name in self._status_cache_versions:
+            self._status_cache_versions[name] += 1
+
+    def _update_status_caches(self, changed_nodes, old_status):
+        """Update cached quantities for nodes whose status has changed.
+
+        Parameters
+        ----------
+        changed_nodes : ndarray of int
+            Nodes whose status has changed.
+        old_status : ndarray of int
+            Previous status of each of the changed nodes.
+
+        Returns
+        -------
+        ndarray of int
+            Links whose status has changed.
+        """
+        versions = self._status_cache_versions
+        new_status = self._node_status[changed_nodes]
+        versions["status_at_node"] += 1
+
+        for status, name, attrs in (
+            (
+                NodeStatus.CORE,
+                "core_nodes",
+                ("_core_nodes", "_core_cells", "_node_at_core_cell"),
+            ),
+            (
+                NodeStatus.FIXED_VALUE,
+                "fixed_value_boundary_nodes",
+                ("_fixed_value_boundary_nodes",),
+            ),
+        ):
+            if np.any((old_status == status) != (new_status == status)):
+                for attr in attrs:
+                    self.__dict__.pop(attr, None)
+                versions[name] += 1
+
+        links = self.links_at_node[changed_nodes]
+        links = np.unique(links[links >= 0])
+        changed_links = _update_cached_status_at_link(
+            self, "_status_at_link", links, self.nodes_at_link
+        )
+        if len(changed_links) == 0:
+            return changed_links
+
+        versions["status_at_link"] += 1
+        for attr in (
+            "_active_links",
+            "_fixed_links",
+            "_activelink_fromnode",
+            "_activelink_tonode",
+            "_active_faces",
+            "__node_active_inlink_matrix",
+            "__node_active_outlink_matrix",
+        ):
+            self.__dict__.pop(attr, None)
+
+        if changed_links[-1] == self.number_of_links - 1:
+            # missing links (-1) alias the last link so rows can't be patched
+            for attr in (
+                "_link_status_at_node",
+                "_active_link_dirs_at_node",
+                "_active_adjacent_nodes_at_node",
+            ):
+                self.__dict__.pop(attr, None)
+            return changed_links
+
+        nodes = np.unique(self.nodes_at_link[changed_links])
+        link_status_at_node = self.status_at_link[self.links_at_node[nodes]]
+        is_active = link_status_at_node == LinkStatus.ACTIVE
+        _patch_cached_rows(
+            self, "_link_status_at_node", nodes, lambda: link_status_at_node
+        )
+        _patch_cached_rows(
+            self,
+            "_active_link_dirs_at_node",
+            nodes,
+            lambda: np.where(is_active, self.link_dirs_at_node[nodes], 0),
+        )
+        _patch_cached_rows(
+            self,
+            "_active_adjacent_nodes_at_node",
+            nodes,
+            lambda: np.where(is_active, self.adjacent_nodes_at_node[nodes], -1),
+        )
+
+        return changed_links
 
     def set_nodata_nodes_to_closed(self, node_data, nodata_value):
         """Make no-data nodes closed boundaries.
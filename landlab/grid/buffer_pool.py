@@ -0,0 +1,185 @@
+#! /usr/bin/env python
+"""Scratch arrays owned by a grid.
+
+Grid mappers and gradient functions return new arrays unless they are given
+an *out* buffer. In a model that calls these functions many times (every
+sub-step of a time step, say) most of the time spent may be in creating and
+freeing these arrays. A :class:`BufferPool` holds arrays that are reused
+from one call to the next.
+
+Reuse is *off* by default, in which case the pool only counts the arrays that
+are allocated. When reuse is turned on, each function returns the same array
+every time it is called, so the result of a call is only valid until the
+next call to the same function on the same grid.
+
+Examples
+--------
+>>> import numpy as np
+>>> from landlab import RasterModelGrid
+>>> grid = RasterModelGrid((3, 4))
+>>> z = np.arange(12.0)
+
+>>> pool = grid.buffer_pool
+>>> grad_1 = grid.calc_grad_at_link(z)
+>>> grad_2 = grid.calc_grad_at_link(z)
+>>> grad_1 is grad_2
+False
+>>> pool.allocations
+2
+
+>>> with pool.reusing():
+...     grad_1 = grid.calc_grad_at_link(z)
+...     grad_2 = grid.calc_grad_at_link(z)
+>>> grad_1 is grad_2
+True
+>>> pool.allocations
+3
+>>> pool.requests
+4
+"""
+import contextlib
+
+import numpy as np
+
+_NUMBER_OF_ELEMENTS = {
+    "node": "number_of_nodes",
+    "link": "number_of_links",
+    "patch": "number_of_patches",
+    "corner": "number_of_corners",
+    "face": "number_of_faces",
+    "cell": "number_of_cells",
+    "diagonal": "number_of_diagonals",
+    "d8": "number_of_d8",
+}
+
+
+class BufferPool:
+
+    """Arrays of a grid that can be reused as outputs or temporaries.
+
+    Buffers are keyed by the grid element they are defined on, their
+    *dtype*, and a name (usually that of the function that uses them).
+
+    Parameters
+    ----------
+    grid : ModelGrid
+        The grid whose elements the buffers are defined on.
+    reuse : bool, optional
+        Reuse buffers from one request to the next.
+
+    Examples
+    --------
+    >>> from landlab import RasterModelGrid
+    >>> from landlab.grid.buffer_pool import BufferPool
+    >>> grid = RasterModelGrid((3, 4))
+    >>> pool = BufferPool(grid, reuse=True)
+    >>> buffer = pool.empty("link", "my_function")
+    >>> buffer.shape
+    (17,)
+    >>> pool.empty("link", "my_function") is buffer
+    True
+    >>> pool.empty("link", "my_function", dtype=int) is buffer
+    False
+    >>> pool.empty("node", "my_function", extra=1, fill=0.0)
+    array([ 0.,  0.,  0.,  0.,  0.,  0.,  0.,  0.,  0.,  0.,  0.,  0.,  0.])
+    >>> pool.allocations, pool.requests
+    (3, 4)
+    >>> pool.nbytes
+    376
+    """
+
+    def __init__(self, grid, reuse=False):
+        self._grid = grid
+        self._reuse = bool(reuse)
+        self._buffers = {}
+        self.reset_counters()
+
+    @property
+    def reuse(self):
+        """Indicate if buffers are reused."""
+        return self._reuse
+
+    @reuse.setter
+    def reuse(self, reuse):
+        self._reuse = bool(reuse)
+        if not self._reuse:
+            self.clear()
+
+    @property
+    def allocations(self):
+        """Number of arrays allocated by the pool."""
+        return self._allocations
+
+    @property
+    def requests(self):
+        """Number of buffers requested from the pool."""
+        return self._requests
+
+    @property
+    def nbytes(self):
+        """Number of bytes held by the pool."""
+        return sum(buffer.nbytes for buffer in self._buffers.values())
+
+    def reset_counters(self):
+        """Set the allocation and request counters back to zero."""
+        self._allocations = 0
+        self._requests = 0
+
+    def clear(self):
+        """Release all of the buffers held by the pool."""
+        self._buffers.clear()
+
+    @contextlib.contextmanager
+    def reusing(self):
+        """Context within which buffers are reused."""
+        reuse = self._reuse
+        self._reuse = True
+        try:
+            yield self
+        finally:
+            self.reuse = reuse
+
+    def empty(self, at, name, dtype=float, extra=0, fill=None):
+        """Get a buffer defined on grid elements.
+
+        Parameters
+        ----------
+        at : str
+            Grid element the buffer is defined on.
+        name : str
+            Name that identifies the buffer.
+        dtype : data-type, optional
+            Data type of the buffer.
+        extra : int, optional
+            Number of extra entries to add to the end of the buffer.
+        fill : scalar, optional
+            If given, fill the buffer with this value.
+
+        Returns
+        -------
+        ndarray
+            The buffer. If reuse is off, this is always a new array.
+        """
+        try:
+            size = getattr(self._grid, _NUMBER_OF_ELEMENTS[at]) + extra
+        except KeyError:
+            raise ValueError("{at}: grid element not understood".format(at=at))
+        dtype = np.dtype(dtype)
+
+        self._requests += 1
+        buffer = None
+        if self._reuse:
+            key = (at, dtype, name)
+            buffer = self._buffers.get(key)
+            if buffer is None or buffer.size != size:
+                buffer = self._buffers[key] = self._allocate(size, dtype)
+        else:
+            buffer = self._allocate(size, dtype)
+
+        if fill is not None:
+            buffer.fill(fill)
+        return buffer
+
+    def _allocate(self, size, dtype):
+        self._allocations += 1
+        return np.empty(size, dtype=dtype)
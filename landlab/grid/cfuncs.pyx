@@ -105,3 +105,256 @@ def _anticlockwise_argsort_points(np.ndarray[DTYPE_INT_t, ndim=2] pts,
     theta[:] = theta % twopi
     out[:] = np.argsort(theta)
 
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _label_connected_open_nodes(shape,
+                                np.ndarray[np.uint8_t, ndim=1] status_at_node,
+                                int closed_status,
+                                int use_diagonals,
+                                np.ndarray[DTYPE_INT_t, ndim=1] out):
+    """Label connected groups of open nodes of a raster.
+
+    Each group of open (not closed) nodes that are connected through their
+    D4 (or D8, if *use_diagonals* is true) neighbors are given the same
+    label. Labels start at zero and are numbered in order of the lowest
+    node of each group. Closed nodes are labeled -1.
+
+    Parameters
+    ----------
+    shape : tuple of int
+        Shape of the raster as (rows, columns).
+    status_at_node : ndarray of uint8
+        Status of each node.
+    closed_status : int
+        Status value of a closed node.
+    use_diagonals : int
+        If non-zero, connect nodes through diagonals.
+    out : ndarray of int
+        Label of each node.
+
+    Returns
+    -------
+    int
+        Number of groups of connected nodes.
+    """
+    cdef int n_rows = shape[0]
+    cdef int n_cols = shape[1]
+    cdef int n_nodes = n_rows * n_cols
+    cdef int n_labels = 0
+    cdef int start, node, neighbor, row, col, d_row, d_col, r, c
+    cdef int head, tail
+    cdef np.ndarray[DTYPE_INT_t, ndim=1] queue = np.empty(n_nodes, dtype=int)
+
+    for node in range(n_nodes):
+        out[node] = -1
+
+    for start in range(n_nodes):
+        if out[start] != -1 or status_at_node[start] == closed_status:
+            continue
+
+        out[start] = n_labels
+        queue[0] = start
+        head, tail = 0, 1
+        while head < tail:
+            node = queue[head]
+            head += 1
+            row = node // n_cols
+            col = node - row * n_cols
+            for d_row in range(-1, 2):
+                r = row + d_row
+                if r < 0 or r >= n_rows:
+                    continue
+                for d_col in range(-1, 2):
+                    if d_row == 0 and d_col == 0:
+                        continue
+                    if not use_diagonals and d_row != 0 and d_col != 0:
+                        continue
+                    c = col + d_col
+                    if c < 0 or c >= n_cols:
+                        continue
+                    neighbor = r * n_cols + c
+                    if out[neighbor] == -1 and status_at_node[neighbor] != closed_status:
+                        out[neighbor] = n_labels
+                        queue[tail] = neighbor
+                        tail += 1
+        n_labels += 1
+
+    return n_labels
+
+
+cdef enum:
+    LINEAR_FLUX = 0
+    TAYLOR_FLUX = 1
+    CRITICAL_FLUX = 2
+
+
+cdef inline double _flux_of_grad(
+    double grad, double coef, int law, double slope_crit, int n_terms
+) nogil:
+    cdef double ratio_sq, series, term
+    cdef int i
+
+    if law == LINEAR_FLUX:
+        return coef * grad
+
+    ratio_sq = (grad / slope_crit) * (grad / slope_crit)
+    if law == TAYLOR_FLUX:
+        series, term = 1.0, 1.0
+        for i in range(1, n_terms):
+            term *= ratio_sq
+            series += term
+        return coef * grad * series
+    else:
+        return coef * grad / (1.0 - ratio_sq)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def _calc_flux_div_of_grad_at_raster_node(
+    shape,
+    double dx,
+    double dy,
+    const DTYPE_FLOAT_t[:] value_at_node,
+    const DTYPE_FLOAT_t[:] coef_at_link,
+    int coef_stride,
+    const np.uint8_t[:] status_at_link,
+    int inactive_status,
+    int law,
+    double slope_crit,
+    int n_terms,
+    DTYPE_FLOAT_t[:] out,
+):
+    """Divergence of a function of the gradient at the nodes of a raster.
+
+    A raster's nodes with cells are its interior nodes. For each of these,
+    gradients along its four links are mapped to fluxes and the divergence
+    of those fluxes is written to *out* without any intermediate arrays.
+
+    Parameters
+    ----------
+    shape : tuple of int
+        Shape of the raster as (rows, columns).
+    dx, dy : float
+        Spacing of columns and rows.
+    value_at_node : ndarray of float
+        Values to take the gradient of.
+    coef_at_link : ndarray of float
+        Coefficient at each link.
+    coef_stride : int
+        Stride through *coef_at_link*; use 0 for a constant coefficient.
+    status_at_link : ndarray of uint8
+        Status of each link. Inactive links carry no flux.
+    inactive_status : int
+        Status value of an inactive link.
+    law : int
+        Relation between gradient and flux (0: linear, 1: Taylor series,
+        2: critical slope).
+    slope_crit : float
+        Critical slope of the nonlinear laws.
+    n_terms : int
+        Number of terms of the Taylor series.
+    out : ndarray of float
+        Divergence at each node. Nodes without cells are not changed.
+    """
+    cdef int n_rows = shape[0]
+    cdef int n_cols = shape[1]
+    cdef int links_per_row = 2 * n_cols - 1
+    cdef int row, col, node, east, north, link
+    cdef double q_east, q_west, q_north, q_south
+
+    with nogil:
+        for row in range(1, n_rows - 1):
+            for col in range(1, n_cols - 1):
+                node = row * n_cols + col
+                east = row * links_per_row + col
+                north = east + n_cols - 1
+
+                link = east
+                q_east = 0.0
+                if status_at_link[link] != inactive_status:
+                    q_east = _flux_of_grad(
+                        (value_at_node[node + 1] - value_at_node[node]) / dx,
+                        coef_at_link[link * coef_stride], law, slope_crit, n_terms,
+                    )
+                link = east - 1
+                q_west = 0.0
+                if status_at_link[link] != inactive_status:
+                    q_west = _flux_of_grad(
+                        (value_at_node[node] - value_at_node[node - 1]) / dx,
+                        coef_at_link[link * coef_stride], law, slope_crit, n_terms,
+                    )
+                link = north
+                q_north = 0.0
+                if status_at_link[link] != inactive_status:
+                    q_north = _flux_of_grad(
+                        (value_at_node[node + n_cols] - value_at_node[node]) / dy,
+                        coef_at_link[link * coef_stride], law, slope_crit, n_terms,
+                    )
+                link = north - links_per_row
+                q_south = 0.0
+                if status_at_link[link] != inactive_status:
+                    q_south = _flux_of_grad(
+                        (value_at_node[node] - value_at_node[node - n_cols]) / dy,
+                        coef_at_link[link * coef_stride], law, slope_crit, n_terms,
+                    )
+
+                out[node] = (q_east - q_west) / dx + (q_north - q_south) / dy
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def _calc_flux_div_of_grad_at_node(
+    const DTYPE_INT_t[:] node_at_cell,
+    const DTYPE_INT_t[:, :] links_at_node,
+    const np.int8_t[:, :] link_dirs_at_node,
+    const DTYPE_INT_t[:, :] nodes_at_link,
+    const DTYPE_FLOAT_t[:] length_of_link,
+    const DTYPE_INT_t[:] face_at_link,
+    const DTYPE_FLOAT_t[:] length_of_face,
+    const DTYPE_FLOAT_t[:] area_of_cell,
+    const DTYPE_FLOAT_t[:] value_at_node,
+    const DTYPE_FLOAT_t[:] coef_at_link,
+    int coef_stride,
+    const np.uint8_t[:] status_at_link,
+    int inactive_status,
+    int law,
+    double slope_crit,
+    int n_terms,
+    DTYPE_FLOAT_t[:] out,
+):
+    """Divergence of a function of the gradient at the nodes of any grid.
+
+    This is the general version of
+    :func:`_calc_flux_div_of_grad_at_raster_node` that walks the links of
+    each node with a cell (as for hexagonal and Voronoi grids).
+    """
+    cdef int n_cells = node_at_cell.shape[0]
+    cdef int max_links = links_at_node.shape[1]
+    cdef int cell, node, i, link, face
+    cdef double grad, net_flux
+
+    with nogil:
+        for cell in range(n_cells):
+            node = node_at_cell[cell]
+            net_flux = 0.0
+            for i in range(max_links):
+                link = links_at_node[node, i]
+                if link < 0 or status_at_link[link] == inactive_status:
+                    continue
+                face = face_at_link[link]
+                if face < 0:
+                    continue
+                grad = (
+                    value_at_node[nodes_at_link[link, 1]]
+                    - value_at_node[nodes_at_link[link, 0]]
+                ) / length_of_link[link]
+                net_flux -= link_dirs_at_node[node, i] * length_of_face[face] * (
+                    _flux_of_grad(
+                        grad, coef_at_link[link * coef_stride], law, slope_crit, n_terms
+                    )
+                )
+            out[node] = net_flux / area_of_cell[cell]
@@ -5,10 +5,13 @@ Grid decorators
 
 .. autosummary::
 
+    ~landlab.grid.decorators.out_from_buffer_pool
     ~landlab.grid.decorators.override_array_setitem_and_reset
     ~landlab.grid.decorators.return_id_array
     ~landlab.grid.decorators.return_readonly_id_array
+    ~landlab.grid.decorators.sync_status_caches
 """
+import inspect
 from functools import wraps
 
 import numpy as np
@@ -99,6 +102,95 @@ class override_array_setitem_and_reset(object):
         return _wrapped
 
 
+class out_from_buffer_pool(object):
+
+    """Decorator that takes a function's *out* buffer from the grid's pool.
+
+    If a grid function that has an *out* keyword is called without an
+    output buffer, a buffer is requested from the grid's
+    :class:`~landlab.grid.buffer_pool.BufferPool` and passed as *out*.
+
+    Parameters
+    ----------
+    at : str
+        Grid element of the output array.
+    dtype : data-type, optional
+        Data type of the output array.
+    fill : scalar, optional
+        Value to initialize the output array with.
+
+    Examples
+    --------
+    >>> from landlab import RasterModelGrid
+    >>> from landlab.grid.decorators import out_from_buffer_pool
+
+    >>> @out_from_buffer_pool("node", fill=0.0)
+    ... def ones_at_core_nodes(grid, out=None):
+    ...     out[grid.core_nodes] = 1.0
+    ...     return out
+
+    >>> grid = RasterModelGrid((3, 4))
+    >>> with grid.buffer_pool.reusing():
+    ...     ones_at_core_nodes(grid) is ones_at_core_nodes(grid)
+    True
+    >>> ones_at_core_nodes(grid)
+    array([ 0.,  0.,  0.,  0.,  0.,  1.,  1.,  0.,  0.,  0.,  0.,  0.])
+    """
+
+    def __init__(self, at, dtype=float, fill=None):
+        self._at = at
+        self._dtype = dtype
+        self._fill = fill
+
+    def __call__(self, func):
+        index = list(inspect.signature(func).parameters).index("out") - 1
+
+        @wraps(func)
+        def _wrapped(grid, *args, **kwds):
+            if len(args) > index:
+                if args[index] is None:
+                    args = list(args)
+                    args[index] = self._get_buffer(grid, func.__name__)
+            elif kwds.get("out") is None:
+                kwds["out"] = self._get_buffer(grid, func.__name__)
+            return func(grid, *args, **kwds)
+
+        return _wrapped
+
+    def _get_buffer(self, grid, name):
+        try:
+            pool = grid.buffer_pool
+        except AttributeError:
+            return None
+        return pool.empty(self._at, name, dtype=self._dtype, fill=self._fill)
+
+
+def sync_status_caches(func):
+    """Decorate a grid method that depends on the status of nodes.
+
+    Cached arrays derived from node status (core nodes, link status, etc.)
+    are brought up to date with the current node status before the wrapped
+    method is called.
+
+    Parameters
+    ----------
+    func : function
+        A grid method that takes no arguments.
+
+    Returns
+    -------
+    func
+        The wrapped method.
+    """
+
+    @wraps(func)
+    def _wrapped(grid):
+        grid._sync_status_caches()
+        return func(grid)
+
+    return _wrapped
+
+
 def return_id_array(func):
     """Decorate a function to return an array of ids.
 
@@ -2,7 +2,8 @@
 import numpy as np
 
 from ..utils.decorators import cache_result_in_object, make_return_array_immutable
-from .decorators import return_readonly_id_array
+from .base import ModelGrid, _patch_cached_rows, _update_cached_status_at_link
+from .decorators import return_readonly_id_array, sync_status_caches
 from .linkstatus import LinkStatus, set_status_at_link
 
 
@@ -103,6 +104,17 @@ class DiagonalsMixIn(object):
 
     """Add diagonals to a structured quad grid."""
 
+    _STATUS_CACHE_ATTRS = ModelGrid._STATUS_CACHE_ATTRS + (
+        "_status_at_diagonal",
+        "_diagonal_status_at_node",
+        "_active_diagonals",
+        "_active_diagonal_dirs_at_node",
+        "_status_at_d8",
+        "_active_d8",
+        "_active_d8_dirs_at_node",
+    )
+    _STATUS_CACHES = ModelGrid._STATUS_CACHES + ("status_at_diagonal",)
+
     @property
     @cache_result_in_object()
     def number_of_diagonals(self):
@@ -377,25 +389,83 @@ class DiagonalsMixIn(object):
         """
         return np.hstack((super().length_of_link, self.length_of_diagonal))
 
-    def reset_status_at_node(self):
-        super().reset_status_at_node()
-        attrs = [
-            "_status_at_diagonal",
-            "_diagonal_status_at_node",
-            "_active_diagonals",
-            "_active_diagonal_dirs_at_node",
+    def _update_status_caches(self, changed_nodes, old_status):
+        changed_links = super()._update_status_caches(changed_nodes, old_status)
+
+        diagonals = self.diagonals_at_node[changed_nodes]
+        diagonals = np.unique(diagonals[diagonals >= 0])
+        changed_diagonals = _update_cached_status_at_link(
+            self, "_status_at_diagonal", diagonals, self.nodes_at_diagonal
+        )
+        if len(changed_links) == 0 and len(changed_diagonals) == 0:
+            return changed_links
+
+        self.__dict__.pop("_active_d8", None)
+        _patch_cached_rows(
+            self,
             "_status_at_d8",
-            "_active_d8",
+            np.concatenate((changed_links, changed_diagonals + self.number_of_links)),
+            lambda: np.concatenate(
+                (
+                    self.status_at_link[changed_links],
+                    self.status_at_diagonal[changed_diagonals],
+                )
+            ),
+        )
+
+        if len(changed_diagonals) > 0:
+            self._status_cache_versions["status_at_diagonal"] += 1
+            self.__dict__.pop("_active_diagonals", None)
+
+            if changed_diagonals[-1] == self.number_of_diagonals - 1:
+                # missing diagonals (-1) alias the last diagonal (and last d8)
+                for attr in (
+                    "_diagonal_status_at_node",
+                    "_active_diagonal_dirs_at_node",
+                    "_active_d8_dirs_at_node",
+                ):
+                    self.__dict__.pop(attr, None)
+                return changed_links
+
+            nodes = np.unique(self.nodes_at_diagonal[changed_diagonals])
+            status_at_node = self.status_at_diagonal[self.diagonals_at_node[nodes]]
+            _patch_cached_rows(
+                self, "_diagonal_status_at_node", nodes, lambda: status_at_node
+            )
+            _patch_cached_rows(
+                self,
+                "_active_diagonal_dirs_at_node",
+                nodes,
+                lambda: np.where(
+                    status_at_node == LinkStatus.ACTIVE,
+                    self.diagonal_dirs_at_node[nodes],
+                    0,
+                ),
+            )
+
+        nodes = np.unique(
+            np.concatenate(
+                (
+                    self.nodes_at_link[changed_links].reshape(-1),
+                    self.nodes_at_diagonal[changed_diagonals].reshape(-1),
+                )
+            )
+        )
+        _patch_cached_rows(
+            self,
             "_active_d8_dirs_at_node",
-        ]
+            nodes,
+            lambda: np.where(
+                self.status_at_d8[self.d8s_at_node[nodes]] == LinkStatus.ACTIVE,
+                self.d8_dirs_at_node[nodes],
+                0,
+            ),
+        )
 
-        for attr in attrs:
-            try:
-                del self.__dict__[attr]
-            except KeyError:
-                pass
+        return changed_links
 
     @property
+    @sync_status_caches
     @cache_result_in_object()
     @make_return_array_immutable
     def status_at_diagonal(self):
@@ -438,18 +508,21 @@ class DiagonalsMixIn(object):
         return set_status_at_link(self.status_at_node[self.nodes_at_diagonal])
 
     @property
+    @sync_status_caches
     @cache_result_in_object()
     @make_return_array_immutable
     def diagonal_status_at_node(self):
         return self.status_at_diagonal[self.diagonals_at_node]
 
     @property
+    @sync_status_caches
     @cache_result_in_object()
     @return_readonly_id_array
     def active_diagonals(self):
         return np.where(self.status_at_diagonal == LinkStatus.ACTIVE)[0]
 
     @property
+    @sync_status_caches
     @cache_result_in_object()
     @make_return_array_immutable
     def active_diagonal_dirs_at_node(self):
@@ -459,18 +532,21 @@ class DiagonalsMixIn(object):
         )
 
     @property
+    @sync_status_caches
     @cache_result_in_object()
     @make_return_array_immutable
     def status_at_d8(self):
         return np.hstack((super().status_at_link, self.status_at_diagonal))
 
     @property
+    @sync_status_caches
     @cache_result_in_object()
     @return_readonly_id_array
     def active_d8(self):
         return np.where(self.status_at_d8 == LinkStatus.ACTIVE)[0]
 
     @property
+    @sync_status_caches
     @cache_result_in_object()
     @make_return_array_immutable
     def active_d8_dirs_at_node(self):
@@ -4,8 +4,12 @@ import numpy as np
 
 from landlab.utils.decorators import use_field_name_or_array
 
+from .decorators import out_from_buffer_pool
+from .linkstatus import LinkStatus
+
 
 @use_field_name_or_array("link")
+@out_from_buffer_pool("node", fill=0.0)
 def calc_flux_div_at_node(grid, unit_flux, out=None):
     """Calculate divergence of link-based fluxes at nodes.
 
@@ -153,6 +157,7 @@ def calc_flux_div_at_cell(grid, unit_flux, out=None):
 
 
 @use_field_name_or_array("link")
+@out_from_buffer_pool("node", fill=0.0)
 def calc_net_flux_at_node(grid, unit_flux_at_links, out=None):
     """Calculate net link fluxes at nodes.
 
@@ -232,6 +237,261 @@ def calc_net_flux_at_node(grid, unit_flux_at_links, out=None):
     return out
 
 
+@use_field_name_or_array("node")
+@out_from_buffer_pool("node", fill=0.0)
+def calc_flux_div_of_grad(grid, value_at_node, coef_at_link=1.0, out=None):
+    """Calculate the divergence of a flux proportional to a gradient.
+
+    The flux along each link is the gradient of *value_at_node* multiplied
+    by *coef_at_link* (inactive links carry no flux). This gives the same
+    result as ``calc_flux_div_at_node(coef_at_link * calc_grad_at_link(...))``
+    but with a single, compiled pass over the grid that does not create any
+    temporary arrays. For diffusion with diffusivity *K*, the rate of change
+    of *z* is ``calc_flux_div_of_grad(z, K)``.
+
+    Parameters
+    ----------
+    grid : ModelGrid
+        A ModelGrid.
+    value_at_node : ndarray or field name
+        Values at nodes.
+    coef_at_link : float or ndarray, optional
+        Coefficient relating gradient to flux, either constant or given at
+        each link.
+    out : ndarray, optional
+        Buffer to hold the result. Values at nodes without cells are not
+        changed.
+
+    Returns
+    -------
+    ndarray (x number of nodes)
+        Flux divergence at nodes.
+
+    Examples
+    --------
+    >>> from landlab import HexModelGrid, RasterModelGrid
+    >>> from landlab.grid.divergence import calc_flux_div_of_grad
+    >>> grid = RasterModelGrid((3, 4), xy_spacing=10.0)
+    >>> z = grid.add_zeros("topographic__elevation", at="node")
+    >>> z[5] = 50.0
+    >>> z[6] = 36.0
+    >>> calc_flux_div_of_grad(grid, z, -1.0)
+    array([ 0.  ,  0.  ,  0.  ,  0.  ,  0.  ,  1.64,  0.94,  0.  ,  0.  ,
+            0.  ,  0.  ,  0.  ])
+
+    Inactive links carry no flux.
+
+    >>> grid.status_at_node[grid.nodes_at_right_edge] = grid.BC_NODE_IS_CLOSED
+    >>> grid.calc_flux_div_of_grad("topographic__elevation", -1.0)
+    array([ 0.  ,  0.  ,  0.  ,  0.  ,  0.  ,  1.64,  0.58,  0.  ,  0.  ,
+            0.  ,  0.  ,  0.  ])
+
+    >>> grid = HexModelGrid((3, 3), spacing=10.0)
+    >>> z = grid.add_zeros("topographic__elevation", at="node")
+    >>> z[4] = 50.0
+    >>> coef = np.full(grid.number_of_links, -2.0)
+    >>> out = grid.zeros(at="node")
+    >>> rtn = grid.calc_flux_div_of_grad(z, coef, out=out)
+    >>> rtn is out
+    True
+    >>> np.round(out[grid.node_at_cell], 4)
+    array([ 4.    , -0.6667])
+
+    LLCATS: NINF GRAD
+    """
+    return _calc_flux_div_of_grad(grid, value_at_node, coef_at_link, out=out)
+
+
+@use_field_name_or_array("node")
+@out_from_buffer_pool("node", fill=0.0)
+def calc_flux_div_of_taylor_grad(
+    grid, value_at_node, coef_at_link=1.0, slope_crit=1.0, n_terms=2, out=None
+):
+    """Calculate the divergence of a flux that is a Taylor series of gradient.
+
+    The flux along each link is,
+
+    .. math::
+
+        q = K S \\sum_{i=0}^{N-1} \\left(\\frac{S}{S_c}\\right)^{2i}
+
+    where *K* is *coef_at_link*, *S* is the gradient of *value_at_node*,
+    *S_c* is *slope_crit*, and *N* is *n_terms*. This is the flux law of
+    the ``TaylorNonLinearDiffuser``. Inactive links carry no flux.
+
+    Parameters
+    ----------
+    grid : ModelGrid
+        A ModelGrid.
+    value_at_node : ndarray or field name
+        Values at nodes.
+    coef_at_link : float or ndarray, optional
+        Coefficient relating gradient to flux.
+    slope_crit : float, optional
+        Critical slope.
+    n_terms : int, optional
+        Number of terms in the Taylor series.
+    out : ndarray, optional
+        Buffer to hold the result. Values at nodes without cells are not
+        changed.
+
+    Returns
+    -------
+    ndarray (x number of nodes)
+        Flux divergence at nodes.
+
+    Examples
+    --------
+    >>> from landlab import RasterModelGrid
+    >>> grid = RasterModelGrid((3, 4))
+    >>> z = grid.add_zeros("topographic__elevation", at="node")
+    >>> z[5] = 0.5
+    >>> grid.calc_flux_div_of_taylor_grad(z, -1.0, slope_crit=1.0, n_terms=1)
+    array([ 0. ,  0. ,  0. ,  0. ,  0. ,  2. , -0.5,  0. ,  0. ,  0. ,  0. ,
+            0. ])
+    >>> grid.calc_flux_div_of_taylor_grad(z, -1.0, slope_crit=1.0, n_terms=2)
+    array([ 0.   ,  0.   ,  0.   ,  0.   ,  0.   ,  2.5  , -0.625,  0.   ,
+            0.   ,  0.   ,  0.   ,  0.   ])
+
+    LLCATS: NINF GRAD
+    """
+    return _calc_flux_div_of_grad(
+        grid,
+        value_at_node,
+        coef_at_link,
+        law=1,
+        slope_crit=slope_crit,
+        n_terms=n_terms,
+        out=out,
+    )
+
+
+@use_field_name_or_array("node")
+@out_from_buffer_pool("node", fill=0.0)
+def calc_flux_div_of_critical_grad(
+    grid, value_at_node, coef_at_link=1.0, slope_crit=1.0, out=None
+):
+    """Calculate the divergence of a flux that diverges at a critical slope.
+
+    The flux along each link is,
+
+    .. math::
+
+        q = \\frac{K S}{1 - (S / S_c)^2}
+
+    where *K* is *coef_at_link*, *S* is the gradient of *value_at_node*,
+    and *S_c* is *slope_crit*. Inactive links carry no flux.
+
+    Parameters
+    ----------
+    grid : ModelGrid
+        A ModelGrid.
+    value_at_node : ndarray or field name
+        Values at nodes.
+    coef_at_link : float or ndarray, optional
+        Coefficient relating gradient to flux.
+    slope_crit : float, optional
+        Critical slope.
+    out : ndarray, optional
+        Buffer to hold the result. Values at nodes without cells are not
+        changed.
+
+    Returns
+    -------
+    ndarray (x number of nodes)
+        Flux divergence at nodes.
+
+    Examples
+    --------
+    >>> from landlab import RasterModelGrid
+    >>> grid = RasterModelGrid((3, 4))
+    >>> z = grid.add_zeros("topographic__elevation", at="node")
+    >>> z[5] = 0.5
+    >>> grid.calc_flux_div_of_critical_grad(z, -1.0, slope_crit=1.0)
+    array([ 0.        ,  0.        ,  0.        ,  0.        ,  0.        ,
+            2.66666667, -0.66666667,  0.        ,  0.        ,  0.        ,
+            0.        ,  0.        ])
+
+    LLCATS: NINF GRAD
+    """
+    return _calc_flux_div_of_grad(
+        grid, value_at_node, coef_at_link, law=2, slope_crit=slope_crit, out=out
+    )
+
+
+def _calc_flux_div_of_grad(
+    grid, value_at_node, coef_at_link, law=0, slope_crit=1.0, n_terms=1, out=None
+):
+    """Divergence of a flux that is a function of gradient at nodes."""
+    from landlab import RasterModelGrid
+
+    from .cfuncs import (
+        _calc_flux_div_of_grad_at_node,
+        _calc_flux_div_of_grad_at_raster_node,
+    )
+
+    value_at_node = np.asarray(value_at_node, dtype=float)
+    if value_at_node.size != grid.number_of_nodes:
+        raise ValueError("value_at_node must be number of nodes long")
+
+    coef_at_link = np.asarray(coef_at_link, dtype=float)
+    if coef_at_link.ndim == 0:
+        coef_at_link, coef_stride = coef_at_link.reshape((1,)), 0
+    elif coef_at_link.size == grid.number_of_links:
+        coef_stride = 1
+    else:
+        raise ValueError("coef_at_link must be a scalar or number of links long")
+
+    if out is None:
+        out = grid.zeros(at="node")
+    elif out.size != grid.number_of_nodes:
+        raise ValueError("output buffer length mismatch with number of nodes")
+
+    # reshape makes a copy if out is not contiguous; copied back below
+    out_at_node = out.reshape(-1)
+
+    if isinstance(grid, RasterModelGrid):
+        _calc_flux_div_of_grad_at_raster_node(
+            grid.shape,
+            grid.dx,
+            grid.dy,
+            value_at_node.reshape(-1),
+            coef_at_link.reshape(-1),
+            coef_stride,
+            grid.status_at_link,
+            LinkStatus.INACTIVE,
+            law,
+            slope_crit,
+            n_terms,
+            out_at_node,
+        )
+    else:
+        _calc_flux_div_of_grad_at_node(
+            grid.node_at_cell,
+            grid.links_at_node,
+            grid.link_dirs_at_node,
+            grid.nodes_at_link,
+            grid.length_of_link,
+            grid.face_at_link,
+            grid.length_of_face,
+            grid.area_of_cell,
+            value_at_node.reshape(-1),
+            coef_at_link.reshape(-1),
+            coef_stride,
+            grid.status_at_link,
+            LinkStatus.INACTIVE,
+            law,
+            slope_crit,
+            n_terms,
+            out_at_node,
+        )
+
+    if not np.may_share_memory(out_at_node, out):
+        out[...] = out_at_node.reshape(out.shape)
+
+    return out
+
+
 @use_field_name_or_array("face")
 def _calc_net_face_flux_at_cell(grid, unit_flux_at_faces, out=None):
     """Calculate net face fluxes at cells.
@@ -15,8 +15,11 @@ import numpy as np
 from landlab.core.utils import radians_to_degrees
 from landlab.utils.decorators import use_field_name_or_array
 
+from .decorators import out_from_buffer_pool
+
 
 @use_field_name_or_array("node")
+@out_from_buffer_pool("link")
 def calc_grad_at_link(grid, node_values, out=None):
     """Calculate gradients of node values at links.
 
@@ -69,6 +72,7 @@ def calc_grad_at_link(grid, node_values, out=None):
 
 
 @use_field_name_or_array("node")
+@out_from_buffer_pool("link")
 def calc_diff_at_link(grid, node_values, out=None):
     """Calculate differences of node values over links.
 
@@ -56,7 +56,10 @@ their 'head' node, while links 15 and 11 have node 'X' as their tail node.
 
 import numpy as np
 
+from .decorators import out_from_buffer_pool
 
+
+@out_from_buffer_pool("link")
 def map_link_head_node_to_link(grid, var_name, out=None):
     """Map values from a link head nodes to links.
 
@@ -114,6 +117,7 @@ def map_link_head_node_to_link(grid, var_name, out=None):
     return out
 
 
+@out_from_buffer_pool("link")
 def map_link_tail_node_to_link(grid, var_name, out=None):
     """Map values from a link tail nodes to links.
 
@@ -173,6 +177,7 @@ def map_link_tail_node_to_link(grid, var_name, out=None):
     return out
 
 
+@out_from_buffer_pool("link")
 def map_min_of_link_nodes_to_link(grid, var_name, out=None):
     """Map the minimum of a link's nodes to the link.
 
@@ -238,6 +243,7 @@ def map_min_of_link_nodes_to_link(grid, var_name, out=None):
     return out
 
 
+@out_from_buffer_pool("link")
 def map_max_of_link_nodes_to_link(grid, var_name, out=None):
     """Map the maximum of a link's nodes to the link.
 
@@ -303,6 +309,7 @@ def map_max_of_link_nodes_to_link(grid, var_name, out=None):
     return out
 
 
+@out_from_buffer_pool("link")
 def map_mean_of_link_nodes_to_link(grid, var_name, out=None):
     """Map the mean of a link's nodes to the link.
 
@@ -360,6 +367,7 @@ def map_mean_of_link_nodes_to_link(grid, var_name, out=None):
     return out
 
 
+@out_from_buffer_pool("link")
 def map_value_at_min_node_to_link(grid, control_name, value_name, out=None):
     """Map the the value found in one node array to a link, based on the
     minimum value found in a second node field or array.
@@ -435,6 +443,7 @@ def map_value_at_min_node_to_link(grid, control_name, value_name, out=None):
     return out
 
 
+@out_from_buffer_pool("link")
 def map_value_at_max_node_to_link(grid, control_name, value_name, out=None):
     """Map the the value found in one node array to a link, based on the
     maximum value found in a second node field or array.
@@ -510,6 +519,7 @@ def map_value_at_max_node_to_link(grid, control_name, value_name, out=None):
     return out
 
 
+@out_from_buffer_pool("cell")
 def map_node_to_cell(grid, var_name, out=None):
     """Map values for nodes to cells.
 
@@ -563,6 +573,7 @@ def map_node_to_cell(grid, var_name, out=None):
     return out
 
 
+@out_from_buffer_pool("node")
 def map_min_of_node_links_to_node(grid, var_name, out=None):
     """Map the minimum value of a nodes' links to the node.
 
@@ -613,7 +624,9 @@ def map_min_of_node_links_to_node(grid, var_name, out=None):
     if out is None:
         out = grid.empty(at="node")
 
-    values_at_linksX = np.empty(grid.number_of_links + 1, dtype=float)
+    values_at_linksX = grid.buffer_pool.empty(
+        "link", "map_min_of_node_links_to_node.values_at_links", extra=1
+    )
     values_at_linksX[-1] = np.finfo(dtype=float).max
     if type(var_name) is str:
         values_at_linksX[:-1] = grid.at_link[var_name]
@@ -624,6 +637,7 @@ def map_min_of_node_links_to_node(grid, var_name, out=None):
     return out
 
 
+@out_from_buffer_pool("node")
 def map_max_of_node_links_to_node(grid, var_name, out=None):
     """Map the maximum value of a nodes' links to the node.
 
@@ -674,7 +688,9 @@ def map_max_of_node_links_to_node(grid, var_name, out=None):
     if out is None:
         out = grid.empty(at="node")
 
-    values_at_linksX = np.empty(grid.number_of_links + 1, dtype=float)
+    values_at_linksX = grid.buffer_pool.empty(
+        "link", "map_max_of_node_links_to_node.values_at_links", extra=1
+    )
     values_at_linksX[-1] = np.finfo(dtype=float).min
     if type(var_name) is str:
         values_at_linksX[:-1] = grid.at_link[var_name]
@@ -685,6 +701,7 @@ def map_max_of_node_links_to_node(grid, var_name, out=None):
     return out
 
 
+@out_from_buffer_pool("node")
 def map_upwind_node_link_max_to_node(grid, var_name, out=None):
     """Map the largest magnitude of the links bringing flux into the node to
     the node.
@@ -750,6 +767,7 @@ def map_upwind_node_link_max_to_node(grid, var_name, out=None):
     return out
 
 
+@out_from_buffer_pool("node")
 def map_downwind_node_link_max_to_node(grid, var_name, out=None):
     """Map the largest magnitude of the links carrying flux from the node to
     the node.
@@ -816,6 +834,7 @@ def map_downwind_node_link_max_to_node(grid, var_name, out=None):
     return out
 
 
+@out_from_buffer_pool("node")
 def map_upwind_node_link_mean_to_node(grid, var_name, out=None):
     """Map the mean magnitude of the links bringing flux into the node to the
     node.
@@ -887,6 +906,7 @@ def map_upwind_node_link_mean_to_node(grid, var_name, out=None):
     return out
 
 
+@out_from_buffer_pool("node")
 def map_downwind_node_link_mean_to_node(grid, var_name, out=None):
     """Map the mean magnitude of the links carrying flux out of the node to the
     node.
@@ -957,6 +977,7 @@ def map_downwind_node_link_mean_to_node(grid, var_name, out=None):
     return out
 
 
+@out_from_buffer_pool("node")
 def map_value_at_upwind_node_link_max_to_node(grid, control_name, value_name, out=None):
     """Map the the value found in one link array to a node, based on the
     largest magnitude value of links bringing fluxes into the node, found in a
@@ -1036,6 +1057,7 @@ def map_value_at_upwind_node_link_max_to_node(grid, control_name, value_name, ou
     return out
 
 
+@out_from_buffer_pool("node")
 def map_value_at_downwind_node_link_max_to_node(
     grid, control_name, value_name, out=None
 ):
@@ -1116,6 +1138,7 @@ def map_value_at_downwind_node_link_max_to_node(
     return out
 
 
+@out_from_buffer_pool("patch", fill=0.0)
 def map_mean_of_patch_nodes_to_patch(
     grid, var_name, ignore_closed_nodes=True, out=None
 ):
@@ -1190,6 +1213,7 @@ def map_mean_of_patch_nodes_to_patch(
     return out
 
 
+@out_from_buffer_pool("patch", fill=0.0)
 def map_max_of_patch_nodes_to_patch(grid, var_name, ignore_closed_nodes=True, out=None):
     """Map the maximum value of nodes around a patch to the patch.
 
@@ -1262,6 +1286,7 @@ def map_max_of_patch_nodes_to_patch(grid, var_name, ignore_closed_nodes=True, ou
     return out
 
 
+@out_from_buffer_pool("patch", fill=0.0)
 def map_min_of_patch_nodes_to_patch(grid, var_name, ignore_closed_nodes=True, out=None):
     """Map the minimum value of nodes around a patch to the patch.
 
@@ -9,7 +9,8 @@ from ..core.utils import add_module_functions_to_class
 from ..field import GraphFields
 from ..graph import NetworkGraph
 from ..utils.decorators import cache_result_in_object
-from .base import BAD_INDEX_VALUE
+from .base import BAD_INDEX_VALUE, ModelGrid
+from .buffer_pool import BufferPool
 from .decorators import override_array_setitem_and_reset, return_readonly_id_array
 from .linkstatus import LinkStatus, set_status_at_link
 from .nodestatus import NodeStatus
@@ -143,6 +144,36 @@ class NetworkModelGrid(NetworkGraph, GraphFields):
         """Set a new value for the model grid xy_of_reference."""
         self._ref_coord = (new_xy_of_reference[0], new_xy_of_reference[1])
 
+    @property
+    @cache_result_in_object()
+    def buffer_pool(self):
+        """Pool of scratch arrays used by grid mappers and gradients.
+
+        Functions like mappers and gradient calculations that are not given
+        an *out* buffer take their output arrays from this pool. By default
+        the pool allocates a new array for every request but counts the
+        allocations. Turn on reuse to have each function reuse its output
+        (and intermediate) arrays from one call to the next.
+
+        See Also
+        --------
+        landlab.grid.buffer_pool.BufferPool
+
+        Examples
+        --------
+        >>> from landlab import NetworkModelGrid
+        >>> grid = NetworkModelGrid(((0, 1, 2), (0, 0, 0)), ((0, 1), (1, 2)))
+        >>> grid.buffer_pool.reuse = True
+        >>> values_at_link = grid.map_mean_of_link_nodes_to_link(grid.x_of_node)
+        >>> values_at_link is grid.map_mean_of_link_nodes_to_link(grid.y_of_node)
+        True
+        >>> grid.buffer_pool.allocations
+        1
+
+        LLCATS: GINF
+        """
+        return BufferPool(self)
+
     @property
     def axis_units(self):
         """Get units for each axis.
@@ -293,6 +324,42 @@ class NetworkModelGrid(NetworkGraph, GraphFields):
 
         self.bc_set_code += 1
 
+    def status_cache_version(self, name="status_at_node"):
+        """Version number of a cached quantity that depends on node status.
+
+        Caches of a network grid are rebuilt whenever the status of nodes is
+        set so all caches share the same version.
+
+        Parameters
+        ----------
+        name : str, optional
+            Name of the cached quantity.
+
+        Returns
+        -------
+        int
+            The version of the cache.
+
+        Examples
+        --------
+        >>> from landlab import NetworkModelGrid
+        >>> grid = NetworkModelGrid(((0, 1, 2), (0, 0, 0)), ((0, 1), (1, 2)))
+        >>> grid.status_cache_version("status_at_link")
+        0
+        >>> grid.status_at_node[0] = grid.BC_NODE_IS_CLOSED
+        >>> grid.status_cache_version("status_at_link")
+        1
+
+        LLCATS: BC
+        """
+        if name not in ModelGrid._STATUS_CACHES:
+            raise ValueError(
+                "{name}: not a status cache (not one of {names})".format(
+                    name=name, names=", ".join(sorted(ModelGrid._STATUS_CACHES))
+                )
+            )
+        return self.bc_set_code
+
     @property
     @make_return_array_immutable
     @cache_result_in_object()
@@ -2036,6 +2036,64 @@ class RasterModelGrid(
         if return_outlet_id:
             return as_id_array(np.array([outlet_loc]))
 
+    def label_connected_open_nodes(self, adjacency_method="D8"):
+        """Label groups of connected open nodes.
+
+        Nodes that are not closed are grouped with all of the other open
+        nodes they can reach by stepping between open neighbors. Each group
+        is given an integer label, starting from zero and numbered in order
+        of the lowest node ID in the group. Closed nodes are labeled -1.
+
+        Parameters
+        ----------
+        adjacency_method : {'D8', 'D4'}, optional
+            Connect nodes through their diagonals ('D8') or only through
+            links ('D4').
+
+        Returns
+        -------
+        ndarray of int
+            Label of the group each node belongs to.
+
+        Examples
+        --------
+        >>> from landlab import RasterModelGrid
+        >>> grid = RasterModelGrid((4, 6))
+        >>> grid.status_at_node[grid.perimeter_nodes] = grid.BC_NODE_IS_CLOSED
+        >>> grid.status_at_node[[9, 16]] = grid.BC_NODE_IS_CLOSED
+        >>> grid.label_connected_open_nodes(adjacency_method="D4").reshape(
+        ...     grid.shape
+        ... )
+        array([[-1, -1, -1, -1, -1, -1],
+               [-1,  0,  0, -1,  1, -1],
+               [-1,  0,  0,  0, -1, -1],
+               [-1, -1, -1, -1, -1, -1]])
+
+        With D8 connectivity, node 10 connects to node 15 through a diagonal.
+
+        >>> grid.label_connected_open_nodes().reshape(grid.shape)
+        array([[-1, -1, -1, -1, -1, -1],
+               [-1,  0,  0, -1,  0, -1],
+               [-1,  0,  0,  0, -1, -1],
+               [-1, -1, -1, -1, -1, -1]])
+
+        LLCATS: BC
+        """
+        from .cfuncs import _label_connected_open_nodes
+
+        if adjacency_method not in ("D8", "D4"):
+            raise ValueError("Method must be either 'D8'(default) or 'D4'")
+
+        labels = np.empty(self.number_of_nodes, dtype=int)
+        _label_connected_open_nodes(
+            self.shape,
+            np.asarray(self.status_at_node, dtype=np.uint8),
+            self.BC_NODE_IS_CLOSED,
+            adjacency_method == "D8",
+            labels,
+        )
+        return labels
+
     def set_open_nodes_disconnected_from_watershed_to_closed(
         self, node_data, outlet_id=None, nodata_value=-9999.0, adjacency_method="D8"
     ):
@@ -2151,55 +2209,11 @@ class RasterModelGrid(
                 adjacency_method == "D4"
             ), "Method must be either 'D8'(default) or 'D4'"
 
-        # begin main code portion.
-        # initialize list of core nodes and new nodes
-        connected_nodes = list(outlet_id)
-        newNodes = connected_nodes
-
-        # keep track of the number of nodes added in the previous itteration.
-        numAdded = len(newNodes)
-
-        # continue running until no new nodes are added.
-        while numAdded > 0:
-
-            # find all potential new nodes by filtering the nodes connected to
-            # the most recent set of new nodes based on their status.
-            connected_orthogonal_nodes = self.adjacent_nodes_at_node[newNodes]
-            potentialNewNodes = list(
-                connected_orthogonal_nodes[
-                    self.status_at_node[connected_orthogonal_nodes]
-                    != self.BC_NODE_IS_CLOSED
-                ]
-            )
-
-            # if method is D8 (default), add the diagonal nodes.
-            if adjacency_method == "D8":
-                connected_diagonal_nodes = self.diagonal_adjacent_nodes_at_node[
-                    newNodes
-                ]
-                potentialNewNodes.extend(
-                    connected_diagonal_nodes[
-                        self.status_at_node[connected_diagonal_nodes]
-                        != self.BC_NODE_IS_CLOSED
-                    ]
-                )
-
-            # filter new nodes further based on if they are already present in
-            # the connected node list
-            newNodes = list(set(potentialNewNodes) - set(connected_nodes))
-            connected_nodes.extend(newNodes)
-
-            # update number added, when this is zero, the loop will end
-            numAdded = len(newNodes)
-
-        # create an array that identifies the nodes that should be closed
-        # of closed boundary nodes
-        not_connected = np.array((0 * self.status_at_node) + 1)
-        not_connected[np.array(connected_nodes)] = 0
-
-        # identify those nodes that should be closed, but are not yet closed.
+        # label groups of connected open nodes and keep only the group
+        # that contains the outlet.
+        labels = self.label_connected_open_nodes(adjacency_method=adjacency_method)
         is_not_connected_to_outlet = (self.status_at_node != self.BC_NODE_IS_CLOSED) & (
-            not_connected == 1
+            labels != labels[outlet_id]
         )
 
         # modify the node_data array to set those that are disconnected
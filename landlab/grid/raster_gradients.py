@@ -18,8 +18,11 @@ from landlab.core.utils import make_optional_arg_into_id_array, radians_to_degre
 from landlab.grid import gradients
 from landlab.utils.decorators import use_field_name_or_array
 
+from .decorators import out_from_buffer_pool
+
 
 @use_field_name_or_array("node")
+@out_from_buffer_pool("d8")
 def calc_diff_at_d8(grid, node_values, out=None):
     """Calculate differences of node values over links and diagonals.
 
@@ -68,6 +71,7 @@ def calc_diff_at_d8(grid, node_values, out=None):
 
 
 @use_field_name_or_array("node")
+@out_from_buffer_pool("diagonal")
 def calc_diff_at_diagonal(grid, node_values, out=None):
     """Calculate differences of node values over diagonals.
 
@@ -113,6 +117,7 @@ def calc_diff_at_diagonal(grid, node_values, out=None):
     )
 
 
+@out_from_buffer_pool("d8")
 def calc_grad_at_d8(grid, node_values, out=None):
     """Calculate gradients over all diagonals and links.
 
@@ -148,6 +153,7 @@ def calc_grad_at_d8(grid, node_values, out=None):
     return grads
 
 
+@out_from_buffer_pool("diagonal")
 def calc_grad_at_diagonal(grid, node_values, out=None):
     """Calculate gradients over all diagonals.
 
@@ -182,6 +188,7 @@ def calc_grad_at_diagonal(grid, node_values, out=None):
 
 
 @use_field_name_or_array("node")
+@out_from_buffer_pool("link")
 def calc_grad_at_link(grid, node_values, out=None):
     """Calculate gradients in node_values at links.
 
@@ -23,6 +23,8 @@ Mapping functions unique to raster grids
 
 import numpy as np
 
+from .decorators import out_from_buffer_pool
+
 
 def _node_out_link_ids(shape):
     """Links leaving each node.
@@ -146,6 +148,7 @@ def _number_of_links_per_node(shape):
     return n_links_at_node.reshape(shape)
 
 
+@out_from_buffer_pool("node")
 def map_sum_of_inlinks_to_node(grid, var_name, out=None):
     """Map the sum of links entering a node to the node.
 
@@ -201,6 +204,7 @@ def map_sum_of_inlinks_to_node(grid, var_name, out=None):
     return out
 
 
+@out_from_buffer_pool("node")
 def map_mean_of_inlinks_to_node(grid, var_name, out=None):
     """Map the mean of links entering a node to the node.
 
@@ -253,6 +257,7 @@ def map_mean_of_inlinks_to_node(grid, var_name, out=None):
     return out
 
 
+@out_from_buffer_pool("node")
 def map_max_of_inlinks_to_node(grid, var_name, out=None):
     """Map the maximum of links entering a node to the node.
 
@@ -308,6 +313,7 @@ def map_max_of_inlinks_to_node(grid, var_name, out=None):
     return out
 
 
+@out_from_buffer_pool("node")
 def map_min_of_inlinks_to_node(grid, var_name, out=None):
     """Map the minimum of links entering a node to the node.
 
@@ -362,6 +368,7 @@ def map_min_of_inlinks_to_node(grid, var_name, out=None):
     return out
 
 
+@out_from_buffer_pool("node")
 def map_sum_of_outlinks_to_node(grid, var_name, out=None):
     """Map the sum of links leaving a node to the node.
 
@@ -416,6 +423,7 @@ def map_sum_of_outlinks_to_node(grid, var_name, out=None):
     return out
 
 
+@out_from_buffer_pool("node")
 def map_mean_of_outlinks_to_node(grid, var_name, out=None):
     """Map the mean of links leaving a node to the node.
 
@@ -470,6 +478,7 @@ def map_mean_of_outlinks_to_node(grid, var_name, out=None):
     return out
 
 
+@out_from_buffer_pool("node")
 def map_max_of_outlinks_to_node(grid, var_name, out=None):
     """Map the max of links leaving a node to the node.
 
@@ -524,6 +533,7 @@ def map_max_of_outlinks_to_node(grid, var_name, out=None):
     return out
 
 
+@out_from_buffer_pool("node")
 def map_min_of_outlinks_to_node(grid, var_name, out=None):
     """Map the min of links leaving a node to the node.
 
@@ -577,6 +587,7 @@ def map_min_of_outlinks_to_node(grid, var_name, out=None):
     return out
 
 
+@out_from_buffer_pool("node")
 def map_mean_of_links_to_node(grid, var_name, out=None):
     """Map the mean of links touching a node to the node.
 
@@ -644,6 +655,7 @@ def map_mean_of_links_to_node(grid, var_name, out=None):
     return out
 
 
+@out_from_buffer_pool("node")
 def map_mean_of_horizontal_links_to_node(grid, var_name, out=None):
     """Map the mean of links in the x direction touching a node to the node.
 
@@ -699,6 +711,7 @@ def map_mean_of_horizontal_links_to_node(grid, var_name, out=None):
     return out
 
 
+@out_from_buffer_pool("node", fill=0.0)
 def map_mean_of_horizontal_active_links_to_node(grid, var_name, out=None):
     """Map the mean of active links in the x direction touching node to the
     node.
@@ -759,6 +772,7 @@ def map_mean_of_horizontal_active_links_to_node(grid, var_name, out=None):
     return out
 
 
+@out_from_buffer_pool("node")
 def map_mean_of_vertical_links_to_node(grid, var_name, out=None):
     """Map the mean of links in the y direction touching a node to the node.
 
@@ -814,6 +828,7 @@ def map_mean_of_vertical_links_to_node(grid, var_name, out=None):
     return out
 
 
+@out_from_buffer_pool("node", fill=0.0)
 def map_mean_of_vertical_active_links_to_node(grid, var_name, out=None):
     """Map the mean of active links in the y direction touching node to the
     node.
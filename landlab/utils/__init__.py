@@ -4,18 +4,22 @@ from .add_halo import add_halo
 from .count_repeats import count_repeated_values
 from .matrix import get_core_node_at_node, get_core_node_matrix
 from .return_array import return_array_at_link, return_array_at_node
+from .sparse_solver import SparseSolver
 from .source_tracking_algorithm import (
     convert_arc_flow_directions_to_landlab_node_ids,
     find_unique_upstream_hsd_ids_and_fractions,
+    find_upstream_hsd_fractions,
     track_source,
 )
 from .stable_priority_queue import StablePriorityQueue
+from .substepping import SubStepper
 from .watershed import (
     get_watershed_mask,
     get_watershed_masks,
     get_watershed_masks_with_area_threshold,
     get_watershed_nodes,
     get_watershed_outlet,
+    label_watersheds,
 )
 
 __all__ = [
@@ -24,14 +28,18 @@ __all__ = [
     "track_source",
     "convert_arc_flow_directions_to_landlab_node_ids",
     "find_unique_upstream_hsd_ids_and_fractions",
+    "find_upstream_hsd_fractions",
     "get_watershed_mask",
     "get_watershed_masks_with_area_threshold",
     "get_watershed_nodes",
     "get_watershed_outlet",
     "get_watershed_masks",
+    "label_watersheds",
     "StablePriorityQueue",
     "return_array_at_node",
     "return_array_at_link",
     "get_core_node_at_node",
     "get_core_node_matrix",
+    "SparseSolver",
+    "SubStepper",
 ]
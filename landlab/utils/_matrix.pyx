@@ -90,3 +90,83 @@ def fill_right_hand_side(
 
     for tail, head in nodes_at_fv2c_link:
         out[core_node_at_node[head]] -= value_at_node[tail]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def fill_matrix_data(
+    const DTYPE_INT_t[:] links,
+    const DTYPE_INT_t[:] diagonal_at_tail,
+    const DTYPE_INT_t[:] diagonal_at_head,
+    const DTYPE_INT_t[:] upper_at_link,
+    const DTYPE_INT_t[:] lower_at_link,
+    const DTYPE_FLOAT_t[:] coef_at_link,
+    DTYPE_FLOAT_t[:] data,
+):
+    """Fill the data of a core-node matrix from coefficients at links.
+
+    Parameters
+    ----------
+    links : ndarray of int
+        Links that contribute to the matrix.
+    diagonal_at_tail, diagonal_at_head : ndarray of int
+        Position in *data* of the diagonal element of the core node at
+        either end of each link (-1 if the node is not a core node).
+    upper_at_link, lower_at_link : ndarray of int
+        Position in *data* of the off-diagonal elements of each link
+        (-1 if the link does not join two core nodes).
+    coef_at_link : ndarray of float
+        Coefficients at links.
+    data : ndarray of float
+        Matrix data to fill.
+    """
+    cdef int n_links = links.shape[0]
+    cdef int n_values = data.shape[0]
+    cdef int i
+    cdef double coef
+
+    with nogil:
+        for i in range(n_values):
+            data[i] = 0.0
+
+        for i in range(n_links):
+            coef = coef_at_link[links[i]]
+            if diagonal_at_tail[i] >= 0:
+                data[diagonal_at_tail[i]] -= coef
+            if diagonal_at_head[i] >= 0:
+                data[diagonal_at_head[i]] -= coef
+            if upper_at_link[i] >= 0:
+                data[upper_at_link[i]] = coef
+                data[lower_at_link[i]] = coef
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def fill_right_hand_side_at_rows(
+    const DTYPE_INT_t[:] rows,
+    const DTYPE_INT_t[:] nodes,
+    const DTYPE_FLOAT_t[:] value_at_node,
+    DTYPE_FLOAT_t[:] out,
+):
+    """Subtract fixed values of neighbor nodes from a right-hand side.
+
+    Parameters
+    ----------
+    rows : ndarray of int
+        Row of the core node of each core-to-fixed-value link.
+    nodes : ndarray of int
+        The fixed-value node of each core-to-fixed-value link.
+    value_at_node : ndarray of float
+        Values at nodes.
+    out : ndarray of float
+        The right-hand side.
+    """
+    cdef int n_rows = out.shape[0]
+    cdef int n_links = rows.shape[0]
+    cdef int i
+
+    with nogil:
+        for i in range(n_rows):
+            out[i] = 0.0
+        for i in range(n_links):
+            out[rows[i]] -= value_at_node[nodes[i]]
@@ -0,0 +1,108 @@
+import numpy as np
+cimport numpy as np
+cimport cython
+
+DTYPE_INT = int
+ctypedef np.int_t DTYPE_INT_t
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _count_upstream_sources(
+    const DTYPE_INT_t[:] receivers,
+    const DTYPE_INT_t[:] donors,
+    const DTYPE_INT_t[:] donors_at_node,
+    const DTYPE_INT_t[:] source_at_node,
+    DTYPE_INT_t n_sources,
+    DTYPE_INT_t[:] row_start,
+    DTYPE_INT_t[:] row_length,
+):
+    """Count the sources of every node, and of all nodes upstream of it.
+
+    Nodes are visited so that each node is visited after all of its donors
+    (nodes that are their own receivers are not their own donors). The
+    sources counted at a node are its own source, if *source_at_node* is
+    not negative, plus those counted at each of its donors. These are
+    merged with a dense work array over sources, so the cost of a node is
+    the number of different sources of its donors.
+
+    Counts are stored by row, one row per node, in the order nodes are
+    visited. The row of each node starts at *row_start* and has
+    *row_length* elements.
+
+    Returns
+    -------
+    tuple of ndarray of int
+        Sources and counts of the sources of all rows.
+    """
+    cdef int n_nodes = receivers.shape[0]
+    cdef DTYPE_INT_t[:] n_pending = np.zeros(n_nodes, dtype=DTYPE_INT)
+    cdef DTYPE_INT_t[:] ready = np.empty(n_nodes, dtype=DTYPE_INT)
+    cdef DTYPE_INT_t[:] count_at_source = np.zeros(n_sources, dtype=DTYPE_INT)
+    cdef DTYPE_INT_t[:] touched = np.empty(n_sources, dtype=DTYPE_INT)
+    cdef int capacity = 2 * n_nodes + 1
+    cdef DTYPE_INT_t[:] sources = np.empty(capacity, dtype=DTYPE_INT)
+    cdef DTYPE_INT_t[:] counts = np.empty(capacity, dtype=DTYPE_INT)
+    cdef int n_ready = 0
+    cdef int n_values = 0
+    cdef int head, node, receiver, donor, source, k, m, n_touched
+
+    for node in range(n_nodes):
+        if receivers[node] != node:
+            n_pending[receivers[node]] += 1
+    for node in range(n_nodes):
+        if n_pending[node] == 0:
+            ready[n_ready] = node
+            n_ready += 1
+
+    for head in range(n_nodes):
+        if head == n_ready:
+            break
+        node = ready[head]
+
+        n_touched = 0
+        source = source_at_node[node]
+        if source >= 0:
+            count_at_source[source] = 1
+            touched[0] = source
+            n_touched = 1
+        for k in range(donors_at_node[node], donors_at_node[node + 1]):
+            donor = donors[k]
+            if donor == node:
+                continue
+            for m in range(row_start[donor], row_start[donor] + row_length[donor]):
+                source = sources[m]
+                if count_at_source[source] == 0:
+                    touched[n_touched] = source
+                    n_touched += 1
+                count_at_source[source] += counts[m]
+
+        if n_values + n_touched > capacity:
+            capacity = max(2 * capacity, n_values + n_touched)
+            sources = _grow(sources, n_values, capacity)
+            counts = _grow(counts, n_values, capacity)
+
+        row_start[node] = n_values
+        row_length[node] = n_touched
+        for k in range(n_touched):
+            source = touched[k]
+            sources[n_values] = source
+            counts[n_values] = count_at_source[source]
+            count_at_source[source] = 0
+            n_values += 1
+
+        receiver = receivers[node]
+        if receiver != node:
+            n_pending[receiver] -= 1
+            if n_pending[receiver] == 0:
+                ready[n_ready] = receiver
+                n_ready += 1
+
+    return np.asarray(sources[:n_values]), np.asarray(counts[:n_values])
+
+
+def _grow(DTYPE_INT_t[:] values, int n_values, int capacity):
+    """Copy the first values of an array to a new, larger array."""
+    grown = np.empty(capacity, dtype=DTYPE_INT)
+    grown[:n_values] = values[:n_values]
+    return grown
@@ -0,0 +1,113 @@
+import numpy as np
+cimport numpy as np
+cimport cython
+
+DTYPE_INT = int
+ctypedef np.int_t DTYPE_INT_t
+
+DTYPE_FLOAT = np.double
+ctypedef np.double_t DTYPE_FLOAT_t
+
+cdef enum:
+    _MIN = 0
+    _MAX = 1
+    _SUM = 2
+
+REDUCE_MIN = _MIN
+REDUCE_MAX = _MAX
+REDUCE_SUM = _SUM
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _accumulate_up_stack(
+    const DTYPE_INT_t[:] stack,
+    const DTYPE_INT_t[:, :] receivers,
+    const DTYPE_FLOAT_t[:, :] weights,
+    DTYPE_FLOAT_t[:] values,
+    int select,
+):
+    """Add weights to the values of receivers, from outlets upstream.
+
+    At each node, the receiver that is followed is the one with the smallest
+    (*select* is ``REDUCE_MIN``) or largest (``REDUCE_MAX``) value; ties go
+    to the smallest (or largest) weight. Receivers less than zero are
+    ignored.
+    """
+    cdef int n_nodes = stack.shape[0]
+    cdef int n_receivers = receivers.shape[1]
+    cdef int i, j, node, receiver
+    cdef double best_value, best_weight, value, weight
+    cdef bint found
+
+    with nogil:
+        for i in range(n_nodes):
+            node = stack[i]
+            found = False
+            for j in range(n_receivers):
+                receiver = receivers[node, j]
+                if receiver < 0:
+                    continue
+                value = values[receiver]
+                weight = weights[node, j]
+                if not found:
+                    found = True
+                elif select == _MIN:
+                    if value > best_value or (
+                        value == best_value and weight >= best_weight
+                    ):
+                        continue
+                else:
+                    if value < best_value or (
+                        value == best_value and weight <= best_weight
+                    ):
+                        continue
+                best_value = value
+                best_weight = weight
+            if found:
+                values[node] = best_value + best_weight
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _accumulate_down_stack(
+    const DTYPE_INT_t[:] stack,
+    const DTYPE_INT_t[:, :] receivers,
+    const DTYPE_FLOAT_t[:, :] weights,
+    DTYPE_FLOAT_t[:] values,
+    int reduce,
+    const np.uint8_t[:] reset_at,
+    double reset_value,
+):
+    """Pass values plus weights to receivers, from headwaters downstream.
+
+    Nodes are visited in the reverse of *stack*. At each node, the value
+    (reset to *reset_value* if *reset_at* is set at the node) plus the
+    weight of each link is combined with the value of the receiver at the
+    other end, using *reduce*. Receivers less than zero, and nodes that are
+    their own receivers, are ignored.
+    """
+    cdef int n_nodes = stack.shape[0]
+    cdef int n_receivers = receivers.shape[1]
+    cdef bint with_reset = reset_at is not None
+    cdef int i, j, node, receiver
+    cdef double value
+
+    with nogil:
+        for i in range(n_nodes - 1, -1, -1):
+            node = stack[i]
+            if with_reset and reset_at[node]:
+                values[node] = reset_value
+            for j in range(n_receivers):
+                receiver = receivers[node, j]
+                if receiver < 0 or receiver == node:
+                    continue
+                value = values[node] + weights[node, j]
+                if reduce == _SUM:
+                    values[receiver] += value
+                elif reduce == _MAX:
+                    if values[receiver] < value:
+                        values[receiver] = value
+                else:
+                    if values[receiver] > value:
+                        values[receiver] = value
@@ -0,0 +1,40 @@
+import numpy as np
+cimport numpy as np
+cimport cython
+
+DTYPE_INT = int
+ctypedef np.int_t DTYPE_INT_t
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _label_watersheds(
+    const DTYPE_INT_t[:] stack,
+    const DTYPE_INT_t[:] receivers,
+    const DTYPE_INT_t[:] basin_at_node,
+    DTYPE_INT_t[:] labels,
+    DTYPE_INT_t[:] parents,
+):
+    """Label nodes with the basin of their nearest downstream outlet.
+
+    Nodes are visited in *stack* order so that receivers are labeled before
+    their donors. Outlets (nodes where *basin_at_node* is not negative) are
+    labeled with their own basin, and the parent of that basin is the label
+    of the outlet's receiver. Other nodes take the label of their receiver.
+    Nodes that are their own receivers, and are not outlets, keep their
+    label.
+    """
+    cdef int n_nodes = stack.shape[0]
+    cdef int i, node, receiver, basin
+
+    with nogil:
+        for i in range(n_nodes):
+            node = stack[i]
+            receiver = receivers[node]
+            basin = basin_at_node[node]
+            if basin >= 0:
+                labels[node] = basin
+                if receiver != node:
+                    parents[basin] = labels[receiver]
+            elif receiver != node:
+                labels[node] = labels[receiver]
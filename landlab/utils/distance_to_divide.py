@@ -4,6 +4,8 @@ import numpy as np
 
 from landlab import FieldError, RasterModelGrid
 
+from .stack_accumulate import accumulate_down_stack
+
 
 def calculate_distance_to_divide(
     grid, longest_path=True, add_to_grid=False, clobber=False
@@ -149,13 +151,6 @@ def calculate_distance_to_divide(
             "nodes of the input grid."
         )
 
-    # get the reciever nodes, depending on if this is to-one, or to-multiple,
-    # we'll need to get a different at-node field.
-    if grid.at_node["flow__receiver_node"].size != grid.size("node"):
-        to_one = False
-    else:
-        to_one = True
-
     flow__receiver_node = grid.at_node["flow__receiver_node"]
     drainage_area = grid.at_node["drainage_area"]
 
@@ -178,56 +173,20 @@ def calculate_distance_to_divide(
     if not longest_path:
         distance_to_divide[:] = 2 * grid.size("node") * np.max(flow_link_lengths)
 
-    # iterate through the flow__upstream_node_order backwards.
-    for node in reversed(flow__upstream_node_order):
-
-        # if drainage are is equal to node cell area, set distance to zeros
-        # this should handle the drainage divide cells as boundary cells have
-        # their area set to zero.
-        if drainage_area[node] == grid.cell_area_at_node[node]:
-            distance_to_divide[node] = 0
-
-        # get flow recievers
-        reciever = flow__receiver_node[node]
-
-        if to_one:
-            # if not processing an outlet node.
-            if reciever != node:
-
-                if longest_path:
-                    cond = (
-                        distance_to_divide[reciever]
-                        < distance_to_divide[node] + flow_link_lengths[node]
-                    )
-                else:
-                    cond = (
-                        distance_to_divide[reciever]
-                        > distance_to_divide[node] + flow_link_lengths[node]
-                    )
-
-                if cond:
-                    distance_to_divide[reciever] = (
-                        distance_to_divide[node] + flow_link_lengths[node]
-                    )
-
-        else:
-            # non-existant links are coded with -1
-            useable_receivers = np.where(reciever != grid.BAD_INDEX)[0]
-
-            for idx in range(len(useable_receivers)):
-                r = reciever[useable_receivers][idx]
-                fll = flow_link_lengths[node][useable_receivers][idx]
-
-                # if not processing an outlet node.
-                if r != node:
-
-                    if longest_path:
-                        cond = distance_to_divide[r] < distance_to_divide[node] + fll
-                    else:
-                        cond = distance_to_divide[r] > distance_to_divide[node] + fll
-
-                    if cond:
-                        distance_to_divide[r] = distance_to_divide[node] + fll
+    # iterate through the flow__upstream_node_order backwards, passing the
+    # distance plus the link length on to receivers if it is longer (or
+    # shorter) than what they have. Where drainage area is equal to node cell
+    # area, the distance is set to zero; this should handle the drainage
+    # divide cells as boundary cells have their area set to zero.
+    accumulate_down_stack(
+        flow__upstream_node_order,
+        flow__receiver_node,
+        flow_link_lengths,
+        out=distance_to_divide,
+        reduce="max" if longest_path else "min",
+        reset_at=drainage_area == grid.cell_area_at_node,
+        reset_value=0.0,
+    )
 
     # store on the grid
     if add_to_grid:
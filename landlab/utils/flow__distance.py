@@ -4,6 +4,8 @@ import numpy as np
 
 from landlab import FieldError, RasterModelGrid
 
+from .stack_accumulate import accumulate_up_stack
+
 
 def calculate_flow__distance(grid, add_to_grid=False, clobber=False):
     """Calculate the along flow distance from node to outlet.
@@ -121,99 +123,39 @@ def calculate_flow__distance(grid, add_to_grid=False, clobber=False):
             "nodes of the input grid."
         )
 
-    # get the reciever nodes, depending on if this is to-one, or to-multiple,
-    # we'll need to get a different at-node field.
-    if grid.at_node["flow__receiver_node"].size != grid.size("node"):
-        to_one = False
-    else:
-        to_one = True
     flow__receiver_node = grid.at_node["flow__receiver_node"]
 
     # get the upstream node order
     flow__upstream_node_order = grid.at_node["flow__upstream_node_order"]
 
     # get downstream flow link lengths, result depends on type of grid.
+    flow__link_to_receiver_node = grid.at_node["flow__link_to_receiver_node"]
     if isinstance(grid, RasterModelGrid):
-        flow_link_lengths = grid.length_of_d8[
-            grid.at_node["flow__link_to_receiver_node"]
-        ]
+        flow_link_lengths = grid.length_of_d8[flow__link_to_receiver_node]
     else:
-        flow_link_lengths = grid.length_of_link[
-            grid.at_node["flow__link_to_receiver_node"]
-        ]
-
-    # create an array that representes the outlet lengths.
-    flow__distance = np.zeros(grid.nodes.size)
-
-    # iterate through the flow__upstream_node_order, this will already have
-    # identified the locations of the outlet nodes and have
-    for node in flow__upstream_node_order:
-
-        # get flow recievers
-        reciever = flow__receiver_node[node]
-
-        # assess if this is a to one (D8/D4) or to multiple (Dinf, MFD)
-        # flow directing method.
-        if to_one:
-            potential_outlet = reciever
-        else:
-            # if this is an outlet, the first element of the recievers will be
-            # the nodes ID.
-            potential_outlet = reciever[0]
-
-        # assess if this is an outlet or not.
-        if potential_outlet == node:
-            not_outlet = False
-        else:
-            not_outlet = True
-
-        # if not an outlet
-        if not_outlet:
-
-            # deal with the two cases of route to one and route to multiple.
-            if to_one:
-                # get the stream length of the downstream node
-                downstream_stream_length = flow__distance[reciever]
-
-                # get the stream segment length from this node to its downstream
-                # neigbor
-                stream_increment_length = flow_link_lengths[node]
-
-            else:
-                # non-existant links are coded with -1
-                useable_receivers = np.where(reciever != grid.BAD_INDEX)[0]
-
-                # we will have the stream flow to the downstream node with the
-                # shortest distance to the outlet.
-                # in the event of a tie, we will choose the shorter link length.
-
-                # get the flow distances of the downstream nodes
-                potential_downstream_stream_lengths = flow__distance[
-                    flow__receiver_node[node]
-                ][useable_receivers]
-
-                # get the stream segment lengths from this node to its downstream
-                # neighbor
-                potential_stream_increment_lengths = flow_link_lengths[node][
-                    useable_receivers
-                ]
-
-                # get the lowest downstream stream length.
-                downstream_stream_length = np.min(potential_downstream_stream_lengths)
-
-                # determine which of the stream increments flowed to this
-                # downstream neighbor.
-                which_link = np.where(
-                    potential_downstream_stream_lengths == downstream_stream_length
-                )[0]
-
-                # and choose the smallest of these links.
-                stream_increment_length = np.min(
-                    potential_stream_increment_lengths[which_link]
-                )
-
-            # set the total stream length of this node
-            flow__distance[node] = downstream_stream_length + stream_increment_length
+        flow_link_lengths = grid.length_of_link[flow__link_to_receiver_node]
+
+    # non-existant links (coded with -1), and links from outlets to
+    # themselves, add nothing, which leaves the distance of outlets as zero.
+    nodes = np.arange(grid.number_of_nodes).reshape(
+        (-1,) + (1,) * (flow__receiver_node.ndim - 1)
+    )
+    flow_link_lengths[
+        (flow__link_to_receiver_node == grid.BAD_INDEX)
+        | (flow__receiver_node == nodes)
+    ] = 0.0
+
+    # iterate upstream through the nodes, adding the length of the link to
+    # the receiver to its distance. With multiple receivers, flow goes to the
+    # downstream node with the shortest distance to the outlet; in the event
+    # of a tie, we choose the shorter link length.
+    flow__distance = accumulate_up_stack(
+        flow__upstream_node_order,
+        flow__receiver_node,
+        flow_link_lengths,
+        out=np.zeros(grid.nodes.size),
+        select="min",
+    )
 
     # store on the grid
     if add_to_grid:
@@ -6,7 +6,8 @@ import numpy as np
 from scipy.sparse import csc_matrix
 
 from ._matrix import (
-    fill_right_hand_side,
+    fill_matrix_data,
+    fill_right_hand_side_at_rows,
     get_matrix_diagonal_elements,
     get_matrix_diagonal_elements_with_coef,
 )
@@ -196,31 +197,244 @@ def get_core_node_matrix(grid, value_at_node, coef_at_link=None):
            [-26.],
            [-30.]])
     """
-    value_at_node = np.broadcast_to(value_at_node, grid.number_of_nodes)
-    if coef_at_link is not None:
-        coef_at_link = np.broadcast_to(coef_at_link, grid.number_of_links)
+    return CoreNodeMatrixBuilder(grid).build(value_at_node, coef_at_link=coef_at_link)
 
-    (values, (row_inds, col_inds)) = get_matrix_entries(grid, coef_at_link=coef_at_link)
 
-    mat = csc_matrix(
-        (values, (row_inds, col_inds)),
-        shape=(grid.number_of_core_nodes, grid.number_of_core_nodes),
-    )
+class CoreNodeMatrixBuilder:
 
-    fv2core = grid.link_with_node_status(
-        status_at_tail=grid.BC_NODE_IS_FIXED_VALUE, status_at_head=grid.BC_NODE_IS_CORE
-    )
-    core2fv = grid.link_with_node_status(
-        status_at_tail=grid.BC_NODE_IS_CORE, status_at_head=grid.BC_NODE_IS_FIXED_VALUE
-    )
+    """Build core-node matrices that share a sparsity pattern.
 
-    core_node_at_node = get_core_node_at_node(grid)
-    nodes_at_c2fv_link = grid.nodes_at_link[core2fv]
-    nodes_at_fv2c_link = grid.nodes_at_link[fv2core]
+    The matrix built by :func:`get_core_node_matrix` has a structure that
+    depends only on the status of the grid's nodes. A
+    *CoreNodeMatrixBuilder* finds this structure, along with the position
+    in the matrix's data array of the elements each link contributes to,
+    once for each version of node status. New matrices are then
+    built by a single compiled pass over the links that only updates the
+    data array.
 
-    rhs = np.zeros(grid.number_of_core_nodes, dtype=float)
-    fill_right_hand_side(
-        nodes_at_c2fv_link, nodes_at_fv2c_link, core_node_at_node, value_at_node, rhs
-    )
+    The matrix is symmetric, so its compressed-column and compressed-row
+    representations are the same; it is returned in compressed-column
+    format, as :func:`get_core_node_matrix` does.
+
+    Parameters
+    ----------
+    grid : RasterModelGrid, HexModelGrid
+        A landlab grid.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab import RasterModelGrid
+    >>> from landlab.utils.matrix import CoreNodeMatrixBuilder
+
+    >>> grid = RasterModelGrid((4, 5))
+    >>> grid.status_at_node[13] = grid.BC_NODE_IS_FIXED_VALUE
+    >>> grid.status_at_node[2] = grid.BC_NODE_IS_CLOSED
+
+    >>> builder = CoreNodeMatrixBuilder(grid)
+    >>> coefs = np.arange(grid.number_of_links, dtype=float)
+    >>> mat = builder.get_matrix(coefs)
+    >>> mat.toarray()
+    array([[-38.,  10.,   0.,  14.,   0.],
+           [ 10., -36.,  11.,   0.,  15.],
+           [  0.,  11., -46.,   0.,   0.],
+           [ 14.,   0.,   0., -74.,  19.],
+           [  0.,  15.,   0.,  19., -78.]])
+    >>> builder.get_rhs(np.arange(grid.number_of_nodes, dtype=float))
+    array([ -6.,   0., -25., -26., -30.])
+
+    The same matrix is returned by each call, with updated values.
+
+    >>> builder.get_matrix() is mat
+    True
+    >>> mat.toarray()
+    array([[-4.,  1.,  0.,  1.,  0.],
+           [ 1., -3.,  1.,  0.,  1.],
+           [ 0.,  1., -4.,  0.,  0.],
+           [ 1.,  0.,  0., -4.,  1.],
+           [ 0.,  1.,  0.,  1., -4.]])
+
+    A change in node status changes the structure of the matrix.
+
+    >>> grid.status_at_node[6] = grid.BC_NODE_IS_FIXED_VALUE
+    >>> builder.get_matrix().shape
+    (4, 4)
+    """
+
+    def __init__(self, grid):
+        self._grid = grid
+        self._status_version = None
+        self._matrix = None
+
+    @property
+    def grid(self):
+        """The grid the matrix is built for."""
+        return self._grid
+
+    def _update_structure(self):
+        """Find the structure of the matrix if node status has changed."""
+        version = self._grid.status_cache_version("status_at_node")
+        if version == self._status_version:
+            return
+        self._status_version = version
+
+        grid = self._grid
+        core2core = grid.link_with_node_status(
+            status_at_tail=grid.BC_NODE_IS_CORE, status_at_head=grid.BC_NODE_IS_CORE
+        )
+        core2fv = grid.link_with_node_status(
+            status_at_tail=grid.BC_NODE_IS_CORE, status_at_head=grid.BC_NODE_IS_FIXED_VALUE
+        )
+        fv2core = grid.link_with_node_status(
+            status_at_tail=grid.BC_NODE_IS_FIXED_VALUE, status_at_head=grid.BC_NODE_IS_CORE
+        )
+        core_node_at_node = get_core_node_at_node(grid)
+        core_nodes_at_c2c_link = core_node_at_node[grid.nodes_at_link[core2core]]
+        n_core_nodes = grid.number_of_core_nodes
+        n_c2c_links = len(core2core)
+
+        # diagonal, upper, and lower elements, sorted into column order
+        rows = np.concatenate(
+            (
+                np.arange(n_core_nodes),
+                core_nodes_at_c2c_link[:, 0],
+                core_nodes_at_c2c_link[:, 1],
+            )
+        )
+        cols = np.concatenate(
+            (
+                np.arange(n_core_nodes),
+                core_nodes_at_c2c_link[:, 1],
+                core_nodes_at_c2c_link[:, 0],
+            )
+        )
+        order = np.lexsort((rows, cols))
+        position = np.empty_like(order)
+        position[order] = np.arange(len(order))
+
+        indptr = np.zeros(n_core_nodes + 1, dtype=int)
+        np.cumsum(np.bincount(cols, minlength=n_core_nodes), out=indptr[1:])
+        self._matrix = csc_matrix(
+            (np.zeros(len(order)), rows[order], indptr),
+            shape=(n_core_nodes, n_core_nodes),
+        )
+        self._matrix.has_sorted_indices = True
+
+        # where each link adds to the matrix data
+        diagonal = position[:n_core_nodes]
+        no_element = np.full(len(core2fv) + len(fv2core), -1, dtype=int)
+        self._links = np.concatenate((core2core, core2fv, fv2core))
+        self._diagonal_at_tail = np.concatenate(
+            (
+                diagonal[core_nodes_at_c2c_link[:, 0]],
+                diagonal[core_node_at_node[grid.node_at_link_tail[core2fv]]],
+                no_element[: len(fv2core)],
+            )
+        )
+        self._diagonal_at_head = np.concatenate(
+            (
+                diagonal[core_nodes_at_c2c_link[:, 1]],
+                no_element[: len(core2fv)],
+                diagonal[core_node_at_node[grid.node_at_link_head[fv2core]]],
+            )
+        )
+        self._upper_at_link = np.concatenate(
+            (position[n_core_nodes : n_core_nodes + n_c2c_links], no_element)
+        )
+        self._lower_at_link = np.concatenate(
+            (position[n_core_nodes + n_c2c_links :], no_element)
+        )
 
-    return mat, rhs.reshape((-1, 1))
+        # fixed-value nodes, and the row of their core neighbor
+        self._rhs_rows = np.concatenate(
+            (
+                core_node_at_node[grid.node_at_link_tail[core2fv]],
+                core_node_at_node[grid.node_at_link_head[fv2core]],
+            )
+        )
+        self._rhs_nodes = np.concatenate(
+            (grid.node_at_link_head[core2fv], grid.node_at_link_tail[fv2core])
+        )
+
+    def get_matrix(self, coef_at_link=None):
+        """Fill the core-node matrix.
+
+        Parameters
+        ----------
+        coef_at_link : ndarray, optional
+            Coefficents at links used to construct the matrix. If not
+            provided, use 1.0.
+
+        Returns
+        -------
+        scipy.sparse.csc_matrix
+            The matrix. This matrix is owned by the builder and is
+            overwritten by the next call.
+        """
+        self._update_structure()
+        if coef_at_link is None:
+            coef_at_link = np.broadcast_to(1.0, self._grid.number_of_links)
+        else:
+            coef_at_link = np.broadcast_to(
+                np.asarray(coef_at_link, dtype=float), self._grid.number_of_links
+            )
+
+        fill_matrix_data(
+            self._links,
+            self._diagonal_at_tail,
+            self._diagonal_at_head,
+            self._upper_at_link,
+            self._lower_at_link,
+            coef_at_link,
+            self._matrix.data,
+        )
+        return self._matrix
+
+    def get_rhs(self, value_at_node, out=None):
+        """Fill the right-hand side vector.
+
+        Parameters
+        ----------
+        value_at_node : ndarray
+            Values defined at nodes used to construct the right-hand side
+            vector.
+        out : ndarray, optional
+            Buffer to place the vector into.
+
+        Returns
+        -------
+        ndarray
+            Right-hand side vector at core nodes.
+        """
+        self._update_structure()
+        value_at_node = np.broadcast_to(
+            np.asarray(value_at_node, dtype=float), self._grid.number_of_nodes
+        )
+        if out is None:
+            out = np.empty(self._grid.number_of_core_nodes, dtype=float)
+
+        fill_right_hand_side_at_rows(
+            self._rhs_rows, self._rhs_nodes, value_at_node, out
+        )
+        return out
+
+    def build(self, value_at_node, coef_at_link=None):
+        """A matrix for core nodes and a right-hand side vector.
+
+        Parameters
+        ----------
+        value_at_node : ndarray
+            Values defined at nodes used to construct the right-hand side
+            vector.
+        coef_at_link : ndarray, optional
+            Coefficents at links used to construct the matrix. If not
+            provided, use 1.0.
+
+        Returns
+        -------
+        tuple of (csc_matrix, ndarray)
+            The matrix and right-hand side vector (as a column vector), as
+            returned by :func:`get_core_node_matrix`.
+        """
+        rhs = self.get_rhs(value_at_node)
+        return self.get_matrix(coef_at_link=coef_at_link), rhs.reshape((-1, 1))
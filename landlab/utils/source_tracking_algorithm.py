@@ -7,6 +7,7 @@ Source Tracking Algorithm
     ~landlab.utils.source_tracking_algorithm.convert_arc_flow_directions_to_landlab_node_ids
     ~landlab.utils.source_tracking_algorithm.track_source
     ~landlab.utils.source_tracking_algorithm.find_unique_upstream_hsd_ids_and_fractions
+    ~landlab.utils.source_tracking_algorithm.find_upstream_hsd_fractions
 
 Authors: Sai Nudurupati & Erkan Istanbulluoglu
 
@@ -27,6 +28,9 @@ import copy
 from collections import Counter
 
 import numpy as np
+from scipy.sparse import csr_matrix
+
+from ._source_tracking import _count_upstream_sources
 
 
 def convert_arc_flow_directions_to_landlab_node_ids(grid, flow_dir_arc):
@@ -102,7 +106,9 @@ def track_source(grid, hsd_ids, flow_directions=None):
     expected to be time intensive. It is not recommended to be run frequently
     in a modeling exercise. Due to its intensive nature, this algorithm may
     fail with large watersheds (a present, the development team has not
-    derived a maximum stable watershed size).
+    derived a maximum stable watershed size). For large grids, use
+    find_upstream_hsd_fractions instead, which finds the fractions of
+    upstream HSD ids at every node in a single pass.
 
     This function was initially developed to find contributing area of a
     30 m grid (MD), where the quantitative data that we were interested in was
@@ -267,3 +273,125 @@ def find_unique_upstream_hsd_ids_and_fractions(hsd_upstr):
         e = [s / float(sum(buf)) for s in buf]
         fractions.update({ke: e})
     return (unique_ids, fractions)
+
+
+def find_upstream_hsd_fractions(grid, hsd_ids, flow_directions=None):
+    """Find the fractions of upstream HSD ids at every core node.
+
+    This is a fast alternative to track_source followed by
+    find_unique_upstream_hsd_ids_and_fractions. Rather than walking
+    downstream from every node, the counts of HSD ids are accumulated in a
+    single pass over the grid from the headwaters down, with the counts at
+    each node made by merging those of its donors. As with track_source,
+    only core nodes contribute and flow paths end where they leave the core
+    nodes. The time taken is proportional to the number of nodes times the
+    number of different HSD ids upstream of each node.
+
+    Parameters
+    ----------
+    grid: RasterModelGrid
+        A grid.
+    hsd_ids: ndarray of int, shape (n_nodes, )
+        array that maps the nodes of the grid to, possibly coarser,
+        Hydrologic Source Domain (HSD) grid ids.
+    flow_directions: ndarray of int, shape (n_nodes, ), optional.
+        downstream node at each node. Alternatively, this data can be
+        provided as a nodal field 'flow__receiver_node' on the grid.
+
+    Returns
+    -------
+    (fractions, unique_ids, flow_accum): (csr_matrix, ndarray, ndarray)
+        'fractions' is a sparse matrix of shape (n_nodes, n_unique_ids).
+        Row i holds the fractions of the upstream contributing nodes of node
+        i that are in each HSD id; rows of nodes that are not core nodes are
+        empty. 'unique_ids' is the HSD id of each column of 'fractions'.
+        'flow_accum' is an array of the number of upstream contributing
+        nodes at each node.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab import RasterModelGrid
+    >>> from landlab.utils import find_upstream_hsd_fractions
+
+    Core nodes 6, 7 and 8 drain, from left to right, to the open boundary
+    node at 9.
+
+    >>> grid = RasterModelGrid((3, 5))
+    >>> grid.status_at_node[9] = grid.BC_NODE_IS_FIXED_VALUE
+    >>> receivers = np.arange(15)
+    >>> receivers[6:9] = [7, 8, 9]
+    >>> hsd_ids = np.array([0, 0, 0, 0, 0, 5, 5, 5, 7, 7, 5, 5, 5, 7, 7])
+    >>> fractions, unique_ids, flow_accum = find_upstream_hsd_fractions(
+    ...     grid, hsd_ids, flow_directions=receivers
+    ... )
+    >>> unique_ids
+    array([0, 5, 7])
+    >>> flow_accum[6:9]
+    array([1, 2, 3])
+    >>> fractions[6:9].toarray()
+    array([[ 0.        ,  1.        ,  0.        ],
+           [ 0.        ,  1.        ,  0.        ],
+           [ 0.        ,  0.66666667,  0.33333333]])
+    """
+    if flow_directions is None:
+        if grid.at_node["flow__receiver_node"].size != grid.size("node"):
+            msg = (
+                "A route-to-multiple flow director has been "
+                "run on this grid. The landlab development team has not "
+                "verified that the source tracking utility is compatible with "
+                "route-to-multiple methods. Please open a GitHub Issue "
+                "to start this process."
+            )
+            raise NotImplementedError(msg)
+
+        r = grid.at_node["flow__receiver_node"]
+    else:
+        r = flow_directions
+
+    n_nodes = grid.number_of_nodes
+    is_core = np.zeros(n_nodes, dtype=bool)
+    is_core[grid.core_nodes] = True
+
+    # flow paths end at nodes that are not core nodes, which neither receive
+    # flow nor contribute it.
+    receivers = np.arange(n_nodes)
+    routes_to_core = is_core & is_core[r]
+    receivers[routes_to_core] = r[routes_to_core]
+
+    donors = np.argsort(receivers, kind="stable")
+    donors_at_node = np.zeros(n_nodes + 1, dtype=int)
+    np.cumsum(np.bincount(receivers, minlength=n_nodes), out=donors_at_node[1:])
+
+    unique_ids, source_at_node = np.unique(hsd_ids, return_inverse=True)
+    source_at_node[~is_core] = -1
+
+    row_start = np.zeros(n_nodes, dtype=int)
+    row_length = np.zeros(n_nodes, dtype=int)
+    sources, counts = _count_upstream_sources(
+        receivers,
+        donors,
+        donors_at_node,
+        source_at_node,
+        len(unique_ids),
+        row_start,
+        row_length,
+    )
+
+    # reorder rows from the order in which nodes were visited to node order.
+    indptr = np.zeros(n_nodes + 1, dtype=int)
+    np.cumsum(row_length, out=indptr[1:])
+    order = np.repeat(row_start - indptr[:-1], row_length) + np.arange(indptr[-1])
+
+    counts = counts[order]
+    has_row = row_length > 0
+    flow_accum = np.zeros(n_nodes, dtype=int)
+    flow_accum[has_row] = np.add.reduceat(counts, indptr[:-1][has_row])
+
+    fractions = csr_matrix(
+        (counts / np.repeat(flow_accum, row_length), sources[order], indptr),
+        shape=(n_nodes, len(unique_ids)),
+    )
+    fractions.sort_indices()
+
+    return (fractions, unique_ids, flow_accum)
@@ -0,0 +1,298 @@
+#! /usr/bin/env python
+"""Solve sparse linear systems that are assembled over and over.
+
+Implicit components build a sparse matrix of the same structure (often with
+the same values) every time they are run. A :class:`SparseSolver` keeps
+what it can from one solve to the next: the factorization of the matrix
+when using a direct solver, and the preconditioner and the previous
+solution (as a starting guess) when using an iterative solver.
+
+Examples
+--------
+>>> import numpy as np
+>>> from landlab import RasterModelGrid
+>>> from landlab.utils import SparseSolver, get_core_node_matrix
+
+>>> grid = RasterModelGrid((4, 5))
+>>> mat, rhs = get_core_node_matrix(grid, np.ones(grid.number_of_nodes))
+
+>>> solver = SparseSolver()
+>>> solver.solve(mat, rhs)
+array([ 1.,  1.,  1.,  1.,  1.,  1.])
+>>> solver.solve(mat, rhs)
+array([ 1.,  1.,  1.,  1.,  1.,  1.])
+>>> solver.number_of_factorizations
+1
+
+>>> solver = SparseSolver(method="cg", preconditioner="jacobi")
+>>> np.allclose(solver.solve(mat, rhs), 1.0)
+True
+>>> solver.iterations > 0
+True
+"""
+import time
+
+import numpy as np
+from scipy.sparse import csc_matrix, diags
+from scipy.sparse.linalg import LinearOperator, bicgstab, cg, spilu, splu
+
+try:
+    import pyamg
+except ImportError:
+    pyamg = None
+
+
+_METHODS = ("direct", "cg", "bicgstab")
+_ITERATIVE_SOLVERS = {"cg": cg, "bicgstab": bicgstab}
+_PRECONDITIONERS = (None, "jacobi", "ilu", "lu", "amg")
+
+
+def _solve_iteratively(
+    method, mat, rhs, x0=None, M=None, rtol=1e-8, maxiter=None, callback=None
+):
+    """Iterative solve for versions of scipy with *tol* or *rtol*."""
+    solver = _ITERATIVE_SOLVERS[method]
+    try:
+        return solver(
+            mat, rhs, x0=x0, M=M, rtol=rtol, maxiter=maxiter, callback=callback
+        )
+    except TypeError:
+        return solver(
+            mat, rhs, x0=x0, M=M, tol=rtol, maxiter=maxiter, callback=callback
+        )
+
+
+def _scaled_ilu(mat):
+    """Incomplete LU preconditioner of a symmetrically scaled matrix.
+
+    The matrix is scaled to have a unit diagonal before it is factored,
+    which keeps the incomplete factorization stable when matrix values
+    span many orders of magnitude.
+    """
+    scale = 1.0 / np.sqrt(np.abs(mat.diagonal()))
+    scale_mat = diags(scale)
+    ilu = spilu(
+        (scale_mat @ mat @ scale_mat).tocsc(),
+        permc_spec="MMD_AT_PLUS_A",
+        diag_pivot_thresh=0.0,
+    )
+
+    def solve(rhs):
+        return scale * ilu.solve(scale * rhs)
+
+    return solve
+
+
+class SparseSolver:
+
+    """Solve a sparse linear system, reusing work from previous solves.
+
+    Parameters
+    ----------
+    method : {"direct", "cg", "bicgstab"}, optional
+        Solve with a sparse LU factorization (*"direct"*), the
+        conjugate gradient method (*"cg"*), or the biconjugate gradient
+        stabilized method (*"bicgstab"*). The conjugate gradient method
+        requires a symmetric and definite matrix, as is the case for
+        the matrices of diffusion-like problems built by
+        :func:`~landlab.utils.get_core_node_matrix`; use *"bicgstab"*
+        for matrices that are not symmetric.
+    preconditioner : {"ilu", "jacobi", "lu", "amg", None}, optional
+        Preconditioner used with the iterative methods. *"ilu"* is
+        an incomplete LU factorization and *"lu"* a complete one. *"amg"*
+        is an algebraic multigrid preconditioner and requires *pyamg*.
+    rtol : float, optional
+        Relative tolerance of the iterative methods.
+    maxiter : int, optional
+        Maximum number of iterations of the iterative methods.
+    refactor_tolerance : float, optional
+        The preconditioner is only recalculated when a value of the matrix
+        has changed by more than this fraction of its value when the
+        preconditioner was last calculated. The direct solver refactors
+        whenever the matrix changes.
+
+    Notes
+    -----
+    Complete factorizations are ordered for matrices with a symmetric
+    sparsity pattern (minimum degree ordering of ``A.T + A``), which is the
+    case for matrices assembled over the links of a grid.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from scipy.sparse import csc_matrix
+    >>> from landlab.utils import SparseSolver
+
+    >>> mat = csc_matrix([[4.0, 1.0, 0.0], [1.0, 4.0, 1.0], [0.0, 1.0, 4.0]])
+    >>> solver = SparseSolver(method="cg", preconditioner="ilu", rtol=1e-12)
+    >>> x = solver.solve(mat, [1.0, 2.0, 3.0])
+    >>> np.allclose(mat @ x, [1.0, 2.0, 3.0])
+    True
+
+    A small change to the matrix doesn't trigger a new preconditioner.
+
+    >>> mat[0, 0] = 4.1
+    >>> x = solver.solve(mat, [1.0, 2.0, 3.0])
+    >>> np.allclose(mat @ x, [1.0, 2.0, 3.0])
+    True
+    >>> solver.number_of_factorizations
+    1
+    """
+
+    def __init__(
+        self,
+        method="direct",
+        preconditioner="ilu",
+        rtol=1e-8,
+        maxiter=None,
+        refactor_tolerance=0.1,
+    ):
+        if method not in _METHODS:
+            raise ValueError(
+                "{method}: method not understood (must be one of {methods})".format(
+                    method=method, methods=", ".join(repr(m) for m in _METHODS)
+                )
+            )
+        if preconditioner not in _PRECONDITIONERS:
+            raise ValueError(
+                "{preconditioner}: preconditioner not understood".format(
+                    preconditioner=preconditioner
+                )
+            )
+        if preconditioner == "amg" and pyamg is None:
+            raise ImportError("the amg preconditioner requires pyamg")
+
+        self._method = method
+        self._preconditioner = preconditioner
+        self._rtol = rtol
+        self._maxiter = maxiter
+        self._refactor_tolerance = refactor_tolerance
+
+        self._factored = None
+        self._factor = None
+        self._solution = None
+
+        self._number_of_factorizations = 0
+        self._iterations = 0
+        self._solve_time = 0.0
+
+    @property
+    def method(self):
+        """Method used to solve the system."""
+        return self._method
+
+    @property
+    def number_of_factorizations(self):
+        """Number of times the matrix (or preconditioner) was factored."""
+        return self._number_of_factorizations
+
+    @property
+    def iterations(self):
+        """Number of iterations used by the last solve."""
+        return self._iterations
+
+    @property
+    def solve_time(self):
+        """Wall time (in seconds) spent in the last solve."""
+        return self._solve_time
+
+    def reset(self):
+        """Forget the stored factorization and previous solution."""
+        self._factored = None
+        self._factor = None
+        self._solution = None
+
+    def _needs_factor(self, mat, tolerance):
+        factored = self._factored
+        if (
+            factored is None
+            or factored.shape != mat.shape
+            or factored.nnz != mat.nnz
+            or not np.array_equal(factored.indptr, mat.indptr)
+            or not np.array_equal(factored.indices, mat.indices)
+        ):
+            return True
+        return np.any(
+            np.abs(mat.data - factored.data) > tolerance * np.abs(factored.data)
+        )
+
+    def _factorize(self, mat):
+        if self._method == "direct" or self._preconditioner == "lu":
+            factor = splu(mat, permc_spec="MMD_AT_PLUS_A").solve
+        elif self._preconditioner == "ilu":
+            factor = _scaled_ilu(mat)
+        elif self._preconditioner == "jacobi":
+            factor = diags(1.0 / mat.diagonal()).dot
+        elif self._preconditioner == "amg":
+            factor = pyamg.smoothed_aggregation_solver(mat.tocsr()).aspreconditioner()
+        else:
+            factor = None
+
+        if factor is not None and not isinstance(factor, LinearOperator):
+            factor = LinearOperator(mat.shape, matvec=factor, dtype=float)
+
+        self._factor = factor
+        self._factored = mat.copy()
+        self._number_of_factorizations += 1
+
+    def solve(self, mat, rhs, x0=None):
+        """Solve the system ``mat @ x = rhs``.
+
+        Parameters
+        ----------
+        mat : sparse matrix
+            Matrix of the system.
+        rhs : array_like
+            Right-hand side of the system.
+        x0 : array_like, optional
+            Starting guess for the iterative methods. If not given, use the
+            previous solution.
+
+        Returns
+        -------
+        ndarray
+            The solution.
+        """
+        start = time.perf_counter()
+
+        mat = csc_matrix(mat)
+        rhs = np.asarray(rhs, dtype=float).reshape(-1)
+
+        tolerance = 0.0 if self._method == "direct" else self._refactor_tolerance
+        if self._needs_factor(mat, tolerance):
+            self._factorize(mat)
+
+        if self._method == "direct":
+            solution = self._factor.matvec(rhs)
+            self._iterations = 0
+        else:
+            if x0 is None and self._solution is not None:
+                if len(self._solution) == len(rhs):
+                    x0 = self._solution
+
+            iterations = [0]
+
+            def count_iterations(xk):
+                iterations[0] += 1
+
+            solution, info = _solve_iteratively(
+                self._method,
+                mat,
+                rhs,
+                x0=x0,
+                M=self._factor,
+                rtol=self._rtol,
+                maxiter=self._maxiter,
+                callback=count_iterations,
+            )
+            if info > 0:
+                raise RuntimeError(
+                    "{method} solver did not converge after "
+                    "{n} iterations".format(method=self._method, n=info)
+                )
+            self._iterations = iterations[0]
+
+        self._solution = solution.copy()
+        self._solve_time = time.perf_counter() - start
+
+        return solution
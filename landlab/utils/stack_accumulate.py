@@ -0,0 +1,175 @@
+#! /usr/bin/env python
+"""Accumulate values along flow paths in stack order.
+
+A stack (the *flow__upstream_node_order* field made by the FlowAccumulator)
+lists nodes so that every node comes after its receivers. Walking a stack
+forward carries values upstream, from outlets to headwaters; walking it
+backward carries them downstream, from headwaters to outlets. Flow distance,
+chi and distance to divide are all calculated this way, with a weight on
+the link from each node to each of its receivers.
+"""
+import numpy as np
+
+from ._stack_accumulate import (
+    REDUCE_MAX,
+    REDUCE_MIN,
+    REDUCE_SUM,
+    _accumulate_down_stack,
+    _accumulate_up_stack,
+)
+
+_REDUCE = {"min": REDUCE_MIN, "max": REDUCE_MAX, "sum": REDUCE_SUM}
+
+
+def _as_stack_arrays(stack, receivers, weights, out):
+    """Convert arguments to the arrays used by the compiled kernels."""
+    stack = np.asarray(stack, dtype=int)
+    receivers = np.asarray(receivers, dtype=int)
+    if receivers.ndim == 1:
+        receivers = receivers.reshape((-1, 1))
+    weights = np.broadcast_to(
+        np.asarray(weights, dtype=float).reshape(
+            (-1, 1) if np.ndim(weights) == 1 else np.shape(weights)
+        ),
+        receivers.shape,
+    )
+    if out is None:
+        out = np.zeros(len(receivers))
+    return stack, receivers, weights, out
+
+
+def accumulate_up_stack(stack, receivers, weights, out=None, select="min"):
+    """Sum weights along flow paths, from outlets upstream.
+
+    Nodes are visited in *stack* order and the value of each becomes the
+    value of its receiver plus the weight of the link to it. A node that is
+    its own receiver adds its weight to its own value. Nodes with more than
+    one receiver follow the receiver with the smallest (or, if *select* is
+    ``"max"``, largest) value, with ties going to the link with the
+    smallest (largest) weight. Receivers of ``-1`` are ignored, as are
+    nodes not in *stack*.
+
+    Parameters
+    ----------
+    stack : array of int
+        Nodes ordered so that receivers come before their donors.
+    receivers : array of int, shape `(n_nodes, )` or `(n_nodes, n_receivers)`
+        Receiver(s) of each node.
+    weights : array of float, shape of *receivers*
+        Weight of the link from each node to each of its receivers.
+    out : array of float, optional
+        Values at nodes, updated in place. If not given, values start at
+        zero.
+    select : {"min", "max"}, optional
+        Which receiver to follow from nodes with more than one.
+
+    Returns
+    -------
+    array of float
+        Values at nodes.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.utils.stack_accumulate import accumulate_up_stack
+
+    Node 0 is an outlet with two chains of donors, 1 <- 2 and 3.
+
+    >>> stack = [0, 1, 3, 2]
+    >>> receivers = [0, 0, 1, 0]
+    >>> weights = [0.0, 1.0, 2.0, 5.0]
+    >>> accumulate_up_stack(stack, receivers, weights)
+    array([ 0.,  1.,  3.,  5.])
+
+    With more than one receiver, the one with the smallest value is
+    followed.
+
+    >>> receivers = [[0, -1], [0, -1], [1, 3], [0, -1]]
+    >>> weights = [[0.0, 0.0], [1.0, 0.0], [2.0, 1.0], [5.0, 0.0]]
+    >>> accumulate_up_stack(stack, receivers, weights)
+    array([ 0.,  1.,  3.,  5.])
+    >>> accumulate_up_stack(stack, receivers, weights, select="max")
+    array([ 0.,  1.,  6.,  5.])
+    """
+    if select not in ("min", "max"):
+        raise ValueError(
+            "select not understood ({0} not one of 'min', 'max')".format(select)
+        )
+    stack, receivers, weights, out = _as_stack_arrays(stack, receivers, weights, out)
+    _accumulate_up_stack(stack, receivers, weights, out, _REDUCE[select])
+    return out
+
+
+def accumulate_down_stack(
+    stack, receivers, weights, out=None, reduce="max", reset_at=None, reset_value=0.0
+):
+    """Pass values along flow paths, from headwaters downstream.
+
+    Nodes are visited in the reverse of *stack* order. The value of each
+    node plus the weight of the link to each of its receivers is combined
+    with the value of that receiver, by keeping the larger (*reduce* is
+    ``"max"``) or smaller (``"min"``) of the two or by adding it (``"sum"``).
+    Values at nodes set in *reset_at* are first set to *reset_value* when
+    the node is visited. Receivers of ``-1``, and nodes that are their own
+    receivers, are ignored.
+
+    Parameters
+    ----------
+    stack : array of int
+        Nodes ordered so that receivers come before their donors.
+    receivers : array of int, shape `(n_nodes, )` or `(n_nodes, n_receivers)`
+        Receiver(s) of each node.
+    weights : array of float, shape of *receivers*
+        Weight of the link from each node to each of its receivers.
+    out : array of float, optional
+        Values at nodes, updated in place. If not given, values start at
+        zero.
+    reduce : {"max", "min", "sum"}, optional
+        How to combine values arriving at a receiver.
+    reset_at : array of bool, optional
+        Nodes at which to reset values before passing them on.
+    reset_value : float, optional
+        Value to reset to.
+
+    Returns
+    -------
+    array of float
+        Values at nodes.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab.utils.stack_accumulate import accumulate_down_stack
+
+    Node 0 is an outlet with two chains of donors, 1 <- 2 and 3.
+
+    >>> stack = [0, 1, 3, 2]
+    >>> receivers = [0, 0, 1, 0]
+    >>> weights = [0.0, 1.0, 2.0, 5.0]
+    >>> accumulate_down_stack(stack, receivers, weights)
+    array([ 5.,  2.,  0.,  0.])
+    >>> accumulate_down_stack(stack, receivers, weights, reduce="sum")
+    array([ 8.,  2.,  0.,  0.])
+
+    For shortest paths, start with large values and reset them at the
+    heads of paths.
+
+    >>> accumulate_down_stack(
+    ...     stack, receivers, weights, out=np.full(4, 100.0), reduce="min",
+    ...     reset_at=np.array([False, False, True, True]),
+    ... )
+    array([ 3.,  2.,  0.,  0.])
+    """
+    if reduce not in _REDUCE:
+        raise ValueError(
+            "reduce not understood ({0} not one of {1})".format(
+                reduce, ", ".join(repr(name) for name in _REDUCE)
+            )
+        )
+    stack, receivers, weights, out = _as_stack_arrays(stack, receivers, weights, out)
+    if reset_at is not None:
+        reset_at = np.asarray(reset_at, dtype=bool).view(np.uint8)
+    _accumulate_down_stack(
+        stack, receivers, weights, out, _REDUCE[reduce], reset_at, reset_value
+    )
+    return out
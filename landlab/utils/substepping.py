@@ -0,0 +1,393 @@
+#! /usr/bin/env python
+"""Divide time steps of explicit schemes into stable sub-steps.
+
+Explicit diffusion-like schemes are only stable for time steps shorter than
+about ``L ** 2 / D``, where ``L`` is the length of a link and ``D`` the
+(effective) diffusivity along it. A :class:`SubStepper` calculates this
+limit from link-by-link quantities, divides a time step into sub-steps that
+respect it, and keeps count of the sub-steps it takes so that components
+that use it can be profiled.
+
+Examples
+--------
+>>> import numpy as np
+>>> from landlab import RasterModelGrid
+>>> from landlab.utils import SubStepper
+
+>>> grid = RasterModelGrid((3, 5))
+>>> stepper = SubStepper(grid, courant_factor=0.2)
+>>> stepper.calc_stable_time_step(2.0)
+0.1
+>>> [round(sub_dt, 6) for sub_dt in stepper.iter_substeps(0.25, lambda: 0.1)]
+[0.1, 0.1, 0.05]
+>>> stepper.number_of_substeps
+3
+"""
+import numpy as np
+
+from ..grid.buffer_pool import BufferPool
+
+_STABILITY_RESPONSES = ("pass", "warn", "raise")
+_TIME_TOLERANCE = 1e-9  # relative; shorter remainders are merged into a step
+
+
+def _next_substep(time_left, stable_dt):
+    """Length of the next sub-step, without leaving a tiny remainder."""
+    if time_left <= stable_dt * (1.0 + _TIME_TOLERANCE):
+        return time_left
+    return stable_dt
+
+
+class SubStepper:
+
+    """Take stable sub-steps of an explicit scheme.
+
+    Parameters
+    ----------
+    grid : ModelGrid
+        The grid the scheme is solved on.
+    courant_factor : float, optional
+        Fraction of ``L ** 2 / D`` used as the stable time step.
+    local : bool, optional
+        Use local time stepping with :meth:`advance`. Only the links whose
+        stable time step is shorter than the full time step are sub-stepped;
+        fluxes on the other links are held at their values from the start
+        of the time step.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab import RasterModelGrid
+    >>> from landlab.utils import SubStepper
+
+    Diffuse a step of elevation where the diffusivity is high on one side
+    of the grid.
+
+    >>> grid = RasterModelGrid((4, 8))
+    >>> z = np.where(grid.x_of_node < 1.5, 1.0, 0.0)
+    >>> kd = np.where(grid.xy_of_link[:, 0] < 2.0, 100.0, 1.0)
+    >>> def flux_and_diffusivity(links):
+    ...     grad = (
+    ...         z[grid.node_at_link_head[links]] - z[grid.node_at_link_tail[links]]
+    ...     ) / grid.length_of_link[links]
+    ...     return -kd[links] * grad, kd[links]
+
+    >>> stepper = SubStepper(grid, courant_factor=0.2, local=True)
+    >>> stepper.advance(0.2, z, flux_and_diffusivity)
+    >>> stepper.number_of_substeps
+    100
+
+    Only the nodes at the ends of the high-diffusivity links were updated
+    every sub-step, the others were updated once.
+
+    >>> stepper.number_of_node_updates
+    408
+    """
+
+    def __init__(self, grid, courant_factor=0.2, local=False):
+        if courant_factor <= 0.0:
+            raise ValueError("courant_factor must be positive")
+
+        self._grid = grid
+        self._courant_factor = courant_factor
+        self._local = bool(local)
+        self._buffers = BufferPool(grid, reuse=True)
+        self._width_at_link = None
+        self._stable_time_step = np.inf
+        self.reset_counters()
+
+    @property
+    def courant_factor(self):
+        """Fraction of the diffusive limit used as the stable time step."""
+        return self._courant_factor
+
+    @property
+    def local(self):
+        """Indicate if local time stepping is used."""
+        return self._local
+
+    @property
+    def stable_time_step(self):
+        """Stable time step calculated at the start of the last time step."""
+        return self._stable_time_step
+
+    @property
+    def number_of_substeps(self):
+        """Number of sub-steps taken during the last time step."""
+        return self._number_of_substeps
+
+    @property
+    def total_substeps(self):
+        """Number of sub-steps taken since the counters were reset."""
+        return self._total_substeps
+
+    @property
+    def number_of_node_updates(self):
+        """Number of node values updated by :meth:`advance`."""
+        return self._number_of_node_updates
+
+    def reset_counters(self):
+        """Set the sub-step and node-update counters back to zero."""
+        self._number_of_substeps = 0
+        self._total_substeps = 0
+        self._number_of_node_updates = 0
+
+    def calc_stable_time_step_at_link(self, diffusivity_at_link, links=None, out=None):
+        """Stable time step of each link.
+
+        Parameters
+        ----------
+        diffusivity_at_link : float or ndarray
+            (Effective) diffusivity at links, or at *links* if they are given.
+        links : ndarray of int, optional
+            Links to calculate the time step for. If not given, use all of
+            the grid's active links.
+        out : ndarray, optional
+            Buffer to hold the result.
+
+        Returns
+        -------
+        ndarray
+            Stable time step at each link. Links with no diffusivity have
+            an infinite time step.
+
+        Examples
+        --------
+        >>> from landlab import RasterModelGrid
+        >>> from landlab.utils import SubStepper
+        >>> grid = RasterModelGrid((3, 4), xy_spacing=(2.0, 1.0))
+        >>> stepper = SubStepper(grid, courant_factor=0.25)
+        >>> stepper.calc_stable_time_step_at_link(1.0)
+        array([ 0.25,  0.25,  1.  ,  1.  ,  1.  ,  0.25,  0.25])
+        """
+        if links is None:
+            links = self._grid.active_links
+            diffusivity = np.asarray(diffusivity_at_link)
+            if diffusivity.ndim > 0:
+                diffusivity = diffusivity[links]
+        else:
+            diffusivity = diffusivity_at_link
+
+        if out is None:
+            out = np.empty(len(links))
+        np.square(self._grid.length_of_link[links], out=out)
+        out *= self._courant_factor
+        with np.errstate(divide="ignore"):
+            out /= np.abs(diffusivity)
+        return out
+
+    def calc_stable_time_step(self, diffusivity_at_link, links=None):
+        """Longest stable time step over a set of links.
+
+        Parameters
+        ----------
+        diffusivity_at_link : float or ndarray
+            (Effective) diffusivity at links, or at *links* if they are given.
+        links : ndarray of int, optional
+            Links to calculate the time step for. If not given, use all of
+            the grid's active links.
+
+        Returns
+        -------
+        float
+            The stable time step (infinite if there is no diffusion).
+        """
+        n_links = len(self._grid.active_links if links is None else links)
+        if n_links == 0:
+            return np.inf
+        dt_at_link = self.calc_stable_time_step_at_link(
+            diffusivity_at_link,
+            links=links,
+            out=self._buffers.empty("link", "stable_time_step")[:n_links],
+        )
+        return float(dt_at_link.min())
+
+    def _check_stability(self, dt, stable_dt, if_unstable, message):
+        if stable_dt < dt and if_unstable != "pass":
+            message = message or (
+                "time step ({dt}) is longer than the stable time step ({stable})"
+            )
+            message = message.format(dt=dt, stable=stable_dt)
+            if if_unstable == "raise":
+                raise RuntimeError(message)
+            else:
+                print(message)
+
+    def iter_substeps(
+        self, dt, calc_stable_time_step, adaptive=True, if_unstable="pass", message=None
+    ):
+        """Divide a time step into stable sub-steps.
+
+        Parameters
+        ----------
+        dt : float
+            The time step.
+        calc_stable_time_step : callable
+            Function, called before each sub-step, that returns the stable
+            time step for the current state of the scheme.
+        adaptive : bool, optional
+            If *False*, take a single step of length *dt*.
+        if_unstable : {"pass", "warn", "raise"}, optional
+            What to do if *adaptive* is *False* and *dt* is longer than the
+            stable time step.
+        message : str, optional
+            Message used to warn of (or raise) an unstable time step. It is
+            formatted with *dt* and *stable*, the stable time step.
+
+        Yields
+        ------
+        float
+            Length of the next sub-step.
+        """
+        if if_unstable not in _STABILITY_RESPONSES:
+            raise ValueError(
+                "{0}: if_unstable not understood (must be one of {1})".format(
+                    if_unstable, ", ".join(repr(r) for r in _STABILITY_RESPONSES)
+                )
+            )
+        self._number_of_substeps = 0
+
+        time_left = dt
+        while time_left > 0.0:
+            stable_dt = calc_stable_time_step()
+            if self._number_of_substeps == 0:
+                self._stable_time_step = stable_dt
+
+            if adaptive:
+                sub_dt = _next_substep(time_left, stable_dt)
+            else:
+                self._check_stability(dt, stable_dt, if_unstable, message)
+                sub_dt = time_left
+
+            self._number_of_substeps += 1
+            self._total_substeps += 1
+
+            yield sub_dt
+            time_left -= sub_dt
+
+    def advance(
+        self,
+        dt,
+        value_at_node,
+        calc_flux_at_link,
+        links=None,
+        flux_at_link=None,
+        adaptive=True,
+        if_unstable="pass",
+        message=None,
+    ):
+        """Advance a conserved quantity through a time step.
+
+        The values at core nodes are updated by the divergence of a flux,
+        ``dv/dt = -div(q)``, in as many sub-steps as are needed to keep the
+        scheme stable.
+
+        Parameters
+        ----------
+        dt : float
+            The time step.
+        value_at_node : ndarray
+            Values at nodes, updated in place.
+        calc_flux_at_link : callable
+            Function that takes an array of links and returns, for the
+            current values at nodes, the flux and the (effective)
+            diffusivity at those links.
+        links : ndarray of int, optional
+            Links that carry a flux. If not given, use all of the grid's
+            active links.
+        flux_at_link : ndarray, optional
+            Array to hold the flux at links.
+        adaptive : bool, optional
+            If *False*, take a single step of length *dt*.
+        if_unstable : {"pass", "warn", "raise"}, optional
+            What to do if *adaptive* is *False* and *dt* is longer than the
+            stable time step.
+        message : str, optional
+            Message used to warn of (or raise) an unstable time step.
+        """
+        grid = self._grid
+        if links is None:
+            links = grid.active_links
+        if flux_at_link is None:
+            flux_at_link = self._buffers.empty("link", "flux", fill=0.0)
+        dt_at_link = self._buffers.empty("link", "stable_time_step")[: len(links)]
+
+        def update_flux_at(links, dt_at_link):
+            flux, diffusivity = calc_flux_at_link(links)
+            flux_at_link[links] = flux
+            self.calc_stable_time_step_at_link(diffusivity, links=links, out=dt_at_link)
+            return dt_at_link.min() if len(dt_at_link) else np.inf
+
+        if not self._local or not adaptive:
+            core_nodes = grid.core_nodes
+            dqdx = self._buffers.empty("node", "flux_div")
+            substeps = self.iter_substeps(
+                dt,
+                lambda: update_flux_at(links, dt_at_link),
+                adaptive=adaptive,
+                if_unstable=if_unstable,
+                message=message,
+            )
+            for sub_dt in substeps:
+                grid.calc_flux_div_at_node(flux_at_link, out=dqdx)
+                value_at_node[core_nodes] -= dqdx[core_nodes] * sub_dt
+                self._number_of_node_updates += len(core_nodes)
+            return
+
+        # local time stepping: nodes at the ends of links that are not stable
+        # over the whole time step are sub-stepped, along with the fluxes of
+        # all of their links. Other nodes are updated once, at the end of the
+        # time step, with the time-integrated flux of their links (which, for
+        # links between two such nodes, is their initial flux).
+        stable_dt = update_flux_at(links, dt_at_link)
+
+        is_core = grid.status_at_node == grid.BC_NODE_IS_CORE
+        is_fast_node = np.zeros(grid.number_of_nodes, dtype=bool)
+        is_fast_node[grid.nodes_at_link[links[dt_at_link < dt]]] = True
+        is_fast_node &= is_core
+        fast_nodes = np.flatnonzero(is_fast_node)
+        slow_nodes = np.flatnonzero(~is_fast_node & is_core)
+
+        is_fast_link = is_fast_node[grid.nodes_at_link[links]].any(axis=1)
+        fast_links = links[is_fast_link]
+        dt_at_fast_link = dt_at_link[is_fast_link]
+        stable_dt = dt_at_fast_link.min() if len(fast_links) else np.inf
+
+        flux_integral = self._buffers.empty("link", "flux_integral", fill=0.0)
+        flux_integral[links] = flux_at_link[links] * dt
+        flux_integral[fast_links] = 0.0
+
+        self._stable_time_step = stable_dt
+        self._number_of_substeps = 0
+        time_left = dt
+        while time_left > 0.0:
+            if self._number_of_substeps > 0:
+                stable_dt = update_flux_at(fast_links, dt_at_fast_link)
+            sub_dt = _next_substep(time_left, stable_dt)
+            value_at_node[fast_nodes] -= (
+                self._calc_flux_div_at(fast_nodes, flux_at_link) * sub_dt
+            )
+            flux_integral[fast_links] += flux_at_link[fast_links] * sub_dt
+            self._number_of_node_updates += len(fast_nodes)
+            self._number_of_substeps += 1
+            self._total_substeps += 1
+            time_left -= sub_dt
+
+        value_at_node[slow_nodes] -= self._calc_flux_div_at(slow_nodes, flux_integral)
+        self._number_of_node_updates += len(slow_nodes)
+
+    def _calc_flux_div_at(self, nodes, flux_at_link):
+        """Divergence of a flux at a subset of the grid's nodes."""
+        grid = self._grid
+        if self._width_at_link is None:
+            has_face = grid.face_at_link >= 0
+            self._width_at_link = np.zeros(grid.number_of_links)
+            self._width_at_link[has_face] = grid.length_of_face[
+                grid.face_at_link[has_face]
+            ]
+        width = self._width_at_link
+        links = grid.links_at_node[nodes]
+
+        return -(
+            flux_at_link[links] * width[links] * grid.link_dirs_at_node[nodes]
+        ).sum(axis=1) / grid.area_of_cell[grid.cell_at_node[nodes]]
@@ -4,6 +4,10 @@
 import numpy as np
 
 from landlab import FieldError
+from landlab.core.utils import as_id_array
+
+from ._watershed import _label_watersheds
+from .stack_accumulate import accumulate_down_stack
 
 
 def get_watershed_mask(grid, outlet_id):
@@ -218,6 +222,155 @@ def get_watershed_masks(grid):
     return watershed_mask
 
 
+def label_watersheds(grid, outlet_ids, nested=False):
+    """Label the watersheds of many outlets in one pass over the grid.
+
+    Every node is labeled with the basin of the nearest outlet downstream of
+    it, where basins are numbered by their position in *outlet_ids*. If
+    outlets are nested, the nodes of a basin are those not in any of its
+    sub-basins unless *nested* is ``True``, in which case the node counts
+    and areas of each basin include those of its sub-basins and the
+    hierarchy of basins is also returned.
+
+    Parameters
+    ----------
+    grid : RasterModelGrid
+        A landlab RasterModelGrid.
+    outlet_ids : array_like of int
+        The ids of the outlet nodes.
+    nested : bool, optional
+        Treat basins as nested within the basins they drain to.
+
+    Returns
+    -------
+    labels : integer ndarray
+        The basin of each node, as an index into *outlet_ids*. Nodes that do
+        not drain to any of the outlets have a value of -1.
+    counts : integer ndarray
+        The number of nodes in each basin.
+    areas : float ndarray
+        The total area of the cells of each basin.
+    parents : integer ndarray
+        Only returned if *nested* is ``True``. The basin that each basin
+        drains to, or -1 if it does not drain to another basin.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from landlab import RasterModelGrid
+    >>> from landlab.components import FlowAccumulator
+    >>> from landlab.utils import label_watersheds
+
+    Create a grid with a node spacing of 200 meter.
+
+    >>> rmg = RasterModelGrid((7, 7), xy_spacing=200)
+    >>> z = np.array([
+    ...     -9999., -9999., -9999., -9999., -9999., -9999., -9999.,
+    ...     -9999.,    26.,     0.,    26.,    30.,    34., -9999.,
+    ...     -9999.,    28.,     1.,    28.,     5.,    32., -9999.,
+    ...     -9999.,    30.,     3.,    30.,    10.,    34., -9999.,
+    ...     -9999.,    32.,    11.,    32.,    15.,    38., -9999.,
+    ...     -9999.,    34.,    32.,    34.,    36.,    40., -9999.,
+    ...     -9999., -9999., -9999., -9999., -9999., -9999., -9999.])
+    >>> rmg.at_node['topographic__elevation'] = z
+    >>> rmg.set_closed_boundaries_at_grid_edges(True, True, True, False)
+
+    Route flow.
+
+    >>> fr = FlowAccumulator(rmg, flow_director='D8')
+    >>> fr.run_one_step()
+
+    Label the watersheds of three outlets. Node 23 drains to node 2.
+
+    >>> labels, counts, areas = label_watersheds(rmg, [2, 18, 23])
+    >>> labels.reshape(rmg.shape)
+    array([[-1, -1,  0, -1, -1, -1, -1],
+           [-1, -1,  0, -1, -1, -1, -1],
+           [-1,  0,  0,  0,  1,  1, -1],
+           [-1,  2,  2,  2,  1,  1, -1],
+           [-1,  2,  2,  2,  1,  1, -1],
+           [-1,  2,  2,  2,  1,  1, -1],
+           [-1, -1, -1, -1, -1, -1, -1]])
+    >>> counts
+    array([5, 8, 9])
+    >>> areas
+    array([ 160000.,  320000.,  360000.])
+
+    With nested basins, the basin of node 2 includes that of node 23.
+
+    >>> labels, counts, areas, parents = label_watersheds(
+    ...     rmg, [2, 18, 23], nested=True
+    ... )
+    >>> counts
+    array([14,  8,  9])
+    >>> areas
+    array([ 520000.,  320000.,  360000.])
+    >>> parents
+    array([-1, -1,  0])
+    """
+    if "flow__receiver_node" not in grid.at_node:
+        raise FieldError(
+            "A 'flow__receiver_node' field is required at the "
+            "nodes of the input grid."
+        )
+
+    if grid.at_node["flow__receiver_node"].size != grid.size("node"):
+        msg = (
+            "A route-to-multiple flow director has been "
+            "run on this grid. The landlab development team has not "
+            "verified that label_watersheds is compatible with "
+            "route-to-multiple methods. Please open a GitHub Issue "
+            "to start this process."
+        )
+        raise NotImplementedError(msg)
+
+    outlet_ids = as_id_array(np.atleast_1d(outlet_ids))
+    n_basins = len(outlet_ids)
+    if np.any((outlet_ids < 0) | (outlet_ids >= grid.number_of_nodes)):
+        raise ValueError("outlet_ids must be ids of nodes of the grid")
+
+    basin_at_node = np.full(grid.number_of_nodes, -1, dtype=int)
+    basin_at_node[outlet_ids] = np.arange(n_basins)
+    if np.count_nonzero(basin_at_node >= 0) != n_basins:
+        raise ValueError("outlet_ids must be unique")
+
+    stack = as_id_array(grid.at_node["flow__upstream_node_order"])
+    labels = np.full(grid.number_of_nodes, -1, dtype=int)
+    parents = np.full(n_basins, -1, dtype=int)
+    _label_watersheds(
+        stack,
+        as_id_array(grid.at_node["flow__receiver_node"]),
+        basin_at_node,
+        labels,
+        parents,
+    )
+
+    is_labeled = labels >= 0
+    counts = np.bincount(labels[is_labeled], minlength=n_basins)
+    areas = np.bincount(
+        labels[is_labeled],
+        weights=grid.cell_area_at_node[is_labeled],
+        minlength=n_basins,
+    ).astype(float)
+
+    if nested:
+        # basins in stack order, so that each comes after the basin it
+        # drains to, then add sub-basins to their parents from upstream down.
+        basin_stack = basin_at_node[stack]
+        basin_stack = basin_stack[basin_stack >= 0]
+        counts = as_id_array(
+            accumulate_down_stack(
+                basin_stack, parents, 0.0, out=counts.astype(float), reduce="sum"
+            )
+        )
+        areas = accumulate_down_stack(
+            basin_stack, parents, 0.0, out=areas, reduce="sum"
+        )
+        return labels, counts, areas, parents
+    else:
+        return labels, counts, areas
+
+
 def get_watershed_masks_with_area_threshold(grid, critical_area):
     """Get masks of all of the watersheds with a minimum drainage area size.
 
@@ -0,0 +1,106 @@
+#! /usr/bin/env python
+"""Time the extraction of channel networks by the ChannelProfiler.
+
+Networks are extracted from every watershed of a grid over which flow has
+been routed, following either just the main channel or every channel. For
+reference, the time for a pure-Python walk upstream that checks the donors
+of one node at a time (as the ChannelProfiler used to do) is also reported.
+
+Usage::
+
+    $ python scripts/benchmark_channel_profiler.py [--shape ROWS COLS]
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from landlab import RasterModelGrid
+from landlab.components import ChannelProfiler, FlowAccumulator
+
+
+def walk_upstream_by_python(grid, outlets, main_channel_only, threshold):
+    receivers = grid.at_node["flow__receiver_node"]
+    area = grid.at_node["drainage_area"]
+    segments = []
+    for outlet in outlets:
+        queue = [outlet]
+        while queue:
+            start = queue.pop(0)
+            segment = [start]
+            node = start
+            while True:
+                donors = np.where(receivers == node)[0]
+                donors = donors[donors != start]
+                above = donors[area[donors] > threshold]
+                if len(above) == 0:
+                    break
+                if main_channel_only or len(above) == 1:
+                    node = donors[np.argmax(area[donors])]
+                    segment.append(node)
+                else:
+                    queue.extend(above)
+                    break
+            segments.append(segment)
+    return segments
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--shape", type=int, nargs=2, default=(200, 200), help="grid shape"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1000.0,
+        help="minimum drainage area of channels",
+    )
+    args = parser.parse_args()
+
+    grid = RasterModelGrid(args.shape, xy_spacing=10.0)
+    z = grid.add_zeros("topographic__elevation", at="node")
+    np.random.seed(1945)
+    z += np.random.rand(grid.number_of_nodes) + 0.01 * grid.y_of_node
+    FlowAccumulator(
+        grid, flow_director="D8", depression_finder="DepressionFinderAndRouter"
+    ).run_one_step()
+
+    print("{0:20s} {1:30s} {2:>10s}".format("channels", "method", "time (s)"))
+    for main_channel_only in (True, False):
+        profiler = ChannelProfiler(
+            grid,
+            number_of_watersheds=None,
+            main_channel_only=main_channel_only,
+            minimum_channel_threshold=args.threshold,
+        )
+
+        def run_and_build_dict():
+            profiler.run_one_step()
+            return profiler.data_structure
+
+        timers = [
+            ("ChannelProfiler.run_one_step", profiler.run_one_step),
+            ("... and data_structure", run_and_build_dict),
+            (
+                "walk upstream by python",
+                lambda: walk_upstream_by_python(
+                    grid,
+                    profiler._outlet_nodes,
+                    main_channel_only,
+                    args.threshold,
+                ),
+            ),
+        ]
+        for name, func in timers:
+            print(
+                "{0:20s} {1:30s} {2:10.4f}".format(
+                    "main" if main_channel_only else "all",
+                    name,
+                    timeit.timeit(func, number=1),
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
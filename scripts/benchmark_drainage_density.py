@@ -0,0 +1,79 @@
+#! /usr/bin/env python
+"""Time finding drainage density for many channelization thresholds.
+
+Flow is routed over a random surface and the distance to the nearest
+channel found at every node for a set of channelization thresholds. The
+distances for all thresholds are found in one pass with
+DrainageDensity.calculate_distances_to_channel and, for reference, one
+threshold at a time with calculate_drainage_density.
+
+Usage::
+
+    $ python scripts/benchmark_drainage_density.py [--shape ROWS COLS] [--thresholds N]
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from landlab import RasterModelGrid
+from landlab.components import DrainageDensity, FlowAccumulator
+
+
+def one_at_a_time(dd, thresholds):
+    for threshold in thresholds:
+        dd._channelization_threshold = threshold
+        dd.calculate_drainage_density()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--shape", type=int, nargs=2, default=(1000, 1000), help="grid shape"
+    )
+    parser.add_argument(
+        "--thresholds", type=int, default=20, help="number of thresholds"
+    )
+    args = parser.parse_args()
+
+    grid = RasterModelGrid(args.shape, xy_spacing=10.0)
+    z = grid.add_zeros("topographic__elevation", at="node")
+    np.random.seed(1945)
+    z += np.random.rand(grid.number_of_nodes) + 0.01 * grid.y_of_node
+    FlowAccumulator(grid, flow_director="D8").run_one_step()
+
+    thresholds = np.logspace(3.0, 6.0, args.thresholds)
+    dd = DrainageDensity(
+        grid,
+        area_coefficient=1.0,
+        slope_coefficient=1.0,
+        area_exponent=1.0,
+        slope_exponent=0.0,
+        channelization_threshold=thresholds[0],
+    )
+
+    print("{0:40s} {1:>10s}".format("method", "time (s)"))
+    print(
+        "{0:40s} {1:10.4f}".format(
+            "calculate_drainage_density, 1 threshold",
+            timeit.timeit(dd.calculate_drainage_density, number=1),
+        )
+    )
+    print(
+        "{0:40s} {1:10.4f}".format(
+            "calculate_distances_to_channel",
+            timeit.timeit(
+                lambda: dd.calculate_distances_to_channel(thresholds), number=1
+            ),
+        )
+    )
+    print(
+        "{0:40s} {1:10.4f}".format(
+            "calculate_drainage_density, in a loop",
+            timeit.timeit(lambda: one_at_a_time(dd, thresholds), number=1),
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#! /usr/bin/env python
+"""Time Space and ErosionDeposition steps with their basic and adaptive solvers.
+
+Each step routes flow with a FlowAccumulator and then runs the eroder; only
+the time spent in the eroder is reported.
+
+Usage::
+
+    $ python scripts/benchmark_erosion_deposition.py [--shape ROWS COLS] [--steps N]
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from landlab import RasterModelGrid
+from landlab.components import ErosionDeposition, FlowAccumulator, Space
+
+
+def make_eroder(name, grid, solver):
+    if name == "Space":
+        return Space(
+            grid,
+            K_sed=0.01,
+            K_br=0.005,
+            F_f=0.2,
+            phi=0.3,
+            H_star=0.5,
+            v_s=1.0,
+            solver=solver,
+        )
+    else:
+        return ErosionDeposition(grid, K=0.005, F_f=0.2, v_s=1.0, solver=solver)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--shape", type=int, nargs=2, default=(200, 200), help="grid shape"
+    )
+    parser.add_argument("--steps", type=int, default=10, help="number of steps")
+    parser.add_argument("--dt", type=float, default=50.0, help="time step")
+    args = parser.parse_args()
+
+    print("{0:20s} {1:>10s} {2:>14s}".format("eroder", "solver", "eroder (s)"))
+    for name in ("Space", "ErosionDeposition"):
+        for solver in ("basic", "adaptive"):
+            grid = RasterModelGrid(args.shape, xy_spacing=10.0)
+            grid.set_closed_boundaries_at_grid_edges(True, True, True, False)
+            z = grid.add_zeros("topographic__elevation", at="node")
+            np.random.seed(1945)
+            z += grid.x_of_node / 1000.0 + np.random.rand(grid.number_of_nodes)
+            soil = grid.add_zeros("soil__depth", at="node")
+            soil += 0.5
+            bedrock = grid.add_field("bedrock__elevation", z - soil, at="node")
+
+            accumulator = FlowAccumulator(
+                grid,
+                flow_director="D8",
+                depression_finder="DepressionFinderAndRouter",
+            )
+            accumulator.run_one_step()
+            eroder = make_eroder(name, grid, solver)
+
+            eroder_time = 0.0
+            for _ in range(args.steps):
+                accumulator.run_one_step()
+                eroder_time += timeit.timeit(
+                    lambda: eroder.run_one_step(args.dt), number=1
+                )
+                z[grid.core_nodes] += 0.001 * args.dt
+                bedrock[grid.core_nodes] += 0.001 * args.dt
+
+            print("{0:20s} {1:>10s} {2:14.3f}".format(name, solver, eroder_time))
+
+
+if __name__ == "__main__":
+    main()
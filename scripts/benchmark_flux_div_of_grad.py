@@ -0,0 +1,77 @@
+#! /usr/bin/env python
+"""Compare fused flux-divergence operators with the composed grid methods.
+
+For each grid, the time to calculate the divergence of a flux that is a
+function of gradient is measured using ``calc_grad_at_link`` followed by
+``calc_flux_div_at_node`` and using the fused, compiled
+``calc_flux_div_of_grad`` (and its nonlinear variants).
+
+Usage::
+
+    $ python scripts/benchmark_flux_div_of_grad.py [--repeat N]
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from landlab import HexModelGrid, LinkStatus, RasterModelGrid
+
+
+def composed(grid, z, coef, n_terms=None, out=None):
+    grad = grid.calc_grad_at_link(z)
+    if n_terms is not None:
+        grad *= sum(grad ** (2 * i) for i in range(n_terms))
+    flux = coef * grad
+    flux[grid.status_at_link == LinkStatus.INACTIVE] = 0.0
+    return grid.calc_flux_div_at_node(flux, out=out)
+
+
+def fused(grid, z, coef, n_terms=None, out=None):
+    if n_terms is None:
+        return grid.calc_flux_div_of_grad(z, coef, out=out)
+    else:
+        return grid.calc_flux_div_of_taylor_grad(z, coef, n_terms=n_terms, out=out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10, help="number of calls")
+    args = parser.parse_args()
+
+    grids = {
+        "raster 1000x1000": lambda: RasterModelGrid((1000, 1000)),
+        "hex 250x250": lambda: HexModelGrid((250, 250)),
+    }
+
+    print("{0:20s} {1:10s} {2:>12s} {3:>12s} {4:>8s}".format(
+        "grid", "law", "composed (s)", "fused (s)", "speedup"
+    ))
+    for name, make_grid in grids.items():
+        grid = make_grid()
+        z = np.random.rand(grid.number_of_nodes)
+        coef = np.random.rand(grid.number_of_links)
+        out = grid.zeros(at="node")
+
+        for law, n_terms in (("linear", None), ("taylor", 3)):
+            assert np.allclose(
+                composed(grid, z, coef, n_terms=n_terms),
+                fused(grid, z, coef, n_terms=n_terms),
+            )
+            times = [
+                min(
+                    timeit.repeat(
+                        lambda: func(grid, z, coef, n_terms=n_terms, out=out),
+                        number=1,
+                        repeat=args.repeat,
+                    )
+                )
+                for func in (composed, fused)
+            ]
+            print("{0:20s} {1:10s} {2:12.4f} {3:12.4f} {4:8.1f}".format(
+                name, law, times[0], times[1], times[0] / times[1]
+            ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#! /usr/bin/env python
+"""Compare the semi-implicit and explicit GroundwaterDupuitPercolator solvers.
+
+A sloping aquifer that drains through one edge of a raster grid is advanced
+for a fixed duration using the explicit adaptive time step solver and the
+semi-implicit solver with a range of time steps. For each run the wall time
+is reported along with the largest difference in aquifer thickness and
+the mean difference in seepage from the explicit solution.
+
+Usage::
+
+    $ python scripts/benchmark_groundwater_dupuit.py [--shape ROWS COLS] [--duration T]
+"""
+import argparse
+import timeit
+import warnings
+
+import numpy as np
+
+from landlab import RasterModelGrid
+from landlab.components import GroundwaterDupuitPercolator
+
+
+def make_component(shape):
+    grid = RasterModelGrid(shape, xy_spacing=10.0)
+    grid.set_closed_boundaries_at_grid_edges(True, True, False, True)
+    np.random.seed(1945)
+    base = grid.add_field(
+        "aquifer_base__elevation", grid.x_of_node / 100.0, at="node"
+    )
+    grid.add_field(
+        "topographic__elevation",
+        base + 3.0 + 0.5 * np.random.rand(grid.number_of_nodes),
+        at="node",
+    )
+    grid.add_field("water_table__elevation", base + 2.0, at="node")
+    return GroundwaterDupuitPercolator(
+        grid, hydraulic_conductivity=1e-3, recharge_rate=1e-7
+    )
+
+
+def run_explicit(gdp, dt):
+    gdp.run_with_adaptive_time_step_solver(dt)
+    gdp.total_substeps = getattr(gdp, "total_substeps", 0) + gdp.number_of_substeps
+
+
+def run(shape, duration, n_steps, method, **kwds):
+    gdp = make_component(shape)
+    dt = duration / n_steps
+
+    def run_steps():
+        for _ in range(n_steps):
+            method(gdp, dt, **kwds)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        time = timeit.timeit(run_steps, number=1)
+    return gdp, time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--shape", type=int, nargs=2, default=(100, 200), help="grid shape"
+    )
+    parser.add_argument(
+        "--duration", type=float, default=1e6, help="duration of the run (s)"
+    )
+    args = parser.parse_args()
+
+    explicit, time = run(
+        args.shape,
+        args.duration,
+        10,
+        run_explicit,
+    )
+    thickness = explicit.grid.at_node["aquifer__thickness"]
+    seepage = explicit.grid.at_node["surface_water__specific_discharge"]
+
+    print(
+        "{0:10s} {1:>8s} {2:>10s} {3:>10s} {4:>12s} {5:>12s}".format(
+            "solver", "steps", "factors", "time (s)", "max dh (m)", "mean dqs"
+        )
+    )
+    print(
+        "{0:10s} {1:8d} {2:>10s} {3:10.4f} {4:12.3e} {5:12.3e}".format(
+            "explicit", explicit.total_substeps, "-", time, 0.0, 0.0
+        )
+    )
+    for solver in ("direct", "cg"):
+        for n_steps in (100, 10, 1):
+            gdp, time = run(
+                args.shape,
+                args.duration,
+                n_steps,
+                GroundwaterDupuitPercolator.run_with_semi_implicit_solver,
+                solver=solver,
+            )
+            print(
+                "{0:10s} {1:8d} {2:10d} {3:10.4f} {4:12.3e} {5:12.3e}".format(
+                    solver,
+                    n_steps,
+                    gdp.number_of_factorizations,
+                    time,
+                    np.abs(gdp.grid.at_node["aquifer__thickness"] - thickness).max(),
+                    np.abs(
+                        gdp.grid.at_node["surface_water__specific_discharge"]
+                        - seepage
+                    ).mean(),
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
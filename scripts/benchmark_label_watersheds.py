@@ -0,0 +1,71 @@
+#! /usr/bin/env python
+"""Time the labeling of the watersheds of many outlets.
+
+Outlets are chosen at random on a grid over which flow has been routed and
+their watersheds labeled, with and without nesting, in one pass with
+label_watersheds. For reference, the time to find the watersheds one
+outlet at a time with get_watershed_mask is also reported, estimated from
+the time taken for a few of the outlets.
+
+Usage::
+
+    $ python scripts/benchmark_label_watersheds.py [--shape ROWS COLS] [--outlets N]
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from landlab import RasterModelGrid
+from landlab.components import FlowAccumulator
+from landlab.utils import get_watershed_mask, label_watersheds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--shape", type=int, nargs=2, default=(1000, 1000), help="grid shape"
+    )
+    parser.add_argument("--outlets", type=int, default=50000, help="number of outlets")
+    args = parser.parse_args()
+
+    grid = RasterModelGrid(args.shape, xy_spacing=10.0)
+    z = grid.add_zeros("topographic__elevation", at="node")
+    np.random.seed(1945)
+    z += np.random.rand(grid.number_of_nodes) + 0.01 * grid.y_of_node
+    FlowAccumulator(grid, flow_director="D8").run_one_step()
+    outlet_ids = np.random.choice(grid.number_of_nodes, args.outlets, replace=False)
+
+    n_masks = min(5, args.outlets)
+    time_per_mask = (
+        timeit.timeit(
+            lambda: [get_watershed_mask(grid, node) for node in outlet_ids[:n_masks]],
+            number=1,
+        )
+        / n_masks
+    )
+
+    print("{0:40s} {1:>12s}".format("method", "time (s)"))
+    print(
+        "{0:40s} {1:12.4f}".format(
+            "label_watersheds",
+            timeit.timeit(lambda: label_watersheds(grid, outlet_ids), number=1),
+        )
+    )
+    print(
+        "{0:40s} {1:12.4f}".format(
+            "label_watersheds, nested",
+            timeit.timeit(
+                lambda: label_watersheds(grid, outlet_ids, nested=True), number=1
+            ),
+        )
+    )
+    print(
+        "{0:40s} {1:12.4f}".format(
+            "get_watershed_mask (estimated)", time_per_mask * args.outlets
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#! /usr/bin/env python
+"""Time LateralEroder steps with its basic and adaptive solvers.
+
+Each step routes flow with a FlowAccumulator and then runs the eroder; the
+time spent in each is reported separately.
+
+Usage::
+
+    $ python scripts/benchmark_lateral_eroder.py [--shape ROWS COLS] [--steps N]
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from landlab import RasterModelGrid
+from landlab.components import FlowAccumulator, LateralEroder
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--shape", type=int, nargs=2, default=(100, 100), help="grid shape"
+    )
+    parser.add_argument("--steps", type=int, default=10, help="number of steps")
+    parser.add_argument("--dt", type=float, default=20.0, help="time step")
+    args = parser.parse_args()
+
+    print("{0:10s} {1:>14s} {2:>14s}".format("solver", "routing (s)", "eroder (s)"))
+    for solver in ("basic", "adaptive"):
+        grid = RasterModelGrid(args.shape, xy_spacing=10.0)
+        grid.set_closed_boundaries_at_grid_edges(True, True, True, True)
+        grid.status_at_node[1] = grid.BC_NODE_IS_FIXED_VALUE
+        z = grid.add_zeros("topographic__elevation", at="node")
+        np.random.seed(1945)
+        z += grid.y_of_node / 10.0 + grid.x_of_node / 10.0
+        z += np.random.rand(grid.number_of_nodes) * 0.1
+
+        accumulator = FlowAccumulator(
+            grid, flow_director="FlowDirectorD8", depression_finder=None
+        )
+        accumulator.run_one_step()
+        eroder = LateralEroder(
+            grid,
+            Kv=0.001,
+            Kl_ratio=1.5,
+            solver=solver,
+            flow_accumulator=accumulator if solver == "adaptive" else None,
+        )
+
+        routing_time = eroder_time = 0.0
+        for _ in range(args.steps):
+            routing_time += timeit.timeit(accumulator.run_one_step, number=1)
+            eroder_time += timeit.timeit(
+                lambda: eroder.run_one_step(args.dt), number=1
+            )
+            z[grid.core_nodes] += 0.001 * args.dt
+
+        print("{0:10s} {1:14.3f} {2:14.3f}".format(solver, routing_time, eroder_time))
+
+
+if __name__ == "__main__":
+    main()
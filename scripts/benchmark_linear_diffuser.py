@@ -0,0 +1,62 @@
+#! /usr/bin/env python
+"""Compare explicit and implicit LinearDiffuser steps much longer than the limit.
+
+The explicit method sub-steps to stay within its stability limit, so its
+cost grows with the length of the time step. The implicit method takes a
+single step with any of its solvers.
+
+Usage::
+
+    $ python scripts/benchmark_linear_diffuser.py [--shape ROWS COLS] [--ratio R]
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from landlab import RasterModelGrid
+from landlab.components import LinearDiffuser
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--shape", type=int, nargs=2, default=(500, 500), help="grid shape"
+    )
+    parser.add_argument(
+        "--ratio",
+        type=float,
+        default=100.0,
+        help="time step as a multiple of the explicit stability limit",
+    )
+    parser.add_argument("--steps", type=int, default=5, help="number of steps")
+    args = parser.parse_args()
+
+    print("{0:20s} {1:>12s} {2:>12s}".format("method", "steps/s", "max change"))
+    for method, solver in (
+        ("simple", None),
+        ("implicit", "adi"),
+        ("implicit", "direct"),
+        ("implicit", "cg"),
+    ):
+        grid = RasterModelGrid(args.shape)
+        z = grid.add_zeros("topographic__elevation", at="node")
+        np.random.seed(1945)
+        z[grid.core_nodes] = np.random.rand(grid.number_of_core_nodes)
+        diffuser = LinearDiffuser(
+            grid, linear_diffusivity=1.0, method=method, solver=solver
+        )
+        # stability limit of the explicit method is 0.15 * dx ** 2 / kd
+        dt = args.ratio * 0.15 * grid.dx ** 2
+        z_initial = z.copy()
+
+        time = timeit.timeit(lambda: diffuser.run_one_step(dt), number=args.steps)
+        print("{0:20s} {1:12.3f} {2:12.4f}".format(
+            method if solver is None else "{0} ({1})".format(method, solver),
+            args.steps / time,
+            np.abs(z - z_initial).max(),
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#! /usr/bin/env python
+"""Time Lithology steps and rock cubes for a grid with many tracked properties.
+
+Each step lowers the topography by a random amount and then updates the
+Lithology, which looks up the surface values of every tracked property.
+
+Usage::
+
+    $ python scripts/benchmark_lithology.py [--shape ROWS COLS] [--properties N]
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from landlab import RasterModelGrid
+from landlab.components import LithoLayers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--shape", type=int, nargs=2, default=(1000, 1000), help="grid shape"
+    )
+    parser.add_argument(
+        "--properties", type=int, default=12, help="number of tracked properties"
+    )
+    parser.add_argument("--layers", type=int, default=40, help="number of layers")
+    parser.add_argument("--steps", type=int, default=10, help="number of steps")
+    parser.add_argument(
+        "--depths", type=int, default=50, help="number of depth slices in the cube"
+    )
+    args = parser.parse_args()
+
+    grid = RasterModelGrid(args.shape)
+    z = grid.add_zeros("topographic__elevation", at="node")
+    rock_ids = np.arange(4)
+    attrs = {
+        "property_{0}".format(i): dict(zip(rock_ids.tolist(), np.random.rand(4)))
+        for i in range(args.properties)
+    }
+    lith = LithoLayers(
+        grid,
+        np.arange(args.layers) * 2.0,
+        np.resize(rock_ids, args.layers),
+        function=lambda x, y: 0.01 * x + 0.005 * y,
+        attrs=attrs,
+    )
+
+    np.random.seed(1945)
+
+    def step():
+        z[:] -= np.random.rand(grid.number_of_nodes) * 0.1
+        lith.run_one_step()
+
+    step_time = timeit.timeit(step, number=args.steps) / args.steps
+    depths = np.linspace(0.0, args.layers, args.depths)
+    cube_time = timeit.timeit(lambda: lith.rock_cube_to_xarray(depths), number=1)
+
+    print("nodes: {0}".format(grid.number_of_nodes))
+    print("run_one_step: {0:.4f} s".format(step_time))
+    print("rock_cube_to_xarray ({0} depths): {1:.4f} s".format(depths.size, cube_time))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#! /usr/bin/env python
+"""Measure the throughput of the OverlandFlow (de Almeida) component.
+
+A raster grid with a rough, gently sloping bed and a layer of water is
+advanced one adaptive sub-step at a time. Throughput is reported as the
+number of link updates per second (the number of links in the grid times the
+number of sub-steps, divided by the time taken).
+
+Usage::
+
+    $ python scripts/benchmark_overland_flow.py [--shape ROWS COLS] [--steps N]
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from landlab import RasterModelGrid
+from landlab.components import OverlandFlow
+
+
+def make_component(shape, steep_slopes=False):
+    grid = RasterModelGrid(shape, xy_spacing=10.0)
+    np.random.seed(1945)
+    grid.add_field(
+        "topographic__elevation",
+        0.02 * np.random.rand(grid.number_of_nodes) + 1e-4 * grid.x_of_node,
+        at="node",
+    )
+    grid.add_field(
+        "surface_water__depth", 0.1 + 0.05 * np.random.rand(grid.number_of_nodes), at="node"
+    )
+    grid.set_closed_boundaries_at_grid_edges(True, True, True, True)
+    return OverlandFlow(grid, mannings_n=0.03, steep_slopes=steep_slopes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--shape", type=int, nargs=2, default=(1000, 1000), help="grid shape"
+    )
+    parser.add_argument("--steps", type=int, default=20, help="number of sub-steps")
+    parser.add_argument("--repeat", type=int, default=3, help="number of trials")
+    args = parser.parse_args()
+
+    print("{0:15s} {1:>12s} {2:>20s}".format(
+        "steep_slopes", "time (s)", "link updates / s"
+    ))
+    for steep_slopes in (False, True):
+        of = make_component(args.shape, steep_slopes=steep_slopes)
+        of.overland_flow()
+
+        def run_sub_steps():
+            for _ in range(args.steps):
+                of.overland_flow()
+
+        time = min(timeit.repeat(run_sub_steps, number=1, repeat=args.repeat))
+        assert np.all(np.isfinite(of.h))
+        updates = of.grid.number_of_links * args.steps
+        print("{0:15s} {1:12.4f} {2:20.3e}".format(
+            str(steep_slopes), time, updates / time
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#! /usr/bin/env python
+"""Time steps of PerronNLDiffuse with its direct and iterative solvers.
+
+A random, low-relief surface is uplifted and diffused for a number of time
+steps. The first step includes building the structure of the matrix (and
+the preconditioner of the iterative solvers); later steps only refill the
+values of the matrix.
+
+Usage::
+
+    $ python scripts/benchmark_perron_nl_diffuse.py [--shape ROWS COLS] [--steps N]
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from landlab import RasterModelGrid
+from landlab.components import PerronNLDiffuse
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--shape", type=int, nargs=2, default=(1000, 1000), help="grid shape"
+    )
+    parser.add_argument("--steps", type=int, default=5, help="number of steps")
+    args = parser.parse_args()
+
+    print("{0:10s} {1:>14s} {2:>14s} {3:>12s}".format(
+        "solver", "first step (s)", "per step (s)", "iterations"
+    ))
+    for solver in ("direct", "bicgstab"):
+        grid = RasterModelGrid(args.shape)
+        z = grid.add_zeros("topographic__elevation", at="node")
+        np.random.seed(1945)
+        z[grid.core_nodes] = np.random.rand(grid.number_of_core_nodes) * 0.01
+        diffuser = PerronNLDiffuse(grid, nonlinear_diffusivity=0.1, solver=solver)
+
+        def step():
+            z[grid.core_nodes] += 0.001
+            diffuser.run_one_step(1.0)
+
+        first = timeit.timeit(step, number=1)
+        rest = timeit.timeit(step, number=args.steps)
+        print("{0:10s} {1:14.3f} {2:14.3f} {3:12d}".format(
+            solver, first, rest / args.steps, diffuser.solver_iterations
+        ))
+
+
+if __name__ == "__main__":
+    main()
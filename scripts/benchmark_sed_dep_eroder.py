@@ -0,0 +1,81 @@
+#! /usr/bin/env python
+"""Report SedDepEroder steps per second with compiled and pure-Python routing.
+
+Each step routes flow with a FlowAccumulator and then runs the eroder; only
+the time spent in the eroder is counted.
+
+Usage::
+
+    $ python scripts/benchmark_sed_dep_eroder.py [--shape ROWS COLS] [--steps N]
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from landlab import RasterModelGrid
+from landlab.components import FlowAccumulator, SedDepEroder
+
+PARAMS = {
+    "power_law": dict(K_sp=1.0e-4, K_t=1.0e-4),
+    "MPM": dict(
+        K_sp=1.0e-6,
+        Dchar=0.05,
+        threshold_Shields=0.05,
+        set_threshold_from_Dchar=True,
+        g=9.81,
+    ),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--shape", type=int, nargs=2, default=(50, 50), help="grid shape"
+    )
+    parser.add_argument("--steps", type=int, default=5, help="number of steps")
+    parser.add_argument("--dt", type=float, default=100.0, help="time step")
+    parser.add_argument(
+        "--sed-dependency-type",
+        default="generalized_humped",
+        help="shape of the sediment flux function",
+    )
+    args = parser.parse_args()
+
+    print("{0:10s} {1:>10s} {2:>14s}".format("Qc", "routing", "steps / s"))
+    for Qc, params in PARAMS.items():
+        for compiled_routing in (True, False):
+            grid = RasterModelGrid(args.shape, xy_spacing=200.0)
+            grid.set_closed_boundaries_at_grid_edges(True, True, True, False)
+            z = grid.add_zeros("topographic__elevation", at="node")
+            np.random.seed(1945)
+            z += 0.01 * grid.y_of_node + np.random.rand(grid.number_of_nodes)
+
+            accumulator = FlowAccumulator(grid, flow_director="D8")
+            eroder = SedDepEroder(
+                grid,
+                Qc=Qc,
+                sed_dependency_type=args.sed_dependency_type,
+                compiled_routing=compiled_routing,
+                **params
+            )
+
+            eroder_time = 0.0
+            for _ in range(args.steps):
+                accumulator.run_one_step()
+                eroder_time += timeit.timeit(
+                    lambda: eroder.run_one_step(args.dt), number=1
+                )
+                z[grid.core_nodes] += 0.001 * args.dt
+
+            print(
+                "{0:10s} {1:>10s} {2:14.2f}".format(
+                    Qc,
+                    "compiled" if compiled_routing else "python",
+                    args.steps / eroder_time,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#! /usr/bin/env python
+"""Time finding the fractions of upstream HSD ids at every node.
+
+Flow is routed over a random surface and the grid divided into square
+blocks of nodes that act as the cells of a coarser Hydrologic Source Domain
+(HSD). The fractions of upstream HSD ids are found at every node with
+find_upstream_hsd_fractions. For reference, the brute-force track_source
+followed by find_unique_upstream_hsd_ids_and_fractions is also timed, but
+only on grids small enough for it to finish (see ``--max-brute-force``).
+
+Usage::
+
+    $ python scripts/benchmark_source_tracking.py [--shape ROWS COLS] [--block N]
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from landlab import RasterModelGrid
+from landlab.components import FlowAccumulator
+from landlab.utils import (
+    find_unique_upstream_hsd_ids_and_fractions,
+    find_upstream_hsd_fractions,
+    track_source,
+)
+
+
+def brute_force(grid, hsd_ids):
+    hsd_upstr, flow_accum = track_source(grid, hsd_ids)
+    return find_unique_upstream_hsd_ids_and_fractions(hsd_upstr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--shape", type=int, nargs=2, default=(1000, 1000), help="grid shape"
+    )
+    parser.add_argument("--block", type=int, default=10, help="HSD cell size, in nodes")
+    parser.add_argument(
+        "--max-brute-force",
+        type=int,
+        default=2500,
+        help="largest number of nodes on which to run track_source",
+    )
+    args = parser.parse_args()
+
+    grid = RasterModelGrid(args.shape, xy_spacing=30.0)
+    z = grid.add_zeros("topographic__elevation", at="node")
+    np.random.seed(1945)
+    z += np.random.rand(grid.number_of_nodes) + 0.01 * grid.y_of_node
+    FlowAccumulator(grid, flow_director="D8").run_one_step()
+
+    rows, cols = np.divmod(np.arange(grid.number_of_nodes), grid.number_of_node_columns)
+    hsd_ids = (rows // args.block) * grid.number_of_node_columns + cols // args.block
+
+    fractions = find_upstream_hsd_fractions(grid, hsd_ids)[0]
+    print(
+        "{0} nodes, {1} HSD ids, {2} stored fractions".format(
+            grid.number_of_nodes, fractions.shape[1], fractions.nnz
+        )
+    )
+
+    print("{0:40s} {1:>10s}".format("method", "time (s)"))
+    print(
+        "{0:40s} {1:10.4f}".format(
+            "find_upstream_hsd_fractions",
+            timeit.timeit(lambda: find_upstream_hsd_fractions(grid, hsd_ids), number=1),
+        )
+    )
+    if grid.number_of_nodes <= args.max_brute_force:
+        print(
+            "{0:40s} {1:10.4f}".format(
+                "track_source (brute force)",
+                timeit.timeit(lambda: brute_force(grid, hsd_ids), number=1),
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
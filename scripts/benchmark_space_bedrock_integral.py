@@ -0,0 +1,117 @@
+#! /usr/bin/env python
+"""Compare Space's closed-form bedrock integral with numerical quadrature.
+
+Space.run_one_step_basic integrates the rate of bedrock lowering over a time
+step at every core node. The integral used to be calculated with
+scipy.integrate.quad, node by node; it is now evaluated in closed form for
+all nodes at once. This script draws random parameters covering all of the
+cases for the evolution of sediment thickness, checks that the two agree,
+and times them.
+
+Usage::
+
+    $ python scripts/benchmark_space_bedrock_integral.py [--size N] [--dt DT]
+"""
+import argparse
+import sys
+import timeit
+
+import numpy as np
+from scipy.integrate import quad
+
+from landlab.components.space.space import _calc_bedrock_lowering, _dRdt
+
+
+def random_parameters(size, seed=1945):
+    """Random parameters in each of the cases of _dRdt."""
+    rng = np.random.RandomState(seed)
+
+    a = 10.0 ** rng.uniform(-6.0, -1.0, size)
+    c = 10.0 ** rng.uniform(-6.0, -1.0, size)
+    d = 10.0 ** rng.uniform(-6.0, -1.0, size)
+    H0 = 10.0 ** rng.uniform(-4.0, 1.0, size)
+
+    case = rng.randint(0, 5, size)
+    d[case == 0] = 0.0  # no entrainment
+    c[case == 1] = d[case == 1]  # deposition balances entrainment
+    H0[case == 2] *= 1000.0  # very thick sediment
+    c[case == 3] = 0.0  # entrainment only
+
+    return a, c, d, H0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=10000, help="number of nodes")
+    parser.add_argument("--dt", type=float, default=100.0, help="time step")
+    parser.add_argument("--H-star", type=float, default=0.1, help="H*")
+    parser.add_argument(
+        "--rtol", type=float, default=1e-10, help="largest relative difference"
+    )
+    args = parser.parse_args()
+
+    a, c, d, H0 = random_parameters(args.size)
+    b = 1.0 / args.H_star
+
+    def by_quad(**kwds):
+        return np.array(
+            [
+                quad(_dRdt, 0, args.dt, (a[i], b, c[i], d[i], H0[i]), **kwds)[0]
+                for i in range(args.size)
+            ]
+        )
+
+    def by_quad_where_finite(**kwds):
+        # quad can crash with break points if the integrand overflows
+        with np.errstate(over="ignore", invalid="ignore"):
+            finite = [
+                np.isfinite(_dRdt(args.dt, a[i], b, c[i], d[i], H0[i]))
+                for i in range(args.size)
+            ]
+        return np.array(
+            [
+                quad(_dRdt, 0, args.dt, (a[i], b, c[i], d[i], H0[i]), **kwds)[0]
+                if finite[i]
+                else np.nan
+                for i in range(args.size)
+            ]
+        )
+
+    def closed_form():
+        return _calc_bedrock_lowering(a, b, c, d, H0, args.dt)
+
+    # quad's default tolerance (about 1.5e-8) is looser than the agreement
+    # we are looking for, so check against a tighter quadrature. Sediment
+    # thickness can change quickly near the start of long time steps, so
+    # also give quad break points that resolve this.
+    expected = by_quad_where_finite(
+        epsabs=0.0,
+        epsrel=1e-13,
+        limit=500,
+        points=args.dt * np.logspace(-12.0, 0.0, 25)[:-1],
+    )
+    actual = closed_form()
+    # ignore differences between values too small to be normal numbers, and
+    # where the integral overflows
+    normal = (np.abs(expected) > np.finfo(float).tiny) & np.isfinite(expected)
+    rel_error = np.abs(actual - expected)[normal] / np.abs(expected[normal])
+
+    quad_time = timeit.timeit(by_quad, number=1)
+    closed_time = min(timeit.repeat(closed_form, number=1, repeat=5))
+
+    print("nodes: {0} ({1} with normal values)".format(args.size, normal.sum()))
+    print("max relative difference: {0:.3e}".format(rel_error.max()))
+    print("quad: {0:.4f} s".format(quad_time))
+    print(
+        "closed form: {0:.6f} s ({1:.0f}x)".format(
+            closed_time, quad_time / closed_time
+        )
+    )
+
+    if not rel_error.max() <= args.rtol:
+        print("FAIL: relative difference larger than {0}".format(args.rtol))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#! /usr/bin/env python
+"""Time flow distance, distance to divide and chi, which accumulate along stacks.
+
+Each is calculated after routing flow over a random surface. For reference,
+the time for a pure-Python loop that sums link lengths up the stack (as
+calculate_flow__distance used to do for route-to-one directors) is also
+reported.
+
+Usage::
+
+    $ python scripts/benchmark_stack_accumulate.py [--shape ROWS COLS]
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from landlab import RasterModelGrid
+from landlab.components import ChiFinder, FlowAccumulator
+from landlab.utils.distance_to_divide import calculate_distance_to_divide
+from landlab.utils.flow__distance import calculate_flow__distance
+
+
+def flow_distance_by_python(grid):
+    receivers = grid.at_node["flow__receiver_node"]
+    lengths = grid.length_of_d8[grid.at_node["flow__link_to_receiver_node"]]
+    distance = np.zeros(grid.number_of_nodes)
+    for node in grid.at_node["flow__upstream_node_order"]:
+        receiver = receivers[node]
+        if receiver != node:
+            distance[node] = distance[receiver] + lengths[node]
+    return distance
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--shape", type=int, nargs=2, default=(500, 500), help="grid shape"
+    )
+    args = parser.parse_args()
+
+    print("{0:10s} {1:30s} {2:>10s}".format("director", "function", "time (s)"))
+    for flow_director in ("D8", "MFD"):
+        grid = RasterModelGrid(args.shape, xy_spacing=10.0)
+        z = grid.add_zeros("topographic__elevation", at="node")
+        np.random.seed(1945)
+        z += np.random.rand(grid.number_of_nodes) + 0.01 * grid.y_of_node
+        FlowAccumulator(grid, flow_director=flow_director).run_one_step()
+
+        timers = [
+            ("calculate_flow__distance", lambda: calculate_flow__distance(grid)),
+            (
+                "calculate_distance_to_divide",
+                lambda: calculate_distance_to_divide(grid),
+            ),
+        ]
+        if flow_director == "D8":
+            chi_finder = ChiFinder(grid, min_drainage_area=1000.0, use_true_dx=True)
+            timers += [
+                ("ChiFinder.calculate_chi", chi_finder.calculate_chi),
+                ("flow distance by python", lambda: flow_distance_by_python(grid)),
+            ]
+
+        for name, func in timers:
+            print(
+                "{0:10s} {1:30s} {2:10.4f}".format(
+                    flow_director, name, timeit.timeit(func, number=1)
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
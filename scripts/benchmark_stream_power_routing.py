@@ -0,0 +1,76 @@
+#! /usr/bin/env python
+"""Time FastscapeEroder and StreamPowerEroder steps that reuse flow routing.
+
+Flow is routed once every few steps (and a routing that does not change
+counts as unchanged), so eroders can reuse link lengths between routings.
+Only the time spent in the eroder is reported, along with how many steps
+reused (hits) or recalculated (misses) link lengths.
+
+Usage::
+
+    $ python scripts/benchmark_stream_power_routing.py [--shape ROWS COLS] [--steps N]
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from landlab import RasterModelGrid
+from landlab.components import FastscapeEroder, FlowAccumulator, StreamPowerEroder
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--shape", type=int, nargs=2, default=(500, 500), help="grid shape"
+    )
+    parser.add_argument("--steps", type=int, default=20, help="number of steps")
+    parser.add_argument(
+        "--route-every", type=int, default=5, help="steps between flow routings"
+    )
+    parser.add_argument("--dt", type=float, default=100.0, help="time step")
+    args = parser.parse_args()
+
+    print(
+        "{0:20s} {1:>12s} {2:>12s} {3:>6s} {4:>7s}".format(
+            "eroder", "cache by", "eroder (s)", "hits", "misses"
+        )
+    )
+    for eroder_class in (FastscapeEroder, StreamPowerEroder):
+        for cache_by in ("accumulator", "links"):
+            grid = RasterModelGrid(args.shape, xy_spacing=10.0)
+            z = grid.add_zeros("topographic__elevation", at="node")
+            np.random.seed(1945)
+            z += np.random.rand(grid.number_of_nodes)
+
+            accumulator = FlowAccumulator(grid, flow_director="D8")
+            eroder = eroder_class(
+                grid,
+                K_sp=0.0001,
+                m_sp=0.5,
+                n_sp=1.5,
+                flow_accumulator=accumulator if cache_by == "accumulator" else None,
+            )
+
+            eroder_time = 0.0
+            for step in range(args.steps):
+                if step % args.route_every == 0:
+                    accumulator.run_one_step()
+                eroder_time += timeit.timeit(
+                    lambda: eroder.run_one_step(args.dt), number=1
+                )
+                z[grid.core_nodes] += 0.001 * args.dt
+
+            print(
+                "{0:20s} {1:>12s} {2:12.3f} {3:6d} {4:7d}".format(
+                    eroder_class.__name__,
+                    cache_by,
+                    eroder_time,
+                    eroder.routing_cache_hits,
+                    eroder.routing_cache_misses,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ Created on Fri Mar  3 10:39:32 2017
 
 @author: gtucker
 """
+import numpy as np
 import pytest
 
 from landlab import RasterModelGrid
@@ -27,3 +28,41 @@ def test_raise_kwargs_error():
 
     with pytest.raises(TypeError):
         DDdiff.soilflux(2.0, bad_var=1)
+
+
+def test_dynamic_dt():
+    def make_hillslope():
+        mg = RasterModelGrid((5, 5))
+        z = mg.add_zeros("topographic__elevation", at="node")
+        BRz = mg.add_zeros("bedrock__elevation", at="node")
+        mg.add_zeros("soil__depth", at="node")
+        mg.add_zeros("soil_production__rate", at="node")
+        z += mg.x_of_node ** 2
+        BRz += z - 1.0
+        return mg, z
+
+    mg, z = make_hillslope()
+    DDdiff = DepthDependentDiffuser(mg, dynamic_dt=True)
+    DDdiff.run_one_step(0.5)
+    assert DDdiff.number_of_substeps > 1
+
+    mg_short, z_short = make_hillslope()
+    DDdiff = DepthDependentDiffuser(mg_short)
+    for _ in range(50):
+        DDdiff.run_one_step(0.01)
+    assert DDdiff.number_of_substeps == 1
+
+    np.testing.assert_array_almost_equal(z, z_short, decimal=1)
+
+
+def test_raise_stability_error():
+    mg = RasterModelGrid((5, 5))
+    z = mg.add_zeros("topographic__elevation", at="node")
+    BRz = mg.add_zeros("bedrock__elevation", at="node")
+    mg.add_zeros("soil__depth", at="node")
+    mg.add_zeros("soil_production__rate", at="node")
+    z += mg.x_of_node ** 2
+    BRz += z - 1.0
+    DDdiff = DepthDependentDiffuser(mg, if_unstable="raise")
+    with pytest.raises(RuntimeError):
+        DDdiff.run_one_step(10.0)
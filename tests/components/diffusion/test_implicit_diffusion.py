@@ -0,0 +1,168 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+
+from landlab import HexModelGrid, RasterModelGrid
+from landlab.components import LinearDiffuser
+
+
+def _make_bump(grid):
+    z = grid.add_zeros("topographic__elevation", at="node")
+    z[grid.core_nodes] = np.exp(
+        -((grid.x_of_node - grid.x_of_node.mean()) ** 2)
+        - (grid.y_of_node - grid.y_of_node.mean()) ** 2
+    )[grid.core_nodes]
+    return z
+
+
+@pytest.mark.parametrize("solver", ["adi", "direct", "cg"])
+def test_steady_state_hillslope(solver):
+    grid = RasterModelGrid((3, 11), xy_spacing=2.0)
+    grid.set_closed_boundaries_at_grid_edges(False, True, False, True)
+    z = grid.add_zeros("topographic__elevation", at="node")
+    ld = LinearDiffuser(grid, linear_diffusivity=0.5, method="implicit", solver=solver)
+
+    uplift_rate, dt = 0.001, 1.0e6
+    for _ in range(5):
+        z[grid.core_nodes] += uplift_rate * dt
+        ld.run_one_step(dt)
+
+    x = grid.x_of_node[grid.core_nodes]
+    assert_allclose(
+        z[grid.core_nodes], uplift_rate / (2 * 0.5) * x * (20.0 - x), rtol=1e-6
+    )
+
+
+@pytest.mark.parametrize("solver", ["adi", "direct", "cg"])
+def test_conserves_mass_with_closed_boundaries(solver):
+    grid = RasterModelGrid((12, 10))
+    grid.set_closed_boundaries_at_grid_edges(True, True, True, True)
+    z = _make_bump(grid)
+    total = z[grid.core_nodes].sum()
+
+    kd = grid.add_ones("kd", at="node") + grid.x_of_node / 10.0
+    ld = LinearDiffuser(grid, linear_diffusivity=kd, method="implicit", solver=solver)
+    for _ in range(3):
+        ld.run_one_step(100.0)
+
+    assert z[grid.core_nodes].sum() == pytest.approx(total)
+    assert z[grid.core_nodes].max() < 0.5
+
+
+@pytest.mark.parametrize("solver", ["adi", "direct", "cg"])
+def test_implicit_matches_explicit_for_short_steps(solver):
+    explicit = RasterModelGrid((15, 17))
+    implicit = RasterModelGrid((15, 17))
+    z_explicit = _make_bump(explicit)
+    z_implicit = _make_bump(implicit)
+
+    explicit_diffuser = LinearDiffuser(explicit, linear_diffusivity=0.5)
+    ld = LinearDiffuser(
+        implicit,
+        linear_diffusivity=0.5,
+        method="implicit",
+        solver=solver,
+        solver_kwds=None if solver == "adi" else {"rtol": 1e-12},
+    )
+    for _ in range(200):
+        explicit_diffuser.run_one_step(0.01)
+        ld.run_one_step(0.01)
+
+    # backward Euler is first order in time, so only approximately the same
+    assert_allclose(z_implicit, z_explicit, atol=2.5e-3)
+
+
+def test_direct_and_cg_agree():
+    grids = [RasterModelGrid((8, 9)), RasterModelGrid((8, 9))]
+    for grid in grids:
+        _make_bump(grid)
+        grid.status_at_node[grid.nodes_at_left_edge] = grid.BC_NODE_IS_CLOSED
+    for grid, solver in zip(grids, ["direct", "cg"]):
+        ld = LinearDiffuser(
+            grid,
+            linear_diffusivity=1.0,
+            method="implicit",
+            solver=solver,
+            solver_kwds={"rtol": 1e-12},
+        )
+        for _ in range(4):
+            ld.run_one_step(10.0)
+    assert_allclose(
+        grids[0].at_node["topographic__elevation"],
+        grids[1].at_node["topographic__elevation"],
+        atol=1e-10,
+    )
+
+
+def test_direct_solver_reuses_factorization():
+    grid = RasterModelGrid((8, 9))
+    _make_bump(grid)
+    ld = LinearDiffuser(
+        grid, linear_diffusivity=1.0, method="implicit", solver="direct"
+    )
+    for _ in range(4):
+        ld.run_one_step(10.0)
+    assert ld._solver.number_of_factorizations == 1
+
+    grid.status_at_node[grid.nodes_at_top_edge] = grid.BC_NODE_IS_CLOSED
+    ld.run_one_step(10.0)
+    assert ld._solver.number_of_factorizations == 2
+
+
+@pytest.mark.parametrize("solver", ["adi", "direct"])
+def test_fixed_gradient_boundaries(solver):
+    grid = RasterModelGrid((6, 7))
+    z = _make_bump(grid)
+    z[grid.perimeter_nodes] = 0.1 * grid.x_of_node[grid.perimeter_nodes]
+    grid.status_at_node[grid.nodes_at_right_edge] = grid.BC_NODE_IS_FIXED_GRADIENT
+    ld = LinearDiffuser(grid, linear_diffusivity=1.0, method="implicit", solver=solver)
+    for _ in range(3):
+        ld.run_one_step(100.0)
+
+    assert_allclose(
+        z[ld.fixed_grad_nodes], z[ld.fixed_grad_anchors] + ld.fixed_grad_offsets
+    )
+    assert np.all(z[grid.nodes_at_left_edge] == 0.0)
+
+
+def test_hex_grid_defaults_to_cg():
+    grids = [HexModelGrid((7, 6)), HexModelGrid((7, 6))]
+    for grid, solver in zip(grids, [None, "direct"]):
+        grid.status_at_node[grid.perimeter_nodes] = grid.BC_NODE_IS_CLOSED
+        z = _make_bump(grid)
+        total = (z * grid.cell_area_at_node)[grid.core_nodes].sum()
+
+        ld = LinearDiffuser(
+            grid,
+            linear_diffusivity=1.0,
+            method="implicit",
+            solver=solver,
+            solver_kwds={"rtol": 1e-12},
+        )
+        for _ in range(2):
+            ld.run_one_step(10.0)
+
+        assert (z * grid.cell_area_at_node)[grid.core_nodes].sum() == pytest.approx(
+            total
+        )
+    assert ld._solver.method == "direct"
+
+    assert_allclose(
+        grids[0].at_node["topographic__elevation"],
+        grids[1].at_node["topographic__elevation"],
+        atol=1e-10,
+    )
+
+
+def test_implicit_bad_arguments():
+    grid = HexModelGrid((5, 4))
+    grid.add_zeros("topographic__elevation", at="node")
+    with pytest.raises(ValueError):
+        LinearDiffuser(grid, method="implicit", solver="adi")
+
+    grid = RasterModelGrid((5, 4))
+    grid.add_zeros("topographic__elevation", at="node")
+    with pytest.raises(ValueError):
+        LinearDiffuser(grid, method="implicit", deposit=False)
+    with pytest.raises(ValueError):
+        LinearDiffuser(grid, method="implicit", solver="lu")
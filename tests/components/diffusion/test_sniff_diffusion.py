@@ -279,3 +279,17 @@ def test_diffusion_no_deposit():
     z_7_after = z[7]
 
     assert_equal(z_7_before, z_7_after)
+
+
+def test_number_of_substeps():
+    mg = RasterModelGrid((5, 5))
+    z = mg.add_zeros("topographic__elevation", at="node")
+    z[12] = 1.0
+    ld = LinearDiffuser(mg, linear_diffusivity=1.0)
+
+    ld.run_one_step(1.0)
+    assert ld.time_step == 0.15
+    assert ld.number_of_substeps == 7
+
+    ld.run_one_step(0.15)
+    assert ld.number_of_substeps == 1
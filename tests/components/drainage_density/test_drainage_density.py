@@ -233,3 +233,126 @@ def test_missing_area_coefficient():
             slope_exponent=1,
             channelization_threshold=1,
         )
+
+
+def _eroded_grid(seed=3542):
+    mg = RasterModelGrid((20, 25), xy_spacing=(10.0, 7.0))
+    z = mg.add_zeros("topographic__elevation", at="node")
+    np.random.seed(seed)
+    z += np.random.rand(mg.number_of_nodes)
+    fr = FlowAccumulator(mg, flow_director="D8")
+    fsc = FastscapeEroder(mg, K_sp=0.001)
+    for _ in range(10):
+        z[mg.core_nodes] += 1.0
+        fr.run_one_step()
+        fsc.run_one_step(dt=100.0)
+    fr.run_one_step()
+    return mg
+
+
+def _walk_to_channel(grid, mask):
+    receivers = grid.at_node["flow__receiver_node"]
+    links = grid.at_node["flow__link_to_receiver_node"]
+    distances = np.zeros(grid.number_of_nodes)
+    for node in range(grid.number_of_nodes):
+        downstream = node
+        while mask[downstream] == 0 and receivers[downstream] != downstream:
+            distances[node] += grid.length_of_d8[links[downstream]]
+            downstream = receivers[downstream]
+    return distances
+
+
+@pytest.mark.parametrize("threshold", [500.0, 5000.0, 1e12])
+def test_distances_match_walk_downstream(threshold):
+    mg = _eroded_grid()
+    mask = (mg.at_node["drainage_area"] > threshold).astype(np.uint8)
+
+    DrainageDensity(mg, channel__mask=mask).calculate_drainage_density()
+
+    np.testing.assert_allclose(
+        mg.at_node["surface_to_channel__minimum_distance"],
+        _walk_to_channel(mg, mask),
+        rtol=1e-12,
+    )
+
+
+def test_mask_not_changed_by_distances():
+    mg = _eroded_grid()
+    mask = np.zeros(mg.number_of_nodes, dtype=np.uint8)
+    mask[mg.core_nodes[::7]] = 1
+    expected = mask.copy()
+
+    DrainageDensity(mg, channel__mask=mask).calculate_drainage_density()
+
+    assert_array_equal(mg.at_node["channel__mask"], expected)
+
+
+def test_mask_updated_with_drainage_area():
+    mg = _eroded_grid()
+    dd = DrainageDensity(
+        mg,
+        area_coefficient=1.0,
+        slope_coefficient=1.0,
+        area_exponent=1.0,
+        slope_exponent=0.0,
+        channelization_threshold=500.0,
+    )
+    dd.calculate_drainage_density()
+
+    mg.at_node["drainage_area"][:] = 0.0
+    dd.calculate_drainage_density()
+
+    assert np.all(mg.at_node["channel__mask"] == 0)
+    np.testing.assert_allclose(
+        mg.at_node["surface_to_channel__minimum_distance"],
+        _walk_to_channel(mg, mg.at_node["channel__mask"]),
+        rtol=1e-12,
+    )
+
+
+def test_distances_for_thresholds():
+    mg = _eroded_grid()
+    thresholds = [100.0, 500.0, 5000.0, 1e12]
+    dd = DrainageDensity(
+        mg,
+        area_coefficient=1.0,
+        slope_coefficient=1.0,
+        area_exponent=1.0,
+        slope_exponent=0.0,
+        channelization_threshold=500.0,
+    )
+    distances = dd.calculate_distances_to_channel(thresholds)
+    assert distances.shape == (len(thresholds), mg.number_of_nodes)
+
+    for threshold, distance in zip(thresholds, distances):
+        dd._channelization_threshold = threshold
+        dd.calculate_drainage_density()
+        assert_array_equal(distance, mg.at_node["surface_to_channel__minimum_distance"])
+
+
+def test_distances_for_thresholds_leaves_fields():
+    mg = _eroded_grid()
+    dd = DrainageDensity(
+        mg,
+        area_coefficient=1.0,
+        slope_coefficient=1.0,
+        area_exponent=1.0,
+        slope_exponent=0.0,
+        channelization_threshold=500.0,
+    )
+    dd.calculate_drainage_density()
+    mask = mg.at_node["channel__mask"].copy()
+    distance = mg.at_node["surface_to_channel__minimum_distance"].copy()
+
+    dd.calculate_distances_to_channel([100.0, 5000.0])
+
+    assert_array_equal(mg.at_node["channel__mask"], mask)
+    assert_array_equal(mg.at_node["surface_to_channel__minimum_distance"], distance)
+
+
+def test_distances_for_thresholds_with_mask():
+    mg = _eroded_grid()
+    mask = (mg.at_node["drainage_area"] > 500.0).astype(np.uint8)
+    dd = DrainageDensity(mg, channel__mask=mask)
+    with pytest.raises(ValueError):
+        dd.calculate_distances_to_channel([100.0, 500.0])
@@ -3,7 +3,7 @@ import pytest
 from numpy import testing
 
 from landlab import RasterModelGrid
-from landlab.components import ErosionDeposition, FlowAccumulator
+from landlab.components import ErosionDeposition, FlowAccumulator, Space
 
 
 def test_Ff_too_high_vals():
@@ -258,3 +258,141 @@ def test_sediment__flux_already_created():
         err_msg="E/D sediment flux field test failed",
         verbose=True,
     )
+
+
+def _make_budget_grid(depression_finder):
+    mg = RasterModelGrid((8, 9), xy_spacing=10.0)
+    z = mg.add_zeros("topographic__elevation", at="node")
+    np.random.seed(1945)
+    z += mg.x_of_node / 100.0 + np.random.rand(mg.number_of_nodes)
+    soil = mg.add_zeros("soil__depth", at="node")
+    soil += np.random.rand(mg.number_of_nodes)
+    mg.set_closed_boundaries_at_grid_edges(True, True, True, False)
+    FlowAccumulator(
+        mg, flow_director="D8", depression_finder=depression_finder
+    ).run_one_step()
+    return mg
+
+
+def _smoothed_threshold(omega, sp_crit):
+    ratio = np.divide(omega, sp_crit, out=np.zeros_like(omega), where=sp_crit != 0)
+    return sp_crit * (1.0 - np.exp(-ratio))
+
+
+def _sediment_budget_by_numpy(eroder, cover):
+    """Erosion, sediment flux and deposition node by node."""
+    grid = eroder._grid
+    q, slope, area = eroder._q, eroder._slope, eroder._cell_area_at_node
+    receivers = eroder._flow_receivers
+
+    omega = np.power(q, eroder._m_sp) * np.power(slope, eroder._n_sp)
+    if cover:
+        omega_br = eroder._K_br * omega
+        omega_sed = eroder._K_sed * omega
+        br = omega_br - _smoothed_threshold(omega_br, eroder._sp_crit_br)
+        sed = omega_sed - _smoothed_threshold(omega_sed, eroder._sp_crit_sed) / (
+            1.0 - eroder._phi
+        )
+        covered = np.exp(-grid.at_node["soil__depth"] / eroder._H_star)
+        Es, Er = sed * (1.0 - covered), br * covered
+    else:
+        Er = eroder._K * omega - _smoothed_threshold(eroder._K * omega, eroder._sp_crit)
+        Es = np.zeros_like(Er)
+
+    is_flooded = eroder._get_flooded_core_nodes()
+    Es[is_flooded] = 0.0
+    Er[is_flooded] = 0.0
+
+    qs = np.zeros(grid.number_of_nodes)
+    qs_in = np.zeros(grid.number_of_nodes)
+    for node in eroder._stack[::-1]:
+        if q[node] > 0.0 and receivers[node] != node:
+            qs[node] = (
+                qs_in[node] + (Es[node] + (1.0 - eroder._F_f) * Er[node]) * area[node]
+            ) / (1.0 + eroder._v_s * area[node] / q[node])
+            qs_in[receivers[node]] += qs[node]
+
+    depo_rate = np.divide(qs * eroder._v_s, q, out=np.zeros_like(qs), where=q > 0.0)
+    if not eroder._depressions_are_handled():
+        depo_rate[is_flooded] = qs_in[is_flooded] / area[is_flooded]
+
+    return Es, Er, qs, qs_in, depo_rate
+
+
+@pytest.mark.parametrize("depression_finder", [None, "DepressionFinderAndRouter"])
+@pytest.mark.parametrize("cover", [False, True])
+def test_sediment_budget_matches_numpy(depression_finder, cover):
+    mg = _make_budget_grid(depression_finder)
+    if cover:
+        eroder = Space(
+            mg,
+            K_sed=0.02,
+            K_br=0.01,
+            F_f=0.3,
+            phi=0.2,
+            H_star=0.5,
+            v_s=2.0,
+            m_sp=0.6,
+            n_sp=1.3,
+            sp_crit_sed=0.01,
+            sp_crit_br=0.02,
+        )
+    else:
+        eroder = ErosionDeposition(
+            mg, K=0.01, F_f=0.3, v_s=2.0, m_sp=0.6, n_sp=1.3, sp_crit=0.02
+        )
+
+    eroder._calc_qs_in_and_depo_rate()
+    Es, Er, qs, qs_in, depo_rate = _sediment_budget_by_numpy(eroder, cover)
+
+    testing.assert_array_almost_equal(eroder._Er if cover else eroder._erosion_term, Er)
+    if cover:
+        testing.assert_array_almost_equal(eroder._Es, Es)
+    testing.assert_array_almost_equal(eroder._qs, qs)
+    testing.assert_array_almost_equal(eroder._qs_in, qs_in)
+    testing.assert_array_almost_equal(eroder._depo_rate, depo_rate)
+
+
+@pytest.mark.parametrize("cover", [False, True])
+def test_sediment_budget_stable_time_step(cover):
+    mg = _make_budget_grid(None)
+    z = mg.at_node["topographic__elevation"]
+    if cover:
+        eroder = Space(mg, K_sed=0.02, K_br=0.01, phi=0.2, v_s=2.0, H_star=0.5)
+    else:
+        eroder = ErosionDeposition(mg, K=0.01, v_s=2.0)
+
+    dzdt = np.empty(mg.number_of_nodes)
+    dHdt = np.empty(mg.number_of_nodes) if cover else None
+    dt = eroder._calc_qs_in_and_depo_rate(
+        z=z, dzdt=dzdt, dHdt=dHdt, max_dt=1e6, time_step_factor=0.5
+    )
+    Es, Er, _, _, depo_rate = _sediment_budget_by_numpy(eroder, cover)
+
+    porosity_factor = 1.0 / (1.0 - eroder._phi) if cover else 1.0
+    expected_dzdt = np.zeros(mg.number_of_nodes)
+    expected_dzdt[mg.core_nodes] = (depo_rate * porosity_factor - (Es + Er))[
+        mg.core_nodes
+    ]
+    testing.assert_array_almost_equal(dzdt, expected_dzdt)
+
+    receivers = eroder._flow_receivers
+    rocdif = dzdt - dzdt[receivers]
+    zdif = z - z[receivers]
+    converging = (rocdif < 0.0) & (zdif > 0.0)
+    expected_dt = min(1e6, np.amin(-0.5 * zdif[converging] / rocdif[converging]))
+    if cover:
+        testing.assert_array_almost_equal(dHdt, porosity_factor * (depo_rate - Es))
+        thinning = dHdt < 0.0
+        expected_dt = min(
+            expected_dt,
+            np.amin(-0.5 * mg.at_node["soil__depth"][thinning] / dHdt[thinning]),
+        )
+    assert dt == pytest.approx(expected_dt)
+
+
+def test_integer_parameters():
+    mg = _make_budget_grid(None)
+    ed = ErosionDeposition(mg, K=1, v_s=1, sp_crit=0)
+    ed.run_one_step(1.0)
+    assert np.all(np.isfinite(mg.at_node["topographic__elevation"]))
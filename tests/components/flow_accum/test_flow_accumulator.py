@@ -1256,3 +1256,40 @@ def test_incompatible_routing():
             flow_director="FlowDirectorD8",
             depression_finder="LakeMapperBarnes",
         )
+
+
+@pytest.mark.parametrize("flow_director", ["D8", "MFD"])
+def test_routing_version(flow_director):
+    mg = RasterModelGrid((5, 6))
+    z = mg.add_zeros("topographic__elevation", at="node")
+    z += mg.x_of_node + 0.5 * mg.y_of_node
+    fa = FlowAccumulator(mg, flow_director=flow_director)
+    assert fa.routing_version == 0
+
+    fa.run_one_step()
+    fa.run_one_step()
+    assert fa.routing_version == 1
+
+    z += 0.5
+    fa.run_one_step()
+    assert fa.routing_version == 1
+
+    z[13] -= 10.0
+    fa.run_one_step()
+    assert fa.routing_version == 2
+
+
+def test_routing_version_with_depression_finder():
+    mg = RasterModelGrid((5, 6))
+    z = mg.add_zeros("topographic__elevation", at="node")
+    z += mg.x_of_node
+    fa = FlowAccumulator(
+        mg, flow_director="D8", depression_finder=DepressionFinderAndRouter
+    )
+    fa.run_one_step()
+    receivers = mg.at_node["flow__receiver_node"].copy()
+
+    z[15] -= 5.0
+    fa.run_one_step()
+    assert fa.routing_version == 2
+    assert np.any(mg.at_node["flow__receiver_node"] != receivers)
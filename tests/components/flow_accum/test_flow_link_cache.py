@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+from landlab import HexModelGrid, RasterModelGrid
+from landlab.components import FlowAccumulator
+from landlab.components.flow_accum.flow_link_cache import FlowLinkCache
+
+
+def _expected_lengths(grid, n):
+    links = grid.at_node["flow__link_to_receiver_node"]
+    has_receiver = links != grid.BAD_INDEX
+    try:
+        length_of_link = grid.length_of_d8
+    except AttributeError:
+        length_of_link = grid.length_of_link
+    return has_receiver, length_of_link[links[has_receiver]] ** n
+
+
+@pytest.mark.parametrize("use_accumulator", [True, False])
+@pytest.mark.parametrize("grid_type", ["raster", "hex"])
+def test_recalculated_when_routing_changes(grid_type, use_accumulator):
+    if grid_type == "raster":
+        grid = RasterModelGrid((6, 7), xy_spacing=2.0)
+    else:
+        grid = HexModelGrid((6, 5))
+    z = grid.add_zeros("topographic__elevation", at="node")
+    np.random.seed(1973)
+    z += np.random.rand(grid.number_of_nodes)
+    fa = FlowAccumulator(grid)
+    cache = FlowLinkCache(grid, 1.5, flow_accumulator=fa if use_accumulator else None)
+
+    fa.run_one_step()
+    assert not cache.update()
+    assert cache.update()
+
+    z -= 1.0
+    fa.run_one_step()
+    assert cache.update()
+
+    z += np.random.rand(grid.number_of_nodes)
+    fa.run_one_step()
+    assert not cache.update()
+
+    has_receiver, length_to_the_n = _expected_lengths(grid, 1.5)
+    assert_array_equal(cache.has_receiver, has_receiver)
+    assert_array_equal(cache.length_to_the_n, length_to_the_n)
+    assert (cache.hits, cache.misses) == (2, 2)
+
+    cache.reset_counters()
+    assert (cache.hits, cache.misses) == (0, 0)
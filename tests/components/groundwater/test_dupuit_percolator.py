@@ -7,7 +7,8 @@ Created on Tue Jun  4 16:26:31 2019
 """
 
 import numpy as np
-from numpy.testing import assert_almost_equal, assert_equal
+import pytest
+from numpy.testing import assert_allclose, assert_almost_equal, assert_equal
 
 from landlab import HexModelGrid, RasterModelGrid
 from landlab.components import FlowAccumulator, GroundwaterDupuitPercolator
@@ -365,3 +366,117 @@ def test_callback_func():
     assert_almost_equal(1e5, sum(subdt))
 
     assert all(x == 0.1 for x in all_n)
+
+
+def test_simple_water_table_semi_implicit():
+    """Test the one-node steady simulation with the semi-implicit solver."""
+    boundaries = {"top": "closed", "left": "closed", "bottom": "closed"}
+    rg = RasterModelGrid((3, 3), bc=boundaries)
+    rg.add_zeros("aquifer_base__elevation", at="node")
+    rg.add_ones("topographic__elevation", at="node")
+    gdp = GroundwaterDupuitPercolator(
+        rg, recharge_rate=1.0e-8, hydraulic_conductivity=0.01
+    )
+    for i in range(20):
+        gdp.run_with_semi_implicit_solver(1e5, refactor_tolerance=0.0)
+
+    assert_equal(np.round(gdp._thickness[4], 5), 0.001)
+
+
+def _make_sloping_aquifer():
+    grid = RasterModelGrid((10, 20), xy_spacing=10.0)
+    grid.set_closed_boundaries_at_grid_edges(True, True, False, True)
+    elev = grid.add_zeros("topographic__elevation", at="node")
+    base = grid.add_zeros("aquifer_base__elevation", at="node")
+    wt = grid.add_zeros("water_table__elevation", at="node")
+    elev[:] = grid.x_of_node / 100 + 3
+    base[:] = grid.x_of_node / 100
+    wt[:] = base + 2.0
+
+    return GroundwaterDupuitPercolator(
+        grid, hydraulic_conductivity=1e-4, recharge_rate=1e-7
+    )
+
+
+@pytest.mark.parametrize("solver", ["direct", "cg"])
+def test_semi_implicit_matches_adaptive_dt(solver):
+    expected = _make_sloping_aquifer()
+    actual = _make_sloping_aquifer()
+    for _ in range(20):
+        expected.run_with_adaptive_time_step_solver(5e4)
+        actual.run_with_semi_implicit_solver(
+            5e4, solver=solver, refactor_tolerance=0.0
+        )
+
+    assert_allclose(actual._thickness, expected._thickness, atol=1e-2)
+    assert_allclose(actual._qs, expected._qs, atol=1e-9)
+
+
+def test_semi_implicit_reuses_factorization():
+    gdp = _make_sloping_aquifer()
+    for _ in range(10):
+        gdp.run_with_semi_implicit_solver(5e4, refactor_tolerance=0.0)
+    assert gdp.number_of_factorizations == 10
+
+    gdp = _make_sloping_aquifer()
+    for _ in range(10):
+        gdp.run_with_semi_implicit_solver(5e4, refactor_tolerance=1.0)
+    assert gdp.number_of_factorizations == 1
+
+    gdp.run_with_semi_implicit_solver(1e5, refactor_tolerance=1.0)
+    assert gdp.number_of_factorizations == 2
+
+    gdp.n = 0.1
+    gdp.run_with_semi_implicit_solver(1e5, refactor_tolerance=1.0)
+    assert gdp.number_of_factorizations == 3
+
+
+def test_semi_implicit_cg_matches_direct():
+    expected = _make_sloping_aquifer()
+    actual = _make_sloping_aquifer()
+    for _ in range(10):
+        expected.run_with_semi_implicit_solver(5e4, refactor_tolerance=0.0)
+        actual.run_with_semi_implicit_solver(5e4, solver="cg", refactor_tolerance=1.0)
+
+    assert_allclose(actual._thickness, expected._thickness, rtol=1e-6)
+
+
+def test_conservation_of_mass_semi_implicit():
+    grid = RasterModelGrid((3, 10), xy_spacing=10.0)
+    grid.set_closed_boundaries_at_grid_edges(True, True, False, True)
+    elev = grid.add_zeros("topographic__elevation", at="node")
+    grid.add_zeros("aquifer_base__elevation", at="node")
+
+    elev[:] = grid.x_of_node / 100 + 1
+    wt = grid.add_zeros("water_table__elevation", at="node")
+    wt[:] = elev
+
+    gdp = GroundwaterDupuitPercolator(
+        grid, hydraulic_conductivity=0.0005, recharge_rate=1e-7
+    )
+    fa = FlowAccumulator(grid, runoff_rate="surface_water__specific_discharge")
+
+    recharge_flux = 0
+    gw_flux = 0
+    sw_flux = 0
+    storage_0 = gdp.calc_total_storage()
+
+    dt = 1e5
+    for i in range(50):
+        gdp.run_with_semi_implicit_solver(dt)
+        fa.run_one_step()
+
+        recharge_flux += gdp.calc_recharge_flux_in() * dt
+        gw_flux += gdp.calc_gw_flux_out() * dt
+        sw_flux += gdp.calc_sw_flux_out() * dt
+    storage = gdp.calc_total_storage()
+
+    assert_almost_equal(
+        (gw_flux + sw_flux + storage - storage_0) / recharge_flux, 1.0, decimal=3
+    )
+
+
+def test_semi_implicit_bad_solver():
+    gdp = _make_sloping_aquifer()
+    with pytest.raises(ValueError):
+        gdp.run_with_semi_implicit_solver(1e4, solver="gmres")
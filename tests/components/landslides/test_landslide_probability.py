@@ -6,7 +6,12 @@ import pytest
 from numpy.testing import assert_array_almost_equal
 
 from landlab import RasterModelGrid
-from landlab.components import LandslideProbability
+from landlab.components import FlowAccumulator, LandslideProbability
+from landlab.utils import (
+    find_unique_upstream_hsd_ids_and_fractions,
+    find_upstream_hsd_fractions,
+    track_source,
+)
 
 (_SHAPE, _SPACING, _ORIGIN) = ((20, 20), (10e0, 10e0), (0.0, 0.0))
 _ARGS = (_SHAPE, _SPACING, _ORIGIN)
@@ -247,3 +252,64 @@ def test_calculate_landslide_probability_lognormal_spatial_method():
     np.testing.assert_almost_equal(
         grid_3.at_node["landslide__probability_of_failure"][9], 0.29999999
     )
+
+
+def test_calculate_landslide_probability_data_driven_spatial_with_matrix():
+    """Testing 'data_driven_spatial' with HSD fractions given as dictionaries
+    or as a sparse matrix.
+    """
+    grid = RasterModelGrid((6, 5), xy_spacing=(0.2, 0.2))
+    gridnum = grid.number_of_nodes
+    np.random.seed(seed=5)
+    grid.add_zeros("soil__saturated_hydraulic_conductivity", at="node")
+    grid.at_node["topographic__elevation"] = grid.y_of_node + np.random.rand(gridnum)
+    grid.at_node["topographic__slope"] = np.random.rand(gridnum)
+    grid.at_node["topographic__specific_contributing_area"] = np.sort(
+        np.random.randint(30, 900, gridnum).astype(float)
+    )
+    grid.at_node["soil__transmissivity"] = np.sort(
+        np.random.randint(5, 20, gridnum).astype(float), -1
+    )
+    grid.at_node["soil__mode_total_cohesion"] = np.sort(
+        np.random.randint(30, 900, gridnum).astype(float)
+    )
+    grid.at_node["soil__minimum_total_cohesion"] = (
+        grid.at_node["soil__mode_total_cohesion"] - 5.0
+    )
+    grid.at_node["soil__maximum_total_cohesion"] = (
+        grid.at_node["soil__mode_total_cohesion"] + 5.0
+    )
+    grid.at_node["soil__internal_friction_angle"] = np.sort(
+        np.random.randint(26, 37, gridnum).astype(float)
+    )
+    grid.at_node["soil__thickness"] = np.sort(
+        np.random.randint(1, 10, gridnum).astype(float)
+    )
+    grid.at_node["soil__density"] = 2000.0 * np.ones(gridnum)
+    FlowAccumulator(grid, flow_director="D8").run_one_step()
+
+    hsd_ids = (grid.x_of_node > 0.5).astype(int) + 2 * (grid.y_of_node > 0.5)
+    HSD_dict = {hsd_id: np.random.uniform(2.0, 7.0, 20) for hsd_id in range(4)}
+
+    hsd_upstr, _ = track_source(grid, hsd_ids)
+    unique_ids, fractions = find_unique_upstream_hsd_ids_and_fractions(hsd_upstr)
+    HSD_id_dict = {node: list(ids) for node, ids in unique_ids.items()}
+    matrix, matrix_ids, _ = find_upstream_hsd_fractions(grid, hsd_ids)
+
+    probability = []
+    for HSD_inputs in (
+        [HSD_dict, HSD_id_dict, fractions],
+        [HSD_dict, matrix, matrix_ids],
+    ):
+        ls_prob = LandslideProbability(
+            grid,
+            number_of_iterations=10,
+            groundwater__recharge_distribution="data_driven_spatial",
+            groundwater__recharge_HSD_inputs=HSD_inputs,
+            seed=7,
+        )
+        ls_prob.calculate_landslide_probability()
+        probability.append(grid.at_node["landslide__probability_of_failure"].copy())
+
+    assert_array_almost_equal(probability[0], probability[1])
+    assert np.any(probability[0] > 0.0)
@@ -13,6 +13,7 @@ from numpy import testing
 
 from landlab import RasterModelGrid
 from landlab.components import FlowAccumulator, LateralEroder
+from landlab.components.lateral_erosion.lateral_erosion import _calc_time_to_flat
 
 
 def test_lateral_erosion_and_node():
@@ -375,3 +376,33 @@ def test_latero_steady_inlet():
         err_msg="LatEro inlet transport-limited sediment flux test failed",
         verbose=True,
     )
+
+
+def test_time_to_flat_matches_loop():
+    np.random.seed(42)
+    n_nodes = 200
+    z = np.random.rand(n_nodes) * 10.0
+    dzdt = np.random.rand(n_nodes) * -1e-2
+    slope = np.random.rand(n_nodes)
+    slope[::7] = 0.0
+    receiver = np.random.randint(0, n_nodes, size=n_nodes)
+    nodes = np.random.permutation(n_nodes)
+
+    expected = 1000.0
+    for i in nodes:
+        dzdtdif = dzdt[receiver[i]] - dzdt[i]
+        if dzdtdif > 1.0e-5 and slope[i] > 1e-5:
+            dtflat = (z[i] - z[receiver[i]]) / dzdtdif
+            if dtflat < expected:
+                expected = dtflat
+            if dzdtdif * dtflat > (z[i] - z[receiver[i]]):
+                expected = (z[i] - z[receiver[i]]) / dzdtdif
+
+    assert _calc_time_to_flat(nodes, receiver, z, dzdt, slope, 1000.0) == expected
+
+
+def test_time_to_flat_not_converging():
+    z = np.array([0.0, 1.0, 2.0])
+    dzdt = np.array([-1.0, -0.5, 0.0])
+    slope = np.ones(3)
+    assert _calc_time_to_flat([2, 1], np.array([0, 0, 1]), z, dzdt, slope, 50.0) == 50.0
@@ -2,7 +2,9 @@ import numpy as np
 import pytest
 
 from landlab import RasterModelGrid
-from landlab.components.lateral_erosion.node_finder import angle_finder
+from landlab.components import FlowAccumulator
+from landlab.components.lateral_erosion.cfuncs import _find_lateral_nodes
+from landlab.components.lateral_erosion.node_finder import angle_finder, node_finder
 
 
 @pytest.mark.parametrize(
@@ -49,3 +51,53 @@ def test_unequal_spacing(dx, dy):
     assert angle_finder(grid, (9, 1, 1, 9), 5, (8, 0, 2, 10)) == pytest.approx(
         np.arctan(dx / dy)
     )
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2, 3])
+def test_find_lateral_nodes_matches_node_finder(seed):
+    np.random.seed(seed)
+    grid = RasterModelGrid((10, 12), xy_spacing=10.0)
+    grid.set_closed_boundaries_at_grid_edges(True, True, True, True)
+    grid.status_at_node[1] = grid.BC_NODE_IS_FIXED_VALUE
+    z = grid.add_zeros("topographic__elevation", at="node")
+    z += grid.y_of_node / 10.0 + grid.x_of_node / 10.0
+    z += np.random.randint(0, 3, size=grid.number_of_nodes) * 0.05
+    FlowAccumulator(grid, flow_director="D8").run_one_step()
+
+    receiver = grid.at_node["flow__receiver_node"]
+    area = grid.at_node["drainage_area"]
+    nodes = grid.at_node["flow__upstream_node_order"][::-1]
+    nodes = nodes[grid.status_at_node[nodes] == grid.BC_NODE_IS_CORE]
+
+    np.random.seed(seed)
+    expected_lat_node = np.zeros(grid.number_of_nodes, dtype=int)
+    expected_inv_rad_curv = np.zeros(grid.number_of_nodes)
+    for node in nodes:
+        if node in receiver:
+            (
+                expected_lat_node[node],
+                expected_inv_rad_curv[node],
+            ) = node_finder(grid, node, receiver, area)
+    expected_state = np.random.get_state()
+
+    np.random.seed(seed)
+    lat_node = np.zeros(grid.number_of_nodes, dtype=int)
+    inv_rad_curv = np.zeros(grid.number_of_nodes)
+    _find_lateral_nodes(
+        nodes,
+        receiver,
+        area,
+        grid.x_of_node,
+        grid.y_of_node,
+        grid.active_adjacent_nodes_at_node,
+        grid.diagonal_adjacent_nodes_at_node,
+        grid.dx,
+        lat_node,
+        inv_rad_curv,
+    )
+
+    assert np.any(lat_node > 0)
+    np.testing.assert_array_equal(lat_node, expected_lat_node)
+    np.testing.assert_array_equal(inv_rad_curv, expected_inv_rad_curv)
+    assert np.random.get_state()[2] == expected_state[2]
+    np.testing.assert_array_equal(np.random.get_state()[1], expected_state[1])
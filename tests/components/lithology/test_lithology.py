@@ -332,3 +332,91 @@ def test_rock_block_xarray():
     )
 
     assert_array_equal(ds.rock_type__id.values, expected_array)
+
+
+def _rock_cube_by_layers(lith, depths):
+    """Rock cube found layer by layer, node by node."""
+    rock_type = lith._layers["rock_type__id"]
+    cube = np.full((len(depths), lith._layers.number_of_stacks), np.nan)
+    for node in range(lith._layers.number_of_stacks):
+        for layer in reversed(range(lith.dz.shape[0])):
+            if lith.dz[layer, node] > 0:
+                in_layer = (depths >= lith.z_top[layer, node]) & (
+                    depths <= lith.z_bottom[layer, node]
+                )
+                cube[in_layer, node] = rock_type[layer, node]
+    return cube.reshape((len(depths),) + lith._grid.shape)
+
+
+@pytest.mark.parametrize("layer_type", ["MaterialLayers", "EventLayers"])
+def test_rock_cube_matches_layers(layer_type):
+    mg = RasterModelGrid((4, 5))
+    z = mg.add_zeros("topographic__elevation", at="node")
+    layer_ids = np.tile([0, 1, 2, 3], 4)
+    attrs = {"K_sp": {0: 0.0003, 1: 0.0001, 2: 0.0002, 3: 0.0004}}
+    lith = LithoLayers(
+        mg,
+        np.arange(16) * 1.5,
+        layer_ids,
+        function=lambda x, y: 0.5 * x + 0.25 * y,
+        attrs=attrs,
+        layer_type=layer_type,
+    )
+    np.random.seed(42)
+    z -= np.random.rand(mg.number_of_nodes) * 2.0
+    lith.run_one_step()
+    lith.rock_id = 3
+    z += 0.5
+    lith.run_one_step()
+
+    depths = np.linspace(0.0, 30.0, 61)
+    ds = lith.rock_cube_to_xarray(depths)
+
+    assert_array_equal(ds.rock_type__id.values, _rock_cube_by_layers(lith, depths))
+
+
+def test_rock_cube_in_blocks():
+    mg = RasterModelGrid((3, 3))
+    mg.add_zeros("topographic__elevation", at="node")
+    attrs = {"K_sp": {0: 0.0003, 1: 0.0001, 2: 0.0002, 3: 0.0004}}
+    lith = LithoLayers(
+        mg,
+        3.0 * np.arange(-10, 10),
+        np.tile([0, 1, 2, 3], 5),
+        function=lambda x, y: x + y,
+        attrs=attrs,
+    )
+    depths = np.arange(0, 10, 1)
+    out = np.empty((10, 3, 3))
+
+    ds = lith.rock_cube_to_xarray(depths, out=out, depths_per_block=3)
+
+    assert_array_equal(out, lith.rock_cube_to_xarray(depths).rock_type__id.values)
+    assert np.shares_memory(ds.rock_type__id.values, out)
+
+
+def test_rock_cube_bad_arguments():
+    mg = RasterModelGrid((3, 3))
+    mg.add_zeros("topographic__elevation", at="node")
+    lith = Lithology(mg, [1, 2], [1, 2], {"K_sp": {1: 0.001, 2: 0.0001}})
+    with pytest.raises(ValueError):
+        lith.rock_cube_to_xarray([-1.0, 1.0])
+    with pytest.raises(ValueError):
+        lith.rock_cube_to_xarray([0.0, 1.0], out=np.empty((3, 3, 3)))
+
+
+def test_surface_values_with_new_rock_types():
+    mg = RasterModelGrid((3, 3))
+    z = mg.add_zeros("topographic__elevation", at="node")
+    attrs = {"K_sp": {4: 0.001, 8: 0.0001}, "D": {4: 0.01, 8: 0.02}}
+    lith = Lithology(mg, [1, 2], [8, 4], attrs)
+    lith.add_rock_type({"K_sp": {2: 0.1}, "D": {2: 0.3}})
+    lith.update_rock_properties("D", 4, 0.5)
+
+    lith.rock_id = np.array([2, 2, 2, 4, 4, 4, 8, 8, 8])
+    z += 1.0
+    lith.run_one_step()
+
+    assert_array_equal(mg.at_node["K_sp"], [0.1] * 3 + [0.001] * 3 + [0.0001] * 3)
+    assert_array_equal(mg.at_node["D"], [0.3] * 3 + [0.5] * 3 + [0.02] * 3)
+    assert_array_equal(lith["D"], mg.at_node["D"])
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+from scipy.sparse import coo_matrix
+
+from landlab import RasterModelGrid
+from landlab.components import PerronNLDiffuse
+
+
+def _run_hill(n_steps=10, **kwds):
+    grid = RasterModelGrid((20, 30))
+    z = grid.add_zeros("topographic__elevation", at="node")
+    np.random.seed(1945)
+    z[grid.core_nodes] = np.random.rand(grid.number_of_core_nodes) * 0.01
+    diffuser = PerronNLDiffuse(grid, nonlinear_diffusivity=0.1, **kwds)
+    for _ in range(n_steps):
+        z[grid.core_nodes] += 0.001
+        diffuser.run_one_step(1.0)
+    return grid, diffuser
+
+
+def test_iterative_solver_matches_direct():
+    expected, _ = _run_hill(solver="direct")
+    actual, diffuser = _run_hill(solver="bicgstab", solver_kwds={"rtol": 1e-12})
+
+    assert diffuser.solver_iterations > 0
+    assert_allclose(
+        actual.at_node["topographic__elevation"],
+        expected.at_node["topographic__elevation"],
+        rtol=1e-8,
+        atol=1e-12,
+    )
+
+
+@pytest.mark.parametrize("solver", ["cg", "gmres"])
+def test_unsupported_solver(solver):
+    grid = RasterModelGrid((4, 5))
+    grid.add_zeros("topographic__elevation", at="node")
+    with pytest.raises(ValueError):
+        PerronNLDiffuse(grid, nonlinear_diffusivity=0.1, solver=solver)
+
+
+def test_iterative_solver_reuses_preconditioner():
+    _, diffuser = _run_hill(
+        solver="bicgstab", solver_kwds={"refactor_tolerance": np.inf}
+    )
+    assert diffuser.number_of_factorizations == 1
+
+
+def test_matrix_matches_coo_assembly():
+    _, diffuser = _run_hill(n_steps=1)
+    n_rows = diffuser._operating_matrix.shape[0]
+
+    np.random.seed(42)
+    rows = np.random.randint(n_rows, size=200).astype(float)
+    cols = np.random.randint(n_rows, size=200).astype(float)
+    for _ in range(2):
+        data = np.random.rand(200)
+        diffuser._fill_operating_matrix(rows, cols, data, n_rows)
+        expected = coo_matrix(
+            (data, (rows.astype(int), cols.astype(int))), shape=(n_rows, n_rows)
+        )
+        assert_allclose(diffuser._operating_matrix.toarray(), expected.toarray())
+    assert diffuser.number_of_structure_updates == 2
+
+
+def test_structure_rebuilt_on_new_boundary_conditions():
+    grid, diffuser = _run_hill(n_steps=2)
+    assert diffuser.number_of_structure_updates == 1
+
+    grid.status_at_node[grid.nodes_at_left_edge] = grid.BC_NODE_IS_CLOSED
+    diffuser.run_one_step(1.0)
+    diffuser.run_one_step(1.0)
+    assert diffuser.number_of_structure_updates == 2
@@ -5,6 +5,8 @@ Unit tests for landlab.components.overland_flow.OverlandFlow
 last updated: 3/14/16
 """
 import numpy as np
+import pytest
+from numpy.testing import assert_allclose
 
 from landlab import RasterModelGrid
 from landlab.components.overland_flow import OverlandFlow
@@ -147,3 +149,185 @@ def test_deAlm_analytical_imposed_dt_long():
     hdeAlm = hdeAlm[1][1:]
     hdeAlm = np.append(hdeAlm, [0])
     np.testing.assert_almost_equal(h_analytical, hdeAlm, decimal=1)
+
+
+def _reference_overland_flow(of, dt):
+    """Advance OverlandFlow one sub-step of length *dt* using NumPy."""
+    grid = of.grid
+    h, z = grid.at_node["surface_water__depth"], grid.at_node["topographic__elevation"]
+    h_links = grid.at_link["surface_water__depth"]
+    slope = grid.at_link["water_surface__gradient"]
+    active = grid.active_links
+
+    w = h + z
+    h_links[active] = (
+        grid.map_max_of_link_nodes_to_link(w) - grid.map_max_of_link_nodes_to_link(z)
+    )[active]
+    slope[active] = grid.calc_grad_at_link(w)[active]
+
+    q = np.append(grid.at_link["surface_water__discharge"], [0.0])
+    neighbors = of._neighbors_at_link
+    q[:-1] = (
+        of._theta * q[:-1]
+        + (1.0 - of._theta) / 2.0 * (q[neighbors[:, 0]] + q[neighbors[:, 1]])
+        - of._g * h_links * dt * slope
+    ) / (
+        1
+        + of._g
+        * dt
+        * of._mannings_n ** 2.0
+        * abs(q[:-1])
+        / h_links ** (7.0 / 3.0)
+    )
+    q = q[:-1]
+
+    if of._steep_slopes:
+        froude = (q / h_links) / np.sqrt(of._g * h_links)
+        courant = q * dt / grid.dx
+        q = np.where(
+            np.abs(courant) > h_links / 4.0,
+            np.sign(q) * h_links * grid.dx / 5.0 / dt,
+            np.where(
+                np.abs(froude) > 1.0, np.sign(q) * h_links * np.sqrt(of._g * h_links), q
+            ),
+        )
+
+    grid.at_link["surface_water__discharge"][:] = q
+    dhdt = of.rainfall_intensity - grid.calc_flux_div_at_node(q)
+    h[grid.core_nodes] += dhdt[grid.core_nodes] * dt
+    if of._steep_slopes:
+        h[h < of._h_init] = of._h_init * 1e-3
+
+
+def _make_flooded_grid(mannings_n_at_link=False):
+    grid = RasterModelGrid((12, 15), xy_spacing=10.0)
+    np.random.seed(1945)
+    grid.add_field(
+        "topographic__elevation",
+        0.02 * np.random.rand(grid.number_of_nodes) + 1e-4 * grid.x_of_node,
+        at="node",
+    )
+    h = grid.add_zeros("surface_water__depth", at="node")
+    h[grid.core_nodes] = 0.1 + 0.05 * np.random.rand(grid.number_of_core_nodes)
+    if mannings_n_at_link:
+        grid.add_field(
+            "mannings_n", 0.01 + 0.02 * np.random.rand(grid.number_of_links), at="link"
+        )
+    return grid
+
+
+@pytest.mark.parametrize("steep_slopes", [False, True])
+@pytest.mark.parametrize("mannings_n_at_link", [False, True])
+def test_deAlm_matches_reference(steep_slopes, mannings_n_at_link):
+    actual = _make_flooded_grid(mannings_n_at_link=mannings_n_at_link)
+    expected = _make_flooded_grid(mannings_n_at_link=mannings_n_at_link)
+    mannings_n = "mannings_n" if mannings_n_at_link else 0.03
+
+    of = OverlandFlow(
+        actual, mannings_n=mannings_n, steep_slopes=steep_slopes, rainfall_intensity=1e-5
+    )
+    of_expected = OverlandFlow(
+        expected,
+        mannings_n=mannings_n,
+        steep_slopes=steep_slopes,
+        rainfall_intensity=1e-5,
+    )
+    of_expected.set_up_neighbor_arrays()
+
+    for _ in range(10):
+        of.overland_flow(dt=1.0)
+        _reference_overland_flow(of_expected, of.dt)
+
+    assert_allclose(
+        actual.at_node["surface_water__depth"],
+        expected.at_node["surface_water__depth"],
+        rtol=1e-12,
+    )
+    for name in (
+        "surface_water__depth",
+        "surface_water__discharge",
+        "water_surface__gradient",
+    ):
+        assert_allclose(actual.at_link[name], expected.at_link[name], rtol=1e-12)
+
+
+def test_deAlm_updates_discharge_in_place():
+    grid = _make_flooded_grid()
+    q = grid.add_zeros("surface_water__discharge", at="link")
+    of = OverlandFlow(grid, mannings_n=0.03)
+
+    of.run_one_step(dt=5.0)
+
+    assert grid.at_link["surface_water__discharge"] is q
+    assert np.any(q != 0.0)
+    assert of._q_at_start_of_step[-1] == 0.0
+
+
+def test_deAlm_bad_mannings_n():
+    grid = _make_flooded_grid()
+    of = OverlandFlow(grid, mannings_n=np.full(grid.number_of_nodes, 0.03))
+    with pytest.raises(ValueError):
+        of.run_one_step(dt=5.0)
+
+
+def _make_pond(track_wet_front, steep_slopes=False, rainfall_intensity=0.0):
+    grid = RasterModelGrid((40, 50), xy_spacing=10.0)
+    grid.add_zeros("topographic__elevation", at="node")
+    h = grid.add_zeros("surface_water__depth", at="node")
+    h.reshape(grid.shape)[18:22, 23:27] = 0.2
+    grid.set_closed_boundaries_at_grid_edges(True, True, True, True)
+    return OverlandFlow(
+        grid,
+        h_init=1e-3,
+        steep_slopes=steep_slopes,
+        rainfall_intensity=rainfall_intensity,
+        track_wet_front=track_wet_front,
+    )
+
+
+@pytest.mark.parametrize("steep_slopes", [False, True])
+def test_deAlm_wet_front_matches_full_update(steep_slopes):
+    of_full = _make_pond(False, steep_slopes=steep_slopes)
+    of_front = _make_pond(True, steep_slopes=steep_slopes)
+
+    fractions = []
+    for _ in range(5):
+        of_full.run_one_step(dt=10.0)
+        of_front.run_one_step(dt=10.0)
+        fractions.append(of_front.active_fraction)
+
+    assert of_full.active_fraction == 1.0
+    assert np.all(np.diff(fractions) > 0.0)
+    assert fractions[-1] < 0.5
+    assert_allclose(of_front.h, of_full.h, rtol=1e-12)
+    assert_allclose(
+        of_front.grid.at_link["surface_water__discharge"],
+        of_full.grid.at_link["surface_water__discharge"],
+        rtol=1e-12,
+        atol=1e-15,
+    )
+
+
+def test_deAlm_wet_front_with_rain():
+    of_full = _make_pond(False, rainfall_intensity=1e-5)
+    of_front = _make_pond(True, rainfall_intensity=1e-5)
+
+    for _ in range(3):
+        of_full.run_one_step(dt=10.0)
+        of_front.run_one_step(dt=10.0)
+
+    assert of_front.active_fraction == 1.0
+    assert_allclose(of_front.h, of_full.h, rtol=1e-12)
+
+
+def test_deAlm_wet_front_zeros_discharge_when_dry():
+    of = _make_pond(True)
+    q = of.grid.at_link["surface_water__discharge"]
+    of.run_one_step(dt=10.0)
+    assert np.any(q != 0.0)
+
+    of.grid.at_node["surface_water__depth"][:] = 1e-3
+    of.run_one_step(dt=10.0)
+
+    assert of.active_fraction == 0.0
+    assert np.all(q == 0.0)
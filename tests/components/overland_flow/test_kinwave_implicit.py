@@ -9,9 +9,16 @@ Created on Sat Apr  1 10:49:33 2017
 """
 
 import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+from scipy.optimize import brentq
 
 from landlab import RasterModelGrid
 from landlab.components import KinwaveImplicitOverlandFlow
+from landlab.components.overland_flow.cfuncs import _solve_water_depth
+from landlab.components.overland_flow.generate_overland_flow_implicit_kinwave import (
+    water_fn,
+)
 
 
 def test_initialization():
@@ -136,6 +143,75 @@ def test_curved_surface():
         )
 
 
+@pytest.mark.parametrize("weight", [1.0, 0.8, 0.5])
+@pytest.mark.parametrize("depth_exp", [1.5, 5.0 / 3.0])
+def test_solve_water_depth(weight, depth_exp):
+    np.random.seed(1973)
+    for a, c, e in np.random.rand(20, 3) * [100.0, 0.01, 0.01]:
+        lo = (1.0 - weight) * c / weight
+        expected = brentq(
+            water_fn, lo, lo + c + e + 1.0, args=(a, weight, c, depth_exp, e), xtol=1e-15
+        )
+        for x0 in (0.0, c, 1.0):
+            actual = _solve_water_depth(x0, a, weight, c, depth_exp, e)
+            assert actual == pytest.approx(expected, rel=1e-10, abs=1e-15)
+
+
+def _reference_run_one_step(kw, dt):
+    """Upstream-to-downstream sweep of KinwaveImplicitOverlandFlow in Python."""
+    grid = kw.grid
+    kw._disch_in[:] = 0.0
+    for n in kw._nodes_ordered[::-1]:
+        if grid.status_at_node[n] != grid.BC_NODE_IS_CORE:
+            continue
+        c = kw._depth[n]
+        e = dt * kw._runoff_rate + dt * kw._disch_in[n] / grid.cell_area_at_node[n]
+        lo = (1.0 - kw._weight) * c / kw._weight
+        kw._depth[n] = brentq(
+            water_fn,
+            lo,
+            lo + c + e + 1.0,
+            args=(kw._alpha[n], kw._weight, c, kw._depth_exp, e),
+            xtol=1e-15,
+        )
+        h_eff = kw._weight * kw._depth[n] + (1.0 - kw._weight) * c
+        outflow = kw._vel_coef * h_eff ** kw._depth_exp * kw._grad_width_sum[n]
+        for receiver, proportion in zip(
+            grid.adjacent_nodes_at_node[n], kw._flow_accum.flow_director._proportions[n]
+        ):
+            if receiver >= 0:
+                kw._disch_in[receiver] += outflow * proportion
+
+
+@pytest.mark.parametrize("weight", [1.0, 0.8])
+def test_matches_reference_sweep(weight):
+    rg = RasterModelGrid((12, 15), xy_spacing=5.0)
+    np.random.seed(1945)
+    rg.add_field(
+        "topographic__elevation",
+        0.05 * rg.y_of_node + 0.02 * rg.x_of_node + np.random.rand(rg.number_of_nodes),
+        at="node",
+    )
+    kw = KinwaveImplicitOverlandFlow(rg, runoff_rate=50.0, weight=weight)
+    for _ in range(5):
+        kw.run_one_step(30.0)
+        assert kw.solve_time >= 0.0
+
+    expected = kw.depth.copy(), kw._disch_in.copy()
+    kw.depth[:] = 0.0
+    for _ in range(5):
+        kw.run_one_step(30.0)
+    actual = kw.depth.copy(), kw._disch_in.copy()
+
+    kw.depth[:] = 0.0
+    for _ in range(5):
+        _reference_run_one_step(kw, 30.0)
+
+    assert_allclose(actual[0], expected[0], rtol=1e-12)
+    assert_allclose(kw.depth, actual[0], rtol=1e-9)
+    assert_allclose(kw._disch_in, actual[1], rtol=1e-9)
+
+
 if __name__ == "__main__":
     test_initialization()
     test_first_iteration()
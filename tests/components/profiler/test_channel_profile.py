@@ -461,3 +461,128 @@ def test_getting_all_the_way_to_the_divide(main, nshed):
 
         # if "profile" is just bits of the edge, then da is 0.
         assert (mg.area_of_cell.min() in da) or (0.0 in da)
+
+
+def _walk_channel_network(receivers, area, outlets, main, threshold):
+    """Find channel segments one node at a time, as a reference."""
+    segments = []
+    for outlet in outlets:
+        queue = [outlet]
+        while queue:
+            start = queue.pop(0)
+            segment = []
+            if receivers[start] != start and start not in outlets:
+                segment.append(receivers[start])
+            node = start
+            while True:
+                segment.append(node)
+                donors = [
+                    donor
+                    for donor in np.where(receivers == node)[0]
+                    if donor != start
+                ]
+                above = [donor for donor in donors if area[donor] > threshold]
+                if main and donors:
+                    best = donors[np.argmax(area[donors])]
+                    if area[best] < threshold:
+                        break
+                    node = best
+                elif len(above) == 1:
+                    node = above[0]
+                else:
+                    queue.extend(above)
+                    break
+            segments.append((outlet, segment))
+    return segments
+
+
+def _eroded_grid(seed):
+    np.random.seed(seed)
+    mg = RasterModelGrid((20, 25), xy_spacing=10.0)
+    z = mg.add_zeros("topographic__elevation", at="node")
+    z += np.random.rand(z.size)
+    fa = FlowAccumulator(mg, flow_director="D8")
+    sp = FastscapeEroder(mg, K_sp=0.0001)
+    for _ in range(50):
+        z[mg.core_nodes] += 1.0
+        fa.run_one_step()
+        sp.run_one_step(dt=1000.0)
+    fa.run_one_step()
+    return mg
+
+
+@pytest.mark.parametrize("main", [True, False])
+@pytest.mark.parametrize("nshed", [1, 3, None])
+@pytest.mark.parametrize("threshold", [0.0, 500.0])
+def test_segments_match_walk_upstream(main, nshed, threshold):
+    mg = _eroded_grid(7)
+    profiler = ChannelProfiler(
+        mg,
+        number_of_watersheds=nshed,
+        main_channel_only=main,
+        minimum_channel_threshold=threshold,
+    )
+    profiler.run_one_step()
+
+    expected = _walk_channel_network(
+        mg.at_node["flow__receiver_node"],
+        mg.at_node["drainage_area"],
+        list(profiler._outlet_nodes),
+        main,
+        threshold,
+    )
+    assert len(profiler.nodes) == len(expected)
+    for actual, (_, segment) in zip(profiler.nodes, expected):
+        np.testing.assert_array_equal(actual, segment)
+
+    flat = [
+        (outlet_id, segment["ids"])
+        for outlet_id in profiler.data_structure
+        for segment in profiler.data_structure[outlet_id].values()
+    ]
+    assert [outlet_id for outlet_id, _ in flat] == [
+        outlet_id for outlet_id, _ in expected
+    ]
+    for (_, ids), nodes in zip(flat, profiler.nodes):
+        assert ids is nodes
+
+
+def test_nested_outlets():
+    mg = _eroded_grid(3)
+    outlets = mg.core_nodes
+    profiler = ChannelProfiler(
+        mg, outlet_nodes=outlets, number_of_watersheds=None, main_channel_only=False
+    )
+    profiler.run_one_step()
+
+    expected = _walk_channel_network(
+        mg.at_node["flow__receiver_node"],
+        mg.at_node["drainage_area"],
+        list(outlets),
+        False,
+        0,
+    )
+    assert len(profiler.nodes) == len(expected)
+    assert len(profiler.nodes) > mg.number_of_nodes + len(outlets)
+    for actual, (_, segment) in zip(profiler.nodes, expected):
+        np.testing.assert_array_equal(actual, segment)
+    assert list(profiler.data_structure) == list(outlets)
+
+
+def test_assign_colors_after_run():
+    mg = _eroded_grid(1)
+    profiler = ChannelProfiler(mg, number_of_watersheds=2, main_channel_only=False)
+    profiler.run_one_step()
+    outlets = list(profiler.data_structure)
+
+    color_mapping = {outlets[0]: (1.0, 0.0, 0.0, 1.0), outlets[1]: "b"}
+    profiler.assign_colors(color_mapping=color_mapping)
+
+    for outlet_id in outlets:
+        for segment in profiler.data_structure[outlet_id].values():
+            assert segment["color"] == color_mapping[outlet_id]
+    assert profiler.colors == [
+        color_mapping[outlet_id]
+        for outlet_id in outlets
+        for _ in profiler.data_structure[outlet_id]
+    ]
@@ -1,9 +1,30 @@
 import numpy as np
 import pytest
 from numpy import testing
+from scipy.integrate import quad
 
 from landlab import HexModelGrid, RasterModelGrid
 from landlab.components import FlowAccumulator, Space
+from landlab.components.space.cfuncs import integrate_bedrock_lowering_rate
+from landlab.components.space.space import _calc_bedrock_lowering, _dRdt
+
+
+def _quad_bedrock_lowering(a, b, c, d, H0, dt):
+    return np.array(
+        [
+            quad(
+                _dRdt,
+                0.0,
+                dt,
+                args,
+                epsabs=0.0,
+                epsrel=1e-13,
+                limit=500,
+                points=dt * np.logspace(-12.0, 0.0, 25)[:-1],
+            )[0]
+            for args in zip(a, [b] * len(a), c, d, H0)
+        ]
+    )
 
 
 def test_route_to_multiple_error_raised():
@@ -528,3 +549,53 @@ def test_can_run_with_hex():
         fa.run_one_step()
         sp.run_one_step(dt=dt)
         z[mg.core_nodes] += U * dt
+
+
+@pytest.mark.parametrize("dt", [1.0, 100.0, 10000.0])
+@pytest.mark.parametrize(
+    "c,d,H0",
+    [
+        (0.01, 0.0, 0.5),  # no entrainment
+        (0.0, 0.0, 0.5),  # no entrainment or deposition
+        (0.01, 0.01, 0.5),  # deposition balances entrainment
+        (0.01, 0.01, 50.0),  # ... with very thick sediment
+        (0.01, 0.02, 50.0),  # erosion of very thick sediment
+        (0.02, 0.01, 0.5),  # net deposition
+        (0.01, 0.02, 0.5),  # net erosion
+        (0.0, 0.02, 9.9),  # entrainment only, thick sediment
+        (0.01, 0.0100001, 0.1),  # nearly balanced
+    ],
+)
+def test_bedrock_lowering_matches_quad(c, d, H0, dt):
+    a = np.array([0.001])
+    expected = _quad_bedrock_lowering(a, 10.0, [c], [d], [H0], dt)
+    actual = _calc_bedrock_lowering(a, 10.0, [c], [d], [H0], dt)
+    testing.assert_allclose(actual, expected, rtol=1e-10, atol=0.0)
+
+
+def test_bedrock_lowering_random_parameters():
+    rng = np.random.RandomState(1945)
+    a, c, d = 10.0 ** rng.uniform(-6.0, -1.0, (3, 200))
+    H0 = 10.0 ** rng.uniform(-4.0, 1.0, 200)
+    d[::4] = 0.0
+    c[1::4] = d[1::4]
+
+    expected = _quad_bedrock_lowering(a, 10.0, c, d, H0, 100.0)
+    actual = _calc_bedrock_lowering(a, 10.0, c, d, H0, 100.0)
+    testing.assert_allclose(actual, expected, rtol=1e-10, atol=1e-300)
+
+
+def test_bedrock_lowering_quadrature():
+    rng = np.random.RandomState(1945)
+    a, c, d = 10.0 ** rng.uniform(-6.0, -1.0, (3, 50))
+    H0 = 10.0 ** rng.uniform(-2.0, 0.0, 50)
+    d[::4] = 0.0
+    c[1::4] = d[1::4]
+    abscissas, weights = np.polynomial.legendre.leggauss(16)
+
+    actual = np.empty(50)
+    integrate_bedrock_lowering_rate(
+        np.arange(50), a, 1.0, c, d, H0, 10.0, abscissas, weights, 32, actual
+    )
+    expected = _calc_bedrock_lowering(a, 1.0, c, d, H0, 10.0)
+    testing.assert_allclose(actual, expected, rtol=1e-12)
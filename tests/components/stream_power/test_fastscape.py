@@ -179,3 +179,41 @@ def test_fastscape_new():
     )
 
     assert_array_almost_equal(mg.at_node["topographic__elevation"], z_trg)
+
+
+def _erode_with_cached_routing(cache_by):
+    mg = RasterModelGrid((8, 9), xy_spacing=10.0)
+    z = mg.add_zeros("topographic__elevation", at="node")
+    numpy.random.seed(2010)
+    z += numpy.random.rand(mg.number_of_nodes)
+
+    fa = FlowAccumulator(mg, flow_director="D8")
+    fa.run_one_step()
+
+    def make_eroder():
+        return Fsc(
+            mg,
+            K_sp=0.01,
+            m_sp=0.5,
+            n_sp=1.5,
+            flow_accumulator=fa if cache_by == "accumulator" else None,
+        )
+
+    sp = make_eroder()
+    for step in range(6):
+        if step % 2 == 0:
+            fa.run_one_step()
+        if cache_by is None:
+            sp = make_eroder()
+        sp.run_one_step(10.0)
+        z[mg.core_nodes] += 0.001
+    return z, sp
+
+
+def test_cached_routing():
+    expected, _ = _erode_with_cached_routing(None)
+    for cache_by in ("accumulator", "links"):
+        z, sp = _erode_with_cached_routing(cache_by)
+        assert numpy.all(z == expected)
+        assert sp.routing_cache_hits >= 3
+        assert sp.routing_cache_hits + sp.routing_cache_misses == 6
@@ -7,10 +7,15 @@ a few more times, to ensure repeatability.
 import os
 
 import numpy as np
-from numpy.testing import assert_array_almost_equal
+import pytest
+from numpy.testing import assert_allclose, assert_array_almost_equal
 
 from landlab import RasterModelGrid
-from landlab.components import FlowAccumulator, SedDepEroder
+from landlab.components import (
+    DepressionFinderAndRouter,
+    FlowAccumulator,
+    SedDepEroder,
+)
 
 _THIS_DIR = os.path.abspath(os.path.dirname(__file__))
 
@@ -95,3 +100,72 @@ def test_sed_dep_new():
         z[mg.core_nodes] += 20.0 * up
 
     assert_array_almost_equal(z, np.loadtxt(finalconds))
+
+
+def _run_sed_dep(compiled_routing, flooded_depths=None, **kwds):
+    mg = RasterModelGrid((12, 15), xy_spacing=200.0)
+    mg.set_closed_boundaries_at_grid_edges(True, True, True, False)
+    z = mg.add_zeros("topographic__elevation", at="node")
+    np.random.seed(7)
+    z += 0.01 * mg.y_of_node + np.random.rand(mg.number_of_nodes) * 5.0
+    if flooded_depths == "field":
+        flood_depth = mg.add_zeros("flood_depth", at="node")
+    elif flooded_depths == "array":
+        flood_depth = np.zeros(mg.number_of_nodes)
+    else:
+        flood_depth = None
+
+    fr = FlowAccumulator(mg, flow_director="D8")
+    sde = SedDepEroder(
+        mg,
+        compiled_routing=compiled_routing,
+        flooded_depths="flood_depth" if flooded_depths == "field" else flood_depth,
+        **kwds
+    )
+    for _ in range(3):
+        fr.run_one_step()
+        if flood_depth is not None:
+            df = DepressionFinderAndRouter(mg)
+            df.map_depressions()
+            flood_depth[:] = df.depression_depth
+        sde.run_one_step(100.0)
+        z[mg.core_nodes] += 0.5
+
+    fields = (
+        "topographic__elevation",
+        "channel_sediment__volumetric_flux",
+        "channel_sediment__relative_flux",
+    )
+    return [mg.at_node[name].copy() for name in fields]
+
+
+@pytest.mark.parametrize("flooded_depths", [None, "field", "array"])
+@pytest.mark.parametrize(
+    "sed_dependency_type",
+    ["generalized_humped", "linear_decline", "almost_parabolic", "None"],
+)
+@pytest.mark.parametrize(
+    "Qc,params",
+    [
+        ("power_law", dict(K_sp=1.0e-4, K_t=1.0e-4)),
+        (
+            "MPM",
+            dict(
+                K_sp=1.0e-6,
+                Dchar=0.05,
+                threshold_Shields=0.05,
+                set_threshold_from_Dchar=True,
+                g=9.81,
+            ),
+        ),
+    ],
+)
+def test_compiled_routing_matches_python(
+    Qc, params, sed_dependency_type, flooded_depths
+):
+    kwds = dict(Qc=Qc, sed_dependency_type=sed_dependency_type, **params)
+    expected = _run_sed_dep(False, flooded_depths=flooded_depths, **kwds)
+    actual = _run_sed_dep(True, flooded_depths=flooded_depths, **kwds)
+
+    for actual_values, expected_values in zip(actual, expected):
+        assert_allclose(actual_values, expected_values, rtol=1e-13, atol=0.0)
@@ -5,7 +5,9 @@ Created on Fri Mar  3 10:39:32 2017
 
 @author: KRB
 """
+import numpy as np
 import pytest
+from numpy.testing import assert_allclose
 
 from landlab import RasterModelGrid
 from landlab.components import TaylorNonLinearDiffuser
@@ -37,6 +39,28 @@ def test_infinite_taylor_error():
         Cdiff.soilflux(10)
 
 
+def test_local_time_stepping_matches_global():
+    def make_hillslope():
+        mg = RasterModelGrid((5, 10))
+        z = mg.add_zeros("topographic__elevation", at="node")
+        x = mg.x_of_node
+        z += 0.1 * x + np.where(x > 6.0, x - 6.0, 0.0) ** 2
+        return mg, z
+
+    mg_global, z_global = make_hillslope()
+    mg_local, z_local = make_hillslope()
+    global_flux = TaylorNonLinearDiffuser(mg_global, slope_crit=0.6, dynamic_dt=True)
+    local_flux = TaylorNonLinearDiffuser(
+        mg_local, slope_crit=0.6, dynamic_dt=True, local_time_stepping=True
+    )
+    for _ in range(10):
+        global_flux.run_one_step(0.01)
+        local_flux.run_one_step(0.01)
+
+    assert local_flux.number_of_substeps == global_flux.number_of_substeps
+    assert_allclose(z_local, z_global, atol=0.05)
+
+
 # def test_warn():
 #    mg = RasterModelGrid((5, 5))
 #    z = mg.add_zeros("topographic__elevation", at="node")
@@ -7,7 +7,9 @@ Created on Sun Jul 12 10:22:59 2020
 """
 
 import numpy as np
+import pytest
 from numpy.testing import (
+    assert_allclose,
     assert_array_almost_equal,
     assert_array_equal,
     assert_equal,
@@ -213,3 +215,80 @@ def test_getters_and_setters():
 
     tfc.mean_sea_level = 1.0
     assert_equal(tfc.mean_sea_level, 1.0)
+
+
+def _make_estuary(grid):
+    np.random.seed(42)
+    z = grid.add_zeros("topographic__elevation", at="node")
+    z[:] = -2.0 + 3.0 * np.random.rand(grid.number_of_nodes)
+    grid.status_at_node[grid.status_at_node != grid.BC_NODE_IS_CORE] = (
+        grid.BC_NODE_IS_CLOSED
+    )
+    grid.status_at_node[grid.nodes_at_bottom_edge] = grid.BC_NODE_IS_FIXED_VALUE
+    grid.status_at_node[grid.nodes_at_left_edge[1:-1]] = grid.BC_NODE_IS_FIXED_VALUE
+    return z
+
+
+@pytest.mark.parametrize("preconditioner", ["ilu", "jacobi", "lu"])
+def test_cg_solver_matches_direct(preconditioner):
+    expected = RasterModelGrid((20, 30), xy_spacing=10.0)
+    _make_estuary(expected)
+    TidalFlowCalculator(expected).run_one_step()
+
+    actual = RasterModelGrid((20, 30), xy_spacing=10.0)
+    _make_estuary(actual)
+    tfc = TidalFlowCalculator(
+        actual,
+        solver="cg",
+        solver_kwds={"preconditioner": preconditioner, "rtol": 1e-10},
+    )
+    tfc.run_one_step()
+
+    assert tfc.solver_iterations > 0
+    assert_allclose(
+        actual.at_link["flood_tide_flow__velocity"],
+        expected.at_link["flood_tide_flow__velocity"],
+        rtol=1e-6,
+        atol=1e-9,
+    )
+
+
+def test_factorization_reuse():
+    grid = RasterModelGrid((20, 30), xy_spacing=10.0)
+    z = _make_estuary(grid)
+    tfc = TidalFlowCalculator(grid)
+
+    tfc.run_one_step()
+    vel = grid.at_link["flood_tide_flow__velocity"].copy()
+    tfc.run_one_step()
+    assert tfc.number_of_factorizations == 1
+    assert tfc.solver_iterations == 0
+    assert tfc.solve_time >= 0.0
+    assert_array_equal(grid.at_link["flood_tide_flow__velocity"], vel)
+
+    z[grid.core_nodes] -= 0.1
+    tfc.run_one_step()
+    assert tfc.number_of_factorizations == 2
+
+
+def test_cg_solver_warm_start():
+    grid = RasterModelGrid((20, 30), xy_spacing=10.0)
+    z = _make_estuary(grid)
+    tfc = TidalFlowCalculator(
+        grid, solver="cg", solver_kwds={"preconditioner": "jacobi"}
+    )
+
+    tfc.run_one_step()
+    cold_iterations = tfc.solver_iterations
+
+    z[grid.core_nodes] -= 1e-4
+    tfc.run_one_step()
+    assert tfc.solver_iterations < cold_iterations
+    assert tfc.number_of_factorizations == 1
+
+
+def test_bad_solver():
+    grid = RasterModelGrid((3, 5))
+    grid.add_zeros("topographic__elevation", at="node")
+    with pytest.raises(ValueError):
+        TidalFlowCalculator(grid, solver="gmres")
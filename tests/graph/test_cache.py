@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_array_almost_equal, assert_array_equal
+
+from landlab import HexModelGrid, RasterModelGrid, VoronoiDelaunayGrid
+from landlab.graph.cache import GRAPH_CACHE_ENV, GraphCache, graph_cache
+
+ELEMENTS = (
+    "x_of_node",
+    "y_of_node",
+    "nodes_at_link",
+    "links_at_node",
+    "link_dirs_at_node",
+    "links_at_patch",
+    "nodes_at_patch",
+    "patches_at_node",
+    "node_at_cell",
+    "nodes_at_face",
+    "x_of_corner",
+    "y_of_corner",
+    "corners_at_face",
+    "faces_at_cell",
+)
+
+
+@pytest.fixture
+def cache_dir(tmpdir, monkeypatch):
+    monkeypatch.setenv(GRAPH_CACHE_ENV, str(tmpdir))
+    graph_cache.reset_counters()
+    yield str(tmpdir)
+    graph_cache.reset_counters()
+
+
+def test_cache_disabled_by_default(monkeypatch):
+    monkeypatch.delenv(GRAPH_CACHE_ENV, raising=False)
+    cache = GraphCache()
+    assert not cache.enabled
+    assert cache.load(cache.key("raster", (3, 4))) is None
+    assert cache.hits == cache.misses == 0
+
+
+def test_cache_key_by_value():
+    assert GraphCache.key((3, 4), 1) == GraphCache.key([3, 4], 1.0)
+    assert GraphCache.key((3, 4), 1) != GraphCache.key((3, 4), 2)
+    assert GraphCache.key(np.arange(4.0)) != GraphCache.key(np.arange(4.0)[::-1])
+
+
+@pytest.mark.parametrize(
+    "make_grid",
+    [
+        lambda: RasterModelGrid((5, 6), xy_spacing=(2.0, 3.0), xy_of_lower_left=(1, 2)),
+        lambda: HexModelGrid((5, 4)),
+        lambda: HexModelGrid((5, 4), orientation="vertical", node_layout="hex"),
+    ],
+    ids=["raster", "hex", "hex-vertical"],
+)
+def test_cache_hit_matches_miss(cache_dir, make_grid):
+    expected = make_grid()
+    assert (graph_cache.hits, graph_cache.misses) == (0, 1)
+
+    actual = make_grid()
+    assert (graph_cache.hits, graph_cache.misses) == (1, 1)
+
+    assert type(actual.dual) is type(expected.dual)
+    for name in ELEMENTS:
+        assert_array_equal(getattr(actual, name), getattr(expected, name))
+    assert_array_almost_equal(actual.area_of_cell, expected.area_of_cell)
+    assert_array_equal(actual.core_nodes, expected.core_nodes)
+    assert_array_equal(actual.active_links, expected.active_links)
+
+
+def test_cache_voronoi(cache_dir):
+    x, y = np.random.rand(2, 30)
+    expected = VoronoiDelaunayGrid(x.copy(), y.copy())
+    actual = VoronoiDelaunayGrid(x.copy(), y.copy())
+    assert (graph_cache.hits, graph_cache.misses) == (1, 1)
+
+    for name in ELEMENTS:
+        assert_array_equal(getattr(actual, name), getattr(expected, name))
+
+    VoronoiDelaunayGrid(x.copy() + 1.0, y.copy())
+    assert (graph_cache.hits, graph_cache.misses) == (1, 2)
+
+
+def test_cached_graph_is_writable_in_memory(cache_dir):
+    RasterModelGrid((3, 4))
+    grid = RasterModelGrid((3, 4))
+    assert graph_cache.hits == 1
+
+    with grid.thawed():
+        grid.x_of_node[0] = 100.0
+    assert RasterModelGrid((3, 4)).x_of_node[0] == 0.0
+
+
+def test_cache_clear(cache_dir):
+    RasterModelGrid((3, 4))
+    graph_cache.clear()
+    RasterModelGrid((3, 4))
+    assert (graph_cache.hits, graph_cache.misses) == (0, 2)
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+from landlab import HexModelGrid, NetworkModelGrid, RasterModelGrid
+from landlab.grid.buffer_pool import BufferPool
+
+
+def test_no_reuse_by_default():
+    grid = RasterModelGrid((3, 4))
+    assert not grid.buffer_pool.reuse
+
+    z = np.arange(12.0)
+    assert grid.calc_grad_at_link(z) is not grid.calc_grad_at_link(z)
+    assert grid.buffer_pool.allocations == 2
+    assert grid.buffer_pool.nbytes == 0
+
+
+def test_reuse_matches_no_reuse():
+    grid = HexModelGrid((5, 4))
+    z = np.random.rand(grid.number_of_nodes)
+    expected = [
+        grid.calc_grad_at_link(z),
+        grid.map_max_of_link_nodes_to_link(z),
+        grid.map_min_of_node_links_to_node(grid.calc_grad_at_link(z)),
+        grid.calc_flux_div_at_node(grid.calc_grad_at_link(z)),
+    ]
+
+    grid.buffer_pool.reuse = True
+    for _ in range(2):
+        assert_array_equal(grid.calc_grad_at_link(z), expected[0])
+        assert_array_equal(grid.map_max_of_link_nodes_to_link(z), expected[1])
+        assert_array_equal(
+            grid.map_min_of_node_links_to_node(grid.calc_grad_at_link(z)), expected[2]
+        )
+        assert_array_equal(
+            grid.calc_flux_div_at_node(grid.calc_grad_at_link(z)), expected[3]
+        )
+
+
+def test_out_keyword_not_taken_from_pool():
+    grid = RasterModelGrid((3, 4))
+    out = np.empty(grid.number_of_links)
+    with grid.buffer_pool.reusing():
+        assert grid.calc_grad_at_link(np.arange(12.0), out=out) is out
+        assert grid.map_mean_of_link_nodes_to_link(grid.x_of_node, out) is out
+    assert grid.buffer_pool.requests == 0
+
+
+def test_reuse_counters():
+    grid = RasterModelGrid((4, 5))
+    z = np.arange(20.0)
+    with grid.buffer_pool.reusing():
+        for _ in range(10):
+            grid.calc_grad_at_link(z)
+            grid.map_mean_of_link_nodes_to_link(z)
+    assert grid.buffer_pool.requests == 20
+    assert grid.buffer_pool.allocations == 2
+
+    grid.buffer_pool.reset_counters()
+    assert grid.buffer_pool.requests == grid.buffer_pool.allocations == 0
+
+
+def test_turning_off_reuse_releases_buffers():
+    grid = RasterModelGrid((4, 5))
+    grid.buffer_pool.reuse = True
+    grid.calc_grad_at_d8(np.arange(20.0))
+    assert grid.buffer_pool.nbytes == grid.number_of_d8 * 8
+
+    grid.buffer_pool.reuse = False
+    assert grid.buffer_pool.nbytes == 0
+
+
+def test_network_grid():
+    grid = NetworkModelGrid(((0, 1, 2), (0, 0, 0)), ((0, 1), (1, 2)))
+    with grid.buffer_pool.reusing():
+        first = grid.map_max_of_node_links_to_node([1.0, 2.0])
+        assert_array_equal(first, [1.0, 2.0, 2.0])
+        assert grid.map_max_of_node_links_to_node([1.0, 2.0]) is first
+
+
+def test_bad_element():
+    pool = BufferPool(RasterModelGrid((3, 4)))
+    with pytest.raises(ValueError):
+        pool.empty("not_an_element", "foo")
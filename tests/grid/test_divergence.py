@@ -0,0 +1,134 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_array_almost_equal
+
+from landlab import HexModelGrid, LinkStatus, RasterModelGrid, VoronoiDelaunayGrid
+
+GRIDS = [
+    lambda: RasterModelGrid((7, 8), xy_spacing=(2.0, 3.0)),
+    lambda: HexModelGrid((7, 6)),
+    lambda: HexModelGrid((7, 6), orientation="vertical", node_layout="rect"),
+]
+GRID_IDS = ["raster", "hex", "hex-vertical"]
+
+
+def _flux_div_of_grad(grid, z, coef, flux_of_grad=lambda grad: grad):
+    grad = grid.calc_grad_at_link(z)
+    flux = coef * flux_of_grad(grad)
+    flux[grid.status_at_link == LinkStatus.INACTIVE] = 0.0
+    return grid.calc_flux_div_at_node(flux)
+
+
+@pytest.fixture
+def random_grid(request):
+    grid = request.param()
+    rng = np.random.default_rng(42)
+    grid.status_at_node[rng.integers(0, grid.number_of_nodes, 4)] = (
+        grid.BC_NODE_IS_CLOSED
+    )
+    z = rng.random(grid.number_of_nodes)
+    coef = rng.random(grid.number_of_links)
+    return grid, z, coef
+
+
+@pytest.mark.parametrize("random_grid", GRIDS, ids=GRID_IDS, indirect=True)
+def test_matches_composed(random_grid):
+    grid, z, coef = random_grid
+    assert_array_almost_equal(
+        grid.calc_flux_div_of_grad(z, coef), _flux_div_of_grad(grid, z, coef)
+    )
+    assert_array_almost_equal(
+        grid.calc_flux_div_of_grad(z, 2.0), _flux_div_of_grad(grid, z, 2.0)
+    )
+
+
+@pytest.mark.parametrize("random_grid", GRIDS, ids=GRID_IDS, indirect=True)
+@pytest.mark.parametrize("n_terms", [1, 2, 4])
+def test_taylor_matches_composed(random_grid, n_terms):
+    grid, z, coef = random_grid
+
+    def taylor(grad):
+        return grad * sum((grad / 1.5) ** (2 * i) for i in range(n_terms))
+
+    assert_array_almost_equal(
+        grid.calc_flux_div_of_taylor_grad(z, coef, slope_crit=1.5, n_terms=n_terms),
+        _flux_div_of_grad(grid, z, coef, flux_of_grad=taylor),
+    )
+
+
+@pytest.mark.parametrize("random_grid", GRIDS, ids=GRID_IDS, indirect=True)
+def test_critical_matches_composed(random_grid):
+    grid, z, coef = random_grid
+
+    def critical(grad):
+        return grad / (1.0 - (grad / 2.0) ** 2)
+
+    assert_array_almost_equal(
+        grid.calc_flux_div_of_critical_grad(z, coef, slope_crit=2.0),
+        _flux_div_of_grad(grid, z, coef, flux_of_grad=critical),
+    )
+
+
+def test_voronoi():
+    grid = VoronoiDelaunayGrid(*np.random.default_rng(1).random((2, 40)))
+    z = np.random.default_rng(2).random(grid.number_of_nodes)
+
+    expected = np.zeros(grid.number_of_nodes)
+    flux = grid.calc_grad_at_link(z)
+    flux[grid.status_at_link == LinkStatus.INACTIVE] = 0.0
+    for link, face in enumerate(grid.face_at_link):
+        if face >= 0:
+            tail, head = grid.nodes_at_link[link]
+            expected[tail] += flux[link] * grid.length_of_face[face]
+            expected[head] -= flux[link] * grid.length_of_face[face]
+    expected[grid.node_at_cell] /= grid.area_of_cell
+    expected[grid.status_at_node != grid.BC_NODE_IS_CORE] = 0.0
+
+    actual = grid.calc_flux_div_of_grad(z)
+    actual[grid.status_at_node != grid.BC_NODE_IS_CORE] = 0.0
+    assert_array_almost_equal(actual, expected)
+
+
+def test_out_keeps_nodes_without_cells():
+    grid = RasterModelGrid((4, 5))
+    out = np.full(grid.number_of_nodes, -1.0)
+    rtn = grid.calc_flux_div_of_grad(np.zeros(grid.number_of_nodes), out=out)
+    assert rtn is out
+    assert np.all(out[grid.node_at_cell] == 0.0)
+    assert np.all(out[grid.perimeter_nodes] == -1.0)
+
+
+@pytest.mark.parametrize("random_grid", GRIDS, ids=GRID_IDS, indirect=True)
+def test_non_contiguous_out(random_grid):
+    grid, z, coef = random_grid
+    expected = grid.calc_flux_div_of_grad(z, coef)
+
+    out = np.full((grid.number_of_nodes, 2), -1.0)[:, 0]
+    assert not out.flags.c_contiguous
+
+    rtn = grid.calc_flux_div_of_grad(z, coef, out=out)
+    assert rtn is out
+    assert_array_almost_equal(out[grid.node_at_cell], expected[grid.node_at_cell])
+    assert np.all(out[grid.perimeter_nodes] == -1.0)
+
+
+def test_non_contiguous_2d_out():
+    grid = RasterModelGrid((4, 5))
+    z = np.random.default_rng(3).random(grid.number_of_nodes)
+    expected = grid.calc_flux_div_of_grad(z)
+
+    out = np.zeros((5, 4)).T
+    rtn = grid.calc_flux_div_of_grad(z, out=out)
+    assert rtn is out
+    assert_array_almost_equal(out.reshape(-1), expected)
+
+
+def test_bad_sizes():
+    grid = RasterModelGrid((4, 5))
+    z = np.zeros(grid.number_of_nodes)
+    with pytest.raises(ValueError):
+        grid.calc_flux_div_of_grad(z[:-1])
+    with pytest.raises(ValueError):
+        grid.calc_flux_div_of_grad(z, np.ones(3))
+    with pytest.raises(ValueError):
+        grid.calc_flux_div_of_grad(z, out=np.empty(3))
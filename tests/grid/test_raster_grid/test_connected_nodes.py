@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+from scipy.ndimage import label
+
+from landlab import RasterModelGrid
+
+
+@pytest.mark.parametrize("adjacency_method", ["D4", "D8"])
+def test_labels_match_ndimage(adjacency_method):
+    grid = RasterModelGrid((40, 50))
+    np.random.seed(42)
+    is_closed = np.random.rand(grid.number_of_nodes) < 0.45
+    grid.status_at_node[is_closed] = grid.BC_NODE_IS_CLOSED
+
+    labels = grid.label_connected_open_nodes(adjacency_method=adjacency_method)
+
+    structure = np.ones((3, 3)) if adjacency_method == "D8" else None
+    expected, n_labels = label(~is_closed.reshape(grid.shape), structure=structure)
+    expected = expected.reshape(-1) - 1
+
+    assert labels.max() + 1 == n_labels
+    assert_array_equal(labels, expected)
+
+
+def test_bad_adjacency_method():
+    grid = RasterModelGrid((3, 4))
+    with pytest.raises(ValueError):
+        grid.label_connected_open_nodes(adjacency_method="D6")
+
+
+@pytest.mark.parametrize("adjacency_method", ["D4", "D8"])
+def test_disconnected_nodes_set_to_closed(adjacency_method):
+    z = np.array(
+        [
+            [-9999.0, -9999.0, -9999.0, -9999.0, -9999.0, -9999.0],
+            [-9999.0, 67.0, 67.0, -9999.0, 50.0, -9999.0],
+            [-9999.0, 67.0, 0.0, -9999.0, -9999.0, 51.0],
+            [-9999.0, 66.0, -9999.0, 52.0, -9999.0, -9999.0],
+            [-9999.0, -9999.0, -9999.0, -9999.0, -9999.0, -9999.0],
+        ]
+    ).reshape(-1)
+    grid = RasterModelGrid((5, 6))
+    outlet = grid.set_watershed_boundary_condition(
+        z,
+        remove_disconnected=True,
+        adjacency_method=adjacency_method,
+        return_outlet_id=True,
+    )
+
+    assert_array_equal(outlet, [14])
+    expected = np.full(grid.number_of_nodes, grid.BC_NODE_IS_CLOSED)
+    expected[[7, 8, 13, 19]] = grid.BC_NODE_IS_CORE
+    expected[14] = grid.BC_NODE_IS_FIXED_VALUE
+    if adjacency_method == "D8":
+        expected[21] = grid.BC_NODE_IS_CORE
+    assert_array_equal(grid.status_at_node, expected)
@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+from landlab import HexModelGrid, NodeStatus, RasterModelGrid
+
+CACHES = (
+    "status_at_link",
+    "active_links",
+    "fixed_links",
+    "core_nodes",
+    "core_cells",
+    "node_at_core_cell",
+    "fixed_value_boundary_nodes",
+    "active_faces",
+    "link_status_at_node",
+    "active_link_dirs_at_node",
+    "active_adjacent_nodes_at_node",
+)
+DIAGONAL_CACHES = (
+    "status_at_diagonal",
+    "diagonal_status_at_node",
+    "active_diagonals",
+    "active_diagonal_dirs_at_node",
+    "status_at_d8",
+    "active_d8",
+    "active_d8_dirs_at_node",
+)
+
+
+@pytest.mark.parametrize(
+    "make_grid,names",
+    [
+        (lambda: RasterModelGrid((7, 9)), CACHES + DIAGONAL_CACHES),
+        (lambda: HexModelGrid((7, 6)), CACHES),
+    ],
+)
+def test_incremental_update_matches_rebuild(make_grid, names):
+    grid = make_grid()
+    rng = np.random.default_rng(1973)
+    statuses = [
+        NodeStatus.CORE,
+        NodeStatus.FIXED_VALUE,
+        NodeStatus.FIXED_GRADIENT,
+        NodeStatus.CLOSED,
+    ]
+    for step in range(100):
+        for name in names:
+            getattr(grid, name)
+
+        if step % 10 == 0:
+            nodes = [grid.number_of_nodes - 1]
+        else:
+            nodes = rng.integers(0, grid.number_of_nodes, size=3)
+        grid.status_at_node[nodes] = rng.choice(statuses, size=len(nodes))
+
+        expected = make_grid()
+        expected.status_at_node[:] = grid.status_at_node
+        for name in names:
+            actual = getattr(grid, name)
+            assert_array_equal(actual, getattr(expected, name))
+            assert actual.dtype == getattr(expected, name).dtype
+            assert not actual.flags.writeable
+
+
+def test_update_does_not_change_returned_arrays():
+    grid = RasterModelGrid((4, 5))
+    status_at_link = grid.status_at_link
+    before = status_at_link.copy()
+
+    grid.status_at_node[7] = grid.BC_NODE_IS_CLOSED
+    assert_array_equal(status_at_link, before)
+    assert np.any(grid.status_at_link != before)
+
+
+def test_versions():
+    grid = RasterModelGrid((10, 10))
+    versions = {
+        name: grid.status_cache_version(name)
+        for name in (
+            "status_at_node",
+            "core_nodes",
+            "fixed_value_boundary_nodes",
+            "status_at_link",
+            "status_at_diagonal",
+        )
+    }
+    assert set(versions.values()) == {0}
+
+    grid.status_at_node[[10, 20]] = grid.BC_NODE_IS_FIXED_GRADIENT
+    assert grid.status_cache_version("core_nodes") == 0
+    assert grid.status_cache_version("fixed_value_boundary_nodes") == 1
+    assert grid.status_cache_version("status_at_link") == 1
+
+    grid.status_at_node[[10, 20]] = grid.BC_NODE_IS_FIXED_GRADIENT
+    assert grid.status_cache_version("status_at_node") == 1
+
+
+def test_version_after_status_set_before_first_use():
+    grid = RasterModelGrid((4, 5))
+    grid.status_at_node[7] = grid.BC_NODE_IS_CLOSED
+    assert grid.status_cache_version("core_nodes") == 1
+    assert_array_equal(grid.core_nodes, [6, 8, 11, 12, 13])
+
+
+def test_bad_version_name():
+    grid = HexModelGrid((3, 3))
+    with pytest.raises(ValueError):
+        grid.status_cache_version("status_at_diagonal")
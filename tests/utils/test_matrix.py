@@ -1,9 +1,11 @@
 import numpy as np
 import pytest
-from numpy.testing import assert_array_equal
+from numpy.testing import assert_array_almost_equal, assert_array_equal
+from scipy.sparse import coo_matrix
 
 from landlab import HexModelGrid, RasterModelGrid
 from landlab.utils import get_core_node_matrix
+from landlab.utils.matrix import CoreNodeMatrixBuilder, get_matrix_entries
 
 
 @pytest.mark.parametrize("diff", (-1, 1))
@@ -220,3 +222,61 @@ def test_hex_grid():
         ],
     )
     assert_array_equal(rhs, [[-3.0], [-3.0], [-4.0], [-2.0], [-4.0]])
+
+
+def _set_mixed_boundaries(grid):
+    grid.status_at_node[grid.boundary_nodes] = grid.BC_NODE_IS_CLOSED
+    grid.status_at_node[grid.boundary_nodes[::3]] = grid.BC_NODE_IS_FIXED_VALUE
+    grid.status_at_node[grid.core_nodes[::7]] = grid.BC_NODE_IS_FIXED_VALUE
+
+
+@pytest.mark.parametrize(
+    "grid",
+    (
+        RasterModelGrid((7, 8)),
+        HexModelGrid((7, 6)),
+        HexModelGrid((5, 4), node_layout="rect"),
+    ),
+)
+def test_builder_matches_matrix_entries(grid):
+    _set_mixed_boundaries(grid)
+    np.random.seed(1973)
+    coef_at_link = np.random.rand(grid.number_of_links)
+
+    builder = CoreNodeMatrixBuilder(grid)
+    for coef in (None, coef_at_link):
+        expected = coo_matrix(
+            get_matrix_entries(grid, coef_at_link=coef),
+            shape=(grid.number_of_core_nodes, grid.number_of_core_nodes),
+        )
+        actual = builder.get_matrix(coef_at_link=coef)
+        assert actual.has_canonical_format
+        assert_array_almost_equal(actual.toarray(), expected.toarray())
+
+
+def test_builder_updates_structure():
+    grid = RasterModelGrid((6, 7))
+    value_at_node = np.arange(grid.number_of_nodes, dtype=float)
+    builder = CoreNodeMatrixBuilder(grid)
+    mat, rhs = builder.build(value_at_node)
+
+    _set_mixed_boundaries(grid)
+    mat, rhs = builder.build(value_at_node, coef_at_link=2.0)
+    expected_mat, expected_rhs = get_core_node_matrix(
+        grid, value_at_node, coef_at_link=2.0
+    )
+
+    assert mat.shape == (grid.number_of_core_nodes, grid.number_of_core_nodes)
+    assert_array_equal(mat.toarray(), expected_mat.toarray())
+    assert_array_equal(rhs, expected_rhs)
+
+
+def test_builder_reuses_matrix():
+    grid = RasterModelGrid((6, 7))
+    builder = CoreNodeMatrixBuilder(grid)
+    mat = builder.get_matrix()
+    assert builder.get_matrix(coef_at_link=2.0) is mat
+    assert_array_equal(mat.diagonal(), -8.0)
+
+    out = np.empty(grid.number_of_core_nodes)
+    assert builder.get_rhs(1.0, out=out) is out
@@ -9,7 +9,11 @@ import pytest
 
 from landlab import RasterModelGrid
 from landlab.components import FlowAccumulator
-from landlab.utils import find_unique_upstream_hsd_ids_and_fractions, track_source
+from landlab.utils import (
+    find_unique_upstream_hsd_ids_and_fractions,
+    find_upstream_hsd_fractions,
+    track_source,
+)
 
 
 def test_route_to_multiple_error_raised():
@@ -151,3 +155,68 @@ def test_find_unique_upstream_hsd_ids_and_fractions():
     np.testing.assert_almost_equal(
         np.sort(np.array(coeff[8])), np.array([0.33333333, 0.66666667])
     )
+
+
+def test_find_upstream_hsd_fractions():
+    """Unit tests find_upstream_hsd_fractions()."""
+    grid = RasterModelGrid((5, 5), xy_spacing=(1.0, 1.0))
+    grid.at_node["topographic__elevation"] = np.array(
+        [
+            [5.0, 5.0, 5.0, 5.0, 5.0],
+            [5.0, 4.0, 5.0, 1.0, 5.0],
+            [0.0, 3.0, 5.0, 3.0, 0.0],
+            [5.0, 4.0, 5.0, 2.0, 5.0],
+            [5.0, 5.0, 5.0, 5.0, 5.0],
+        ]
+    ).flatten()
+    grid.status_at_node[10] = 0
+    grid.status_at_node[14] = 0
+    fr = FlowAccumulator(grid, flow_director="D8")
+    fr.run_one_step()
+    hsd_ids = np.empty(grid.number_of_nodes, dtype=int)
+    hsd_ids[:] = 1
+    hsd_ids[2:5] = 0
+    hsd_ids[7:10] = 0
+    (fractions, unique_ids, flow_accum) = find_upstream_hsd_fractions(grid, hsd_ids)
+    np.testing.assert_array_equal(unique_ids, [0, 1])
+    np.testing.assert_almost_equal(fractions[8].toarray(), [[0.66666667, 0.33333333]])
+    np.testing.assert_almost_equal(fractions[14].toarray(), [[2.0 / 7.0, 5.0 / 7.0]])
+    assert flow_accum[14] == 7
+
+
+def test_route_to_multiple_error_raised_hsd_fractions():
+    grid = RasterModelGrid((5, 5))
+    z = grid.add_zeros("topographic__elevation", at="node")
+    z += grid.x_of_node + grid.y_of_node
+    fa = FlowAccumulator(grid, flow_director="MFD")
+    fa.run_one_step()
+
+    with pytest.raises(NotImplementedError):
+        find_upstream_hsd_fractions(grid, np.zeros(grid.number_of_nodes, dtype=int))
+
+
+@pytest.mark.parametrize("flow_director", ["D8", "D4"])
+@pytest.mark.parametrize("seed", [0, 1])
+def test_find_upstream_hsd_fractions_matches_track_source(flow_director, seed):
+    np.random.seed(seed)
+    grid = RasterModelGrid((12, 15))
+    z = grid.add_zeros("topographic__elevation", at="node")
+    z += np.random.rand(z.size) + 0.1 * grid.y_of_node
+    grid.status_at_node[grid.nodes_at_top_edge] = grid.BC_NODE_IS_CLOSED
+    FlowAccumulator(grid, flow_director=flow_director).run_one_step()
+    hsd_ids = 100 + 10 * (grid.x_of_node // 4).astype(int) + grid.y_of_node // 3
+
+    (hsd_upstr, expected_accum) = track_source(grid, hsd_ids)
+    (uniq_ids, coeff) = find_unique_upstream_hsd_ids_and_fractions(hsd_upstr)
+    (fractions, unique_ids, flow_accum) = find_upstream_hsd_fractions(grid, hsd_ids)
+
+    np.testing.assert_array_equal(flow_accum, expected_accum)
+    assert fractions.shape == (grid.number_of_nodes, len(np.unique(hsd_ids)))
+    assert fractions.has_sorted_indices
+    for node in range(grid.number_of_nodes):
+        row = fractions[node]
+        actual = dict(zip(unique_ids[row.indices], row.data))
+        if node in hsd_upstr:
+            assert actual == dict(zip(uniq_ids[node], coeff[node]))
+        else:
+            assert actual == {}
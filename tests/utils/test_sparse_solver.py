@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+from scipy.sparse.linalg import spsolve
+
+from landlab import HexModelGrid, RasterModelGrid
+from landlab.utils import SparseSolver, get_core_node_matrix
+from landlab.utils.sparse_solver import pyamg
+
+
+def _make_system(grid):
+    np.random.seed(1945)
+    value_at_node = np.random.rand(grid.number_of_nodes)
+    coef_at_link = 10.0 ** np.random.uniform(-3, 3, grid.number_of_links)
+    return get_core_node_matrix(grid, value_at_node, coef_at_link=coef_at_link)
+
+
+@pytest.mark.parametrize(
+    "method,preconditioner",
+    [
+        ("direct", None),
+        ("cg", None),
+        ("cg", "jacobi"),
+        ("cg", "ilu"),
+        ("cg", "lu"),
+        ("bicgstab", "ilu"),
+        pytest.param(
+            "cg",
+            "amg",
+            marks=pytest.mark.skipif(pyamg is None, reason="pyamg not installed"),
+        ),
+    ],
+)
+@pytest.mark.parametrize("grid", [RasterModelGrid((20, 30)), HexModelGrid((20, 15))])
+def test_solve_matches_spsolve(grid, method, preconditioner):
+    mat, rhs = _make_system(grid)
+    solver = SparseSolver(
+        method=method, preconditioner=preconditioner, rtol=1e-12, maxiter=10000
+    )
+    assert_allclose(solver.solve(mat, rhs), spsolve(mat, rhs), rtol=1e-6)
+
+
+def test_direct_refactors_when_matrix_changes():
+    mat, rhs = _make_system(RasterModelGrid((10, 10)))
+    solver = SparseSolver()
+
+    solver.solve(mat, rhs)
+    solver.solve(mat.copy(), rhs)
+    assert solver.number_of_factorizations == 1
+    assert solver.iterations == 0
+
+    mat.data *= 1.001
+    assert_allclose(solver.solve(mat, rhs), spsolve(mat, rhs))
+    assert solver.number_of_factorizations == 2
+
+    solver.reset()
+    solver.solve(mat, rhs)
+    assert solver.number_of_factorizations == 3
+
+
+def test_cg_reuses_preconditioner():
+    mat, rhs = _make_system(RasterModelGrid((10, 10)))
+    solver = SparseSolver(method="cg", refactor_tolerance=0.01, rtol=1e-12)
+
+    solver.solve(mat, rhs)
+    mat.data *= 1.001
+    assert_allclose(solver.solve(mat, rhs), spsolve(mat, rhs), rtol=1e-8)
+    assert solver.number_of_factorizations == 1
+
+    mat.data *= 1.1
+    solver.solve(mat, rhs)
+    assert solver.number_of_factorizations == 2
+
+
+def test_cg_warm_start():
+    mat, rhs = _make_system(RasterModelGrid((20, 20)))
+    solver = SparseSolver(method="cg", preconditioner="jacobi")
+
+    solver.solve(mat, rhs)
+    cold_iterations = solver.iterations
+    solver.solve(mat, rhs)
+    assert solver.iterations < cold_iterations
+
+
+def test_cg_not_converged():
+    mat, rhs = _make_system(RasterModelGrid((20, 20)))
+    solver = SparseSolver(method="cg", preconditioner=None, maxiter=2)
+    with pytest.raises(RuntimeError):
+        solver.solve(mat, rhs)
+
+
+def test_bad_method():
+    with pytest.raises(ValueError):
+        SparseSolver(method="gmres")
+    with pytest.raises(ValueError):
+        SparseSolver(method="cg", preconditioner="ssor")
+
+
+def test_bicgstab_nonsymmetric():
+    mat, rhs = _make_system(RasterModelGrid((20, 20)))
+    mat = mat.tolil()
+    mat.setdiag(mat.diagonal(k=1) * 0.5, k=1)
+    mat = mat.tocsc()
+
+    solver = SparseSolver(method="bicgstab", rtol=1e-12)
+    assert_allclose(solver.solve(mat, rhs), spsolve(mat, rhs), rtol=1e-6)
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+from landlab import RasterModelGrid
+from landlab.components import FlowAccumulator
+from landlab.utils.stack_accumulate import accumulate_down_stack, accumulate_up_stack
+
+
+def _routed_grid(flow_director):
+    grid = RasterModelGrid((12, 10))
+    z = grid.add_zeros("topographic__elevation", at="node")
+    np.random.seed(1984)
+    z += np.random.rand(grid.number_of_nodes) + 0.1 * grid.y_of_node
+    FlowAccumulator(grid, flow_director=flow_director).run_one_step()
+
+    receivers = grid.at_node["flow__receiver_node"].reshape((grid.number_of_nodes, -1))
+    weights = np.random.rand(*receivers.shape)
+    return grid.at_node["flow__upstream_node_order"], receivers, weights
+
+
+def _up_stack_by_python(stack, receivers, weights, select):
+    values = np.zeros(len(receivers))
+    for node in stack:
+        choices = [
+            (values[receiver], weight)
+            for receiver, weight in zip(receivers[node], weights[node])
+            if receiver >= 0
+        ]
+        if choices:
+            value, weight = min(choices) if select == "min" else max(choices)
+            values[node] = value + weight
+    return values
+
+
+def _down_stack_by_python(stack, receivers, weights, reduce, reset_at):
+    values = np.full(len(receivers), 1e6 if reduce == "min" else 0.0)
+    for node in stack[::-1]:
+        if reset_at[node]:
+            values[node] = 0.0
+        for receiver, weight in zip(receivers[node], weights[node]):
+            if receiver >= 0 and receiver != node:
+                value = values[node] + weight
+                if reduce == "sum":
+                    values[receiver] += value
+                elif reduce == "max":
+                    values[receiver] = max(values[receiver], value)
+                else:
+                    values[receiver] = min(values[receiver], value)
+    return values
+
+
+@pytest.mark.parametrize("select", ["min", "max"])
+@pytest.mark.parametrize("flow_director", ["D8", "MFD"])
+def test_up_stack_matches_python(flow_director, select):
+    stack, receivers, weights = _routed_grid(flow_director)
+    actual = accumulate_up_stack(stack, receivers, weights, select=select)
+    assert_array_equal(actual, _up_stack_by_python(stack, receivers, weights, select))
+
+
+@pytest.mark.parametrize("reduce", ["min", "max", "sum"])
+@pytest.mark.parametrize("flow_director", ["D8", "MFD"])
+def test_down_stack_matches_python(flow_director, reduce):
+    stack, receivers, weights = _routed_grid(flow_director)
+    reset_at = np.random.rand(len(receivers)) > 0.5
+    actual = accumulate_down_stack(
+        stack,
+        receivers,
+        weights,
+        out=np.full(len(receivers), 1e6 if reduce == "min" else 0.0),
+        reduce=reduce,
+        reset_at=reset_at,
+    )
+    assert_array_equal(
+        actual, _down_stack_by_python(stack, receivers, weights, reduce, reset_at)
+    )
+
+
+def test_partial_stack():
+    stack, receivers, weights = _routed_grid("D8")
+    values = np.full(len(receivers), -1.0)
+    accumulate_up_stack(stack[:1], receivers, weights, out=values)
+
+    expected = np.full(len(receivers), -1.0)
+    expected[stack[0]] += weights[stack[0], 0]
+    assert_array_equal(values, expected)
+
+
+def test_scalar_weight_for_each_receiver():
+    receivers = np.array([[0, -1], [0, -1], [1, 0]])
+    values = accumulate_up_stack([0, 1, 2], receivers, [0.0, 1.0, 2.0])
+    assert_array_equal(values, [0.0, 1.0, 2.0])
+
+
+def test_bad_reduction():
+    with pytest.raises(ValueError):
+        accumulate_up_stack([0], [0], [0.0], select="sum")
+    with pytest.raises(ValueError):
+        accumulate_down_stack([0], [0], [0.0], reduce="mean")
@@ -0,0 +1,145 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_array_almost_equal
+
+from landlab import LinkStatus, RasterModelGrid
+from landlab.utils import SubStepper
+
+
+def _make_flux_function(grid, z, kd):
+    def flux_and_diffusivity(links):
+        grad = grid.calc_grad_at_link(z)[links]
+        return -kd[links] * grad, kd[links]
+
+    return flux_and_diffusivity
+
+
+def _make_step_problem():
+    grid = RasterModelGrid((5, 12))
+    grid.set_closed_boundaries_at_grid_edges(True, True, True, True)
+    z = np.where(grid.x_of_node < 4.5, 1.0, 0.0)
+    kd = np.where(grid.xy_of_link[:, 0] < 4.0, 50.0, 1.0)
+    return grid, z, kd
+
+
+def test_iter_substeps_covers_time_step():
+    stepper = SubStepper(RasterModelGrid((3, 3)))
+    substeps = list(stepper.iter_substeps(1.0, lambda: 0.3))
+
+    assert substeps == pytest.approx([0.3, 0.3, 0.3, 0.1])
+    assert sum(substeps) == pytest.approx(1.0)
+    assert stepper.number_of_substeps == 4
+    assert stepper.stable_time_step == pytest.approx(0.3)
+
+
+def test_iter_substeps_no_tiny_remainder():
+    stepper = SubStepper(RasterModelGrid((3, 3)))
+    substeps = list(stepper.iter_substeps(1.0, lambda: 0.1))
+
+    assert len(substeps) == 10
+    assert sum(substeps) == pytest.approx(1.0)
+
+
+def test_iter_substeps_not_adaptive():
+    stepper = SubStepper(RasterModelGrid((3, 3)))
+    assert list(stepper.iter_substeps(1.0, lambda: 0.1, adaptive=False)) == [1.0]
+
+
+@pytest.mark.parametrize("if_unstable", ["raise", "warn"])
+def test_iter_substeps_unstable(if_unstable, capsys):
+    stepper = SubStepper(RasterModelGrid((3, 3)))
+    substeps = stepper.iter_substeps(
+        1.0,
+        lambda: 0.1,
+        adaptive=False,
+        if_unstable=if_unstable,
+        message="dt={dt}, stable={stable}",
+    )
+    if if_unstable == "raise":
+        with pytest.raises(RuntimeError, match="dt=1.0, stable=0.1"):
+            list(substeps)
+    else:
+        assert list(substeps) == [1.0]
+        assert "dt=1.0, stable=0.1" in capsys.readouterr().out
+
+
+def test_iter_substeps_bad_if_unstable():
+    stepper = SubStepper(RasterModelGrid((3, 3)))
+    with pytest.raises(ValueError):
+        list(stepper.iter_substeps(1.0, lambda: 0.1, if_unstable="ignore"))
+
+
+def test_bad_courant_factor():
+    with pytest.raises(ValueError):
+        SubStepper(RasterModelGrid((3, 3)), courant_factor=0.0)
+
+
+def test_stable_time_step_without_diffusion():
+    stepper = SubStepper(RasterModelGrid((3, 3)))
+    assert stepper.calc_stable_time_step(0.0) == np.inf
+    assert stepper.calc_stable_time_step(1.0, links=[]) == np.inf
+
+
+def test_stable_time_step_uses_magnitude():
+    grid = RasterModelGrid((3, 4), xy_spacing=(2.0, 1.0))
+    stepper = SubStepper(grid, courant_factor=0.25)
+    kd = np.full(grid.number_of_links, -1.0)
+    assert stepper.calc_stable_time_step(kd) == pytest.approx(0.25)
+
+
+@pytest.mark.parametrize("local", [False, True])
+def test_advance_conserves_mass(local):
+    grid, z, kd = _make_step_problem()
+    total = z[grid.core_nodes].sum()
+
+    stepper = SubStepper(grid, local=local)
+    stepper.advance(1.0, z, _make_flux_function(grid, z, kd))
+
+    assert z[grid.core_nodes].sum() == pytest.approx(total)
+
+
+def test_advance_local_matches_global():
+    grid, z_global, kd = _make_step_problem()
+    z_local = z_global.copy()
+
+    global_stepper = SubStepper(grid, local=False)
+    local_stepper = SubStepper(grid, local=True)
+    for _ in range(10):
+        global_stepper.advance(0.1, z_global, _make_flux_function(grid, z_global, kd))
+        local_stepper.advance(0.1, z_local, _make_flux_function(grid, z_local, kd))
+
+    assert local_stepper.number_of_substeps == global_stepper.number_of_substeps
+    assert local_stepper.number_of_node_updates < (
+        global_stepper.number_of_node_updates
+    )
+    assert_array_almost_equal(z_local, z_global, decimal=2)
+
+
+def test_advance_counters():
+    grid, z, kd = _make_step_problem()
+    stepper = SubStepper(grid)
+
+    stepper.advance(0.1, z, _make_flux_function(grid, z, kd))
+    n_substeps = stepper.number_of_substeps
+    assert n_substeps > 1
+    assert stepper.number_of_node_updates == n_substeps * grid.number_of_core_nodes
+
+    stepper.advance(0.1, z, _make_flux_function(grid, z, kd))
+    assert stepper.total_substeps == stepper.number_of_substeps + n_substeps
+
+    stepper.reset_counters()
+    assert stepper.total_substeps == 0
+    assert stepper.number_of_node_updates == 0
+
+
+def test_advance_fills_flux_at_link():
+    grid, z, kd = _make_step_problem()
+    flux = grid.add_zeros("flux", at="link")
+
+    SubStepper(grid).advance(
+        0.01, z, _make_flux_function(grid, z, kd), flux_at_link=flux
+    )
+
+    assert np.all(flux[grid.active_links] >= 0.0)
+    assert np.any(flux[grid.active_links] > 0.0)
+    assert np.all(flux[grid.status_at_link == LinkStatus.INACTIVE] == 0.0)
@@ -9,6 +9,7 @@ from landlab.utils import (
     get_watershed_masks_with_area_threshold,
     get_watershed_nodes,
     get_watershed_outlet,
+    label_watersheds,
 )
 
 
@@ -266,3 +267,89 @@ def test_route_to_multiple_error_raised_watershed_mask():
 
     with pytest.raises(NotImplementedError):
         get_watershed_mask(mg, 10)
+
+
+def test_route_to_multiple_error_raised_label_watersheds():
+    mg = RasterModelGrid((10, 10))
+    z = mg.add_zeros("topographic__elevation", at="node")
+    z += mg.x_of_node + mg.y_of_node
+    fa = FlowAccumulator(mg, flow_director="MFD")
+    fa.run_one_step()
+
+    with pytest.raises(NotImplementedError):
+        label_watersheds(mg, [10])
+
+
+@pytest.mark.parametrize("outlet_ids", [[12, 12], [-1], [100]])
+def test_label_watersheds_bad_outlets(outlet_ids):
+    mg = RasterModelGrid((10, 10))
+    z = mg.add_zeros("topographic__elevation", at="node")
+    z += mg.x_of_node + mg.y_of_node
+    FlowAccumulator(mg).run_one_step()
+
+    with pytest.raises(ValueError):
+        label_watersheds(mg, outlet_ids)
+
+
+@pytest.mark.parametrize("nested", [False, True])
+def test_label_watersheds_no_outlets(nested):
+    mg = RasterModelGrid((10, 10))
+    z = mg.add_zeros("topographic__elevation", at="node")
+    z += mg.x_of_node + mg.y_of_node
+    FlowAccumulator(mg).run_one_step()
+
+    labels, counts, areas = label_watersheds(mg, [], nested=nested)[:3]
+    np.testing.assert_array_equal(labels, -1)
+    assert len(counts) == len(areas) == 0
+    assert areas.dtype == float
+
+
+def _random_watersheds(seed):
+    np.random.seed(seed)
+    mg = RasterModelGrid((20, 30), xy_spacing=(5.0, 10.0))
+    z = mg.add_zeros("topographic__elevation", at="node")
+    z += np.random.rand(z.size) + 0.05 * mg.y_of_node
+    FlowAccumulator(mg, flow_director="D8").run_one_step()
+    outlet_ids = np.random.choice(mg.number_of_nodes, size=60, replace=False)
+    return mg, outlet_ids
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_label_watersheds_nested(seed):
+    mg, outlet_ids = _random_watersheds(seed)
+    labels, counts, areas, parents = label_watersheds(mg, outlet_ids, nested=True)
+
+    masks = np.array([get_watershed_mask(mg, outlet_id) for outlet_id in outlet_ids])
+    np.testing.assert_array_equal(counts, masks.sum(axis=1))
+    np.testing.assert_array_almost_equal(areas, masks @ mg.cell_area_at_node)
+
+    for basin, outlet_id in enumerate(outlet_ids):
+        # the parent is the smallest other watershed that contains the outlet.
+        containing = np.where(masks[:, outlet_id])[0]
+        containing = containing[containing != basin]
+        if len(containing) == 0:
+            assert parents[basin] == -1
+        else:
+            assert parents[basin] == containing[np.argmin(counts[containing])]
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_label_watersheds_labels(seed):
+    mg, outlet_ids = _random_watersheds(seed)
+    labels, counts, areas = label_watersheds(mg, outlet_ids)
+
+    masks = np.array([get_watershed_mask(mg, outlet_id) for outlet_id in outlet_ids])
+    for node in range(mg.number_of_nodes):
+        basins = np.where(masks[:, node])[0]
+        if len(basins) == 0:
+            assert labels[node] == -1
+        else:
+            # the nearest outlet downstream has the smallest watershed.
+            assert labels[node] == basins[np.argmin(masks[basins].sum(axis=1))]
+
+    np.testing.assert_array_equal(
+        counts, np.bincount(labels[labels >= 0], minlength=60)
+    )
+    np.testing.assert_array_equal(labels[outlet_ids], np.arange(60))
+    assert areas.dtype == float
+    assert areas.sum() == pytest.approx(mg.cell_area_at_node[labels >= 0].sum())